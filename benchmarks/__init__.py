@@ -0,0 +1,3 @@
+"""
+저장해 둔 매일성경 페이지와 로컬 SMTP 서버로 크롤링-렌더링-전송 성능을 측정하는 벤치마크입니다.
+"""
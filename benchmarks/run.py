@@ -0,0 +1,359 @@
+"""
+매일성경 크롤러 벤치마크 실행 모듈입니다.
+
+실제 사이트와 Gmail 대신 다음 대역을 사용합니다.
+- 로컬 HTTP 서버: benchmarks/fixtures에 저장해 둔 페이지와 스타일시트를 제공
+- 로컬 SMTP 서버(aiosmtpd): 받은 메일 수만 세고 버림
+
+측정 항목:
+- startup_interpreter / startup_import: 빈 인터프리터 실행과 daily_bible_crawler.main을 가져오는
+  새 프로세스의 실행 시간 (짧게 실행되는 cron 컨테이너의 시작 비용)
+- capture_http / capture_playwright: 각 추출 경로로 페이지에서 말씀과 해설 추출
+  (Chromium이 설치되어 있지 않으면 capture_playwright는 건너뜀)
+- build_content: 텍스트/HTML 본문 구성
+- render_email: 이메일 HTML 생성 (CSS 정리 포함)
+- archive_write: 텍스트/HTML 파일 저장
+- mime_<N>: 메시지 인코딩과 수신자 N명분의 메시지 생성
+- ledger_<N>: 수신자 N명분의 전송 결과를 전송 원장에 모아 쓰기
+- smtp_<N>: 로컬 SMTP 서버로 수신자 N명에게 전송 (한 번만 실행)
+
+결과는 benchmarks/results/<시각>.json에 저장하고 직전 결과와 비교해 출력하며,
+thresholds.json의 한도(중앙값 기준, 초)를 넘는 항목이 있으면 종료 코드 1로 끝납니다.
+
+사용 예:
+    python -m benchmarks.run
+    python -m benchmarks.run --recipients 1,100 --repeat 5
+"""
+import argparse
+import functools
+import glob
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+THRESHOLDS_PATH = os.path.join(BENCHMARK_DIR, 'thresholds.json')
+FIXTURE_PAGE = 'bible_today.html'
+
+DEFAULT_RECIPIENT_COUNTS = (1, 100, 10000)
+DEFAULT_REPEAT = 3
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """픽스처 디렉토리를 제공하며 요청 로그를 남기지 않는 핸들러"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """저장해 둔 페이지를 제공하는 로컬 HTTP 서버"""
+
+    def __enter__(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/{FIXTURE_PAGE}"
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class CountingHandler:
+    """받은 메일 수와 수신자 수만 세는 SMTP 핸들러"""
+
+    def __init__(self):
+        self.messages = 0
+        self.recipients = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        self.recipients += len(envelope.rcpt_tos)
+        return '250 OK'
+
+
+class LocalSmtpServer:
+    """aiosmtpd로 띄우는 로컬 SMTP 대역 서버"""
+
+    def __enter__(self):
+        from aiosmtpd.controller import Controller
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        self.handler = CountingHandler()
+        # 큰 첨부 파일도 받을 수 있도록 메시지 크기 제한을 해제
+        self.controller = Controller(self.handler, hostname='127.0.0.1', port=self.port, data_size_limit=0)
+        self.controller.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.controller.stop()
+
+
+def measure(function, repeat):
+    """
+    function을 repeat번 실행하여 소요 시간 통계를 반환합니다.
+
+    Args:
+        function (callable): 측정할 함수
+        repeat (int): 반복 횟수
+
+    Returns:
+        dict: {'runs': int, 'min': float, 'median': float, 'max': float}
+    """
+    durations = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started_at)
+    return {
+        'runs': repeat,
+        'min': round(min(durations), 6),
+        'median': round(statistics.median(durations), 6),
+        'max': round(max(durations), 6),
+    }
+
+
+def measure_startup(repeat):
+    """
+    새 파이썬 프로세스의 시작 시간을 측정합니다.
+
+    Args:
+        repeat (int): 반복 횟수
+
+    Returns:
+        dict: {'startup_interpreter': 측정 결과, 'startup_import': 측정 결과}
+    """
+    project_dir = os.path.dirname(BENCHMARK_DIR)
+
+    def run(code):
+        subprocess.run([sys.executable, '-c', code], cwd=project_dir, check=True)
+
+    return {
+        'startup_interpreter': measure(lambda: run('pass'), repeat),
+        'startup_import': measure(lambda: run('import daily_bible_crawler.main'), repeat),
+    }
+
+
+def run_benchmarks(recipient_counts=DEFAULT_RECIPIENT_COUNTS, repeat=DEFAULT_REPEAT, include_playwright=True):
+    """
+    모든 벤치마크를 실행합니다.
+
+    파일을 쓰는 항목(CSS 캐시, 보관 파일)이 작업 디렉토리를 건드리지 않도록 임시 디렉토리에서 실행합니다.
+
+    Args:
+        recipient_counts (iterable): MIME 생성과 SMTP 전송을 측정할 수신자 수
+        repeat (int): 전송을 제외한 항목의 반복 횟수
+        include_playwright (bool): Playwright 추출 경로도 측정할지 여부
+
+    Returns:
+        dict: 항목 이름별 측정 결과. 건너뛴 항목은 {'skipped': 사유}
+    """
+    from daily_bible_crawler import css_pruner
+    from daily_bible_crawler.http_fetcher import fetch_bible_data
+    from daily_bible_crawler.main import (
+        build_bible_content,
+        collect_bible_data_with_playwright,
+        create_html_email,
+        save_html_file,
+        save_text_file,
+    )
+    from daily_bible_crawler.ledger import DeliveryLedger
+    from daily_bible_crawler.message_builder import PreparedMessage
+    from daily_bible_crawler.smtp_sender import SmtpConnectionPool, send_messages
+
+    results = measure_startup(repeat)
+    working_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir, FixtureServer() as fixture_server:
+        os.chdir(temp_dir)
+        try:
+            def capture_http():
+                bible_result = fetch_bible_data(fixture_server.url)
+                assert bible_result is not None, "픽스처 페이지에서 내용을 추출하지 못했습니다."
+                return bible_result
+
+            results['capture_http'] = measure(capture_http, repeat)
+            bible_data, explanation_data, css_content = capture_http()
+
+            if include_playwright:
+                try:
+                    results['capture_playwright'] = measure(
+                        functools.partial(collect_bible_data_with_playwright, url=fixture_server.url), repeat
+                    )
+                except Exception as e:
+                    logger.warning(f"Playwright 추출 측정을 건너뜁니다: {e}")
+                    results['capture_playwright'] = {'skipped': str(e).splitlines()[0]}
+
+            results['build_content'] = measure(lambda: build_bible_content(bible_data, explanation_data), repeat)
+            content, html_content = build_bible_content(bible_data, explanation_data)
+
+            def render_email():
+                # 매번 CSS 정리부터 다시 하도록 메모리 캐시를 비움 (디스크 캐시는 임시 디렉토리)
+                css_pruner._memory_cache.clear()
+                return create_html_email(content, html_content, css_content)
+
+            results['render_email'] = measure(render_email, repeat)
+            html_email = render_email()
+
+            archive_dir = os.path.join(temp_dir, 'texts')
+            results['archive_write'] = measure(
+                lambda: (save_text_file(content, output_dir=archive_dir), save_html_file(html_email, output_dir=archive_dir)),
+                repeat,
+            )
+
+            sender = 'sender@example.com'
+            subject = '[매일성경] 오늘의 말씀 - 벤치마크'
+            for count in recipient_counts:
+                recipients = [f"user{index}@example.com" for index in range(count)]
+
+                def build_messages():
+                    prepared = PreparedMessage(sender, subject, html_email)
+                    return [(recipient, (sender, [recipient], prepared.as_bytes(recipient))) for recipient in recipients]
+
+                results[f'mime_{count}'] = measure(build_messages, repeat)
+                messages = build_messages()
+
+                ledger_path = os.path.join(temp_dir, 'ledger.sqlite3')
+
+                def record_ledger():
+                    # 전송 결과를 원장에 모아 쓰는 비용 (매번 빈 원장에서 시작)
+                    if os.path.exists(ledger_path):
+                        os.remove(ledger_path)
+                    ledger = DeliveryLedger(path=ledger_path)
+                    for recipient in recipients:
+                        ledger.record(datetime(2025, 3, 24), 'smtp', recipient)
+                    ledger.flush()
+
+                results[f'ledger_{count}'] = measure(record_ledger, repeat)
+
+                with LocalSmtpServer() as smtp_server:
+                    def deliver():
+                        with SmtpConnectionPool(host='127.0.0.1', port=smtp_server.port, use_ssl=False) as pool:
+                            stats = send_messages(pool, messages)
+                        assert stats['failed'] == 0, f"{stats['failed']}건 전송 실패"
+
+                    results[f'smtp_{count}'] = measure(deliver, 1)
+                    results[f'smtp_{count}']['rate'] = round(count / max(results[f'smtp_{count}']['median'], 1e-9), 1)
+        finally:
+            os.chdir(working_dir)
+
+    return results
+
+
+def check_thresholds(results, thresholds):
+    """
+    측정 결과의 중앙값이 한도를 넘는 항목을 찾습니다.
+
+    Args:
+        results (dict): run_benchmarks 결과
+        thresholds (dict): 항목 이름별 최대 허용 시간(초)
+
+    Returns:
+        list: (항목 이름, 중앙값, 한도) 목록
+    """
+    exceeded = []
+    for name, limit in thresholds.items():
+        result = results.get(name)
+        if result and 'median' in result and result['median'] > limit:
+            exceeded.append((name, result['median'], limit))
+    return exceeded
+
+
+def latest_result_path(results_dir=RESULTS_DIR):
+    """저장된 결과 중 가장 최근 파일 경로를 반환합니다. 없으면 None"""
+    paths = sorted(glob.glob(os.path.join(results_dir, '*.json')))
+    return paths[-1] if paths else None
+
+
+def save_results(results, results_dir=RESULTS_DIR):
+    """
+    측정 결과를 실행 환경 정보와 함께 저장합니다.
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    document = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def print_report(results, baseline=None):
+    """측정 결과를 표로 출력하고, 이전 결과가 있으면 중앙값 변화율을 함께 출력합니다."""
+    print(f"{'항목':<20}{'중앙값(초)':>12}{'최소(초)':>12}{'이전 대비':>12}")
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:<20}{'건너뜀':>12}  {result['skipped']}")
+            continue
+        change = ''
+        previous = (baseline or {}).get(name, {})
+        if previous.get('median'):
+            change = f"{(result['median'] / previous['median'] - 1) * 100:+.1f}%"
+        print(f"{name:<20}{result['median']:>12.4f}{result['min']:>12.4f}{change:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 페이지와 로컬 SMTP 서버로 크롤링/렌더링/전송 성능을 측정합니다.")
+    parser.add_argument('--recipients', default=','.join(str(count) for count in DEFAULT_RECIPIENT_COUNTS),
+                        help="측정할 수신자 수 목록 (쉼표로 구분)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="전송을 제외한 항목의 반복 횟수")
+    parser.add_argument('--no-playwright', action='store_true', help="Playwright 추출 경로를 측정하지 않음")
+    parser.add_argument('--thresholds', default=THRESHOLDS_PATH, help="항목별 한도(초)를 담은 JSON 파일")
+    parser.add_argument('--results-dir', default=RESULTS_DIR, help="결과를 저장할 디렉토리")
+    args = parser.parse_args(argv)
+
+    baseline_path = latest_result_path(args.results_dir)
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    # 측정 중에는 크롤러의 로그를 남기지 않음
+    logger.disable('daily_bible_crawler')
+    try:
+        results = run_benchmarks(
+            recipient_counts=[int(count) for count in args.recipients.split(',') if count.strip()],
+            repeat=args.repeat,
+            include_playwright=not args.no_playwright,
+        )
+    finally:
+        logger.enable('daily_bible_crawler')
+    print_report(results, baseline)
+    print(f"결과 저장: {save_results(results, args.results_dir)}")
+
+    with open(args.thresholds, 'r', encoding='utf-8') as f:
+        thresholds = json.load(f)
+    exceeded = check_thresholds(results, thresholds)
+    for name, median, limit in exceeded:
+        print(f"한도 초과: {name} {median:.4f}초 > {limit}초")
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,460 @@
+"""
+날짜별 말씀을 압축하여 저장하는 보관소 모듈입니다.
+
+매일 texts/에 .txt와 전체 스타일시트가 들어 있는 .html 파일을 쓰는 대신, 날짜마다 구조화된
+말씀(DailyReading 바이너리)만 압축하여 texts/archive.sqlite3에 저장합니다. 날마다 거의 같은
+사이트 CSS는 내용 해시를 키로 한 번만 저장하며, 텍스트와 HTML은 요청할 때 다시 렌더링합니다.
+날짜가 기본 키이므로 원하는 날짜를 바로 읽을 수 있습니다.
+
+압축 방식은 ARCHIVE_COMPRESSION으로 정합니다. 기본값은 표준 라이브러리의 zlib이며,
+zstandard 패키지가 설치되어 있으면 zstd도 사용할 수 있습니다. 항목마다 압축 방식을 기록하므로
+방식을 바꿔도 이전 항목을 그대로 읽습니다.
+
+사용 예:
+    python -m daily_bible_crawler.archive migrate texts            # 기존 .txt/.html 파일을 보관소로 옮김
+    python -m daily_bible_crawler.archive migrate texts --remove   # 옮긴 뒤 원본 파일 삭제
+    python -m daily_bible_crawler.archive show 2025-03-24 --format html > day.html
+    python -m daily_bible_crawler.archive stats
+"""
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from contextlib import closing
+from datetime import datetime
+
+from loguru import logger
+
+from daily_bible_crawler.reading import DailyReading, Section, Verse
+
+ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', 'texts')
+ARCHIVE_FILENAME = 'archive.sqlite3'
+ARCHIVE_COMPRESSION = os.environ.get('ARCHIVE_COMPRESSION', 'zlib')  # 'zlib' 또는 'zstd'
+ARCHIVE_COMPRESSION_LEVEL = int(os.environ.get('ARCHIVE_COMPRESSION_LEVEL', '9'))
+
+# 이전 버전이 저장한 파일 이름 (bible_content_YYYYMMDD.txt/html)
+LEGACY_FILE_PATTERN = re.compile(r'^bible_content_(\d{8})\.(txt|html)$')
+# create_html_email이 사이트 CSS 앞에 넣는 주석
+SITE_CSS_MARKER = '/* 추가 사용자 정의 스타일 */'
+
+
+def _compress(data, codec, level=ARCHIVE_COMPRESSION_LEVEL):
+    if codec == 'zstd':
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=min(level, 22)).compress(data)
+    if codec == 'zlib':
+        return zlib.compress(data, level)
+    raise ValueError(f"지원하지 않는 압축 방식입니다: {codec} (zlib, zstd 중 하나)")
+
+
+def _decompress(data, codec):
+    if codec == 'zstd':
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    raise ValueError(f"지원하지 않는 압축 방식입니다: {codec}")
+
+
+def content_hash(data):
+    """
+    공유 자원을 저장할 때 키로 쓰는 내용 해시를 반환합니다.
+
+    Args:
+        data (bytes): 내용
+
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class ArchiveStore:
+    """날짜별 말씀을 압축하여 저장하고, 공유 CSS는 내용 해시로 한 번만 저장하는 보관소"""
+
+    def __init__(self, directory=ARCHIVE_DIR, compression=ARCHIVE_COMPRESSION):
+        """
+        Args:
+            directory (str): 보관소 디렉토리 (archive.sqlite3를 만듦)
+            compression (str): 새로 저장할 항목의 압축 방식 ('zlib' 또는 'zstd')
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, ARCHIVE_FILENAME)
+        self.compression = compression
+        # 날짜를 여러 번 읽어도 같은 CSS는 한 번만 풀도록 해시별로 보관
+        self._assets = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(directory or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS assets (
+                    hash TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS days (
+                    date TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    reading BLOB NOT NULL,
+                    css_hash TEXT,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _key(date):
+        return date.strftime('%Y%m%d')
+
+    def put(self, date, reading):
+        """
+        날짜의 말씀을 저장합니다. 같은 날짜가 있으면 바꿉니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+            reading (DailyReading): 말씀 모델 (CSS 포함)
+        """
+        css = (reading.css or '').encode('utf-8')
+        css_hash = content_hash(css) if css else None
+        # CSS는 자원으로 따로 저장하므로 말씀에서는 비움
+        payload = DailyReading(
+            date=date, header=reading.header, verses=reading.verses,
+            title=reading.title, sections=reading.sections, info=reading.info,
+        ).to_bytes()
+
+        with closing(self._connect()) as conn, conn:
+            if css_hash is not None and conn.execute(
+                    'SELECT 1 FROM assets WHERE hash = ?', (css_hash,)).fetchone() is None:
+                conn.execute(
+                    'INSERT INTO assets (hash, codec, size, data) VALUES (?, ?, ?, ?)',
+                    (css_hash, self.compression, len(css), _compress(css, self.compression)),
+                )
+            conn.execute(
+                'INSERT OR REPLACE INTO days (date, codec, size, reading, css_hash, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (self._key(date), self.compression, len(payload), _compress(payload, self.compression),
+                 css_hash, time.time()),
+            )
+
+    def get(self, date):
+        """
+        날짜의 말씀을 반환합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            DailyReading | None: 없으면 None
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT codec, reading, css_hash FROM days WHERE date = ?', (self._key(date),)
+            ).fetchone()
+            if row is None:
+                return None
+            codec, data, css_hash = row
+            reading = DailyReading.from_bytes(_decompress(data, codec))
+            if css_hash is not None:
+                reading.css = self._asset(conn, css_hash)
+        return reading
+
+    def _asset(self, conn, asset_hash):
+        with self._lock:
+            if asset_hash in self._assets:
+                return self._assets[asset_hash]
+        codec, data = conn.execute('SELECT codec, data FROM assets WHERE hash = ?', (asset_hash,)).fetchone()
+        value = _decompress(data, codec).decode('utf-8')
+        with self._lock:
+            self._assets[asset_hash] = value
+        return value
+
+    def __contains__(self, date):
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT 1 FROM days WHERE date = ?', (self._key(date),)).fetchone() is not None
+
+    def dates(self, start=None, end=None):
+        """
+        저장된 날짜를 오래된 순서로 반환합니다.
+
+        Args:
+            start (datetime, optional): 시작일 (포함)
+            end (datetime, optional): 종료일 (포함)
+
+        Returns:
+            list: datetime 목록
+        """
+        query, params = 'SELECT date FROM days', []
+        conditions = []
+        if start is not None:
+            conditions.append('date >= ?')
+            params.append(self._key(start))
+        if end is not None:
+            conditions.append('date <= ?')
+            params.append(self._key(end))
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + ' ORDER BY date', params).fetchall()
+        return [datetime.strptime(row[0], '%Y%m%d') for row in rows]
+
+    def versions(self):
+        """
+        날짜별 마지막 저장 시각을 반환합니다. (검색 색인 등에서 바뀐 날짜만 다시 처리할 때 사용)
+
+        Returns:
+            dict: {datetime: 저장 시각(float, time.time() 기준)}
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT date, updated_at FROM days').fetchall()
+        return {datetime.strptime(key, '%Y%m%d'): updated_at for key, updated_at in rows}
+
+    def render_text(self, date):
+        """
+        날짜의 텍스트 파일 내용을 다시 만듭니다. (save_text_file과 같은 형식)
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            str | None: 없으면 None
+        """
+        from daily_bible_crawler.main import format_text_content, render_reading
+
+        reading = self.get(date)
+        if reading is None:
+            return None
+        content, _ = render_reading(reading)
+        return format_text_content(content)
+
+    def render_html(self, date):
+        """
+        날짜의 HTML 파일 내용을 다시 만듭니다. (create_html_email과 같은 형식)
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            str | None: 없으면 None
+        """
+        from daily_bible_crawler.main import create_html_email, render_reading
+
+        reading = self.get(date)
+        if reading is None:
+            return None
+        content, html_content = render_reading(reading)
+        return create_html_email(content, html_content, reading.css, date)
+
+    def stats(self):
+        """
+        저장된 날짜 수, 자원 수와 압축 전후 크기를 반환합니다.
+
+        Returns:
+            dict: {'days', 'assets', 'raw_bytes', 'stored_bytes', 'file_bytes'}
+        """
+        with closing(self._connect()) as conn:
+            days, day_raw, day_stored = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(reading)), 0) FROM days'
+            ).fetchone()
+            assets, asset_raw, asset_stored = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM assets'
+            ).fetchone()
+        return {
+            'days': days,
+            'assets': assets,
+            'raw_bytes': day_raw + asset_raw,
+            'stored_bytes': day_stored + asset_stored,
+            'file_bytes': os.path.getsize(self.path),
+        }
+
+
+def parse_archived_html(html, date=None):
+    """
+    이전 버전이 저장한 HTML 파일에서 말씀 모델을 다시 읽습니다.
+
+    Args:
+        html (str): create_html_email로 만든 HTML
+        date (datetime, optional): 말씀 날짜
+
+    Returns:
+        DailyReading: 말씀 모델
+
+    Raises:
+        ValueError: 말씀 영역이 없는 경우
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    bible_info = soup.select_one('.bible-info')
+    if bible_info is None:
+        raise ValueError("말씀 영역(.bible-info)이 없는 HTML입니다.")
+
+    def text_with_breaks(element):
+        # 렌더링할 때 줄바꿈을 <br>로 바꾸었으므로 되돌림
+        if element is None:
+            return ''
+        return ''.join('\n' if getattr(child, 'name', None) == 'br' else child.get_text()
+                       for child in element.children)
+
+    def text(element):
+        return element.get_text() if element is not None else ''
+
+    verses = [
+        (text(verse.select_one('.verse-number')), text(verse.select_one('.verse-text')))
+        for verse in soup.select('.bible-verse')
+    ]
+    sections = [
+        (text(section.select_one('.explanation-subtitle')), text_with_breaks(section.select_one('.explanation-content')))
+        for section in soup.select('.explanation-section')
+    ]
+    style = soup.find('style')
+    css = ''
+    if style is not None and SITE_CSS_MARKER in style.string:
+        css = style.string.split(SITE_CSS_MARKER, 1)[1].strip()
+
+    return DailyReading(
+        date=date,
+        header=text_with_breaks(bible_info),
+        verses=(Verse(number, verse_text) for number, verse_text in verses),
+        title=text(soup.select_one('.explanation-title')),
+        sections=(Section(subtitle, content) for subtitle, content in sections),
+        info=text(soup.select_one('.explanation-info')),
+        css=css,
+    )
+
+
+def archived_days(directory):
+    """
+    보관소의 날짜와 이전 방식의 .html 파일을 모아, 날짜별 저장 시각과 말씀을 읽는 함수를 반환합니다.
+    (검색 색인처럼 보관한 말씀에서 만드는 색인이 바뀐 날짜만 다시 처리할 때 사용)
+
+    같은 날짜가 보관소와 파일에 모두 있으면 보관소를 사용합니다.
+
+    Args:
+        directory (str): 보관 디렉토리
+
+    Returns:
+        dict: {datetime: (저장 시각(float), 인자 없이 DailyReading을 반환하는 함수)}
+    """
+    days = {}
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            match = LEGACY_FILE_PATTERN.match(name)
+            if match and match.group(2) == 'html':
+                path = os.path.join(directory, name)
+                date = datetime.strptime(match.group(1), '%Y%m%d')
+
+                def load(path=path, date=date):
+                    with open(path, encoding='utf-8') as f:
+                        return parse_archived_html(f.read(), date)
+
+                days[date] = (os.path.getmtime(path), load)
+    if os.path.exists(os.path.join(directory, ARCHIVE_FILENAME)):
+        store = ArchiveStore(directory)
+        for date, version in store.versions().items():
+            days[date] = (version, lambda date=date: store.get(date))
+    return days
+
+
+def migrate_texts_dir(source_dir, store=None, remove=False):
+    """
+    texts/의 날짜별 .html(과 .txt) 파일을 보관소로 옮깁니다.
+
+    HTML에서 말씀 모델을 다시 읽어 저장하고, 같은 날짜의 .txt가 있으면 보관소에서 다시 만든
+    텍스트와 같은지 확인합니다. remove가 True이면 확인된 날짜의 원본 파일만 삭제합니다.
+    .txt만 있는 날짜는 구조를 정확히 되살릴 수 없으므로 건너뜁니다.
+
+    Args:
+        source_dir (str): 기존 파일이 있는 디렉토리
+        store (ArchiveStore, optional): 저장할 보관소 (기본값: source_dir의 보관소)
+        remove (bool): 확인된 원본 파일을 삭제할지 여부
+
+    Returns:
+        dict: {'migrated': int, 'skipped': int, 'mismatched': int, 'removed': int, 'bytes_before': int}
+    """
+    store = store or ArchiveStore(source_dir)
+    files = {}
+    for name in os.listdir(source_dir):
+        match = LEGACY_FILE_PATTERN.match(name)
+        if match:
+            files.setdefault(match.group(1), {})[match.group(2)] = os.path.join(source_dir, name)
+
+    stats = {'migrated': 0, 'skipped': 0, 'mismatched': 0, 'removed': 0, 'bytes_before': 0}
+    for key, paths in sorted(files.items()):
+        stats['bytes_before'] += sum(os.path.getsize(path) for path in paths.values())
+        if 'html' not in paths:
+            logger.warning(f"{key}: HTML 파일이 없어 건너뜁니다.")
+            stats['skipped'] += 1
+            continue
+
+        date = datetime.strptime(key, '%Y%m%d')
+        with open(paths['html'], encoding='utf-8') as f:
+            reading = parse_archived_html(f.read(), date)
+        store.put(date, reading)
+        stats['migrated'] += 1
+
+        verified = True
+        if 'txt' in paths:
+            with open(paths['txt'], encoding='utf-8') as f:
+                verified = f.read() == store.render_text(date)
+            if not verified:
+                logger.warning(f"{key}: 다시 만든 텍스트가 원본과 달라 원본 파일을 남깁니다.")
+                stats['mismatched'] += 1
+        if remove and verified:
+            for path in paths.values():
+                os.remove(path)
+                stats['removed'] += 1
+
+    logger.info(
+        f"보관소로 옮김: {stats['migrated']}일, 건너뜀 {stats['skipped']}일, 텍스트 불일치 {stats['mismatched']}일, "
+        f"원본 {stats['bytes_before']:,}바이트 -> 보관소 {os.path.getsize(store.path):,}바이트"
+    )
+    return stats
+
+
+if __name__ == "__main__":
+    def parse_date(value):
+        return datetime.strptime(value, '%Y-%m-%d')
+
+    parser = argparse.ArgumentParser(description="압축 보관소를 관리합니다.")
+    parser.add_argument('--dir', default=ARCHIVE_DIR, help="보관소 디렉토리 (기본값: ARCHIVE_DIR)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    migrate_parser = commands.add_parser('migrate', help="기존 .txt/.html 파일을 보관소로 옮김")
+    migrate_parser.add_argument('source', nargs='?', default=None, help="기존 파일 디렉토리 (기본값: --dir)")
+    migrate_parser.add_argument('--remove', action='store_true', help="옮긴 뒤 확인된 원본 파일 삭제")
+
+    show_parser = commands.add_parser('show', help="날짜의 텍스트 또는 HTML 출력")
+    show_parser.add_argument('date', type=parse_date, help="말씀 날짜 (YYYY-MM-DD)")
+    show_parser.add_argument('--format', choices=('txt', 'html'), default='txt')
+
+    commands.add_parser('stats', help="저장된 날짜 수와 크기 출력")
+    args = parser.parse_args()
+
+    from daily_bible_crawler.main import init
+
+    # 다시 만드는 HTML의 요일 표기를 위해 로케일 설정
+    init()
+    archive = ArchiveStore(args.dir)
+    if args.command == 'migrate':
+        migrate_texts_dir(args.source or args.dir, archive, remove=args.remove)
+    elif args.command == 'show':
+        output = archive.render_text(args.date) if args.format == 'txt' else archive.render_html(args.date)
+        if output is None:
+            sys.exit(f"{args.date:%Y-%m-%d}: 보관소에 없습니다.")
+        sys.stdout.write(output)
+    else:
+        for name, value in archive.stats().items():
+            print(f"{name}\t{value}")
@@ -0,0 +1,299 @@
+"""
+크롤링, 렌더링, 보관, 전송을 asyncio로 겹쳐 실행하는 비동기 진입점입니다.
+
+main()은 추출, 텍스트 저장, 렌더링, HTML 저장, 전송을 차례로 실행하지만, 이 모듈은
+서로 의존하지 않는 작업을 동시에 실행합니다.
+
+- 텍스트 저장은 추출이 끝나자마자 렌더링과 함께 시작합니다.
+- HTML 저장과 이메일 전송은 렌더링이 끝나면 함께 시작합니다.
+- 앱 비밀번호 전송은 최대 PIPELINE_SEND_CONCURRENCY통을 동시에 보냅니다.
+
+따라서 전체 소요 시간은 각 단계의 합이 아니라 가장 느린 경로(보통 추출 + 전송)에 가까워집니다.
+브라우저가 필요하면 playwright.async_api를 사용합니다. 파일 쓰기와 SMTP 전송은 작업 스레드에서
+실행하여 이벤트 루프를 막지 않습니다.
+
+추출과 전송에는 각각 시간 제한이 있으며, 시간이 지나거나 SIGTERM/Ctrl+C로 취소되면 진행 중인
+작업을 정리하고 종료합니다. main()과 마찬가지로 전송 실패는 실행을 실패시키지 않고,
+보관 실패는 전송이 끝난 뒤 예외로 다시 발생시킵니다.
+
+사용 예:
+    python -m daily_bible_crawler.async_pipeline
+    python -m daily_bible_crawler.async_pipeline --refresh
+"""
+import argparse
+import asyncio
+import os
+import signal
+from datetime import datetime
+
+from loguru import logger
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.cache import ContentCache
+from daily_bible_crawler.reading import DailyReading
+from daily_bible_crawler.recipients import add_shard_arguments
+from daily_bible_crawler.main import (
+    ARCHIVE_BACKEND,
+    CACHE_ENABLED,
+    CACHE_FORCE_REFRESH,
+    EMAIL_APP_PASSWORD,
+    EMAIL_RECIPIENTS,
+    EMAIL_SENDER,
+    EXPLANATION_XHR_URL,
+    OAUTH_CREDENTIALS_PATH,
+    TEXTS_DIR,
+    USE_HTTP_FAST_PATH,
+    WEBSITE_URL,
+    create_html_email,
+    init,
+    raise_for_delivery_stats,
+    render_reading,
+    save_html_file,
+    save_reading,
+    save_text_file,
+    send_email,
+    send_email_with_oauth2,
+    update_indexes,
+)
+
+# 앱 비밀번호 전송 시 동시에 보낼 메일 수 (SMTP 연결 수)
+PIPELINE_SEND_CONCURRENCY = int(os.environ.get('PIPELINE_SEND_CONCURRENCY', '8'))
+# 추출(캐시 조회 포함)과 전송 전체의 시간 제한(초)
+PIPELINE_CAPTURE_TIMEOUT = float(os.environ.get('PIPELINE_CAPTURE_TIMEOUT', '60'))
+PIPELINE_DELIVERY_TIMEOUT = float(os.environ.get('PIPELINE_DELIVERY_TIMEOUT', '600'))
+
+
+async def capture_reading_async(use_http=USE_HTTP_FAST_PATH, url=WEBSITE_URL, cache=None, date=None,
+                                force_refresh=False, browser=None):
+    """
+    capture_reading의 비동기 버전입니다.
+
+    캐시, HTTP 빠른 경로, 비동기 Playwright 순서로 시도합니다.
+
+    Args:
+        use_http (bool): HTTP 빠른 경로를 먼저 시도할지 여부
+        url (str): 접속할 페이지 URL
+        cache (ContentCache, optional): 날짜별 크롤링 결과 캐시
+        date (datetime, optional): 캐시 키로 사용할 말씀 날짜 (기본값: 오늘)
+        force_refresh (bool): 캐시를 무시하고 다시 크롤링할지 여부
+        browser (AsyncBrowserFallback, optional): HTTP로 추출하지 못했을 때 사용할 브라우저.
+            없으면 필요할 때 띄웠다가 종료합니다.
+
+    Returns:
+        DailyReading: 말씀 모델 (사이트 CSS 포함)
+    """
+    date = date or datetime.now()
+    bible_result = None
+    if cache is not None and not force_refresh:
+        with metrics.stage('cache_lookup'):
+            bible_result = await asyncio.to_thread(cache.get, date)
+    if bible_result is None:
+        bible_result = await _collect_bible_data_async(use_http, url, browser)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, date, *bible_result)
+
+    return DailyReading.from_dicts(*bible_result, date=date)
+
+
+async def capture_bible_content_async(use_http=USE_HTTP_FAST_PATH, url=WEBSITE_URL, cache=None, date=None,
+                                      force_refresh=False, browser=None):
+    """
+    capture_bible_content의 비동기 버전입니다. 인자는 capture_reading_async와 같습니다.
+
+    Returns:
+        tuple: (텍스트 내용(dict), HTML 내용(str), CSS 내용(str))
+    """
+    reading = await capture_reading_async(use_http=use_http, url=url, cache=cache, date=date,
+                                          force_refresh=force_refresh, browser=browser)
+    with metrics.stage('build_content'):
+        content, html_content = render_reading(reading)
+    return content, html_content, reading.css
+
+
+async def _collect_bible_data_async(use_http, url, browser):
+    bible_result = None
+    if use_http:
+        from daily_bible_crawler.http_fetcher import fetch_bible_data
+
+        logger.info("HTTP로 웹사이트 접속 중...")
+        with metrics.stage('http_fetch'):
+            bible_result = await asyncio.to_thread(fetch_bible_data, url, explanation_url=EXPLANATION_XHR_URL)
+        if bible_result is None:
+            logger.info("HTTP로 내용을 추출하지 못해 Playwright로 다시 시도합니다.")
+
+    if bible_result is None:
+        from daily_bible_crawler.browser_pool import AsyncBrowserFallback
+
+        owned_browser = browser is None
+        browser = browser or AsyncBrowserFallback()
+        try:
+            with metrics.stage('playwright_capture'):
+                bible_result = await browser.collect(url)
+        finally:
+            if owned_browser:
+                await browser.close()
+    return bible_result
+
+
+async def send_email_async(subject, html_email, concurrency=PIPELINE_SEND_CONCURRENCY, date=None):
+    """
+    send_email의 비동기 버전입니다.
+
+    앱 비밀번호를 사용할 때는 최대 concurrency개의 SMTP 연결로 수신자에게 동시에 보냅니다.
+    OAuth2는 Gmail 배치 요청으로 이미 한 번에 여러 통을 보내므로 작업 스레드에서 그대로 실행합니다.
+
+    Args:
+        subject (str): 이메일 제목
+        html_email (str): 첨부할 HTML 내용
+        concurrency (int): 동시에 보낼 메일 수
+        date (datetime, optional): 전송 원장에 기록할 말씀 날짜 (기본값: 오늘)
+
+    Raises:
+        DeliveryError: 일부 수신자에게 보내지 못한 경우
+        DailyLimitReached: 하루 전송 한도에 도달하여 남은 수신자에게 보내지 못한 경우
+    """
+    if os.path.exists(OAUTH_CREDENTIALS_PATH):
+        await asyncio.to_thread(send_email_with_oauth2, subject, html_email, date)
+        return
+    if not EMAIL_APP_PASSWORD or not EMAIL_SENDER or not EMAIL_RECIPIENTS:
+        # 설정 안내 로그는 기존 함수가 남김
+        await asyncio.to_thread(send_email, subject, html_email)
+        return
+
+    from daily_bible_crawler.ledger import tracked_delivery
+    from daily_bible_crawler.message_builder import PreparedMessage, smtp_envelopes
+    from daily_bible_crawler.rate_limiter import get_rate_limiter
+    from daily_bible_crawler.smtp_sender import SmtpConnectionPool, send_messages_async
+
+    with metrics.stage('mime_build'):
+        prepared = await asyncio.to_thread(PreparedMessage, EMAIL_SENDER, subject, html_email)
+    metrics.set_value('email_bytes', prepared.size)
+
+    pool = SmtpConnectionPool(EMAIL_SENDER, EMAIL_APP_PASSWORD, size=concurrency)
+    try:
+        # 원장에서 이미 받은 수신자를 빼고 보냄
+        with tracked_delivery(date or datetime.now(), 'smtp', EMAIL_RECIPIENTS) as (recipients, on_result), \
+                metrics.stage('send_smtp'):
+            stats = await send_messages_async(pool, smtp_envelopes(prepared, recipients), concurrency, on_result,
+                                              limiter=get_rate_limiter('smtp'))
+    finally:
+        await asyncio.to_thread(pool.close)
+    metrics.add('messages_sent', stats['sent'])
+    metrics.add('messages_failed', stats['failed'])
+
+    logger.info(f"앱 비밀번호로 이메일 전송 완료: {subject} -> {stats['sent']}명 ({EMAIL_RECIPIENTS!r})")
+    raise_for_delivery_stats(stats)
+
+
+async def _archive(stage, function, *args):
+    # 보관 실패는 전송을 취소하지 않도록 예외를 반환값으로 돌려줌
+    try:
+        with metrics.stage(stage):
+            await asyncio.to_thread(function, *args)
+    except Exception as e:
+        return e
+    return None
+
+
+async def _deliver(subject, html_email, timeout, date=None):
+    try:
+        async with asyncio.timeout(timeout):
+            with metrics.stage('send'):
+                await send_email_async(subject, html_email, date=date)
+    except TimeoutError:
+        logger.error(f"이메일 전송이 {timeout:.0f}초 안에 끝나지 않아 남은 전송을 취소했습니다.")
+    except Exception as e:
+        # 이메일 전송 실패는 프로그램을 중단시키지 않음
+        logger.error(f"이메일 전송 중 오류 발생: {str(e)}")
+
+
+async def run_pipeline(force_refresh=CACHE_FORCE_REFRESH, date=None, output_dir=TEXTS_DIR,
+                       capture_timeout=PIPELINE_CAPTURE_TIMEOUT, delivery_timeout=PIPELINE_DELIVERY_TIMEOUT):
+    """
+    말씀을 추출하고 보관과 전송을 동시에 실행합니다.
+
+    Args:
+        force_refresh (bool): 캐시를 무시하고 다시 크롤링할지 여부
+        date (datetime, optional): 말씀 날짜 (기본값: 오늘)
+        output_dir (str): 보관 디렉토리
+        capture_timeout (float): 추출 시간 제한(초)
+        delivery_timeout (float): 전송 시간 제한(초)
+
+    Raises:
+        TimeoutError: 추출이 시간 안에 끝나지 않은 경우
+        Exception: 보관(파일 저장) 중 오류가 발생한 경우 (전송은 끝까지 진행됨)
+    """
+    cache = ContentCache() if CACHE_ENABLED else None
+    async with asyncio.timeout(capture_timeout):
+        with metrics.stage('capture'):
+            reading = await capture_reading_async(cache=cache, date=date, force_refresh=force_refresh)
+    if cache is not None:
+        cache.log_stats()
+        metrics.set_value('cache_hits', cache.hits)
+    with metrics.stage('build_content'):
+        content, html_content = render_reading(reading)
+
+    email_subject = f"[매일성경] 오늘의 말씀 - {(date or datetime.now()).strftime('%Y-%m-%d (%A)')}"
+    archive_tasks = []
+    async with asyncio.TaskGroup() as tasks:
+        # 보관소 저장(또는 텍스트 저장)은 렌더링과 동시에 진행
+        if ARCHIVE_BACKEND == 'store':
+            archive_tasks.append(tasks.create_task(_archive('save_archive', save_reading, reading, date, output_dir)))
+        else:
+            archive_tasks.append(tasks.create_task(_archive('save_text', save_text_file, content, date, output_dir)))
+        with metrics.stage('render'):
+            html_email = await asyncio.to_thread(create_html_email, content, html_content, reading.css, date)
+        metrics.set_value('html_bytes', len(html_email.encode('utf-8')))
+
+        # HTML 저장과 전송을 동시에 진행 (보관소는 필요할 때 HTML을 다시 만듦)
+        if ARCHIVE_BACKEND != 'store':
+            archive_tasks.append(tasks.create_task(_archive('save_html', save_html_file, html_email, date, output_dir)))
+        tasks.create_task(_archive('update_indexes', update_indexes, reading, date))
+        tasks.create_task(_deliver(email_subject, html_email, delivery_timeout, date))
+
+    for task in archive_tasks:
+        if task.result() is not None:
+            raise task.result()
+
+
+async def main_async(force_refresh=CACHE_FORCE_REFRESH):
+    """
+    비동기 파이프라인의 메인 함수입니다. SIGTERM을 받으면 진행 중인 작업을 취소하고 종료합니다.
+
+    Args:
+        force_refresh (bool): 캐시를 무시하고 다시 크롤링할지 여부
+    """
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, task.cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
+
+    try:
+        with metrics.RunMetrics.from_env(labels=EMAIL_RECIPIENTS.shard_labels()):
+            logger.info("비동기 파이프라인 시작")
+            await run_pipeline(force_refresh=force_refresh)
+            logger.info("비동기 파이프라인 정상 종료")
+    except asyncio.CancelledError:
+        logger.warning("비동기 파이프라인이 취소되었습니다.")
+        raise
+    except Exception as e:
+        logger.error(f"프로그램 실행 중 오류 발생: {str(e)}")
+        raise
+    finally:
+        try:
+            loop.remove_signal_handler(signal.SIGTERM)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="매일성경 말씀을 추출하고 보관과 이메일 전송을 동시에 실행합니다.")
+    parser.add_argument('--refresh', action='store_true', default=CACHE_FORCE_REFRESH,
+                        help="캐시를 무시하고 웹사이트를 다시 크롤링")
+    add_shard_arguments(parser)
+    args = parser.parse_args()
+    EMAIL_RECIPIENTS.select_shard(args.shard_index, args.shard_count)
+    init()
+    asyncio.run(main_async(force_refresh=args.refresh))
@@ -0,0 +1,244 @@
+"""
+지난 날짜의 말씀과 해설을 한꺼번에 수집하는 백필 모듈입니다.
+
+날짜 범위의 각 날짜를 제한된 동시성으로 크롤링하고, 하루가 끝날 때마다 바로
+texts/ 디렉토리(ARCHIVE_BACKEND가 'store'이면 압축 보관소)에 저장합니다.
+이미 저장된 날짜는 건너뛰므로 중단된 백필을 같은 명령으로 다시 실행하면
+남은 날짜만 수집합니다.
+
+사용 예:
+    python -m daily_bible_crawler.backfill 2024-01-01 2024-12-31 --concurrency 8 --rate 4
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import requests
+from loguru import logger
+
+from daily_bible_crawler.browser_pool import AsyncBrowserFallback
+from daily_bible_crawler.http_fetcher import fetch_bible_data
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.main import (
+    ARCHIVE_BACKEND,
+    WEBSITE_URL,
+    TEXTS_DIR,
+    EXPLANATION_XHR_URL,
+    archive_file_path,
+    create_html_email,
+    init,
+    render_reading,
+    save_reading,
+    save_text_file,
+    save_html_file,
+    update_indexes,
+)
+from daily_bible_crawler.reading import DailyReading
+
+# 날짜별 페이지 URL 형식 (date는 datetime으로 전달됨)
+BACKFILL_URL_TEMPLATE = os.environ.get('BACKFILL_URL_TEMPLATE', WEBSITE_URL + '?base_de={date:%Y-%m-%d}')
+# 동시에 처리할 날짜 수
+BACKFILL_CONCURRENCY = int(os.environ.get('BACKFILL_CONCURRENCY', '4'))
+# 호스트별 초당 최대 요청 수
+BACKFILL_REQUESTS_PER_SECOND = float(os.environ.get('BACKFILL_REQUESTS_PER_SECOND', '2'))
+
+
+def date_range(start_date, end_date):
+    """
+    시작일부터 종료일까지(종료일 포함) 날짜를 하나씩 생성합니다.
+
+    Args:
+        start_date (datetime): 시작일
+        end_date (datetime): 종료일
+
+    Yields:
+        datetime: 각 날짜
+    """
+    date = start_date
+    while date <= end_date:
+        yield date
+        date += timedelta(days=1)
+
+
+class HostRateLimiter:
+    """호스트별로 요청 사이에 최소 간격을 두는 비동기 속도 제한기"""
+
+    def __init__(self, requests_per_second):
+        """
+        Args:
+            requests_per_second (float): 호스트별 초당 최대 요청 수 (0 이하이면 제한 없음)
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url):
+        """
+        해당 URL의 호스트에 요청을 보낼 수 있을 때까지 기다립니다.
+
+        Args:
+            url (str): 요청할 URL
+        """
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+_thread_local = threading.local()
+
+
+def _thread_session():
+    # requests.Session은 스레드 간 공유가 안전하지 않으므로 작업 스레드마다 하나씩 사용
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    return session
+
+
+def _fetch_with_thread_session(url):
+    return fetch_bible_data(url, session=_thread_session(), explanation_url=EXPLANATION_XHR_URL)
+
+
+def is_archived(date, output_dir=TEXTS_DIR, store=None):
+    """
+    해당 날짜가 보관소에 있거나, 텍스트와 HTML 파일이 모두 저장되어 있는지 확인합니다.
+
+    Args:
+        date (datetime): 말씀 날짜
+        output_dir (str): 저장 디렉토리
+        store (ArchiveStore, optional): 압축 보관소 (없으면 파일만 확인)
+
+    Returns:
+        bool: 저장되어 있으면 True
+    """
+    if store is not None and date in store:
+        return True
+    return all(os.path.exists(archive_file_path(date, extension, output_dir)) for extension in ('txt', 'html'))
+
+
+async def backfill(start_date, end_date, concurrency=BACKFILL_CONCURRENCY,
+                   requests_per_second=BACKFILL_REQUESTS_PER_SECOND, output_dir=TEXTS_DIR,
+                   url_template=BACKFILL_URL_TEMPLATE, use_browser=True):
+    """
+    날짜 범위의 말씀과 해설을 수집하여 texts/ 디렉토리에 저장합니다.
+
+    동시에 최대 concurrency개의 날짜를 처리하며, 각 날짜는 먼저 HTTP로 추출하고
+    실패하면 (use_browser가 True일 때) 비동기 Playwright로 다시 시도합니다.
+    결과는 날짜마다 바로 보관소나 파일로 저장되므로 메모리 사용량이 날짜 수에 따라 늘지 않습니다.
+
+    Args:
+        start_date (datetime): 시작일
+        end_date (datetime): 종료일 (포함)
+        concurrency (int): 동시에 처리할 날짜 수
+        requests_per_second (float): 호스트별 초당 최대 요청 수
+        output_dir (str): 저장 디렉토리
+        url_template (str): 날짜별 페이지 URL 형식
+        use_browser (bool): HTTP 추출 실패 시 브라우저 사용 여부
+
+    Returns:
+        dict: {'saved': int, 'skipped': int, 'failed': int, 'failed_dates': [str, ...]}
+    """
+    stats = {'saved': 0, 'skipped': 0, 'failed': 0, 'failed_dates': []}
+    limiter = HostRateLimiter(requests_per_second)
+    browser = AsyncBrowserFallback() if use_browser else None
+    dates = date_range(start_date, end_date)
+    store = ArchiveStore(output_dir) if ARCHIVE_BACKEND == 'store' else None
+
+    async def process(date):
+        if is_archived(date, output_dir, store):
+            stats['skipped'] += 1
+            return
+
+        url = url_template.format(date=date)
+        await limiter.wait(url)
+        bible_result = await asyncio.to_thread(_fetch_with_thread_session, url)
+        if bible_result is None and browser is not None:
+            logger.info(f"{date:%Y-%m-%d}: HTTP로 추출하지 못해 브라우저로 다시 시도합니다.")
+            await limiter.wait(url)
+            bible_result = await browser.collect(url)
+        if bible_result is None:
+            raise ValueError("말씀과 해설을 추출하지 못했습니다.")
+
+        reading = DailyReading.from_dicts(*bible_result, date=date)
+        # 날짜 파라미터가 무시되어 다른 날의 말씀이 저장되는 것을 방지
+        if f"{date:%Y.%m.%d}" not in reading.header:
+            raise ValueError(f"헤더의 날짜가 요청한 날짜와 다릅니다: {reading.header[:40]!r}")
+
+        if store is not None:
+            await asyncio.to_thread(save_reading, reading, date, output_dir)
+        else:
+            content, html_content = render_reading(reading)
+            html_email = create_html_email(content, html_content, reading.css, date=date)
+            await asyncio.to_thread(save_text_file, content, date, output_dir)
+            await asyncio.to_thread(save_html_file, html_email, date, output_dir)
+        await asyncio.to_thread(update_indexes, reading, date)
+        stats['saved'] += 1
+
+    async def worker():
+        # 모든 작업자가 하나의 날짜 생성기를 공유하므로 날짜 목록 전체를 미리 만들지 않음
+        for date in dates:
+            try:
+                await process(date)
+            except Exception as e:
+                stats['failed'] += 1
+                stats['failed_dates'].append(f"{date:%Y-%m-%d}")
+                logger.error(f"{date:%Y-%m-%d} 백필 실패: {e}")
+
+    started_at = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        if browser is not None:
+            await browser.close()
+
+    logger.info(
+        f"백필 완료 ({time.perf_counter() - started_at:.1f}초): 저장 {stats['saved']}일, "
+        f"건너뜀 {stats['skipped']}일, 실패 {stats['failed']}일"
+    )
+    return stats
+
+
+def main(argv=None):
+    """
+    백필 명령줄 진입점입니다.
+
+    Args:
+        argv (list, optional): 명령줄 인자 (기본값: sys.argv)
+
+    Returns:
+        int: 실패한 날짜가 있으면 1, 없으면 0
+    """
+    parser = argparse.ArgumentParser(description="지난 날짜의 말씀과 해설을 수집하여 texts/에 저장합니다.")
+    parser.add_argument('start_date', type=lambda value: datetime.strptime(value, '%Y-%m-%d'), help="시작일 (YYYY-MM-DD)")
+    parser.add_argument('end_date', type=lambda value: datetime.strptime(value, '%Y-%m-%d'), help="종료일 (YYYY-MM-DD, 포함)")
+    parser.add_argument('--concurrency', type=int, default=BACKFILL_CONCURRENCY, help="동시에 처리할 날짜 수")
+    parser.add_argument('--rate', type=float, default=BACKFILL_REQUESTS_PER_SECOND, help="호스트별 초당 최대 요청 수")
+    parser.add_argument('--output-dir', default=TEXTS_DIR, help="저장 디렉토리")
+    parser.add_argument('--no-browser', action='store_true', help="HTTP 추출 실패 시 브라우저를 사용하지 않음")
+    args = parser.parse_args(argv)
+    init()
+
+    stats = asyncio.run(backfill(
+        args.start_date,
+        args.end_date,
+        concurrency=args.concurrency,
+        requests_per_second=args.rate,
+        output_dir=args.output_dir,
+        use_browser=not args.no_browser,
+    ))
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,403 @@
+"""
+Playwright 브라우저를 계속 띄워 두고 BrowserContext를 풀로 재사용하는 모듈입니다.
+
+캡처할 때마다 Chromium을 새로 띄우는 대신 하나의 브라우저 프로세스를 유지하고,
+격리된 컨텍스트를 크기 제한이 있는 풀에서 빌려줍니다. 컨텍스트는 정해진 횟수만큼
+사용되었거나 브라우저 메모리 사용량이 한도를 넘으면 새로 만듭니다.
+
+main의 변경 감지 재확인과 단계 재시도, 상주 스케줄러(scheduler.py)는 shared_browser_pool로 만든
+풀 하나를 계속 사용하므로, HTTP 추출이 실패하여 Playwright로 여러 번 캡처해도 브라우저는 한 번만
+띄웁니다. 브라우저는 Playwright 경로가 처음 필요할 때 띄우므로 HTTP로 추출하면 띄우지 않습니다.
+
+비동기 코드(백필, 비동기 파이프라인)에서는 AsyncBrowserFallback을 사용합니다.
+"""
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+
+from loguru import logger
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.main import BLOCKED_RESOURCE_TYPES, BLOCKED_URL_PATTERN, SECTION_READY_TIMEOUT
+from daily_bible_crawler.page_scripts import (
+    PAGE_EXTRACTION_SCRIPT,
+    EXPLANATION_EXTRACTION_SCRIPT,
+    BIBLE_READY_SCRIPT,
+    EXPLANATION_READY_SCRIPT,
+)
+
+# 풀 기본 설정 (BROWSER_POOL_ENABLED=false이면 캡처할 때마다 브라우저를 새로 띄움)
+BROWSER_POOL_ENABLED = os.environ.get('BROWSER_POOL_ENABLED', 'true').lower() != 'false'
+DEFAULT_MAX_CONTEXTS = int(os.environ.get('BROWSER_POOL_MAX_CONTEXTS', '2'))
+DEFAULT_MAX_USES_PER_CONTEXT = int(os.environ.get('BROWSER_POOL_MAX_USES', '20'))
+DEFAULT_MAX_RSS_MB = float(os.environ.get('BROWSER_POOL_MAX_RSS_MB', '1024'))
+
+
+def descendant_rss_mb(pid=None):
+    """
+    지정한 프로세스의 모든 하위 프로세스(Chromium 등)의 RSS 합계를 MB 단위로 반환합니다.
+
+    /proc을 사용하므로 리눅스에서만 동작하며, 그 밖의 환경에서는 0을 반환합니다.
+
+    Args:
+        pid (int, optional): 기준 프로세스 ID (기본값: 현재 프로세스)
+
+    Returns:
+        float: 하위 프로세스 RSS 합계(MB)
+    """
+    pid = pid or os.getpid()
+    if not os.path.isdir('/proc'):
+        return 0.0
+
+    children = {}
+    rss_pages = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # 프로세스 이름에 공백이나 괄호가 있을 수 있으므로 마지막 ')' 이후를 기준으로 분리
+        fields = stat[stat.rfind(')') + 2:].split()
+        child_pid, parent_pid = int(entry), int(fields[1])
+        children.setdefault(parent_pid, []).append(child_pid)
+        rss_pages[child_pid] = int(fields[21])
+
+    total_pages = 0
+    stack = list(children.get(pid, []))
+    while stack:
+        child_pid = stack.pop()
+        total_pages += rss_pages.get(child_pid, 0)
+        stack.extend(children.get(child_pid, []))
+
+    return total_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+class PooledContext:
+    """풀에서 관리하는 BrowserContext와 사용 횟수"""
+
+    __slots__ = ('context', 'uses')
+
+    def __init__(self, context):
+        self.context = context
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    하나의 Chromium 프로세스를 유지하면서 BrowserContext를 빌려주는 풀입니다.
+
+    Playwright 동기 API를 사용하므로 풀은 생성한 스레드에서만 사용해야 합니다.
+
+    사용 예:
+        with BrowserPool() as pool:
+            for _ in range(3):
+                capture_bible_content(pool=pool)
+            pool.log_stats()
+    """
+
+    def __init__(self, max_contexts=DEFAULT_MAX_CONTEXTS, max_uses_per_context=DEFAULT_MAX_USES_PER_CONTEXT,
+                 max_rss_mb=DEFAULT_MAX_RSS_MB, headless=True, context_options=None):
+        """
+        Args:
+            max_contexts (int): 동시에 유지할 수 있는 컨텍스트 수
+            max_uses_per_context (int): 컨텍스트를 재생성하기 전까지 사용할 횟수
+            max_rss_mb (float): 브라우저 하위 프로세스 RSS 한도(MB). 넘으면 유휴 컨텍스트를 정리
+            headless (bool): 헤드리스 모드 여부
+            context_options (dict, optional): browser.new_context()에 전달할 옵션
+        """
+        self.max_contexts = max_contexts
+        self.max_uses_per_context = max_uses_per_context
+        self.max_rss_mb = max_rss_mb
+        self.headless = headless
+        self.context_options = context_options or {}
+
+        self._playwright = None
+        self._browser = None
+        self._idle = []
+        self._in_use = 0
+        # 브라우저 실행 후 아직 캡처에 반영되지 않은 실행 시간 (첫 캡처를 콜드로 기록)
+        self._pending_launch_seconds = None
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.cold_latencies = []
+        self.warm_latencies = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def started(self):
+        return self._browser is not None
+
+    def start(self):
+        """
+        브라우저 프로세스를 띄웁니다. 이미 실행 중이면 아무것도 하지 않습니다.
+
+        오래 떠 있는 동안 브라우저 프로세스가 종료되었으면 정리하고 다시 띄웁니다.
+        """
+        if self.started:
+            if self._browser.is_connected():
+                return
+            logger.warning("브라우저 연결이 끊어져 다시 띄웁니다.")
+            self._idle = []
+            self._browser = None
+            self.close()
+        from playwright.sync_api import sync_playwright
+
+        started_at = time.perf_counter()
+        with metrics.stage('browser_launch'):
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+        self._pending_launch_seconds = time.perf_counter() - started_at
+        logger.info(f"브라우저 풀 시작 ({self._pending_launch_seconds:.2f}초)")
+
+    def close(self):
+        """모든 컨텍스트와 브라우저 프로세스를 종료합니다."""
+        for pooled in self._idle:
+            self._close_context(pooled)
+        self._idle = []
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _close_context(self, pooled):
+        try:
+            pooled.context.close()
+        except Exception as e:
+            logger.warning(f"브라우저 컨텍스트 종료 중 오류 발생: {e}")
+
+    def _acquire(self):
+        if self._idle:
+            self.hits += 1
+            return self._idle.pop()
+
+        if self._in_use >= self.max_contexts:
+            raise RuntimeError(f"브라우저 풀의 컨텍스트 {self.max_contexts}개가 모두 사용 중입니다.")
+
+        self.misses += 1
+        return PooledContext(self._browser.new_context(**self.context_options))
+
+    def _release(self, pooled):
+        if pooled.uses >= self.max_uses_per_context:
+            logger.info(f"컨텍스트 사용 횟수({pooled.uses}) 초과로 재생성합니다.")
+            self.recycled += 1
+            self._close_context(pooled)
+            return
+
+        rss_mb = descendant_rss_mb()
+        if self.max_rss_mb and rss_mb > self.max_rss_mb:
+            logger.info(f"브라우저 메모리 {rss_mb:.0f}MB가 한도 {self.max_rss_mb:.0f}MB를 넘어 컨텍스트를 정리합니다.")
+            for idle in self._idle + [pooled]:
+                self.recycled += 1
+                self._close_context(idle)
+            self._idle = []
+            return
+
+        self._idle.append(pooled)
+
+    @contextmanager
+    def page(self):
+        """
+        풀에서 컨텍스트를 빌려 새 페이지를 엽니다.
+
+        블록을 빠져나오면 페이지를 닫고 컨텍스트를 풀에 돌려줍니다. 브라우저 실행 후
+        첫 캡처는 실행 시간을 포함하여 콜드로, 그 이후 캡처는 웜으로 기록됩니다.
+
+        Yields:
+            Page: Playwright 페이지
+        """
+        self.start()
+        started_at = time.perf_counter()
+        launch_seconds, self._pending_launch_seconds = self._pending_launch_seconds, None
+        cold = launch_seconds is not None
+
+        pooled = self._acquire()
+        self._in_use += 1
+        page = None
+        try:
+            page = pooled.context.new_page()
+            pooled.uses += 1
+            yield page
+        finally:
+            if page is not None:
+                try:
+                    page.close()
+                except Exception as e:
+                    logger.warning(f"페이지 종료 중 오류 발생: {e}")
+            self._in_use -= 1
+            self._release(pooled)
+
+            elapsed = time.perf_counter() - started_at + (launch_seconds or 0)
+            (self.cold_latencies if cold else self.warm_latencies).append(elapsed)
+            logger.info(f"{'콜드' if cold else '웜'} 캡처 지연 시간: {elapsed:.2f}초")
+
+    def stats(self):
+        """
+        풀 통계를 반환합니다.
+
+        Returns:
+            dict: 히트/미스 수, 재생성 수, 콜드/웜 캡처 지연 시간 요약
+        """
+        def summarize(latencies):
+            if not latencies:
+                return {'count': 0, 'avg': None, 'max': None}
+            return {
+                'count': len(latencies),
+                'avg': sum(latencies) / len(latencies),
+                'max': max(latencies),
+            }
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'recycled': self.recycled,
+            'idle_contexts': len(self._idle),
+            'cold': summarize(self.cold_latencies),
+            'warm': summarize(self.warm_latencies),
+        }
+
+    def log_stats(self):
+        """풀 통계를 로그로 남깁니다."""
+        stats = self.stats()
+        logger.info(f"브라우저 풀 히트: {stats['hits']}, 미스: {stats['misses']}, 재생성: {stats['recycled']}")
+        for kind, label in (('cold', '콜드'), ('warm', '웜')):
+            summary = stats[kind]
+            if summary['count']:
+                logger.info(f"{label} 캡처 {summary['count']}회, 평균 {summary['avg']:.2f}초, 최대 {summary['max']:.2f}초")
+
+
+def record_pool_stats(pool):
+    """
+    브라우저를 띄운 적이 있으면 풀 통계를 로그와 현재 실행 지표(browser_pool_*)로 남깁니다.
+
+    Args:
+        pool (BrowserPool | None): 브라우저 풀
+    """
+    if pool is None or not (pool.hits or pool.misses):
+        return
+    pool.log_stats()
+    stats = pool.stats()
+    metrics.set_value('browser_pool_hits', stats['hits'])
+    metrics.set_value('browser_pool_misses', stats['misses'])
+    metrics.set_value('browser_pool_recycled', stats['recycled'])
+    for kind in ('cold', 'warm'):
+        if stats[kind]['count']:
+            metrics.set_value(f'browser_capture_{kind}_count', stats[kind]['count'])
+            metrics.set_value(f'browser_capture_{kind}_seconds_avg', round(stats[kind]['avg'], 3))
+
+
+@contextmanager
+def shared_browser_pool(enabled=BROWSER_POOL_ENABLED):
+    """
+    실행하는 동안 여러 번의 캡처가 함께 쓸 브라우저 풀을 만들고, 끝나면 통계를 남기고 닫습니다.
+
+    풀을 만들어도 Playwright 경로가 처음 필요할 때까지 브라우저는 띄우지 않습니다.
+    만든 스레드에서만 사용해야 합니다.
+
+    사용 예:
+        with shared_browser_pool() as pool:
+            reading = capture_reading(pool=pool)
+
+    Args:
+        enabled (bool): 풀을 사용할지 여부 (False이면 None을 돌려주어 캡처마다 브라우저를 띄움)
+
+    Yields:
+        BrowserPool | None: 브라우저 풀
+    """
+    if not enabled:
+        yield None
+        return
+    pool = BrowserPool()
+    try:
+        yield pool
+    finally:
+        record_pool_stats(pool)
+        pool.close()
+
+
+class AsyncBrowserFallback:
+    """
+    HTTP로 추출하지 못했을 때만 사용하는 비동기 Playwright 브라우저입니다. (백필, 비동기 파이프라인)
+
+    처음 필요할 때 한 번만 브라우저를 띄우고, 페이지마다 격리된 컨텍스트를 사용합니다.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                logger.info("비동기 브라우저 시작")
+        return self._browser
+
+    async def collect(self, url):
+        """
+        페이지를 렌더링하여 말씀과 해설 데이터를 추출합니다.
+
+        Args:
+            url (str): 페이지 URL
+
+        Returns:
+            tuple: (bible_data(dict), explanation_data(dict), CSS 내용(str))
+        """
+        browser = await self._ensure_browser()
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+
+            async def block_unneeded_requests(route):
+                request = route.request
+                if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERN.search(request.url):
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            timeout_ms = SECTION_READY_TIMEOUT * 1000
+            await page.route("**/*", block_unneeded_requests)
+            await page.goto(url, wait_until="domcontentloaded")
+            try:
+                await page.wait_for_function(BIBLE_READY_SCRIPT, timeout=timeout_ms)
+            except Exception as e:
+                logger.warning(f"말씀 영역 준비 대기 시간 초과: {e}, 계속 진행합니다.")
+            page_data = await page.evaluate(PAGE_EXTRACTION_SCRIPT, False)
+
+            try:
+                await page.locator("#mainTitle_3").click(timeout=timeout_ms)
+                await page.wait_for_function(EXPLANATION_READY_SCRIPT, timeout=timeout_ms)
+            except Exception as e:
+                logger.warning(f"해설 탭 대기 실패: {e}, 계속 진행합니다.")
+            explanation_data = await page.evaluate(EXPLANATION_EXTRACTION_SCRIPT)
+
+            return page_data.get('bible', {}), explanation_data, page_data.get('css', '')
+        finally:
+            await context.close()
+
+    async def close(self):
+        """브라우저를 띄웠다면 종료합니다."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
@@ -0,0 +1,148 @@
+"""
+크롤링 결과를 날짜별로 저장하는 SQLite 캐시 모듈입니다.
+
+capture_bible_content 앞에 두어, 같은 날짜를 다시 실행하거나 재전송할 때
+웹사이트를 다시 크롤링하지 않도록 합니다. 렌더링 전의 구조화된 결과
+(말씀 헤더/구절, 해설 섹션/정보, CSS)를 저장하므로 렌더링 방식이 바뀌어도
+캐시를 그대로 사용할 수 있습니다.
+
+- 오늘 날짜 항목은 TTL이 지나면 만료되어 다시 크롤링합니다 (사이트 수정 반영).
+- 지난 날짜 항목은 바뀌지 않으므로 만료되지 않고, 개수 한도를 넘으면
+  가장 오래 사용하지 않은 항목부터 삭제합니다 (LRU).
+- 항목은 DailyReading의 바이너리 형식(reading.py)으로 저장합니다. 이전 버전이 JSON으로
+  저장한 항목도 그대로 읽을 수 있습니다.
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+
+from loguru import logger
+
+from daily_bible_crawler.reading import DailyReading, is_serialized_reading
+
+CACHE_PATH = os.environ.get('CACHE_PATH', os.path.join('cache', 'bible_content.sqlite3'))
+CACHE_TODAY_TTL = float(os.environ.get('CACHE_TODAY_TTL', '3600'))  # 오늘 항목 유효 시간(초)
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', '400'))  # 지난 날짜 항목 최대 개수
+
+
+class ContentCache:
+    """날짜를 키로 구조화된 크롤링 결과를 저장하는 캐시"""
+
+    def __init__(self, path=CACHE_PATH, today_ttl=CACHE_TODAY_TTL, max_entries=CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            today_ttl (float): 오늘 날짜 항목의 유효 시간(초)
+            max_entries (int): 지난 날짜 항목의 최대 개수
+        """
+        self.path = path
+        self.today_ttl = today_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS readings (
+                    date TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            ''')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _key(date):
+        return date.strftime('%Y%m%d')
+
+    def get_reading(self, date):
+        """
+        날짜에 해당하는 말씀 모델을 반환합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            DailyReading | None: 없거나 만료되었으면 None
+        """
+        key = self._key(date)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute('SELECT payload, created_at FROM readings WHERE date = ?', (key,)).fetchone()
+            if row is not None and key == self._key(datetime.now()) and now - row[1] > self.today_ttl:
+                logger.info(f"캐시 항목 만료: {key} ({now - row[1]:.0f}초 경과)")
+                row = None
+            if row is None:
+                self.misses += 1
+                logger.info(f"캐시 미스: {key}")
+                return None
+            conn.execute('UPDATE readings SET accessed_at = ? WHERE date = ?', (now, key))
+
+        self.hits += 1
+        logger.info(f"캐시 히트: {key}")
+        if is_serialized_reading(row[0]):
+            return DailyReading.from_bytes(row[0])
+        # 이전 버전이 저장한 JSON 항목
+        payload = json.loads(row[0])
+        return DailyReading.from_dicts(payload['bible'], payload['explanation'], payload['css'], date=date)
+
+    def get(self, date):
+        """
+        날짜에 해당하는 크롤링 결과를 추출 함수와 같은 형식으로 반환합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            tuple | None: (bible_data, explanation_data, css_content). 없거나 만료되었으면 None
+        """
+        reading = self.get_reading(date)
+        return None if reading is None else reading.to_dicts()
+
+    def put_reading(self, date, reading):
+        """
+        말씀 모델을 저장하고, 지난 날짜 항목이 한도를 넘으면 오래된 항목을 삭제합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+            reading (DailyReading): 말씀 모델
+        """
+        key = self._key(date)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO readings (date, payload, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, reading.to_bytes(), now, now),
+            )
+            # 오늘 항목은 LRU 대상에서 제외
+            evicted = conn.execute('''
+                DELETE FROM readings WHERE date IN (
+                    SELECT date FROM readings WHERE date != ?
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self._key(datetime.now()), self.max_entries)).rowcount
+        if evicted:
+            logger.info(f"캐시 항목 {evicted}개 삭제 (최대 {self.max_entries}개)")
+
+    def put(self, date, bible_data, explanation_data, css_content):
+        """
+        추출 함수 형식의 크롤링 결과를 저장합니다. (put_reading 참고)
+
+        Args:
+            date (datetime): 말씀 날짜
+            bible_data (dict): 말씀 데이터
+            explanation_data (dict): 해설 데이터
+            css_content (str): CSS 내용
+        """
+        self.put_reading(date, DailyReading.from_dicts(bible_data, explanation_data, css_content, date=date))
+
+    def log_stats(self):
+        """캐시 히트/미스 수를 로그로 남깁니다."""
+        logger.info(f"캐시 히트: {self.hits}, 미스: {self.misses}")
@@ -0,0 +1,208 @@
+"""
+사이트에 새 말씀이 올라왔는지 확인하는 변경 감지 모듈입니다.
+
+cron이 일찍 실행되어 사이트가 아직 어제 말씀을 보여 주는 경우, 그대로 진행하면 어제 말씀을 다시
+렌더링하고 저장하고 보내게 됩니다. main은 추출하기 전에 ChangeDetector.wait_for_new_reading으로
+새 말씀인지 확인하고, 마지막으로 끝까지 처리한 말씀과 같으면 렌더링, 저장, 전송을 건너뜁니다.
+
+- 페이지를 본문 없는 조건부 HEAD 요청(If-None-Match/If-Modified-Since)으로 확인하여, 서버가 304로
+  응답하면 추출하지 않고 바뀌지 않은 것으로 봅니다. 확인에서는 본문을 받지 않으므로 페이지가 바뀌었을
+  때도 본문은 추출할 때 한 번만 받습니다.
+- 200이면 말씀을 추출하여 공백을 정리한 내용의 해시(reading_fingerprint)를 마지막 해시와 비교합니다.
+  사이트 CSS는 해시에 넣지 않습니다.
+- 오늘 이미 처리한 말씀과 같으면 바로 건너뛰고, 어제 처리한 말씀과 같으면 사이트가 늦게 올리는
+  것이므로 CHANGE_POLL_INTERVAL초마다 조건부 요청으로 다시 확인하며 CHANGE_POLL_TIMEOUT초까지
+  기다립니다.
+
+마지막 해시와 검증값(ETag, Last-Modified)은 전송까지 끝난 뒤에만 record로 저장하므로, 중간에
+실패한 실행을 다시 실행하면 건너뛰지 않고 다시 진행합니다.
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+from loguru import logger
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.main import WEBSITE_URL, write_file_atomic
+
+CHANGE_STATE_PATH = os.environ.get('CHANGE_STATE_PATH', os.path.join('cache', 'change_state.json'))
+# 새 말씀이 올라오기를 기다릴 때 확인 간격과 최대 대기 시간(초, 0이면 기다리지 않음)
+CHANGE_POLL_INTERVAL = float(os.environ.get('CHANGE_POLL_INTERVAL', '300'))
+CHANGE_POLL_TIMEOUT = float(os.environ.get('CHANGE_POLL_TIMEOUT', '7200'))
+CHANGE_PROBE_TIMEOUT = 10
+
+PROBE_NOT_MODIFIED = 'not_modified'
+PROBE_MODIFIED = 'modified'
+PROBE_FAILED = 'failed'
+
+
+def reading_fingerprint(reading):
+    """
+    말씀 내용의 해시를 반환합니다. 공백 차이와 사이트 CSS는 무시합니다.
+
+    Args:
+        reading (DailyReading): 말씀 모델
+
+    Returns:
+        str: SHA-256 16진수 문자열
+    """
+    fields = [reading.header, reading.title, reading.info]
+    fields += [part for verse in reading.verses for part in (verse.number, verse.text)]
+    fields += [part for section in reading.sections for part in (section.subtitle, section.content)]
+    normalized = '\x1f'.join(re.sub(r'\s+', ' ', field or '').strip() for field in fields)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ChangeDetector:
+    """마지막으로 처리한 말씀과 비교하여 새 말씀이 올라왔는지 확인합니다."""
+
+    def __init__(self, path=CHANGE_STATE_PATH, url=WEBSITE_URL, session=None,
+                 poll_interval=CHANGE_POLL_INTERVAL, poll_timeout=CHANGE_POLL_TIMEOUT, sleep=time.sleep):
+        """
+        Args:
+            path (str): 상태 파일 경로 (마지막 해시, 처리한 날짜, 검증값)
+            url (str): 조건부 요청으로 확인할 페이지 URL
+            session (requests.Session, optional): 재사용할 HTTP 세션
+            poll_interval (float): 새 말씀을 기다릴 때 확인 간격(초)
+            poll_timeout (float): 새 말씀을 기다릴 최대 시간(초)
+            sleep (callable): 대기 함수 (테스트에서 바꿀 수 있음)
+        """
+        self.path = path
+        self.url = url
+        self.session = session
+        self.poll_interval = poll_interval
+        self.poll_timeout = poll_timeout
+        self.sleep = sleep
+        self.state = self._load()
+        # 이번 실행에서 받은 검증값 (record할 때 저장)
+        self._validators = {}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.warning(f"변경 감지 상태 파일을 읽지 못해 무시합니다: {e}")
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        write_file_atomic(self.path, json.dumps(self.state, ensure_ascii=False, indent=2))
+
+    def probe(self):
+        """
+        페이지를 본문 없는 조건부 HEAD 요청으로 확인합니다.
+
+        200이어도 본문을 받아 해시하지 않고 검증값만 보관하며, 본문은 이어서 capture가 한 번만
+        받습니다. (GET으로 확인하면 바뀐 페이지를 확인과 추출에서 두 번 받게 됨)
+
+        Returns:
+            str: PROBE_NOT_MODIFIED(304), PROBE_MODIFIED(200), PROBE_FAILED(요청 실패) 중 하나
+        """
+        import requests
+
+        from daily_bible_crawler.http_fetcher import HTTP_HEADERS
+
+        headers = dict(HTTP_HEADERS)
+        validators = self.state.get('validators') or {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        try:
+            response = (self.session or requests).head(self.url, headers=headers, timeout=CHANGE_PROBE_TIMEOUT,
+                                                       allow_redirects=True)
+        except requests.RequestException as e:
+            logger.warning(f"조건부 요청 실패: {e}")
+            return PROBE_FAILED
+        if response.status_code == 304:
+            return PROBE_NOT_MODIFIED
+        if not response.ok:
+            logger.warning(f"조건부 요청 응답 코드: {response.status_code}")
+            return PROBE_FAILED
+        self._validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        return PROBE_MODIFIED
+
+    def is_new(self, reading):
+        """
+        말씀이 마지막으로 처리한 말씀과 다른지 확인합니다.
+
+        Args:
+            reading (DailyReading): 말씀 모델
+
+        Returns:
+            bool: 처음 실행했거나 내용이 다르면 True
+        """
+        return reading_fingerprint(reading) != self.state.get('fingerprint')
+
+    def wait_for_new_reading(self, capture):
+        """
+        새 말씀이 올라올 때까지 확인하고, 새 말씀을 반환합니다.
+
+        Args:
+            capture (callable): capture(force_refresh)로 말씀을 추출하는 함수.
+                조건부 요청에서 페이지가 바뀌었다고 하거나 다시 확인할 때는 캐시에 남은 이전 내용으로
+                비교하지 않도록 force_refresh=True로 부릅니다.
+
+        Returns:
+            DailyReading | None: 새 말씀. 오늘 이미 처리했거나 기다려도 바뀌지 않으면 None
+        """
+        if not self.state.get('fingerprint'):
+            return capture(False)
+
+        today = datetime.now().strftime('%Y%m%d')
+        max_polls = int(self.poll_timeout // self.poll_interval) if self.poll_interval > 0 else 0
+        polls = 0
+        force_refresh = False
+        while True:
+            status = self.probe()
+            if status == PROBE_NOT_MODIFIED:
+                logger.info("조건부 요청: 페이지가 바뀌지 않았습니다. (304)")
+            else:
+                # 오늘 날짜로 캐시된 내용이 이전 실행에서 받은 어제 말씀일 수 있으므로, 페이지가
+                # 바뀌었으면 캐시를 쓰지 않고 다시 추출 (요청이 실패했으면 캐시라도 사용)
+                reading = capture(force_refresh or status == PROBE_MODIFIED)
+                if self.is_new(reading):
+                    return reading
+                logger.info("추출한 말씀이 마지막으로 처리한 말씀과 같습니다.")
+                # 같은 내용의 검증값이므로 다음 확인부터는 304로 응답받을 수 있도록 저장
+                if any(self._validators.values()):
+                    self.state['validators'] = self._validators
+                    self._save()
+
+            if self.state.get('completed_on') == today:
+                logger.info("오늘 말씀은 이미 처리했으므로 건너뜁니다.")
+                return None
+            if polls >= max_polls:
+                logger.warning(f"{polls * self.poll_interval:.0f}초 동안 새 말씀이 올라오지 않아 건너뜁니다.")
+                metrics.set_value('change_poll_timeout', 1)
+                return None
+            polls += 1
+            logger.info(f"새 말씀이 아직 없어 {self.poll_interval:.0f}초 후 다시 확인합니다. ({polls}/{max_polls})")
+            metrics.add('change_polls')
+            self.sleep(self.poll_interval)
+            force_refresh = True
+
+    def record(self, reading):
+        """
+        말씀을 끝까지 처리했음을 기록합니다. (다음 실행에서 같은 말씀이면 건너뜀)
+
+        Args:
+            reading (DailyReading): 처리한 말씀
+        """
+        self.state = {
+            'fingerprint': reading_fingerprint(reading),
+            'completed_on': datetime.now().strftime('%Y%m%d'),
+            'header': reading.header.split('\n', 1)[0],
+            'validators': self._validators or self.state.get('validators') or {},
+        }
+        self._save()
@@ -0,0 +1,336 @@
+"""
+파이프라인을 단계별로 나누어 실행하고, 각 단계의 결과를 체크포인트로 저장하는 모듈입니다.
+
+단계는 다음 순서로 실행됩니다.
+
+1. bible: 말씀(헤더, 구절)과 CSS 추출
+2. explanation: 해설 추출
+3. render: 텍스트/HTML 생성 및 texts/ 저장
+4. delivery: 이메일 전송
+
+각 단계는 STAGE_RETRY_POLICIES에 따라 tenacity로 따로 재시도하고, 성공하면 결과를
+checkpoints/YYYYMMDD/<단계>.json에 저장합니다. 같은 날짜로 다시 실행하면 저장된 단계는
+건너뛰고 마지막으로 성공한 단계 다음부터 이어서 실행합니다. 예를 들어 해설 탭 클릭만
+실패했다면 다시 실행할 때 말씀은 다시 추출하지 않고 해설만 추출합니다.
+
+전송 원장(ledger.py)을 사용하면 전송 단계를 다시 시도해도 아직 받지 못한 수신자에게만 보냅니다.
+원장을 끈 경우에는 한 통이라도 보낸 뒤에는 재시도하지 않습니다. (이미 받은 수신자에게 중복 전송 방지)
+
+CHECKPOINT_ENABLED가 켜져 있으면(기본값) main()이 이 모듈로 파이프라인을 실행합니다.
+"""
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+
+from loguru import logger
+from tenacity import Retrying, before_sleep_log, retry_if_exception, stop_after_attempt, wait_exponential
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.main import (
+    ARCHIVE_BACKEND,
+    CACHE_FORCE_REFRESH,
+    EMAIL_RECIPIENTS,
+    EXPLANATION_XHR_URL,
+    TEXTS_DIR,
+    USE_HTTP_FAST_PATH,
+    WEBSITE_URL,
+    DeliveryError,
+    collect_bible_data_with_playwright,
+    collect_explanation_from_page,
+    create_html_email,
+    render_reading,
+    save_html_file,
+    save_reading,
+    save_text_file,
+    send_email,
+    update_indexes,
+    write_file_atomic,
+)
+from daily_bible_crawler.reading import DailyReading
+
+# 체크포인트 저장 디렉토리와 보관 기간(일)
+CHECKPOINT_DIR = os.environ.get('CHECKPOINT_DIR', 'checkpoints')
+CHECKPOINT_RETENTION_DAYS = int(os.environ.get('CHECKPOINT_RETENTION_DAYS', '7'))
+
+STAGES = ('bible', 'explanation', 'render', 'delivery')
+
+# 단계별 재시도 정책 (attempts: 최대 시도 횟수, wait_min/wait_max: 지수 대기 시간 범위(초))
+STAGE_RETRY_POLICIES = {
+    # 사이트 응답 지연, 탭 클릭 실패 등 일시적인 오류가 많으므로 기존 @retry 설정과 같게 재시도
+    'bible': {'attempts': 3, 'wait_min': 4, 'wait_max': 10},
+    'explanation': {'attempts': 3, 'wait_min': 4, 'wait_max': 10},
+    # 렌더링은 입력이 같으면 결과도 같으므로 파일 저장 오류만 한 번 더 시도
+    'render': {'attempts': 2, 'wait_min': 1, 'wait_max': 1},
+    # SMTP/Gmail 일시 오류는 조금 더 기다렸다가 재시도
+    'delivery': {'attempts': 3, 'wait_min': 30, 'wait_max': 120},
+}
+
+
+class CheckpointStore:
+    """날짜별로 단계 결과를 JSON 파일로 저장하는 체크포인트 저장소"""
+
+    def __init__(self, date, directory=CHECKPOINT_DIR):
+        """
+        Args:
+            date (datetime): 말씀 날짜
+            directory (str): 체크포인트 최상위 디렉토리
+        """
+        self.date = date
+        self.directory = directory
+        self.path = os.path.join(directory, date.strftime('%Y%m%d'))
+
+    def _file_path(self, stage):
+        return os.path.join(self.path, f"{stage}.json")
+
+    def load(self, stage):
+        """
+        저장된 단계 결과를 반환합니다.
+
+        Args:
+            stage (str): 단계 이름
+
+        Returns:
+            dict | None: 단계 결과. 없거나 읽을 수 없으면 None
+        """
+        try:
+            with open(self._file_path(stage), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"체크포인트를 읽지 못해 단계를 다시 실행합니다 ({stage}): {e}")
+            return None
+
+    def save(self, stage, result):
+        """
+        단계 결과를 저장합니다. 중간에 중단되어도 반쯤 쓰인 파일이 남지 않습니다.
+
+        Args:
+            stage (str): 단계 이름
+            result (dict): JSON으로 저장할 수 있는 단계 결과
+        """
+        write_file_atomic(self._file_path(stage), json.dumps(result, ensure_ascii=False))
+
+    def clear(self):
+        """이 날짜의 체크포인트를 모두 삭제합니다."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def prune_checkpoints(directory=CHECKPOINT_DIR, retention_days=CHECKPOINT_RETENTION_DAYS, today=None):
+    """
+    보관 기간이 지난 날짜의 체크포인트 디렉토리를 삭제합니다.
+
+    Args:
+        directory (str): 체크포인트 최상위 디렉토리
+        retention_days (int): 보관 기간(일)
+        today (datetime, optional): 기준 날짜 (기본값: 오늘)
+
+    Returns:
+        int: 삭제한 날짜 수
+    """
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = ((today or datetime.now()) - timedelta(days=retention_days)).strftime('%Y%m%d')
+    removed = 0
+    for name in os.listdir(directory):
+        if len(name) == 8 and name.isdigit() and name < cutoff:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+            removed += 1
+    if removed:
+        logger.info(f"지난 체크포인트 {removed}일치 삭제 ({retention_days}일 보관)")
+    return removed
+
+
+def _is_retryable_delivery_error(error):
+    from daily_bible_crawler.ledger import LEDGER_ENABLED
+    from daily_bible_crawler.rate_limiter import DailyLimitReached
+
+    # 하루 전송 한도에 도달했으면 오늘은 다시 시도해도 보낼 수 없음
+    if isinstance(error, DailyLimitReached):
+        return False
+    # 원장 없이 일부라도 보냈다면, 다시 보낼 때 이미 받은 수신자에게 중복 전송되므로 재시도하지 않음
+    return LEDGER_ENABLED or not isinstance(error, DeliveryError) or error.sent == 0
+
+
+def run_stage(store, stage, function, retry=None, policy=None):
+    """
+    단계를 실행하고 결과를 체크포인트로 저장합니다. 이미 저장된 단계는 실행하지 않습니다.
+
+    Args:
+        store (CheckpointStore): 체크포인트 저장소
+        stage (str): 단계 이름 (STAGE_RETRY_POLICIES의 키)
+        function (callable): 단계 결과(dict)를 반환하는 함수
+        retry (callable, optional): 예외를 받아 재시도 여부를 반환하는 함수 (기본값: 항상 재시도)
+        policy (dict, optional): 재시도 정책 (기본값: STAGE_RETRY_POLICIES[stage])
+
+    Returns:
+        dict: 단계 결과
+    """
+    result = store.load(stage)
+    if result is not None:
+        logger.info(f"체크포인트 사용, 단계 건너뜀: {stage}")
+        metrics.add('stages_skipped', 1)
+        return result
+
+    policy = policy or STAGE_RETRY_POLICIES[stage]
+    retrying = Retrying(
+        stop=stop_after_attempt(policy['attempts']),
+        wait=wait_exponential(multiplier=1, min=policy['wait_min'], max=policy['wait_max']),
+        retry=retry_if_exception(retry or (lambda error: True)),
+        before_sleep=before_sleep_log(logger, 'WARNING'),
+        reraise=True,
+    )
+    with metrics.stage(f"stage_{stage}"):
+        result = retrying(function)
+    store.save(stage, result)
+    logger.info(f"단계 완료, 체크포인트 저장: {stage}")
+    return result
+
+
+def _fetch_bible(use_http, url, pool):
+    from daily_bible_crawler.http_fetcher import fetch_page_sections, has_bible_content
+
+    bible_result = None
+    if use_http:
+        logger.info("HTTP로 웹사이트 접속 중...")
+        with metrics.stage('http_fetch'):
+            bible_result = fetch_page_sections(url, explanation_url=EXPLANATION_XHR_URL)
+        if bible_result is not None and not has_bible_content(bible_result[0]):
+            logger.info("HTTP로 말씀을 추출하지 못해 Playwright로 다시 시도합니다.")
+            bible_result = None
+
+    if bible_result is None:
+        bible_result = collect_bible_data_with_playwright(pool=pool, url=url)
+    if not has_bible_content(bible_result[0]):
+        raise ValueError("말씀 내용을 추출하지 못했습니다.")
+    return bible_result
+
+
+def _fetch_explanation(use_http, url, pool):
+    from daily_bible_crawler.http_fetcher import fetch_page_sections, has_explanation_content
+
+    explanation_data = None
+    if use_http:
+        # 해설 요청 URL이 있으면 그 응답만, 없으면 페이지를 CSS 없이 받아 해설만 파싱
+        logger.info("HTTP로 해설 추출 중...")
+        with metrics.stage('http_fetch'):
+            sections = fetch_page_sections(EXPLANATION_XHR_URL or url, include_css=False)
+        if sections is not None and has_explanation_content(sections[1]):
+            explanation_data = sections[1]
+        else:
+            logger.info("HTTP로 해설을 추출하지 못해 Playwright로 다시 시도합니다.")
+
+    if explanation_data is None:
+        explanation_data = collect_bible_data_with_playwright(pool=pool, url=url, collect=collect_explanation_from_page)
+    if not has_explanation_content(explanation_data):
+        raise ValueError("해설 내용을 추출하지 못했습니다.")
+    return explanation_data
+
+
+def run_stages(date=None, force_refresh=CACHE_FORCE_REFRESH, store=None, cache=None, use_http=USE_HTTP_FAST_PATH,
+               pool=None, url=WEBSITE_URL, output_dir=TEXTS_DIR):
+    """
+    말씀 추출, 해설 추출, 렌더링, 전송을 단계별로 실행합니다.
+
+    이미 성공한 단계는 체크포인트에서 결과를 읽어 건너뜁니다. 말씀 단계에서 해설도 함께
+    추출되면 해설 단계의 체크포인트도 바로 저장합니다. 캐시에 해당 날짜의 결과가 있으면
+    두 추출 단계를 캐시로 채웁니다.
+
+    Args:
+        date (datetime, optional): 말씀 날짜 (기본값: 오늘)
+        force_refresh (bool): 체크포인트와 캐시를 무시하고 처음부터 다시 실행할지 여부
+        store (CheckpointStore, optional): 체크포인트 저장소 (기본값: CHECKPOINT_DIR의 날짜별 저장소)
+        cache (ContentCache, optional): 날짜별 크롤링 결과 캐시
+        use_http (bool): HTTP 빠른 경로를 먼저 시도할지 여부
+        pool (BrowserPool, optional): Playwright 경로에서 재사용할 브라우저 풀
+        url (str): 접속할 페이지 URL
+        output_dir (str): 텍스트/HTML 저장 디렉토리
+
+    Returns:
+        dict: 단계 이름별 결과
+
+    Raises:
+        Exception: 추출이나 렌더링 단계가 재시도 후에도 실패한 경우 (전송 실패는 로그만 남김)
+    """
+    date = date or datetime.now()
+    store = store or CheckpointStore(date)
+    if force_refresh:
+        store.clear()
+
+    from_cache = False
+    if cache is not None and not force_refresh and store.load('bible') is None:
+        with metrics.stage('cache_lookup'):
+            cached = cache.get(date)
+        if cached is not None:
+            from_cache = True
+            bible_data, explanation_data, css_content = cached
+            store.save('bible', {'bible': bible_data, 'css': css_content})
+            store.save('explanation', {'explanation': explanation_data})
+
+    def extract_bible():
+        from daily_bible_crawler.http_fetcher import has_explanation_content
+
+        bible_data, explanation_data, css_content = _fetch_bible(use_http, url, pool)
+        # 해설도 함께 추출되었으면 해설 단계를 따로 실행하지 않도록 저장
+        if has_explanation_content(explanation_data) and store.load('explanation') is None:
+            store.save('explanation', {'explanation': explanation_data})
+        return {'bible': bible_data, 'css': css_content}
+
+    bible_stage = run_stage(store, 'bible', extract_bible)
+    explanation_stage = run_stage(
+        store, 'explanation', lambda: {'explanation': _fetch_explanation(use_http, url, pool)}
+    )
+    if cache is not None and not from_cache:
+        cache.put(date, bible_stage['bible'], explanation_stage['explanation'], bible_stage['css'])
+
+    def render():
+        reading = DailyReading.from_dicts(bible_stage['bible'], explanation_stage['explanation'],
+                                          bible_stage['css'], date=date)
+        with metrics.stage('build_content'):
+            content, html_content = render_reading(reading)
+        if ARCHIVE_BACKEND == 'store':
+            with metrics.stage('save_archive'):
+                save_reading(reading, date, output_dir)
+        else:
+            with metrics.stage('save_text'):
+                save_text_file(content, date, output_dir)
+        with metrics.stage('render'):
+            html_email = create_html_email(content, html_content, reading.css, date)
+        metrics.set_value('html_bytes', len(html_email.encode('utf-8')))
+        if ARCHIVE_BACKEND != 'store':
+            with metrics.stage('save_html'):
+                save_html_file(html_email, date, output_dir)
+        with metrics.stage('update_indexes'):
+            update_indexes(reading, date)
+        return {'content': content, 'html_email': html_email}
+
+    render_stage = run_stage(store, 'render', render)
+
+    def deliver():
+        from daily_bible_crawler.ledger import LEDGER_ENABLED
+
+        email_subject = f"[매일성경] 오늘의 말씀 - {date.strftime('%Y-%m-%d (%A)')}"
+        try:
+            with metrics.stage('send'):
+                send_email(email_subject, render_stage['html_email'], raise_errors=True, date=date)
+        except DeliveryError as e:
+            if not e.sent or LEDGER_ENABLED:
+                raise
+            # 일부만 보낸 경우 다시 보내지 않도록 실패한 수신자만 기록하고 단계를 마침
+            logger.error(f"일부 수신자에게 전송하지 못했습니다 (다시 보내지 않음): {e}")
+            return {'sent': e.sent, 'failed_recipients': e.failed_recipients}
+        return {'failed_recipients': []}
+
+    results = {'bible': bible_stage, 'explanation': explanation_stage, 'render': render_stage}
+    try:
+        # 샤드마다 수신자가 다르므로 전송 단계만 샤드별로 저장 (추출/렌더링 결과는 함께 사용)
+        shard_labels = EMAIL_RECIPIENTS.shard_labels()
+        delivery_stage = 'delivery' + ''.join(f".{name}{value}" for name, value in sorted(shard_labels.items()))
+        results['delivery'] = run_stage(store, delivery_stage, deliver, retry=_is_retryable_delivery_error,
+                                        policy=STAGE_RETRY_POLICIES['delivery'])
+    except Exception as e:
+        # 이메일 전송 실패는 프로그램을 중단시키지 않음 (체크포인트를 남기지 않으므로 다시 실행하면 재전송)
+        logger.error(f"이메일 전송 중 오류 발생: {str(e)}")
+    return results
+
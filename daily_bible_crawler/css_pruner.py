@@ -0,0 +1,274 @@
+"""
+웹사이트에서 가져온 CSS 중 이메일 HTML에서 실제로 쓰이는 규칙만 남기는 모듈입니다.
+
+사이트의 모든 스타일시트 규칙을 그대로 붙이는 대신, 생성한 HTML에 있는 태그/클래스/ID로
+만족될 수 있는 선택자만 남기고, 중복 규칙을 없앤 뒤 공백을 줄입니다. 결과는 스타일시트와
+HTML 어휘의 해시로 캐시하므로 사이트 CSS가 바뀔 때만 다시 계산합니다.
+
+선택자 판정은 구조(부모-자식 관계 등)를 보지 않고 각 단순 선택자에 필요한 태그, 클래스,
+ID가 HTML에 모두 있는지만 확인합니다. 따라서 실제로는 적용되지 않는 규칙이 일부 남을 수는
+있어도, 적용되는 규칙이 빠지지는 않습니다.
+"""
+import hashlib
+import os
+import re
+from html.parser import HTMLParser
+
+from loguru import logger
+
+CSS_CACHE_DIR = os.environ.get('CSS_CACHE_DIR', os.path.join('cache', 'css'))
+
+# 중첩 규칙을 가진 at-rule (안쪽 규칙도 같은 방식으로 정리)
+NESTED_AT_RULES = ('@media', '@supports', '@layer', '@container', '@scope', '@document', '@starting-style')
+# 이메일에서 쓰지 않으므로 제외하는 at-rule (그 밖의 모르는 at-rule은 그대로 유지)
+DROPPED_AT_RULES = ('@font-face', '@keyframes', '@-webkit-keyframes', '@-moz-keyframes')
+
+COMMENT_PATTERN = re.compile(r'/\*.*?\*/', re.S)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# :not(...), :is(...) 등 괄호가 있는 의사 클래스, 속성 선택자, 의사 클래스/요소
+# (:is(.a, :not(.b))처럼 중첩될 수 있으므로 안쪽부터 반복해서 제거)
+PSEUDO_WITH_ARGS_PATTERN = re.compile(r'::?[\w-]+\([^()]*\)')
+ATTRIBUTE_PATTERN = re.compile(r'\[[^\]]*\]')
+PSEUDO_PATTERN = re.compile(r'::?[\w-]+')
+COMBINATOR_PATTERN = re.compile(r'\s*[>+~]\s*|\s+')
+TAG_PATTERN = re.compile(r'^[a-zA-Z][\w-]*')
+CLASS_PATTERN = re.compile(r'\.([\w-]+)')
+ID_PATTERN = re.compile(r'#([\w-]+)')
+
+_memory_cache = {}
+
+
+class MarkupVocabulary(HTMLParser):
+    """HTML에 등장하는 태그, 클래스, ID를 모읍니다."""
+
+    def __init__(self, html):
+        super().__init__()
+        self.tags = set()
+        self.classes = set()
+        self.ids = set()
+        self.feed(html)
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag.lower())
+        for name, value in attrs:
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+
+    def signature(self):
+        return '|'.join([' '.join(sorted(self.tags)), ' '.join(sorted(self.classes)), ' '.join(sorted(self.ids))])
+
+
+def selector_matches(selector, vocabulary):
+    """
+    선택자의 모든 단순 선택자가 HTML 어휘로 만족될 수 있는지 확인합니다.
+
+    Args:
+        selector (str): 쉼표가 없는 단일 선택자
+        vocabulary (MarkupVocabulary): HTML 어휘
+
+    Returns:
+        bool: 남길 선택자이면 True
+    """
+    simplified = ATTRIBUTE_PATTERN.sub('', selector)
+    removed = 1
+    while removed:
+        simplified, removed = PSEUDO_WITH_ARGS_PATTERN.subn('', simplified)
+    simplified = PSEUDO_PATTERN.sub('', simplified)
+    for compound in COMBINATOR_PATTERN.split(simplified.strip()):
+        if not compound or compound == '*':
+            continue
+        tag = TAG_PATTERN.match(compound)
+        if tag and tag.group(0).lower() not in vocabulary.tags:
+            return False
+        if any(name not in vocabulary.classes for name in CLASS_PATTERN.findall(compound)):
+            return False
+        if any(name not in vocabulary.ids for name in ID_PATTERN.findall(compound)):
+            return False
+    return True
+
+
+def _scan_top_level(text):
+    """
+    문자열과 괄호 밖에 있는 문자의 (위치, 문자)를 순서대로 생성합니다.
+
+    url("data:image/png;base64,...")의 세미콜론이나 :is(.a, .b)의 쉼표처럼 따옴표나 괄호
+    안에 있는 구분자를 최상위 구분자로 잘못 보지 않기 위해 사용합니다.
+    """
+    quote = None
+    depth = 0
+    index = 0
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char == '\\':
+            # 이스케이프된 문자는 구분자로 보지 않음
+            index += 2
+            continue
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            yield index, char
+        index += 1
+
+
+def _split_top_level(text, separator):
+    """따옴표와 괄호 밖에 있는 separator로만 text를 나눕니다."""
+    parts = []
+    start = 0
+    for index, char in _scan_top_level(text):
+        if char == separator:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _split_blocks(css):
+    """최상위 수준의 (머리, 본문) 블록과 세미콜론으로 끝나는 at-rule을 순서대로 생성합니다."""
+    start = 0
+    brace = None
+    depth = 0
+    for index, char in _scan_top_level(css):
+        if char == '{':
+            if depth == 0:
+                brace = index
+            depth += 1
+        elif char == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                yield css[start:brace].strip(), css[brace + 1:index]
+                start = index + 1
+        elif char == ';' and depth == 0 and css[start:index].strip().startswith('@'):
+            # @import, @charset 등 본문이 없는 at-rule
+            yield css[start:index].strip(), None
+            start = index + 1
+    if depth:
+        # 닫히지 않은 마지막 블록은 스타일시트 끝에서 닫힌 것으로 봄
+        yield css[start:brace].strip(), css[brace + 1:]
+
+
+def _minify_selector(selector):
+    selector = WHITESPACE_PATTERN.sub(' ', selector.strip())
+    return re.sub(r'\s*([>+~,])\s*', r'\1', selector)
+
+
+def _minify_declarations(body):
+    declarations = []
+    for declaration in _split_top_level(body, ';'):
+        name, separator, value = declaration.partition(':')
+        if not separator or not name.strip():
+            continue
+        declarations.append(f"{name.strip()}:{WHITESPACE_PATTERN.sub(' ', value.strip())}")
+    return ';'.join(declarations)
+
+
+def _prune_rules(css, vocabulary, stats):
+    rules = []
+    for head, body in _split_blocks(css):
+        if body is None:
+            continue
+        if head.startswith('@'):
+            name = re.match(r'@[\w-]+', head).group(0).lower()
+            if name in NESTED_AT_RULES:
+                inner = _prune_rules(body, vocabulary, stats)
+                if inner:
+                    rules.append(f"{WHITESPACE_PATTERN.sub(' ', head)}{{{''.join(inner)}}}")
+            elif name in DROPPED_AT_RULES:
+                stats['dropped'] += 1
+            else:
+                # 구조를 모르는 at-rule은 잘못 정리하지 않도록 공백만 줄여서 유지
+                stats['kept'] += 1
+                rules.append(f"{WHITESPACE_PATTERN.sub(' ', head)}{{{WHITESPACE_PATTERN.sub(' ', body.strip())}}}")
+            continue
+
+        selectors = [selector for selector in _split_top_level(head, ',') if selector.strip()]
+        kept = [_minify_selector(selector) for selector in selectors if selector_matches(selector, vocabulary)]
+        declarations = _minify_declarations(body)
+        if not kept or not declarations:
+            stats['dropped'] += 1
+            continue
+        stats['kept'] += 1
+        rules.append(f"{','.join(kept)}{{{declarations}}}")
+
+    # 같은 규칙이 여러 번 나오면 마지막 것만 남김 (뒤에 나온 규칙이 우선하므로 결과가 같음)
+    deduplicated = []
+    seen = set()
+    for rule in reversed(rules):
+        if rule in seen:
+            stats['duplicates'] += 1
+            continue
+        seen.add(rule)
+        deduplicated.append(rule)
+    return list(reversed(deduplicated))
+
+
+def prune_css(css_content, html):
+    """
+    HTML에서 쓰이지 않는 CSS 규칙을 제거하고 중복 제거 및 압축한 CSS를 반환합니다.
+
+    Args:
+        css_content (str): 원본 CSS
+        html (str): CSS를 적용할 HTML
+
+    Returns:
+        str: 정리된 CSS
+    """
+    vocabulary = MarkupVocabulary(html)
+    stats = {'kept': 0, 'dropped': 0, 'duplicates': 0}
+    pruned = ''.join(_prune_rules(COMMENT_PATTERN.sub('', css_content or ''), vocabulary, stats))
+    logger.info(
+        f"CSS 정리: {len(css_content or '')}자 -> {len(pruned)}자 "
+        f"(규칙 유지 {stats['kept']}, 제거 {stats['dropped']}, 중복 {stats['duplicates']})"
+    )
+    return pruned
+
+
+def prune_css_cached(css_content, html, cache_dir=CSS_CACHE_DIR):
+    """
+    prune_css 결과를 스타일시트와 HTML 어휘의 해시로 캐시하여 반환합니다.
+
+    메모리와 디스크(cache_dir)에 함께 저장하므로 사이트 CSS가 바뀌지 않으면 다음 실행에서도
+    다시 계산하지 않습니다.
+
+    Args:
+        css_content (str): 원본 CSS
+        html (str): CSS를 적용할 HTML
+        cache_dir (str | None): 디스크 캐시 디렉토리 (None이면 메모리 캐시만 사용)
+
+    Returns:
+        str: 정리된 CSS
+    """
+    digest = hashlib.sha256()
+    digest.update((css_content or '').encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(MarkupVocabulary(html).signature().encode('utf-8'))
+    key = digest.hexdigest()
+
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    cache_path = os.path.join(cache_dir, f"{key}.css") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            pruned = f.read()
+        logger.info(f"정리된 CSS 캐시 사용: {key[:12]}")
+    else:
+        pruned = prune_css(css_content, html)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(pruned)
+            os.replace(temp_path, cache_path)
+
+    _memory_cache[key] = pruned
+    return pruned
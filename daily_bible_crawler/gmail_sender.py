@@ -0,0 +1,202 @@
+"""
+Gmail API 배치 요청으로 여러 통의 메일을 보내는 모듈입니다.
+
+수신자마다 messages().send().execute()를 순서대로 호출하는 대신, 여러 요청을 하나의
+배치 HTTP 요청으로 묶어 보냅니다. 배치 안에서 할당량 오류(429, rateLimitExceeded 등)로
+실패한 메시지만 지수 백오프 후 다시 보내며, 이미 성공한 메시지는 다시 보내지 않습니다.
+속도 제한기(rate_limiter.py)를 넘기면 배치를 보내기 전에 배치에 담긴 메시지 수만큼 토큰을 받으며
+(배치 크기는 줄이지 않고 배치 사이의 간격으로 속도를 맞춤), 할당량 오류가 나면 백오프 대신 제한기가
+속도를 줄여 다시 보냅니다.
+
+Gmail API 서비스 객체는 패키지에 포함된 정적 디스커버리 문서로 한 번만 만들어
+프로세스 안에서 재사용합니다.
+"""
+import json
+import os
+import time
+
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from loguru import logger
+
+GMAIL_BATCH_SIZE = int(os.environ.get('GMAIL_BATCH_SIZE', '50'))  # 배치당 요청 수 (Gmail 권장 최대 50)
+GMAIL_MAX_RETRIES = int(os.environ.get('GMAIL_MAX_RETRIES', '5'))
+GMAIL_BACKOFF_BASE = float(os.environ.get('GMAIL_BACKOFF_BASE', '1'))  # 재시도 대기 기본 시간(초)
+
+# 재시도할 할당량/일시 오류
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'quotaExceeded', 'backendError'}
+# 하루 전송 한도 초과 (다시 시도해도 다음 날까지 실패)
+DAILY_LIMIT_REASONS = {'dailyLimitExceeded'}
+
+_service_cache = {}
+
+
+def get_gmail_service(creds):
+    """
+    Gmail API 서비스 객체를 반환합니다.
+
+    디스커버리 문서를 네트워크로 받지 않고 googleapiclient에 포함된 정적 문서를 사용하며,
+    같은 인증 정보에 대해서는 만들어 둔 서비스 객체를 재사용합니다.
+
+    Args:
+        creds (Credentials): OAuth2 인증 정보
+
+    Returns:
+        Resource: Gmail API 서비스
+    """
+    if _service_cache.get('creds') is not creds:
+        _service_cache['service'] = build('gmail', 'v1', credentials=creds, static_discovery=True, cache_discovery=False)
+        _service_cache['creds'] = creds
+    return _service_cache['service']
+
+
+def _error_reasons(error):
+    try:
+        details = json.loads(error.content.decode('utf-8')).get('error', {}).get('errors', [])
+    except (ValueError, AttributeError):
+        return set()
+    return {detail.get('reason') for detail in details}
+
+
+def is_retryable_error(error):
+    """
+    할당량 초과나 일시적인 서버 오류처럼 다시 시도할 수 있는 오류인지 확인합니다.
+
+    Args:
+        error (Exception): 요청 오류
+
+    Returns:
+        bool: 재시도 가능 여부
+    """
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status in RETRYABLE_STATUSES:
+        return True
+    if error.resp.status == 403:
+        return bool(_error_reasons(error) & RETRYABLE_REASONS)
+    return False
+
+
+def is_daily_limit_error(error):
+    """
+    하루 전송 한도 초과 오류인지 확인합니다.
+
+    Args:
+        error (Exception): 요청 오류
+
+    Returns:
+        bool: 하루 한도 초과 여부
+    """
+    return isinstance(error, HttpError) and bool(_error_reasons(error) & DAILY_LIMIT_REASONS)
+
+
+def _retry_after(error):
+    # 서버가 Retry-After(초)를 알려 주면 그만큼 기다림
+    try:
+        return float(error.resp.get('retry-after'))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def send_raw_messages(service, messages, batch_size=GMAIL_BATCH_SIZE, max_retries=GMAIL_MAX_RETRIES,
+                      backoff_base=GMAIL_BACKOFF_BASE, on_result=None, limiter=None):
+    """
+    base64url로 인코딩된 메시지를 배치 요청으로 보냅니다.
+
+    Args:
+        service (Resource): Gmail API 서비스
+        messages (iterable): (수신자, raw) 튜플
+        batch_size (int): 배치 하나에 담을 요청 수
+        max_retries (int): 할당량 오류로 실패한 메시지의 최대 재시도 횟수
+        backoff_base (float): 재시도 대기 기본 시간(초). 시도마다 두 배로 늘어남 (limiter가 없을 때)
+        on_result (callable, optional): 메시지의 최종 결과마다 (수신자, 메시지 ID, 오류)로 호출할 함수
+        limiter (AdaptiveRateLimiter, optional): 전송 속도와 하루 전송 수를 제한할 속도 제한기
+
+    Returns:
+        dict: {'sent': int, 'failed': int, 'failed_recipients': list, 'message_ids': dict,
+               'limit_reached': bool, 'elapsed': float, 'rate': float}
+    """
+    from daily_bible_crawler.rate_limiter import DailyLimitReached
+
+    stats = {'sent': 0, 'failed': 0, 'failed_recipients': [], 'message_ids': {}, 'limit_reached': False}
+    started_at = time.perf_counter()
+
+    def send_chunk(chunk):
+        pending = dict(enumerate(chunk))
+        for attempt in range(max_retries + 1):
+            retry = {}
+            retry_after = []
+
+            def callback(request_id, response, exception):
+                recipient, raw = pending[int(request_id)]
+                if exception is None:
+                    stats['sent'] += 1
+                    stats['message_ids'][recipient] = response.get('id')
+                    if limiter is not None:
+                        limiter.on_success()
+                    if on_result is not None:
+                        on_result(recipient, response.get('id'), None)
+                elif is_retryable_error(exception) and attempt < max_retries:
+                    retry[int(request_id)] = (recipient, raw)
+                    retry_after.append(_retry_after(exception))
+                else:
+                    if is_daily_limit_error(exception):
+                        stats['limit_reached'] = True
+                    logger.error(f"OAuth2 이메일 전송 실패: {recipient} ({exception})")
+                    stats['failed'] += 1
+                    stats['failed_recipients'].append(recipient)
+                    if limiter is not None:
+                        limiter.on_failure()
+                    if on_result is not None:
+                        on_result(recipient, None, exception)
+
+            if limiter is not None:
+                # 메시지마다 토큰 하나씩 받음 (버스트보다 큰 배치는 모자란 토큰이 찰 때까지 기다렸다가 보냄)
+                limiter.acquire(len(pending))
+            batch = service.new_batch_http_request(callback=callback)
+            for request_id, (recipient, raw) in pending.items():
+                batch.add(service.users().messages().send(userId='me', body={'raw': raw}), request_id=str(request_id))
+            batch.execute()
+
+            if not retry:
+                return
+            if limiter is not None:
+                # 제한된 메시지 수만큼 한 번에 알려 속도는 한 번만 줄이고, 다음 acquire에서 기다림
+                waits = [wait for wait in retry_after if wait is not None]
+                limiter.on_throttle(max(waits) if waits else None, count=len(retry))
+                logger.warning(f"할당량 오류로 {len(retry)}건을 다시 보냅니다. ({attempt + 1}/{max_retries})")
+            else:
+                delay = backoff_base * (2 ** attempt)
+                logger.warning(f"할당량 오류로 {len(retry)}건을 {delay:.1f}초 후 다시 보냅니다. ({attempt + 1}/{max_retries})")
+                time.sleep(delay)
+            pending = retry
+
+    try:
+        chunk = []
+        for message in messages:
+            chunk.append(message)
+            if len(chunk) >= batch_size:
+                send_chunk(chunk)
+                chunk = []
+                if stats['limit_reached']:
+                    break
+        else:
+            if chunk:
+                send_chunk(chunk)
+    except DailyLimitReached as e:
+        # 남은 메시지는 보내지 않음 (전송 원장이 있으면 다음 실행에서 이어서 보냄)
+        logger.warning(str(e))
+        stats['limit_reached'] = True
+
+    stats['elapsed'] = time.perf_counter() - started_at
+    stats['rate'] = stats['sent'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+    logger.info(
+        f"OAuth2 배치 전송 완료: 성공 {stats['sent']}건, 실패 {stats['failed']}건, "
+        f"{stats['elapsed']:.2f}초 ({stats['rate']:.1f}통/초)"
+    )
+    if stats['limit_reached']:
+        logger.warning("하루 전송 한도에 도달하여 남은 수신자에게는 보내지 않았습니다.")
+    if limiter is not None:
+        limiter.log_status()
+    return stats
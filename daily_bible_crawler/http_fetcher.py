@@ -0,0 +1,313 @@
+"""
+브라우저 없이 HTTP 요청만으로 매일성경 페이지를 가져와 파싱하는 모듈입니다.
+
+Chromium을 띄우지 않고 requests로 HTML을 받아 말씀(#font_uparea02)과
+해설(#font_uparea03, .g_text, #dailybible_info2) 영역을 Python에서 추출합니다.
+필요한 선택자가 없거나 비어 있으면 None을 반환하여 호출자가 Playwright 경로로
+대체할 수 있도록 합니다.
+"""
+import re
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup, NavigableString, Tag
+from loguru import logger
+
+from daily_bible_crawler import metrics
+
+# HTTP 요청 설정
+HTTP_TIMEOUT = 10
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+}
+
+# innerText 계산 시 줄바꿈으로 취급할 블록 요소
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'section', 'table', 'tr', 'ul',
+}
+# 앞뒤로 빈 줄이 들어가는 요소 (브라우저의 innerText 규칙과 동일)
+PARAGRAPH_TAGS = {'p'}
+SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+VERSE_PATTERN = re.compile(r'^(\d+)\s(.+)$')
+VERSE_START_PATTERN = re.compile(r'^\d+\s')
+
+
+def inner_text(element):
+    """
+    브라우저의 innerText와 비슷한 규칙으로 요소의 텍스트를 추출합니다.
+
+    인라인 요소는 이어 붙이고, 블록 요소와 <br>은 줄바꿈으로, <p>는 빈 줄로 구분합니다.
+
+    Args:
+        element (Tag): BeautifulSoup 요소
+
+    Returns:
+        str: 추출된 텍스트
+    """
+    parts = []
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, NavigableString):
+                # 주석, DOCTYPE 등 특수 문자열은 제외
+                if type(child) is NavigableString:
+                    parts.append(re.sub(r'\s+', ' ', str(child)))
+            elif isinstance(child, Tag):
+                if child.name in SKIP_TAGS:
+                    continue
+                if child.name == 'br':
+                    parts.append('\n')
+                    continue
+                separator = '\n\n' if child.name in PARAGRAPH_TAGS else '\n' if child.name in BLOCK_TAGS else ''
+                parts.append(separator)
+                walk(child)
+                parts.append(separator)
+
+    walk(element)
+    lines = [line.strip() for line in ''.join(parts).split('\n')]
+    text = '\n'.join(lines)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def parse_bible_data(soup):
+    """
+    말씀 영역(#font_uparea02)에서 헤더와 구절을 추출합니다.
+
+    Playwright 경로의 bible_data 스크립트와 같은 규칙을 사용합니다.
+
+    Args:
+        soup (BeautifulSoup): 파싱된 페이지
+
+    Returns:
+        dict: {'header': str, 'verses': [{'number': str, 'text': str}, ...]}
+    """
+    bible_div = soup.select_one('#font_uparea02')
+    if bible_div is None:
+        return {'header': '', 'verses': []}
+
+    lines = [line for line in inner_text(bible_div).split('\n') if line.strip()]
+
+    # 헤더 정보 (날짜, 제목, 본문 등) 추출
+    header_end_index = 0
+    while header_end_index < len(lines) and not VERSE_START_PATTERN.match(lines[header_end_index]):
+        header_end_index += 1
+    header = '\n'.join(lines[:header_end_index])
+
+    # 성경 구절 추출 (숫자로 시작하는 줄)
+    verses = []
+    for line in lines[header_end_index:]:
+        match = VERSE_PATTERN.match(line)
+        if match:
+            verses.append({'number': match.group(1), 'text': match.group(2)})
+
+    return {'header': header, 'verses': verses}
+
+
+def parse_explanation_data(soup):
+    """
+    해설 영역(#font_uparea03)에서 제목, 섹션, 정보를 추출합니다.
+
+    Playwright 경로의 explanation_data 스크립트와 같은 규칙을 사용합니다.
+
+    Args:
+        soup (BeautifulSoup): 파싱된 페이지
+
+    Returns:
+        dict: {'title': str, 'sections': [{'subtitle': str, 'content': str}, ...], 'info': str}
+    """
+    title_element = soup.select_one('.b_text')
+    explanation = {
+        'title': inner_text(title_element) if title_element else '',
+        'sections': [],
+    }
+
+    explanation_div = soup.select_one('#font_uparea03')
+    if explanation_div is not None:
+        # 각 섹션 추출 (g_text는 제목, 다음 형제 요소 중 text 클래스가 내용)
+        for section_element in explanation_div.select('.g_text'):
+            subtitle = inner_text(section_element)
+            content = ''
+            next_element = section_element.find_next_sibling()
+            while next_element is not None and 'g_text' not in next_element.get('class', []):
+                if 'text' in next_element.get('class', []):
+                    content = inner_text(next_element)
+                    break
+                next_element = next_element.find_next_sibling()
+
+            if subtitle or content:
+                explanation['sections'].append({'subtitle': subtitle, 'content': content})
+
+    info_element = soup.select_one('#dailybible_info2')
+    explanation['info'] = inner_text(info_element) if info_element else ''
+    return explanation
+
+
+def extract_css(soup, base_url, session=None, timeout=HTTP_TIMEOUT):
+    """
+    페이지의 <style> 내용과 <link rel="stylesheet"> 파일을 모아 반환합니다.
+
+    외부 스타일시트를 가져오지 못하면 브라우저 경로와 마찬가지로 빈 문자열로 처리합니다.
+
+    Args:
+        soup (BeautifulSoup): 파싱된 페이지
+        base_url (str): 상대 경로 해석에 사용할 페이지 URL
+        session (requests.Session, optional): 재사용할 HTTP 세션
+        timeout (float): 요청 타임아웃(초)
+
+    Returns:
+        str: 연결된 CSS 문자열
+    """
+    http = session or requests
+    css_parts = []
+    for element in soup.find_all(['style', 'link']):
+        if element.name == 'style':
+            css_parts.append(element.get_text())
+        elif 'stylesheet' in element.get('rel', []) and element.get('href'):
+            try:
+                response = http.get(urljoin(base_url, element['href']), headers=HTTP_HEADERS, timeout=timeout)
+                response.raise_for_status()
+                css_parts.append(response.text)
+            except requests.RequestException as e:
+                logger.warning(f"스타일시트 다운로드 실패: {element['href']} ({e})")
+    return '\n'.join(part.strip() for part in css_parts if part.strip())
+
+
+def has_bible_content(bible_data):
+    """말씀 데이터에 헤더와 구절이 모두 있는지 확인합니다."""
+    return bool(bible_data and bible_data.get('header') and bible_data.get('verses'))
+
+
+def has_explanation_content(explanation_data):
+    """해설 데이터에 내용이 채워진 섹션이 하나 이상 있는지 확인합니다."""
+    sections = (explanation_data or {}).get('sections') or []
+    return any(section.get('content') for section in sections)
+
+
+def parse_page_sections(html, base_url, session=None, timeout=HTTP_TIMEOUT, explanation_html=None, include_css=True):
+    """
+    매일성경 페이지 HTML에서 말씀, 해설, CSS를 내용이 비어 있는지 확인하지 않고 그대로 추출합니다.
+
+    선택자로 영역을 찾는 곳은 이 함수 하나이며, parse_bible_page와 fetch_page_sections,
+    fetch_bible_data는 모두 이 함수를 거칩니다.
+
+    Args:
+        html (str): 페이지 HTML
+        base_url (str): 페이지 URL
+        session (requests.Session, optional): 스타일시트 요청에 사용할 세션
+        timeout (float): 요청 타임아웃(초)
+        explanation_html (str, optional): 해설 탭 요청의 응답 HTML.
+            주어지면 페이지 대신 이 응답에서 해설을 추출합니다.
+        include_css (bool): 말씀이 있을 때 스타일시트도 가져올지 여부
+
+    Returns:
+        tuple: (bible_data, explanation_data, css_content)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    bible_data = parse_bible_data(soup)
+    explanation_soup = BeautifulSoup(explanation_html, 'html.parser') if explanation_html else soup
+    explanation_data = parse_explanation_data(explanation_soup)
+    css_content = ''
+    if include_css and has_bible_content(bible_data):
+        css_content = extract_css(soup, base_url, session=session, timeout=timeout)
+    return bible_data, explanation_data, css_content
+
+
+def _complete_sections(sections):
+    """말씀과 해설이 모두 채워져 있으면 그대로, 아니면 None을 반환합니다. (브라우저로 다시 시도할 신호)"""
+    if sections is None:
+        return None
+    bible_data, explanation_data, _ = sections
+    if not has_bible_content(bible_data):
+        logger.info("HTTP 응답에 말씀 영역(#font_uparea02)이 없거나 비어 있습니다.")
+        return None
+    if not has_explanation_content(explanation_data):
+        logger.info("HTTP 응답에 해설 영역(#font_uparea03 .g_text)이 없거나 비어 있습니다.")
+        return None
+    return sections
+
+
+def parse_bible_page(html, base_url, session=None, timeout=HTTP_TIMEOUT, explanation_html=None):
+    """
+    매일성경 페이지 HTML에서 말씀, 해설, CSS를 추출합니다.
+
+    Args:
+        html (str): 페이지 HTML
+        base_url (str): 페이지 URL
+        session (requests.Session, optional): 스타일시트 요청에 사용할 세션
+        timeout (float): 요청 타임아웃(초)
+        explanation_html (str, optional): 해설 탭 요청의 응답 HTML.
+            주어지면 페이지 대신 이 응답에서 해설을 추출합니다.
+
+    Returns:
+        tuple | None: (bible_data, explanation_data, css_content).
+            필요한 선택자가 없거나 비어 있으면 None
+    """
+    return _complete_sections(
+        parse_page_sections(html, base_url, session=session, timeout=timeout, explanation_html=explanation_html)
+    )
+
+
+def fetch_bible_data(url, session=None, timeout=HTTP_TIMEOUT, explanation_url=None):
+    """
+    브라우저 없이 HTTP로 페이지를 받아 말씀과 해설 데이터를 추출합니다.
+
+    fetch_page_sections로 받고 파싱한 뒤, 말씀이나 해설이 비어 있으면 None을 반환합니다.
+
+    Args:
+        url (str): 매일성경 페이지 URL
+        session (requests.Session, optional): 재사용할 HTTP 세션
+        timeout (float): 요청 타임아웃(초)
+        explanation_url (str, optional): 해설 탭이 내부적으로 호출하는 요청 URL.
+            주어지면 해설은 이 응답에서 추출합니다.
+
+    Returns:
+        tuple | None: (bible_data, explanation_data, css_content).
+            요청이 실패하거나 필요한 내용이 없으면 None
+    """
+    return _complete_sections(
+        fetch_page_sections(url, session=session, timeout=timeout, explanation_url=explanation_url)
+    )
+
+
+def fetch_page_sections(url, session=None, timeout=HTTP_TIMEOUT, explanation_url=None, include_css=True):
+    """
+    페이지를 받아 말씀, 해설, CSS를 내용이 비어 있는지 확인하지 않고 그대로 반환합니다.
+
+    영역별로 나누어 다시 시도하는 단계별 실행에서 사용합니다. (한쪽만 비어 있어도 다른 쪽은 사용)
+
+    Args:
+        url (str): 매일성경 페이지 URL
+        session (requests.Session, optional): 재사용할 HTTP 세션
+        timeout (float): 요청 타임아웃(초)
+        explanation_url (str, optional): 해설 탭이 내부적으로 호출하는 요청 URL
+        include_css (bool): 말씀이 있을 때 스타일시트도 가져올지 여부
+
+    Returns:
+        tuple | None: (bible_data, explanation_data, css_content). 요청이 실패하면 None
+    """
+    http = session or requests
+    try:
+        html = _get_text(http, url, timeout)
+        explanation_html = _get_text(http, explanation_url, timeout) if explanation_url else None
+    except requests.RequestException as e:
+        logger.warning(f"HTTP 요청 실패: {e}")
+        return None
+
+    logger.info(f"HTTP 페이지 내용 길이: {len(html)}")
+    return parse_page_sections(html, url, session=session, timeout=timeout, explanation_html=explanation_html,
+                               include_css=include_css)
+
+
+def _get_text(http, url, timeout):
+    response = http.get(url, headers=HTTP_HEADERS, timeout=timeout)
+    response.raise_for_status()
+    metrics.add('bytes_fetched', len(response.content))
+
+    # 서버가 charset을 명시하지 않으면 requests가 ISO-8859-1로 추정하므로 본문 기준으로 보정
+    if response.encoding is None or response.encoding.lower() == 'iso-8859-1':
+        response.encoding = response.apparent_encoding
+    return response.text
@@ -0,0 +1,241 @@
+"""
+날짜, 수신자, 전송 방식별 전송 결과를 기록하는 SQLite 전송 원장 모듈입니다.
+
+전송 함수는 보내기 전에 원장에서 이미 성공한 수신자를 빼고, 보낸 결과(성공/실패, 메시지 ID)를
+원장에 기록합니다. 그래서 전송이 중간에 실패하거나 중단된 뒤 다시 실행하면 아직 받지 못한
+수신자에게만 보내고, 이미 받은 수신자에게는 다시 보내지 않습니다.
+
+수신자가 많을 때 원장 기록이 전송을 늦추지 않도록, 결과는 메모리에 모았다가
+LEDGER_FLUSH_SIZE건마다 또는 LEDGER_FLUSH_INTERVAL초마다 한 트랜잭션으로 씁니다.
+(프로세스가 강제 종료되면 마지막으로 쓰지 못한 결과는 다음 실행에서 다시 보낼 수 있습니다)
+
+사용 예:
+    python -m daily_bible_crawler.ledger            # 오늘 전송 결과 요약
+    python -m daily_bible_crawler.ledger 2025-03-24
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from datetime import datetime
+from functools import partial
+
+from loguru import logger
+
+LEDGER_ENABLED = os.environ.get('LEDGER_ENABLED', 'true').lower() != 'false'
+LEDGER_PATH = os.environ.get('LEDGER_PATH', os.path.join('cache', 'delivery_ledger.sqlite3'))
+LEDGER_FLUSH_SIZE = int(os.environ.get('LEDGER_FLUSH_SIZE', '200'))  # 한 번에 쓸 최대 결과 수
+LEDGER_FLUSH_INTERVAL = float(os.environ.get('LEDGER_FLUSH_INTERVAL', '1'))  # 결과를 모아 둘 최대 시간(초)
+LEDGER_LOOKUP_SIZE = 500  # 보낼 수신자를 확인할 때 한 번에 조회할 주소 수 (SQLite 변수 개수 한도 이내)
+
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+
+class DeliveryLedger:
+    """(날짜, 수신자, 전송 방식)별 전송 상태와 메시지 ID를 저장하는 원장"""
+
+    def __init__(self, path=LEDGER_PATH, flush_size=LEDGER_FLUSH_SIZE, flush_interval=LEDGER_FLUSH_INTERVAL):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+            flush_size (int): 모아 둔 결과가 이 수에 이르면 씀
+            flush_interval (float): 마지막으로 쓴 뒤 이 시간(초)이 지나면 씀
+        """
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.flushes = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS deliveries (
+                    date TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    backend TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    message_id TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (date, recipient, backend)
+                ) WITHOUT ROWID
+            ''')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 전송 중 예외가 나도 그때까지의 결과는 남김
+        self.flush()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _key(date):
+        return date.strftime('%Y%m%d')
+
+    def delivered(self, date, backend):
+        """
+        해당 날짜에 전송 방식으로 이미 받은 수신자 집합을 반환합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+            backend (str): 전송 방식 ('smtp', 'gmail')
+
+        Returns:
+            set: 전송에 성공한 수신자 주소
+        """
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT recipient FROM deliveries WHERE date = ? AND backend = ? AND status = ?',
+                (self._key(date), backend, STATUS_SENT),
+            )
+            return {row[0] for row in rows}
+
+    def pending(self, date, backend, recipients):
+        """
+        아직 받지 못한 수신자만 차례로 생성합니다.
+
+        수신자를 LEDGER_LOOKUP_SIZE명씩 읽어 그 주소만 원장에서 조회하므로, 수신자 목록이나
+        이미 받은 수신자 전체를 메모리에 올리지 않습니다. send_messages의 작업 스레드들이 번갈아
+        꺼내 가므로 연결을 계속 열어 두지 않고 묶음마다 짧게 열어 조회합니다.
+        (SQLite 연결은 만든 스레드에서만 쓸 수 있음)
+
+        Args:
+            date (datetime): 말씀 날짜
+            backend (str): 전송 방식
+            recipients (iterable): 전체 수신자 주소
+
+        Yields:
+            str: 보낼 수신자 주소
+        """
+        from daily_bible_crawler.message_builder import chunked
+
+        self.flush()
+        skipped = 0
+        for chunk in chunked(recipients, LEDGER_LOOKUP_SIZE):
+            placeholders = ', '.join('?' * len(chunk))
+            with closing(self._connect()) as conn:
+                delivered = {row[0] for row in conn.execute(
+                    f'SELECT recipient FROM deliveries WHERE date = ? AND backend = ? AND status = ? '
+                    f'AND recipient IN ({placeholders})',
+                    (self._key(date), backend, STATUS_SENT, *chunk),
+                )}
+            for recipient in chunk:
+                if recipient in delivered:
+                    skipped += 1
+                else:
+                    yield recipient
+        if skipped:
+            logger.info(f"전송 원장: 이미 받은 수신자 {skipped}명 건너뜀 ({self._key(date)}, {backend})")
+
+    def record(self, date, backend, recipient, message_id=None, error=None):
+        """
+        전송 결과를 기록합니다. 결과는 모아 두었다가 한꺼번에 씁니다. 여러 스레드에서 호출해도 됩니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+            backend (str): 전송 방식
+            recipient (str): 수신자 주소. 숨은 참조 발송의 표시 이름('a, b')이면 주소마다 기록
+            message_id (str, optional): 전송된 메시지 ID
+            error (Exception | str, optional): 실패 원인 (없으면 성공)
+        """
+        status = STATUS_SENT if error is None else STATUS_FAILED
+        now = time.time()
+        # 숨은 참조 발송은 한 통에 여러 수신자가 ', '로 묶여 있으므로 주소마다 같은 결과를 기록
+        rows = [
+            (self._key(date), address, backend, status, message_id, None if error is None else str(error), now)
+            for address in recipient.split(', ')
+        ]
+        with self._lock:
+            self._buffer.extend(rows)
+            due = (len(self._buffer) >= self.flush_size
+                   or time.monotonic() - self._flushed_at >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 결과를 한 트랜잭션으로 씁니다."""
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            self._flushed_at = time.monotonic()
+            if not rows:
+                return
+            # 쓰는 동안 다른 스레드의 기록은 다음 묶음으로 모음 (쓰기 순서 보장을 위해 잠금 유지)
+            with closing(self._connect()) as conn, conn:
+                conn.executemany('''
+                    INSERT INTO deliveries (date, recipient, backend, status, message_id, error, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (date, recipient, backend) DO UPDATE SET
+                        status = excluded.status,
+                        message_id = excluded.message_id,
+                        error = excluded.error,
+                        attempts = attempts + 1,
+                        updated_at = excluded.updated_at
+                ''', rows)
+            self.flushes += 1
+
+    def summary(self, date):
+        """
+        날짜의 전송 방식/상태별 수신자 수를 반환합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            dict: {(backend, status): int}
+        """
+        self.flush()
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT backend, status, COUNT(*) FROM deliveries WHERE date = ? GROUP BY backend, status',
+                (self._key(date),),
+            )
+            return {(backend, status): count for backend, status, count in rows}
+
+
+@contextmanager
+def tracked_delivery(date, backend, recipients, ledger=None, enabled=LEDGER_ENABLED):
+    """
+    원장을 확인하여 보낼 수신자와 결과 기록 함수를 돌려주고, 끝나면 남은 결과를 씁니다.
+
+    사용 예:
+        with tracked_delivery(date, 'smtp', EMAIL_RECIPIENTS) as (recipients, on_result):
+            send_messages(pool, smtp_envelopes(prepared, recipients), on_result=on_result)
+
+    Args:
+        date (datetime): 말씀 날짜
+        backend (str): 전송 방식 ('smtp', 'gmail')
+        recipients (iterable): 전체 수신자 주소
+        ledger (DeliveryLedger, optional): 사용할 원장 (기본값: LEDGER_PATH의 원장)
+        enabled (bool): 원장을 사용할지 여부 (ledger가 주어지면 무시)
+
+    Yields:
+        tuple: (보낼 수신자(iterable), 결과 기록 함수 또는 None)
+    """
+    if ledger is None and not enabled:
+        yield recipients, None
+        return
+    ledger = ledger or DeliveryLedger()
+    try:
+        yield ledger.pending(date, backend, recipients), partial(ledger.record, date, backend)
+    finally:
+        ledger.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="날짜별 이메일 전송 결과를 요약합니다.")
+    parser.add_argument('date', nargs='?', type=lambda value: datetime.strptime(value, '%Y-%m-%d'),
+                        default=datetime.now(), help="말씀 날짜 (YYYY-MM-DD, 기본값: 오늘)")
+    args = parser.parse_args()
+    for (backend, status), count in sorted(DeliveryLedger().summary(args.date).items()):
+        print(f"{backend}\t{status}\t{count}")
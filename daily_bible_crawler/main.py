@@ -1,34 +1,38 @@
+# 시작 시간을 줄이기 위해 전송/추출 백엔드(Google API, Playwright, requests/bs4)는
+# 실제로 사용하는 함수 안에서 가져옵니다.
+import argparse
 import locale
 import os
 import re
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
 from datetime import datetime
-import base64
 import pickle
 import os.path
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
 from loguru import logger
-from playwright.sync_api import sync_playwright
-from tenacity import retry, wait_exponential, stop_after_attempt
-import requests
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.cache import ContentCache
+from daily_bible_crawler.css_pruner import prune_css_cached
+from daily_bible_crawler.reading import DailyReading
+from daily_bible_crawler.recipients import add_shard_arguments, open_recipient_source
+from daily_bible_crawler.page_scripts import (
+    BIBLE_STRUCTURE_SCRIPT,
+    CSS_EXTRACTION_SCRIPT,
+    BIBLE_EXTRACTION_SCRIPT,
+    EXPLANATION_EXTRACTION_SCRIPT,
+    PAGE_EXTRACTION_SCRIPT,
+)
 
 # 환경 변수에서 설정 가져오기
 EMAIL_SENDER = os.environ.get('EMAIL_SENDER')
 EMAIL_PASSWORD = os.environ.get('EMAIL_PASSWORD')  # 앱 비밀번호로 사용 가능
-EMAIL_RECIPIENT = os.environ.get('EMAIL_RECIPIENT')  # 콤마로 구분된 이메일 주소 목록
+EMAIL_RECIPIENT = os.environ.get('EMAIL_RECIPIENT')  # 콤마로 구분된 이메일 주소 목록 (RECIPIENT_SOURCE가 없을 때)
 EMAIL_APP_PASSWORD = os.environ.get('EMAIL_APP_PASSWORD')  # Gmail 앱 비밀번호 
 
-# 이메일 수신자 목록 처리 (콤마로 구분된 이메일 주소를 리스트로 변환)
-EMAIL_RECIPIENTS = []
-if EMAIL_RECIPIENT:
-    EMAIL_RECIPIENTS = [email.strip() for email in EMAIL_RECIPIENT.split(',') if email.strip()]
-    logger.info(f"이메일 수신자 {len(EMAIL_RECIPIENTS)}명이 설정되었습니다.")
+# 이메일 수신자 원본 (RECIPIENT_SOURCE의 CSV/JSONL/SQLite 또는 EMAIL_RECIPIENT)
+# 목록을 미리 읽지 않고 보낼 때 한 명씩 읽으며, SHARD_INDEX/SHARD_COUNT로 이 프로세스의 몫만 보냄
+EMAIL_RECIPIENTS = open_recipient_source(env_value=EMAIL_RECIPIENT)
 
 # 현재 스크립트의 디렉토리 경로를 기준으로 절대 경로 설정
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -38,9 +42,72 @@ OAUTH_CREDENTIALS_PATH = os.environ.get('OAUTH_CREDENTIALS_PATH', os.path.join(S
 # 웹사이트 URL 상수 정의
 WEBSITE_URL = "https://sum.su.or.kr:8888/bible/today"
 
-# 로거 설정
-logger.add("bible_crawler.log", rotation="1 day", retention="7 days")
-locale.setlocale(locale.LC_TIME, 'ko_KR.UTF-8')
+# 크롤링 결과를 저장할 디렉토리
+TEXTS_DIR = "texts"
+
+# 보관 방식: 'store'이면 압축 보관소(archive.py)에 구조화된 말씀만 저장하고,
+# 'files'이면 기존처럼 날짜별 .txt/.html 파일을 씀
+ARCHIVE_BACKEND = os.environ.get('ARCHIVE_BACKEND', 'store')
+
+# 새 말씀이 올라왔는지 확인하고 마지막으로 처리한 말씀과 같으면 건너뛸지 여부 (change_detection.py)
+CHANGE_DETECTION_ENABLED = os.environ.get('CHANGE_DETECTION_ENABLED', 'true').lower() != 'false'
+
+# 크롤링 결과 캐시 사용 여부와 강제 새로고침 여부
+CACHE_ENABLED = os.environ.get('CACHE_ENABLED', 'true').lower() != 'false'
+CACHE_FORCE_REFRESH = os.environ.get('CACHE_FORCE_REFRESH', 'false').lower() == 'true'
+
+# 브라우저 없이 HTTP로 먼저 추출할지 여부 (false로 설정하면 항상 Playwright 사용)
+USE_HTTP_FAST_PATH = os.environ.get('USE_HTTP_FAST_PATH', 'true').lower() != 'false'
+
+# Playwright 추출 설정
+# 최적화 모드: 불필요한 요청을 차단하고 탭 상태마다 한 번의 evaluate로 추출
+PLAYWRIGHT_OPTIMIZED = os.environ.get('PLAYWRIGHT_OPTIMIZED', 'true').lower() != 'false'
+# 최적화 모드에서 진단용 구조 분석 실행 여부
+PLAYWRIGHT_STRUCTURE_PROBE = os.environ.get('PLAYWRIGHT_STRUCTURE_PROBE', 'false').lower() == 'true'
+# 추출에 필요 없어 차단할 리소스 유형과 분석/광고 스크립트 주소
+BLOCKED_RESOURCE_TYPES = {'image', 'font', 'media'}
+BLOCKED_URL_PATTERN = re.compile(
+    r'google-analytics\.com|googletagmanager\.com|doubleclick\.net|facebook\.net|wcs\.naver\.net|adservice\.google'
+)
+
+# 캡처 준비 대기 설정
+CAPTURE_TIME_BUDGET = float(os.environ.get('CAPTURE_TIME_BUDGET', '30'))  # 캡처 전체 시간 예산(초)
+SECTION_READY_TIMEOUT = float(os.environ.get('SECTION_READY_TIMEOUT', '10'))  # 영역별 최대 대기 시간(초)
+# 해설 탭이 내부적으로 호출하는 요청 URL (설정하면 탭 클릭 대신 직접 요청)
+EXPLANATION_XHR_URL = os.environ.get('EXPLANATION_XHR_URL')
+
+# 말씀/해설 추출, 렌더링, 전송을 체크포인트 단계로 나누어 실행할지 여부 (checkpoint.py)
+CHECKPOINT_ENABLED = os.environ.get('CHECKPOINT_ENABLED', 'true').lower() != 'false'
+
+# 사이트 CSS 중 이메일 HTML에서 쓰는 규칙만 남길지 여부
+CSS_PRUNE_ENABLED = os.environ.get('CSS_PRUNE_ENABLED', 'true').lower() != 'false'
+# create_html_email이 본문 바깥에 두는 요소 (CSS 정리 시 함께 고려)
+EMAIL_LAYOUT_MARKUP = '<html><head></head><body><div class="header"><h1></h1></div><div class="footer"><p></p></div></body></html>'
+
+# 로그 파일 경로
+LOG_PATH = os.environ.get('LOG_PATH', 'bible_crawler.log')
+
+_initialized = False
+
+
+def init(log_path=LOG_PATH):
+    """
+    로그 파일 출력과 한국어 날짜 표기(요일)를 설정합니다.
+
+    모듈을 가져올 때는 아무 설정도 하지 않으므로, 명령줄 진입점(main, backfill 등)에서
+    실행 전에 한 번 호출합니다. 여러 번 호출해도 한 번만 설정됩니다.
+
+    Args:
+        log_path (str | None): 로그 파일 경로 (None이면 파일로 남기지 않음)
+    """
+    global _initialized
+    if _initialized:
+        return
+    if log_path:
+        logger.add(log_path, rotation="1 day", retention="7 days")
+    locale.setlocale(locale.LC_TIME, 'ko_KR.UTF-8')
+    logger.info(f"이메일 수신자 원본: {EMAIL_RECIPIENTS!r}")
+    _initialized = True
 
 # 기존 이메일 전송 함수 (주석 처리)
 """
@@ -65,61 +132,130 @@ def send_email(subject, html_content):
         raise
 """
 
-def send_email_with_app_password(subject, html_content):
+class DeliveryError(RuntimeError):
+    """일부 또는 모든 수신자에게 메일을 보내지 못했을 때 발생하는 예외"""
+    
+    def __init__(self, sent, failed_recipients):
+        """
+        Args:
+            sent (int): 보낸 메일 수
+            failed_recipients (list): 보내지 못한 수신자 목록
+        """
+        super().__init__(f"{len(failed_recipients)}명에게 전송하지 못했습니다: {', '.join(failed_recipients)}")
+        self.sent = sent
+        self.failed_recipients = failed_recipients
+
+def raise_for_delivery_stats(stats):
+    """
+    전송 결과에 보내지 못한 수신자가 있으면 예외를 발생시킵니다.
+    
+    Args:
+        stats (dict): send_messages/send_raw_messages의 전송 결과
+    
+    Raises:
+        DailyLimitReached: 하루 전송 한도에 도달하여 남은 수신자에게 보내지 못한 경우
+        DeliveryError: 일부 수신자에게 보내지 못한 경우
+    """
+    from daily_bible_crawler.rate_limiter import DailyLimitReached
+    
+    if stats.get('limit_reached'):
+        raise DailyLimitReached(f"하루 전송 한도에 도달하여 {stats['sent']}명에게만 보냈습니다. 남은 수신자는 다음 실행에서 보냅니다.")
+    if stats['failed']:
+        raise DeliveryError(stats['sent'], stats['failed_recipients'])
+
+def send_email_with_app_password(subject, html_content, date=None, recipients=None, prepared=None, pool=None):
     """
     Gmail 앱 비밀번호를 사용하여 HTML 첨부 파일 형식의 이메일을 전송하는 함수
     
     Gmail 앱 비밀번호는 Google 계정 보안 설정에서 생성할 수 있습니다.
     https://myaccount.google.com/apppasswords
     
+    수신자마다 새로 연결하고 로그인하는 대신 인증된 SMTP 연결 풀(SMTP_POOL_SIZE개)을
+    만들어 여러 통을 보내며, 수신자는 같은 수의 작업 스레드에 나누어 전송합니다.
+    전송 원장(ledger.py)에 이미 성공으로 기록된 수신자에게는 다시 보내지 않습니다.
+    전송 속도와 하루 전송 수는 SMTP 속도 제한기(rate_limiter.py)로 제한합니다.
+    
     Args:
         subject (str): 이메일 제목
         html_content (str): HTML 형식의 이메일 내용
+        date (datetime, optional): 전송 원장에 기록할 말씀 날짜 (기본값: 오늘)
+        recipients (RecipientSource, optional): 보낼 수신자 원본 (기본값: EMAIL_RECIPIENTS)
+        prepared (PreparedMessage, optional): 미리 인코딩해 둔 메시지 (주어지면 다시 만들지 않음)
+        pool (SmtpConnectionPool, optional): 미리 연결해 둔 연결 풀 (주어지면 닫지 않고 재사용)
+    
+    Raises:
+        DeliveryError: 일부 수신자에게 보내지 못한 경우
+        DailyLimitReached: 하루 전송 한도에 도달하여 남은 수신자에게 보내지 못한 경우
     """
+    from contextlib import nullcontext
+    
+    from daily_bible_crawler.ledger import tracked_delivery
+    from daily_bible_crawler.message_builder import PreparedMessage, smtp_envelopes
+    from daily_bible_crawler.rate_limiter import get_rate_limiter
+    from daily_bible_crawler.smtp_sender import SmtpConnectionPool, send_messages
+    
+    recipients = EMAIL_RECIPIENTS if recipients is None else recipients
     try:
-        if not EMAIL_SENDER or not EMAIL_APP_PASSWORD or not EMAIL_RECIPIENTS:
+        if not EMAIL_SENDER or not EMAIL_APP_PASSWORD or not recipients:
             logger.warning("이메일 전송에 필요한 앱 비밀번호 설정이 없습니다.")
             return
         
-        for recipient in EMAIL_RECIPIENTS:
-            msg = MIMEMultipart()
-            msg['From'] = EMAIL_SENDER
-            msg['To'] = recipient
-            msg['Subject'] = subject
-            
-            # 간단한 본문 텍스트 추가
-            plain_text = "오늘의 성경 말씀과 해설을 첨부파일로 보내드립니다. 첨부된 HTML 파일을 열어 확인해 주세요."
-            msg.attach(MIMEText(plain_text, 'plain', 'utf-8'))
-            
-            # HTML 파일 첨부
-            today_date = datetime.now().strftime('%Y%m%d')
-            html_attachment = MIMEText(html_content, 'html', 'utf-8')
-            html_attachment.add_header('Content-Disposition', 'attachment', 
-                                    filename=f'bible_content_{today_date}.html')
-            msg.attach(html_attachment)
-            
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                # 앱 비밀번호 사용
-                server.login(EMAIL_SENDER, EMAIL_APP_PASSWORD)
-                server.send_message(msg)
+        # 본문과 첨부 파일은 한 번만 인코딩하고 수신자별로 To 헤더만 붙임
+        if prepared is None:
+            with metrics.stage('mime_build'):
+                prepared = PreparedMessage(EMAIL_SENDER, subject, html_content, date=date)
+        metrics.set_value('email_bytes', prepared.size)
+        
+        # 원장에서 이미 받은 수신자를 빼고 보내며, 결과는 모아서 원장에 기록
+        with tracked_delivery(date or datetime.now(), 'smtp', recipients) as (pending, on_result):
+            # EMAIL_BCC_FANOUT이면 수신자를 묶어 숨은 참조로 발송
+            messages = smtp_envelopes(prepared, pending)
             
-            logger.info(f"앱 비밀번호로 이메일 전송 완료: {subject} -> {recipient}")
+            # 앱 비밀번호로 인증한 연결 풀 사용 (미리 연결해 둔 풀은 호출자가 닫음)
+            owned_pool = SmtpConnectionPool(EMAIL_SENDER, EMAIL_APP_PASSWORD) if pool is None else nullcontext(pool)
+            with metrics.stage('send_smtp'), owned_pool as pool:
+                stats = send_messages(pool, messages, on_result=on_result, limiter=get_rate_limiter('smtp'))
+        metrics.add('messages_sent', stats['sent'])
+        metrics.add('messages_failed', stats['failed'])
+        
+        logger.info(f"앱 비밀번호로 이메일 전송 완료: {subject} -> {stats['sent']}명 ({recipients!r})")
+        raise_for_delivery_stats(stats)
         
     except Exception as e:
         logger.error(f"앱 비밀번호 이메일 전송 중 오류 발생: {str(e)}")
         raise
 
-def send_email_with_oauth2(subject, html_content):
+def send_email_with_oauth2(subject, html_content, date=None, recipients=None, prepared=None):
     """
     OAuth2를 사용하여 Gmail API로 HTML 첨부 파일 형식의 이메일을 전송하는 함수
     
     OAuth2 인증은 Google Cloud Console에서 설정한 OAuth 클라이언트 ID와 비밀번호가 필요합니다.
     https://console.cloud.google.com/apis/credentials
     
+    수신자별 요청을 GMAIL_BATCH_SIZE개씩 배치 요청으로 묶어 보내며, 할당량 오류로 실패한
+    메시지만 다시 보냅니다. 전송 원장(ledger.py)에 이미 성공으로 기록된 수신자에게는
+    다시 보내지 않고, 보낸 메시지 ID를 원장에 기록합니다. 전송 속도와 하루 전송 수는
+    Gmail API 속도 제한기(rate_limiter.py)로 제한합니다.
+    
     Args:
         subject (str): 이메일 제목
         html_content (str): HTML 형식의 이메일 내용
+        date (datetime, optional): 전송 원장에 기록할 말씀 날짜 (기본값: 오늘)
+        recipients (RecipientSource, optional): 보낼 수신자 원본 (기본값: EMAIL_RECIPIENTS)
+        prepared (PreparedMessage, optional): 미리 인코딩해 둔 메시지 (주어지면 다시 만들지 않음)
+    
+    Raises:
+        DeliveryError: 일부 수신자에게 보내지 못한 경우
+        DailyLimitReached: 하루 전송 한도에 도달하여 남은 수신자에게 보내지 못한 경우
     """
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from googleapiclient.errors import HttpError
+    from daily_bible_crawler.gmail_sender import get_gmail_service, send_raw_messages
+    from daily_bible_crawler.ledger import tracked_delivery
+    from daily_bible_crawler.message_builder import PreparedMessage, gmail_raw_messages
+    from daily_bible_crawler.rate_limiter import get_rate_limiter
+    
     try:
         # Gmail API 권한 범위 설정
         SCOPES = ['https://www.googleapis.com/auth/gmail.send']
@@ -147,35 +283,25 @@ def send_email_with_oauth2(subject, html_content):
             with open(OAUTH_TOKEN_PATH, 'wb') as token:
                 pickle.dump(creds, token)
                 
-        # Gmail API 서비스 생성
-        service = build('gmail', 'v1', credentials=creds)
+        # 본문과 첨부 파일은 한 번만 base64로 인코딩하고 수신자별 헤더만 따로 인코딩
+        if prepared is None:
+            with metrics.stage('mime_build'):
+                prepared = PreparedMessage(EMAIL_SENDER, subject, html_content, date=date)
+        metrics.set_value('email_bytes', prepared.size)
         
-        for recipient in EMAIL_RECIPIENTS:
-            # 이메일 메시지 생성
-            message = MIMEMultipart()
-            message['to'] = recipient
-            message['from'] = EMAIL_SENDER
-            message['subject'] = subject
-            
-            # 간단한 본문 텍스트 추가
-            plain_text = "오늘의 성경 말씀과 해설을 첨부파일로 보내드립니다. 첨부된 HTML 파일을 열어 확인해 주세요."
-            message.attach(MIMEText(plain_text, 'plain', 'utf-8'))
-            
-            # HTML 파일 첨부
-            today_date = datetime.now().strftime('%Y%m%d')
-            html_attachment = MIMEText(html_content, 'html', 'utf-8')
-            html_attachment.add_header('Content-Disposition', 'attachment', 
-                                    filename=f'bible_content_{today_date}.html')
-            message.attach(html_attachment)
+        recipients = EMAIL_RECIPIENTS if recipients is None else recipients
+        with tracked_delivery(date or datetime.now(), 'gmail', recipients) as (pending, on_result):
+            messages = gmail_raw_messages(prepared, pending)
             
-            # 메시지를 바이트로 변환하고 base64로 인코딩
-            raw = base64.urlsafe_b64encode(message.as_bytes())
-            raw = raw.decode()
-            body = {'raw': raw}
-            
-            # 메시지 전송
-            message_result = (service.users().messages().send(userId='me', body=body).execute())
-            logger.info(f"OAuth2로 이메일 전송 완료: {subject} -> {recipient} (메시지 ID: {message_result['id']})")
+            # Gmail API 서비스(정적 디스커버리 문서, 프로세스 내 재사용)로 배치 전송
+            with metrics.stage('send_gmail'):
+                stats = send_raw_messages(get_gmail_service(creds), messages, on_result=on_result,
+                                          limiter=get_rate_limiter('gmail'))
+        metrics.add('messages_sent', stats['sent'])
+        metrics.add('messages_failed', stats['failed'])
+        for recipient, message_id in stats['message_ids'].items():
+            logger.info(f"OAuth2로 이메일 전송 완료: {subject} -> {recipient} (메시지 ID: {message_id})")
+        raise_for_delivery_stats(stats)
         
     except HttpError as error:
         logger.error(f"OAuth2 이메일 전송 중 API 오류 발생: {error}")
@@ -185,7 +311,7 @@ def send_email_with_oauth2(subject, html_content):
         raise
 
 # 기본 이메일 전송 함수
-def send_email(subject, html_content):
+def send_email(subject, html_content, raise_errors=False, date=None, recipients=None, prepared=None, pool=None):
     """
     이메일 전송 함수의 래퍼 함수입니다.
     
@@ -196,14 +322,20 @@ def send_email(subject, html_content):
     Args:
         subject (str): 이메일 제목
         html_content (str): HTML 형식의 이메일 내용
+        raise_errors (bool): 전송 오류를 로그만 남기지 않고 다시 발생시킬지 여부 (재시도하는 호출자용)
+        date (datetime, optional): 전송 원장에 기록할 말씀 날짜 (기본값: 오늘)
+        recipients (RecipientSource, optional): 보낼 수신자 원본 (기본값: EMAIL_RECIPIENTS)
+        prepared (PreparedMessage, optional): 미리 인코딩해 둔 메시지
+        pool (SmtpConnectionPool, optional): 앱 비밀번호 전송에 사용할 미리 연결해 둔 연결 풀
     """
     try:
         # OAuth2 설정이 있는지 확인
         if os.path.exists(OAUTH_CREDENTIALS_PATH):
-            send_email_with_oauth2(subject, html_content)
+            send_email_with_oauth2(subject, html_content, date, recipients=recipients, prepared=prepared)
         # 앱 비밀번호가 있는지 확인
         elif EMAIL_APP_PASSWORD:
-            send_email_with_app_password(subject, html_content)
+            send_email_with_app_password(subject, html_content, date, recipients=recipients, prepared=prepared,
+                                         pool=pool)
         # 기존 비밀번호가 있는지 확인
         elif EMAIL_PASSWORD:
             logger.warning("일반 비밀번호는 보안 위험이 있습니다. 앱 비밀번호나 OAuth2를 사용하세요.")
@@ -215,259 +347,384 @@ def send_email(subject, html_content):
             logger.info("2. 앱 비밀번호: EMAIL_APP_PASSWORD 환경 변수 설정")
     except Exception as e:
         logger.error(f"이메일 전송 중 오류 발생: {str(e)}")
+        if raise_errors:
+            raise
         
-# @retry(wait=wait_exponential(multiplier=1, min=4, max=10), stop=stop_after_attempt(3))
-def capture_bible_content():
+def build_bible_content(bible_data, explanation_data):
     """
-    웹사이트에서 말씀과 해설 내용을 추출합니다.
+    추출한 말씀과 해설 데이터를 텍스트와 HTML로 구성합니다.
     
-    웹사이트에서 말씀(성경 구절)과 해설 내용을 추출하고 구조화된 형태로 반환합니다.
-    Playwright를 사용하여 웹 페이지를 렌더링하고 JavaScript를 실행하여 내용을 추출합니다.
+    브라우저 경로와 HTTP 경로가 같은 형식의 데이터를 반환하므로 둘 다 이 함수로 렌더링합니다.
+    딕셔너리를 DailyReading으로 바꾼 뒤 render_reading으로 렌더링합니다.
     
+    Args:
+        bible_data (dict): {'header': str, 'verses': [{'number': str, 'text': str}, ...]}
+        explanation_data (dict): {'title': str, 'sections': [{'subtitle': str, 'content': str}, ...], 'info': str}
+        
     Returns:
-        tuple: (텍스트 내용(dict), HTML 내용(str), CSS 내용(str))
+        tuple: (텍스트 내용(dict), HTML 내용(str))
+    """
+    return render_reading(DailyReading.from_dicts(bible_data, explanation_data))
+
+def render_reading(reading):
+    """
+    말씀 모델을 텍스트와 HTML로 렌더링합니다.
+    
+    조각을 목록에 모아 한 번에 이어 붙이므로 구절과 섹션이 많아도 문자열을 반복해서 다시 만들지 않습니다.
+    
+    Args:
+        reading (DailyReading): 말씀 모델
+        
+    Returns:
+        tuple: (텍스트 내용(dict), HTML 내용(str))
             - 텍스트 내용: {'말씀': str, '해설': str} 형태의 딕셔너리
             - HTML 내용: 구조화된 HTML 문자열
-            - CSS 내용: 웹사이트에서 추출한 CSS 스타일
     """
-    logger.info("웹사이트 접속 중...")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(WEBSITE_URL)
-        
+    # 말씀 HTML 구성 (헤더의 줄바꿈은 <br>로)
+    bible_parts = ['<div class="bible-header">',
+                   '<div class="bible-info">', reading.header.replace('\n', '<br>'), '</div>',
+                   '</div>',
+                   '<div class="bible-content">']
+    for verse in reading.verses:
+        bible_parts.append(f'<div class="bible-verse"><span class="verse-number">{verse.number}</span>'
+                           f'<span class="verse-text">{verse.text}</span></div>')
+    bible_parts.append('</div>')
+    
+    # 해설 텍스트와 HTML을 함께 구성
+    explanation_text = [f"{reading.title}\n\n"]
+    explanation_parts = ['<div class="explanation-wrapper">', f'<h2 class="explanation-title">{reading.title}</h2>']
+    for section in reading.sections:
+        explanation_text.append(f"{section.subtitle}\n{section.content}\n\n")
+        # 줄바꿈을 HTML <br> 태그로 변환하여 해설 내용에 반영
+        content_with_breaks = section.content.replace('\n\n', '<br><br>').replace('\n', '<br>')
+        explanation_parts.append(
+            f'<div class="explanation-section"><h3 class="explanation-subtitle">{section.subtitle}</h3>'
+            f'<div class="explanation-content">{content_with_breaks}</div></div>'
+        )
+    explanation_text.append(reading.info)
+    explanation_parts.append(f'<div class="explanation-info">{reading.info}</div></div>')
+    
+    # 텍스트 내용을 딕셔너리로 구성
+    content = {
+        "말씀": f"{reading.header}\n\n" + '\n'.join(f"{verse.number}. {verse.text}" for verse in reading.verses),
+        "해설": ''.join(explanation_text),
+    }
+    
+    # HTML 내용 구성
+    html_content = f'''
+    <div class="bible-wrapper">
+        <h1 class="section-title">말씀</h1>
+        {''.join(bible_parts)}
+    </div>
+    <div class="explanation-container">
+        <h1 class="section-title">해설</h1>
+        {''.join(explanation_parts)}
+    </div>
+    '''
+    
+    return content, html_content
+
+def block_unneeded_requests(route, traffic):
+    """
+    추출에 필요 없는 요청(이미지, 폰트, 미디어, 분석 스크립트)을 차단하는 라우트 핸들러입니다.
+    
+    Args:
+        route (Route): Playwright 라우트
+        traffic (PageTrafficStats): 차단 건수를 기록할 통계 객체
+    """
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_PATTERN.search(request.url):
+        traffic.blocked += 1
+        route.abort()
+    else:
+        route.continue_()
+
+class PageTrafficStats:
+    """페이지에서 발생한 응답 수, 차단한 요청 수, 전송 바이트(Content-Length 기준)를 집계합니다."""
+    
+    def __init__(self):
+        self.responses = 0
+        self.blocked = 0
+        self.bytes = 0
+    
+    def on_response(self, response):
+        self.responses += 1
+        content_length = response.headers.get('content-length', '')
+        if content_length.isdigit():
+            self.bytes += int(content_length)
+
+def collect_bible_data_from_page(page, optimized=PLAYWRIGHT_OPTIMIZED, probe=PLAYWRIGHT_STRUCTURE_PROBE, deadline=None,
+                                 url=WEBSITE_URL):
+    """
+    열린 Playwright 페이지에서 말씀과 해설 데이터를 추출합니다.
+    
+    최적화 모드(기본값)에서는 추출에 필요 없는 요청을 차단하고, 탭 상태마다 한 번의
+    evaluate 호출로 필요한 내용을 모두 가져옵니다. 최적화 모드를 끄면 페이지 내용 확인,
+    구조 분석, CSS, 말씀, 해설을 각각 따로 호출하는 기존 방식으로 추출합니다.
+    
+    networkidle을 기다리지 않고 영역별 준비 조건(구절 줄, 내용이 채워진 해설 섹션)을
+    확인하며, 모든 대기는 캡처 시간 예산 안에서 이루어집니다.
+    
+    Args:
+        page (Page): Playwright 페이지
+        optimized (bool): 요청 차단과 단일 evaluate 추출 사용 여부
+        probe (bool): 최적화 모드에서 진단용 구조 분석을 함께 실행할지 여부
+        deadline (CaptureDeadline, optional): 캡처 시간 예산 (기본값: CAPTURE_TIME_BUDGET)
+        url (str): 접속할 페이지 URL
+    
+    Returns:
+        tuple: (bible_data(dict), explanation_data(dict), CSS 내용(str))
+    """
+    from daily_bible_crawler.readiness import CaptureDeadline, wait_for_section
+    
+    started_at = time.perf_counter()
+    deadline = deadline or CaptureDeadline(CAPTURE_TIME_BUDGET)
+    traffic = PageTrafficStats()
+    page.on("response", traffic.on_response)
+    if optimized:
+        page.route("**/*", lambda route: block_unneeded_requests(route, traffic))
+    
+    with metrics.stage('page_goto'):
+        page.goto(url, wait_until="domcontentloaded", timeout=deadline.timeout_ms())
+    with metrics.stage('wait_bible'):
+        wait_for_section(page, 'bible', deadline, SECTION_READY_TIMEOUT)
+    
+    if optimized:
+        # 말씀, CSS, (선택적으로) 구조 분석을 한 번에 추출
+        logger.info("말씀 영역 텍스트 및 CSS 추출 중...")
+        with metrics.stage('extract_bible'):
+            page_data = page.evaluate(PAGE_EXTRACTION_SCRIPT, probe)
+        if probe:
+            logger.info(f"웹사이트 구조: {page_data.get('structure')}")
+        css_content = page_data.get('css', '')
+        bible_data = page_data.get('bible', {})
+    else:
         # 페이지의 전체 HTML 구조를 로깅
         page_content = page.content()
         logger.info(f"페이지 내용 길이: {len(page_content)}")
         logger.info("페이지 HTML 구조 확인")
         
-        # 웹사이트 구조 분석을 위한 스크립트 실행
-        bible_structure = page.evaluate('''
-            () => {
-                // 말씀 영역 분석
-                const bibleContainer = document.querySelector('#font_uparea02');
-                const bibleInfo = {
-                    exists: !!bibleContainer,
-                    id: bibleContainer ? bibleContainer.id : null,
-                    className: bibleContainer ? bibleContainer.className : null,
-                    children: bibleContainer ? bibleContainer.children.length : 0,
-                    text: bibleContainer ? bibleContainer.innerText.substring(0, 100) + '...' : null
-                };
-                
-                // 해설 영역 분석
-                const explanationContainer = document.querySelector('#font_uparea03');
-                const explanationInfo = {
-                    exists: !!explanationContainer,
-                    id: explanationContainer ? explanationContainer.id : null,
-                    className: explanationContainer ? explanationContainer.className : null,
-                    children: explanationContainer ? explanationContainer.children.length : 0,
-                    text: explanationContainer ? explanationContainer.innerText.substring(0, 100) + '...' : null
-                };
-                
-                return {
-                    bible: bibleInfo,
-                    explanation: explanationInfo
-                };
-            }
-        ''')
-        logger.info(f"웹사이트 구조: {bible_structure}")
-        
-        # CSS 스타일 추출
-        css_content = page.evaluate('''
-            () => {
-                const styleSheets = Array.from(document.styleSheets);
-                return styleSheets.map(sheet => {
-                    try {
-                        return Array.from(sheet.cssRules).map(rule => rule.cssText).join('\\n');
-                    } catch (e) {
-                        return '';
-                    }
-                }).join('\\n');
-            }
-        ''')
-        
-        # 말씀 영역 텍스트 및 HTML 추출
-        logger.info("말씀 영역 텍스트 및 HTML 추출 중...")
-        
-        # 말씀 데이터 추출 - 더 구조화된 방식으로
-        bible_data = page.evaluate('''
-            () => {
-                const bibleDiv = document.querySelector('#font_uparea02');
-                if (!bibleDiv) return { header: '', verses: [] };
-                
-                // 텍스트 내용 가져오기
-                const fullText = bibleDiv.innerText;
-                const lines = fullText.split('\\n').filter(line => line.trim());
-                
-                // 헤더 정보 (날짜, 제목, 본문 등) 추출
-                let headerEndIndex = 0;
-                while (headerEndIndex < lines.length && !lines[headerEndIndex].match(/^\\d+\\s/)) {
-                    headerEndIndex++;
-                }
-                
-                const headerLines = lines.slice(0, headerEndIndex);
-                const header = headerLines.join('\\n');
-                
-                // 성경 구절 추출 (숫자로 시작하는 줄)
-                const versesLines = lines.slice(headerEndIndex);
-                const verses = [];
-                
-                for (let i = 0; i < versesLines.length; i++) {
-                    const line = versesLines[i];
-                    const match = line.match(/^(\\d+)\\s(.+)$/);
-                    
-                    if (match) {
-                        verses.push({
-                            number: match[1],
-                            text: match[2]
-                        });
-                    }
-                }
-                
-                return { header, verses };
-            }
-        ''')
-        
-        logger.info(f"추출된 구절 수: {len(bible_data.get('verses', []))}")
-        
-        # 헤더 정보
-        bible_header = bible_data.get('header', '')
-        # 구절 정보
-        bible_verses = bible_data.get('verses', [])
-        
-        # 말씀 HTML 구성
-        bible_html = '<div class="bible-header">'
-        # 백슬래시 문제 해결을 위해 f-string 대신 format 메서드 사용
-        bible_header_with_breaks = bible_header.replace('\n', '<br>')
-        bible_html += '<div class="bible-info">{0}</div>'.format(bible_header_with_breaks)
-        bible_html += '</div>'
-        
-        bible_html += '<div class="bible-content">'
-        for verse in bible_verses:
-            verse_num = verse.get('number', '')
-            verse_text = verse.get('text', '')
-            bible_html += f'<div class="bible-verse"><span class="verse-number">{verse_num}</span><span class="verse-text">{verse_text}</span></div>'
-        bible_html += '</div>'
-        
-        # 해설 영역 텍스트 및 HTML 추출
-        logger.info("해설 영역 텍스트 및 HTML 추출 중...")
-        
-        # 해설 탭으로 이동 시도
-        try:
-            page.locator("#mainTitle_3").click()
+        with metrics.stage('extract_bible'):
+            # 웹사이트 구조 분석을 위한 스크립트 실행
+            bible_structure = page.evaluate(BIBLE_STRUCTURE_SCRIPT)
+            logger.info(f"웹사이트 구조: {bible_structure}")
+            
+            # CSS 스타일 추출
+            css_content = page.evaluate(CSS_EXTRACTION_SCRIPT)
+            
+            # 말씀 영역 텍스트 및 HTML 추출
+            logger.info("말씀 영역 텍스트 및 HTML 추출 중...")
+            bible_data = page.evaluate(BIBLE_EXTRACTION_SCRIPT)
+    
+    logger.info(f"추출된 구절 수: {len(bible_data.get('verses', []))}")
+    
+    explanation_data = extract_explanation_from_page(page, deadline)
+    log_page_traffic(traffic, started_at)
+    
+    return bible_data, explanation_data, css_content
+
+def extract_explanation_from_page(page, deadline):
+    """
+    말씀 페이지가 열린 상태에서 해설 데이터를 추출합니다.
+    
+    설정된 경우 해설 탭이 호출하는 요청을 직접 보내고, 아니면 탭을 클릭한 뒤 내용이 채워질 때까지 기다립니다.
+    
+    Args:
+        page (Page): 말씀 페이지가 열린 Playwright 페이지
+        deadline (CaptureDeadline): 캡처 시간 예산
+    
+    Returns:
+        dict: {'title': str, 'sections': [{'subtitle': str, 'content': str}, ...], 'info': str}
+    """
+    from daily_bible_crawler.readiness import wait_for_section, fetch_explanation_via_xhr
+    
+    # 해설 영역 텍스트 및 HTML 추출
+    logger.info("해설 영역 텍스트 및 HTML 추출 중...")
+    
+    explanation_data = None
+    if EXPLANATION_XHR_URL:
+        with metrics.stage('explanation_xhr'):
+            explanation_data = fetch_explanation_via_xhr(page, EXPLANATION_XHR_URL, deadline, SECTION_READY_TIMEOUT)
+    
+    if explanation_data is None:
+        with metrics.stage('explanation_tab'):
             try:
-                page.wait_for_load_state("networkidle")
-                logger.info("해설 탭으로 이동 완료")
+                page.locator("#mainTitle_3").click(timeout=deadline.timeout_ms(SECTION_READY_TIMEOUT))
+                if wait_for_section(page, 'explanation', deadline, SECTION_READY_TIMEOUT):
+                    logger.info("해설 탭으로 이동 완료")
             except Exception as e:
-                logger.warning(f"wait_for_load_state 호출 중 오류 발생: {e}, 계속 진행합니다.")
-        except Exception as e:
-            logger.error(f"해설 탭 이동 실패: {e}")
-        
-        explanation_data = page.evaluate('''
-            () => {
-                const explanation = {};
-                
-                // 제목 추출
-                const titleElement = document.querySelector('.b_text');
-                explanation.title = titleElement ? titleElement.innerText : '';
-                
-                // 섹션 추출
-                explanation.sections = [];
-                
-                // 더 정확한 섹션 선택자 찾기
-                const explanationDiv = document.querySelector('#font_uparea03');
-                if (explanationDiv) {
-                    // 메인 설명 텍스트 영역
-                    const mainTextDiv = explanationDiv.querySelector('.body_text');
-                    
-                    // 각 섹션 추출 (g_text는 제목, 다음 형제 요소는 내용)
-                    const sectionElements = explanationDiv.querySelectorAll('.g_text');
-                    
-                    for (let i = 0; i < sectionElements.length; i++) {
-                        const subtitle = sectionElements[i].innerText.trim();
-                        let content = '';
-                        
-                        // 제목 다음 요소에서 실제 내용 찾기
-                        let nextElement = sectionElements[i].nextElementSibling;
-                        while (nextElement && !nextElement.classList.contains('g_text')) {
-                            // text 클래스를 가진 요소만 처리
-                            if (nextElement.classList.contains('text')) {
-                                content = nextElement.innerText.trim();
-                                break;
-                            }
-                            nextElement = nextElement.nextElementSibling;
-                        }
-                        
-                        if (subtitle || content) {
-                            explanation.sections.push({ subtitle, content });
-                        }
-                    }
-                }
-                
-                // 정보 추출
-                const infoElement = document.querySelector('#dailybible_info2');
-                explanation.info = infoElement ? infoElement.innerText : '';
-                
-                return explanation;
-            }
-        ''')
-        
-        logger.info(f"해설 데이터: {explanation_data}")
-        
-        # 추출한 데이터 구조화
-        explanation_title = explanation_data.get('title', '')
-        explanation_sections = explanation_data.get('sections', [])
-        explanation_info = explanation_data.get('info', '')
-        
-        # 해설 텍스트 구성
-        explanation_text = f"{explanation_title}\n\n"
-        for section in explanation_sections:
-            subtitle = section.get('subtitle', '')
-            content = section.get('content', '')
-            explanation_text += f"{subtitle}\n{content}\n\n"
-        explanation_text += f"{explanation_info}"
-        
-        # 해설 HTML 구성
-        explanation_html = '<div class="explanation-wrapper">'
-        explanation_html += f'<h2 class="explanation-title">{explanation_title}</h2>'
-        
-        for section in explanation_sections:
-            subtitle = section.get('subtitle', '')
-            content = section.get('content', '')
-            # 줄바꿈을 HTML <br> 태그로 변환하여 해설 내용에 반영
-            content_with_breaks = content.replace('\n\n', '<br><br>').replace('\n', '<br>')
-            
-            explanation_html += f'<div class="explanation-section">'
-            explanation_html += f'<h3 class="explanation-subtitle">{subtitle}</h3>'
-            explanation_html += f'<div class="explanation-content">{content_with_breaks}</div>'
-            explanation_html += '</div>'
-        
-        explanation_html += f'<div class="explanation-info">{explanation_info}</div>'
-        explanation_html += '</div>'
-        
-        # 텍스트 내용을 딕셔너리로 구성
-        content = {
-            "말씀": f"{bible_header}\n\n" + '\n'.join([f"{verse.get('number')}. {verse.get('text')}" for verse in bible_verses]),
-            "해설": explanation_text
-        }
-        
-        # HTML 내용 구성
-        html_content = f'''
-        <div class="bible-wrapper">
-            <h1 class="section-title">말씀</h1>
-            {bible_html}
-        </div>
-        <div class="explanation-container">
-            <h1 class="section-title">해설</h1>
-            {explanation_html}
-        </div>
-        '''
+                logger.error(f"해설 탭 이동 실패: {e}")
         
+        with metrics.stage('extract_explanation'):
+            explanation_data = page.evaluate(EXPLANATION_EXTRACTION_SCRIPT)
+    
+    logger.info(f"해설 데이터: {explanation_data}")
+    return explanation_data
+
+def log_page_traffic(traffic, started_at):
+    """Playwright 추출 시간과 페이지 트래픽을 로그와 실행 지표로 남깁니다."""
+    logger.info(
+        f"Playwright 추출 완료: {time.perf_counter() - started_at:.2f}초, "
+        f"응답 {traffic.responses}건, 차단 {traffic.blocked}건, 전송 {traffic.bytes}바이트"
+    )
+    metrics.add('bytes_fetched', traffic.bytes)
+    metrics.add('requests_blocked', traffic.blocked)
+    # 브라우저가 떠 있는 동안의 하위 프로세스 메모리 (종료 후에는 보고서의 children 최대 RSS에 반영)
+    if metrics.current() is not None:
+        from daily_bible_crawler.browser_pool import descendant_rss_mb
+        metrics.observe_max('browser_rss_bytes', int(descendant_rss_mb() * 1024 * 1024))
+
+def collect_explanation_from_page(page, optimized=PLAYWRIGHT_OPTIMIZED, deadline=None, url=WEBSITE_URL):
+    """
+    열린 Playwright 페이지에서 해설 데이터만 추출합니다. 말씀은 다시 추출하지 않습니다.
+    
+    말씀은 이미 추출했고 해설만 실패했을 때 다시 시도하는 데 사용합니다.
+    
+    Args:
+        page (Page): Playwright 페이지
+        optimized (bool): 추출에 필요 없는 요청을 차단할지 여부
+        deadline (CaptureDeadline, optional): 캡처 시간 예산 (기본값: CAPTURE_TIME_BUDGET)
+        url (str): 접속할 페이지 URL
+    
+    Returns:
+        dict: 해설 데이터
+    """
+    from daily_bible_crawler.readiness import CaptureDeadline
+    
+    started_at = time.perf_counter()
+    deadline = deadline or CaptureDeadline(CAPTURE_TIME_BUDGET)
+    traffic = PageTrafficStats()
+    page.on("response", traffic.on_response)
+    if optimized:
+        page.route("**/*", lambda route: block_unneeded_requests(route, traffic))
+    
+    with metrics.stage('page_goto'):
+        page.goto(url, wait_until="domcontentloaded", timeout=deadline.timeout_ms())
+    explanation_data = extract_explanation_from_page(page, deadline)
+    log_page_traffic(traffic, started_at)
+    return explanation_data
+
+def collect_bible_data_with_playwright(pool=None, url=WEBSITE_URL, collect=None):
+    """
+    Playwright로 웹 페이지를 렌더링하여 말씀과 해설 데이터를 추출합니다.
+    
+    브라우저 풀이 주어지면 이미 떠 있는 브라우저의 컨텍스트를 빌려 사용하고,
+    없으면 이번 추출만을 위해 브라우저를 띄웠다가 종료합니다.
+    
+    Args:
+        pool (BrowserPool, optional): 재사용할 브라우저 풀
+        url (str): 접속할 페이지 URL
+        collect (callable, optional): 페이지에서 내용을 추출할 함수 (기본값: collect_bible_data_from_page).
+            해설만 추출하려면 collect_explanation_from_page를 넘깁니다.
+    
+    Returns:
+        collect의 반환값. 기본값이면 (bible_data(dict), explanation_data(dict), CSS 내용(str))
+    """
+    from playwright.sync_api import sync_playwright
+    
+    collect = collect or collect_bible_data_from_page
+    logger.info("웹사이트 접속 중...")
+    if pool is not None:
+        with pool.page() as page:
+            return collect(page, url=url)
+    
+    with sync_playwright() as p:
+        with metrics.stage('browser_launch'):
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+        bible_result = collect(page, url=url)
         browser.close()
         
-    return content, html_content, css_content
+    return bible_result
+
+def collect_bible_data(use_http=USE_HTTP_FAST_PATH, pool=None, url=WEBSITE_URL):
+    """
+    웹사이트에서 렌더링 전의 말씀과 해설 데이터를 추출합니다.
+    
+    먼저 브라우저 없이 HTTP로 페이지를 받아 파싱하고, 필요한 영역이 없거나 비어 있으면
+    Playwright로 웹 페이지를 렌더링하여 JavaScript로 내용을 추출합니다.
+    
+    Args:
+        use_http (bool): HTTP 빠른 경로를 먼저 시도할지 여부
+        pool (BrowserPool, optional): Playwright 경로에서 재사용할 브라우저 풀
+        url (str): 접속할 페이지 URL
+    
+    Returns:
+        tuple: (bible_data(dict), explanation_data(dict), CSS 내용(str))
+    """
+    bible_result = None
+    if use_http:
+        from daily_bible_crawler.http_fetcher import fetch_bible_data
+        
+        logger.info("HTTP로 웹사이트 접속 중...")
+        with metrics.stage('http_fetch'):
+            bible_result = fetch_bible_data(url, explanation_url=EXPLANATION_XHR_URL)
+        if bible_result is None:
+            logger.info("HTTP로 내용을 추출하지 못해 Playwright로 다시 시도합니다.")
+    
+    if bible_result is None:
+        bible_result = collect_bible_data_with_playwright(pool=pool, url=url)
+    
+    return bible_result
 
-def create_html_email(content, html_content, css_content):
+def capture_reading(use_http=USE_HTTP_FAST_PATH, pool=None, url=WEBSITE_URL, cache=None, date=None,
+                    force_refresh=False):
+    """
+    웹사이트에서 말씀과 해설을 추출하여 말씀 모델로 반환합니다.
+    
+    캐시가 주어지면 해당 날짜의 저장된 결과를 먼저 사용하고, 새로 추출한 결과는 캐시에 저장합니다.
+    인자는 capture_bible_content와 같습니다.
+    
+    Returns:
+        DailyReading: 말씀 모델 (사이트 CSS 포함)
+    """
+    date = date or datetime.now()
+    bible_result = None
+    if cache is not None and not force_refresh:
+        with metrics.stage('cache_lookup'):
+            bible_result = cache.get(date)
+    
+    if bible_result is None:
+        bible_result = collect_bible_data(use_http=use_http, pool=pool, url=url)
+        if cache is not None:
+            cache.put(date, *bible_result)
+    
+    return DailyReading.from_dicts(*bible_result, date=date)
+
+# @retry(wait=wait_exponential(multiplier=1, min=4, max=10), stop=stop_after_attempt(3))
+def capture_bible_content(use_http=USE_HTTP_FAST_PATH, pool=None, url=WEBSITE_URL, cache=None, date=None,
+                          force_refresh=False):
+    """
+    웹사이트에서 말씀과 해설 내용을 추출합니다.
+    
+    웹사이트에서 말씀(성경 구절)과 해설 내용을 추출하고 구조화된 형태로 반환합니다.
+    먼저 브라우저 없이 HTTP로 페이지를 받아 파싱하고, 필요한 영역이 없거나 비어 있으면
+    Playwright로 웹 페이지를 렌더링하여 JavaScript로 내용을 추출합니다.
+    캐시가 주어지면 해당 날짜의 저장된 결과를 먼저 사용합니다.
+    
+    Args:
+        use_http (bool): HTTP 빠른 경로를 먼저 시도할지 여부
+        pool (BrowserPool, optional): Playwright 경로에서 재사용할 브라우저 풀.
+            재시도나 여러 번의 캡처에서 브라우저 실행 비용을 아낄 수 있습니다.
+        url (str): 접속할 페이지 URL (기본값: 오늘의 말씀 페이지)
+        cache (ContentCache, optional): 날짜별 크롤링 결과 캐시
+        date (datetime, optional): 캐시 키로 사용할 말씀 날짜 (기본값: 오늘)
+        force_refresh (bool): 캐시를 무시하고 다시 크롤링할지 여부 (결과는 캐시에 저장)
+    
+    Returns:
+        tuple: (텍스트 내용(dict), HTML 내용(str), CSS 내용(str))
+            - 텍스트 내용: {'말씀': str, '해설': str} 형태의 딕셔너리
+            - HTML 내용: 구조화된 HTML 문자열
+            - CSS 내용: 웹사이트에서 추출한 CSS 스타일
+    """
+    reading = capture_reading(use_http=use_http, pool=pool, url=url, cache=cache, date=date,
+                              force_refresh=force_refresh)
+    with metrics.stage('build_content'):
+        content, html_content = render_reading(reading)
+    
+    return content, html_content, reading.css
+
+def create_html_email(content, html_content, css_content, date=None):
     """
     HTML 형식의 이메일 내용을 생성합니다.
     
@@ -477,11 +734,16 @@ def create_html_email(content, html_content, css_content):
         content (dict): {'말씀': str, '해설': str} 형태의 텍스트 내용
         html_content (str): 구조화된 HTML 콘텐츠
         css_content (str): 적용할 CSS 스타일
+        date (datetime, optional): 말씀 날짜 (기본값: 오늘)
         
     Returns:
         str: 완성된 HTML 이메일 내용
     """
-    today_date = datetime.now().strftime('%Y년 %m월 %d일 (%A)')
+    today_date = (date or datetime.now()).strftime('%Y년 %m월 %d일 (%A)')
+
+    # 사용하지 않는 사이트 CSS 규칙 제거 (결과는 스타일시트 해시로 캐시)
+    if CSS_PRUNE_ENABLED:
+        css_content = prune_css_cached(css_content, EMAIL_LAYOUT_MARKUP + html_content)
     
     # 기본 HTML 구조
     email_html = f"""
@@ -606,76 +868,273 @@ def create_html_email(content, html_content, css_content):
     
     return email_html
 
-def main():
+def archive_file_path(date, extension, output_dir=TEXTS_DIR):
     """
-    프로그램의 메인 함수입니다.
+    날짜별 저장 파일 경로를 반환합니다.
     
-    1. 웹사이트에서 성경 말씀과 해설을 추출합니다.
-    2. 텍스트 파일로 저장합니다.
-    3. HTML 파일로 저장합니다.
-    4. 이메일 설정이 있는 경우 이메일을 전송합니다.
+    Args:
+        date (datetime): 말씀 날짜
+        extension (str): 'txt' 또는 'html'
+        output_dir (str): 저장 디렉토리
+        
+    Returns:
+        str: texts/bible_content_YYYYMMDD.<extension> 형태의 경로
+    """
+    return os.path.join(output_dir, f"bible_content_{date.strftime('%Y%m%d')}.{extension}")
+
+def write_file_atomic(file_path, text):
+    """
+    임시 파일에 쓴 뒤 이름을 바꿔 저장합니다.
     
-    오류가 발생하면 로깅 후 예외를 발생시킵니다.
+    중간에 중단되더라도 반쯤 쓰인 파일이 남지 않으므로, 파일 존재 여부로
+    완료 여부를 판단하는 백필 재시작 등에서 안전하게 사용할 수 있습니다.
+    
+    Args:
+        file_path (str): 저장할 파일 경로
+        text (str): 저장할 내용
     """
-    try:
-        logger.info("프로그램 시작")
-        
-        # 텍스트 및 HTML 내용 추출
-        content, html_content, css_content = capture_bible_content()
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, file_path)
+
+def format_text_content(content):
+    """
+    텍스트 내용을 텍스트 파일 형식으로 만듭니다.
+    
+    Args:
+        content (dict | str): {'말씀': str, '해설': str} 형태의 텍스트 내용
         
-        # 디렉토리 생성 (존재하지 않는 경우)
-        os.makedirs("texts", exist_ok=True)
+    Returns:
+        str: '===== 말씀 =====' 등 제목이 붙은 텍스트
+    """
+    if isinstance(content, dict):
+        return ''.join(f"===== {description} =====\n\n{body}\n\n" for description, body in content.items())
+    # content가 문자열인 경우 그대로 저장
+    return str(content)
+
+def save_text_file(content, date=None, output_dir=TEXTS_DIR):
+    """
+    추출한 텍스트 내용을 날짜별 텍스트 파일로 저장합니다.
+    
+    Args:
+        content (dict | str): {'말씀': str, '해설': str} 형태의 텍스트 내용
+        date (datetime, optional): 말씀 날짜 (기본값: 오늘)
+        output_dir (str): 저장 디렉토리
         
-        # 날짜 형식의 파일 이름 생성
-        today_date = datetime.now().strftime('%Y%m%d')
-        file_path = os.path.join("texts", f"bible_content_{today_date}.txt")
+    Returns:
+        str: 저장된 파일 경로
+    """
+    file_path = archive_file_path(date or datetime.now(), "txt", output_dir)
+    try:
+        write_file_atomic(file_path, format_text_content(content))
+        logger.info(f"내용이 {file_path} 파일에 저장되었습니다.")
+    except Exception as e:
+        logger.error(f"텍스트 파일 저장 중 오류 발생: {str(e)}")
+        raise
+    return file_path
+
+def save_html_file(html_email, date=None, output_dir=TEXTS_DIR):
+    """
+    완성된 HTML 내용을 날짜별 HTML 파일로 저장합니다.
+    
+    Args:
+        html_email (str): create_html_email로 생성한 HTML
+        date (datetime, optional): 말씀 날짜 (기본값: 오늘)
+        output_dir (str): 저장 디렉토리
         
-        # content 타입 로깅
-        logger.info(f"Content type: {type(content)}")
+    Returns:
+        str: 저장된 파일 경로
+    """
+    html_file_path = archive_file_path(date or datetime.now(), "html", output_dir)
+    try:
+        write_file_atomic(html_file_path, html_email)
+        logger.info(f"HTML 내용이 {html_file_path} 파일에 저장되었습니다.")
+    except Exception as e:
+        logger.error(f"HTML 파일 저장 중 오류 발생: {str(e)}")
+        raise
+    return html_file_path
+
+def save_reading(reading, date=None, output_dir=TEXTS_DIR):
+    """
+    말씀을 날짜별로 압축 보관소에 저장합니다. (ARCHIVE_BACKEND가 'store'일 때 파일 저장 대신 사용)
+    
+    텍스트와 HTML은 저장하지 않고 필요할 때 보관소에서 다시 만듭니다. (archive.py 참고)
+    
+    Args:
+        reading (DailyReading): 말씀 모델
+        date (datetime, optional): 말씀 날짜 (기본값: 오늘)
+        output_dir (str): 보관소 디렉토리
         
-        # 텍스트 파일로 저장
+    Returns:
+        str: 보관소 파일 경로
+    """
+    from daily_bible_crawler.archive import ArchiveStore
+    
+    date = date or datetime.now()
+    try:
+        store = ArchiveStore(output_dir)
+        store.put(date, reading)
+        logger.info(f"말씀이 {store.path}에 저장되었습니다. ({date.strftime('%Y-%m-%d')})")
+    except Exception as e:
+        logger.error(f"보관소 저장 중 오류 발생: {str(e)}")
+        raise
+    return store.path
+
+def update_indexes(reading, date=None):
+    """
+    저장한 말씀을 검색 색인(search.py)과 본문 범위 색인(passages.py)에 추가합니다.
+    (SEARCH_ENABLED, PASSAGE_INDEX_ENABLED로 각각 끌 수 있음)
+    
+    색인은 보관소에서 다시 만들 수 있으므로 실패해도 예외를 올리지 않고 로그만 남깁니다.
+    
+    Args:
+        reading (DailyReading): 말씀 모델
+        date (datetime, optional): 말씀 날짜 (기본값: 오늘)
+    """
+    from daily_bible_crawler.passages import PASSAGE_INDEX_ENABLED, PassageIndex
+    from daily_bible_crawler.search import SEARCH_ENABLED, SearchIndex
+    
+    date = date or datetime.now()
+    for name, enabled, index_class in (('검색', SEARCH_ENABLED, SearchIndex),
+                                       ('본문 범위', PASSAGE_INDEX_ENABLED, PassageIndex)):
+        if not enabled:
+            continue
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                if isinstance(content, dict):
-                    for description, text in content.items():
-                        f.write(f"===== {description} =====\n\n{text}\n\n")
-                else:
-                    # content가 문자열인 경우 그대로 저장
-                    f.write(str(content))
-            logger.info(f"내용이 {file_path} 파일에 저장되었습니다.")
+            index_class().add_reading(reading, date)
         except Exception as e:
-            logger.error(f"텍스트 파일 저장 중 오류 발생: {str(e)}")
-            raise
-        
-        # HTML 이메일 내용 생성
-        html_email = create_html_email(content, html_content, css_content)
-        
-        # HTML 파일로 저장
-        html_file_path = os.path.join("texts", f"bible_content_{today_date}.html")
+            logger.error(f"{name} 색인 갱신 중 오류 발생 (sync 명령으로 다시 만들 수 있음): {str(e)}")
+
+def main(force_refresh=CACHE_FORCE_REFRESH):
+    """
+    프로그램의 메인 함수입니다.
+    
+    1. 웹사이트에서 성경 말씀과 해설을 추출합니다. (캐시에 오늘 결과가 있으면 재사용)
+       마지막으로 처리한 말씀과 같으면 새 말씀이 올라올 때까지 기다리거나 건너뜁니다.
+    2. 텍스트 파일로 저장합니다.
+    3. HTML 파일로 저장합니다.
+    4. 이메일 설정이 있는 경우 이메일을 전송합니다.
+    
+    CHECKPOINT_ENABLED가 켜져 있으면 각 단계를 체크포인트로 저장하며 실행하므로, 다시 실행하면
+    실패한 단계부터 이어서 진행합니다. (checkpoint.run_stages 참고)
+    
+    Playwright로 캡처해야 하면 브라우저 풀(browser_pool.shared_browser_pool) 하나를 실행 내내
+    재사용하므로, 변경 감지 재확인이나 단계 재시도마다 브라우저를 새로 띄우지 않습니다.
+    
+    단계별 소요 시간과 지표는 실행이 끝나면 JSON 보고서와 Prometheus textfile로 저장합니다.
+    오류가 발생하면 로깅 후 예외를 발생시킵니다.
+    
+    Args:
+        force_refresh (bool): 캐시를 무시하고 다시 크롤링할지 여부
+    """
+    from daily_bible_crawler.browser_pool import shared_browser_pool
+    
+    # 샤드별로 보고서 파일과 Prometheus 레이블을 나누어 샤드마다 전송 지표를 남김
+    with metrics.RunMetrics.from_env(labels=EMAIL_RECIPIENTS.shard_labels()), \
+            shared_browser_pool() as browser_pool:
         try:
-            with open(html_file_path, "w", encoding="utf-8") as f:
-                f.write(html_email)
-            logger.info(f"HTML 내용이 {html_file_path} 파일에 저장되었습니다.")
+            logger.info("프로그램 시작")
+            cache = ContentCache() if CACHE_ENABLED else None
+            
+            # 새 말씀이 올라왔는지 먼저 확인하고, 마지막으로 처리한 말씀과 같으면 건너뜀
+            # (--refresh이면 확인하지 않고 다시 처리)
+            detector = reading = None
+            if CHANGE_DETECTION_ENABLED and not force_refresh:
+                from daily_bible_crawler.change_detection import ChangeDetector
+                
+                detector = ChangeDetector()
+                with metrics.stage('capture'):
+                    reading = detector.wait_for_new_reading(
+                        lambda refresh: capture_reading(pool=browser_pool, cache=cache, force_refresh=refresh)
+                    )
+                if reading is None:
+                    metrics.set_value('content_unchanged', 1)
+                    logger.info("새 말씀이 없어 렌더링, 저장, 전송을 건너뛰고 종료합니다.")
+                    return
+            
+            if CHECKPOINT_ENABLED:
+                from daily_bible_crawler.checkpoint import prune_checkpoints, run_stages
+                
+                # 단계별로 실행하고, 이전 실행에서 성공한 단계는 건너뜀
+                # (변경 감지에서 추출한 말씀은 캐시에 있으므로 다시 크롤링하지 않음)
+                results = run_stages(force_refresh=force_refresh, cache=cache, pool=browser_pool)
+                if cache is not None:
+                    cache.log_stats()
+                    metrics.set_value('cache_hits', cache.hits)
+                prune_checkpoints()
+                # 전송 단계가 실패하면 run_stages는 로그만 남기고 결과에 'delivery'를 넣지 않음
+                # (기록하지 않아야 다시 실행할 때 건너뛰지 않고 전송 단계부터 이어서 진행)
+                if detector is not None and 'delivery' in results:
+                    detector.record(reading)
+                logger.info("프로그램 정상 종료")
+                return
+            
+            # 텍스트 및 HTML 내용 추출
+            if reading is None:
+                with metrics.stage('capture'):
+                    reading = capture_reading(pool=browser_pool, cache=cache, force_refresh=force_refresh)
+            if cache is not None:
+                cache.log_stats()
+                metrics.set_value('cache_hits', cache.hits)
+            with metrics.stage('build_content'):
+                content, html_content = render_reading(reading)
+            
+            # content 타입 로깅
+            logger.info(f"Content type: {type(content)}")
+            
+            # 보관소에 저장하거나, 'files'이면 텍스트 파일로 저장
+            if ARCHIVE_BACKEND == 'store':
+                with metrics.stage('save_archive'):
+                    save_reading(reading)
+            else:
+                with metrics.stage('save_text'):
+                    save_text_file(content)
+            
+            # HTML 이메일 내용 생성
+            with metrics.stage('render'):
+                html_email = create_html_email(content, html_content, reading.css)
+            metrics.set_value('html_bytes', len(html_email.encode('utf-8')))
+            
+            # HTML 파일로 저장 (보관소는 필요할 때 HTML을 다시 만듦)
+            if ARCHIVE_BACKEND != 'store':
+                with metrics.stage('save_html'):
+                    save_html_file(html_email)
+            with metrics.stage('update_indexes'):
+                update_indexes(reading)
+            
+            # 이메일 전송 (환경 변수가 설정된 경우에만 실행)
+            # if EMAIL_SENDER and EMAIL_PASSWORD and EMAIL_RECIPIENT:
+            email_subject = f"[매일성경] 오늘의 말씀 - {datetime.now().strftime('%Y-%m-%d (%A)')}"
+            try:
+                with metrics.stage('send'):
+                    send_email(email_subject, html_email, raise_errors=True)
+            except Exception as e:
+                logger.error(f"이메일 전송 중 오류 발생: {str(e)}")
+                # 이메일 전송 실패는 프로그램을 중단시키지 않음 (다시 실행하면 건너뛰지 않도록 기록하지 않음)
+            else:
+                if detector is not None:
+                    detector.record(reading)
+            # else:
+            # #     logger.warning("이메일 설정이 완료되지 않아 이메일 전송을 건너뜁니다.")
+            
+            logger.info("프로그램 정상 종료")
+            
         except Exception as e:
-            logger.error(f"HTML 파일 저장 중 오류 발생: {str(e)}")
+            logger.error(f"프로그램 실행 중 오류 발생: {str(e)}")
             raise
-        
-        # 이메일 전송 (환경 변수가 설정된 경우에만 실행)
-        # if EMAIL_SENDER and EMAIL_PASSWORD and EMAIL_RECIPIENT:
-        email_subject = f"[매일성경] 오늘의 말씀 - {datetime.now().strftime('%Y-%m-%d (%A)')}"
-        try:
-            send_email(email_subject, html_email)
-        except Exception as e:
-            logger.error(f"이메일 전송 중 오류 발생: {str(e)}")
-            # 이메일 전송 실패는 프로그램을 중단시키지 않음
-        # else:
-        # #     logger.warning("이메일 설정이 완료되지 않아 이메일 전송을 건너뜁니다.")
-        
-        logger.info("프로그램 정상 종료")
-        
-    except Exception as e:
-        logger.error(f"프로그램 실행 중 오류 발생: {str(e)}")
-        raise
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="매일성경 말씀과 해설을 크롤링하여 저장하고 이메일로 전송합니다.")
+    parser.add_argument('--refresh', action='store_true', default=CACHE_FORCE_REFRESH,
+                        help="캐시를 무시하고 웹사이트를 다시 크롤링")
+    add_shard_arguments(parser)
+    args = parser.parse_args()
+    # python -m으로 실행하면 이 파일은 __main__ 모듈이 되어, checkpoint 등이 가져오는
+    # daily_bible_crawler.main과 전역 변수(EMAIL_RECIPIENTS 등)가 따로 생김.
+    # 샤드 설정이 모든 전송 경로에 적용되도록 패키지 모듈을 통해 실행함
+    from daily_bible_crawler import main as app
+    
+    app.EMAIL_RECIPIENTS.select_shard(args.shard_index, args.shard_count)
+    app.init()
+    app.main(force_refresh=args.refresh)
\ No newline at end of file
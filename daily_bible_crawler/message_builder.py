@@ -0,0 +1,210 @@
+"""
+이메일 메시지를 한 번만 만들어 여러 수신자에게 재사용하는 모듈입니다.
+
+본문 텍스트와 큰 HTML 첨부 파일을 포함한 MIME 메시지를 한 번만 인코딩해 두고,
+수신자마다 To 헤더만 앞에 붙여 보냅니다. Gmail API용 base64url 인코딩도 본문은
+한 번만 계산하고 수신자별 헤더만 따로 인코딩해 이어 붙입니다.
+
+base64는 3바이트 단위로 인코딩되므로, 수신자별 헤더의 길이를 3의 배수로 맞추면
+(헤더 줄 끝에 공백을 덧붙임) base64(헤더 + 본문) == base64(헤더) + base64(본문)이
+성립합니다. 헤더 값 끝의 공백은 메일 클라이언트가 무시합니다.
+"""
+import base64
+import os
+from datetime import datetime
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.policy import compat32
+from email.utils import formatdate
+
+# 수신자 목록을 한 통의 메일로 숨은 참조(BCC) 발송할지 여부 (허용된 목록에만 사용)
+EMAIL_BCC_FANOUT = os.environ.get('EMAIL_BCC_FANOUT', 'false').lower() == 'true'
+# BCC 발송 시 한 통에 담을 최대 수신자 수 (Gmail은 메일당 수신자 수를 제한함)
+EMAIL_BCC_CHUNK_SIZE = int(os.environ.get('EMAIL_BCC_CHUNK_SIZE', '100'))
+
+# 기존 메시지와 같은 헤더 인코딩(compat32)에 SMTP용 CRLF 줄바꿈만 적용
+SMTP_POLICY = compat32.clone(linesep='\r\n')
+
+PLAIN_TEXT = "오늘의 성경 말씀과 해설을 첨부파일로 보내드립니다. 첨부된 HTML 파일을 열어 확인해 주세요."
+
+
+def _header_value(value):
+    # ASCII가 아닌 값은 RFC 2047 형식으로 인코딩
+    try:
+        value.encode('ascii')
+        return value
+    except UnicodeEncodeError:
+        return Header(value, 'utf-8').encode()
+
+
+def chunked(items, size):
+    """
+    반복 가능한 객체를 size개씩 나눈 리스트로 생성합니다.
+
+    Args:
+        items (iterable): 나눌 항목
+        size (int): 묶음 크기
+
+    Yields:
+        list: 최대 size개의 항목
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class PreparedMessage:
+    """
+    수신자 헤더를 제외한 부분을 미리 인코딩해 둔 메시지입니다.
+
+    사용 예:
+        prepared = PreparedMessage(EMAIL_SENDER, subject, html_email)
+        for recipient in recipients:
+            server.sendmail(EMAIL_SENDER, [recipient], prepared.as_bytes(recipient))
+    """
+
+    def __init__(self, sender, subject, html_content, date=None, plain_text=PLAIN_TEXT, sent_at=None):
+        """
+        Args:
+            sender (str): 발신자 주소
+            subject (str): 이메일 제목
+            html_content (str): 첨부할 HTML 내용
+            date (datetime, optional): 첨부 파일 이름에 사용할 날짜 (기본값: 오늘)
+            plain_text (str): 본문 텍스트
+            sent_at (datetime, optional): Date 헤더에 쓸 시각 (기본값: 지금, 미리 만들어 둘 때는 전송 예정 시각)
+        """
+        self.sender = sender
+        self.subject = subject
+
+        msg = MIMEMultipart()
+        msg['From'] = sender
+        msg['Subject'] = subject
+        msg['Date'] = formatdate(sent_at.timestamp() if sent_at else None, localtime=True)
+
+        # 간단한 본문 텍스트 추가
+        msg.attach(MIMEText(plain_text, 'plain', 'utf-8'))
+
+        # HTML 파일 첨부
+        attachment_date = (date or datetime.now()).strftime('%Y%m%d')
+        html_attachment = MIMEText(html_content, 'html', 'utf-8')
+        html_attachment.add_header('Content-Disposition', 'attachment',
+                                   filename=f'bible_content_{attachment_date}.html')
+        msg.attach(html_attachment)
+
+        # 수신자와 무관한 헤더와 본문을 한 번만 인코딩 (SMTP용 CRLF 줄바꿈)
+        self.template = msg.as_bytes(policy=SMTP_POLICY)
+        self._template_b64 = None
+
+    @property
+    def size(self):
+        """수신자 헤더를 제외한 메시지 크기(바이트)"""
+        return len(self.template)
+
+    def _prefix(self, headers, pad_to=1):
+        lines = [f"{name}: {_header_value(value)}" for name, value in headers]
+        prefix = ('\r\n'.join(lines)).encode('ascii')
+        # 마지막 헤더 줄 끝에 공백을 붙여 길이를 pad_to의 배수로 맞춤
+        prefix += b' ' * (-(len(prefix) + 2) % pad_to)
+        return prefix + b'\r\n'
+
+    def as_bytes(self, recipient):
+        """
+        수신자 한 명에게 보낼 메시지를 반환합니다.
+
+        Args:
+            recipient (str): 수신자 주소
+
+        Returns:
+            bytes: SMTP로 보낼 메시지
+        """
+        return self._prefix([('To', recipient)]) + self.template
+
+    def as_bcc_bytes(self):
+        """
+        숨은 참조 발송용 메시지를 반환합니다. To는 발신자이며 실제 수신자는 SMTP 봉투에만 담습니다.
+
+        Returns:
+            bytes: SMTP로 보낼 메시지
+        """
+        return self._prefix([('To', self.sender)]) + self.template
+
+    def _raw(self, headers):
+        if self._template_b64 is None:
+            self._template_b64 = base64.urlsafe_b64encode(self.template).decode('ascii')
+        return base64.urlsafe_b64encode(self._prefix(headers, pad_to=3)).decode('ascii') + self._template_b64
+
+    def as_raw(self, recipient):
+        """
+        Gmail API에 보낼 base64url 인코딩 메시지를 반환합니다. 본문은 한 번만 인코딩됩니다.
+
+        Args:
+            recipient (str): 수신자 주소
+
+        Returns:
+            str: messages().send()의 raw 값
+        """
+        return self._raw([('To', recipient)])
+
+    def as_bcc_raw(self, recipients):
+        """
+        Gmail API로 숨은 참조 발송할 base64url 인코딩 메시지를 반환합니다.
+
+        Gmail은 Bcc 헤더의 주소로 메일을 보낸 뒤 헤더를 제거하므로 수신자끼리 주소가 보이지 않습니다.
+
+        Args:
+            recipients (list): 숨은 참조 수신자 목록
+
+        Returns:
+            str: messages().send()의 raw 값
+        """
+        # 한 줄이 너무 길어지지 않도록 주소마다 줄을 접음
+        return self._raw([('To', self.sender), ('Bcc', ',\r\n '.join(recipients))])
+
+
+def smtp_envelopes(prepared, recipients, bcc=EMAIL_BCC_FANOUT, chunk_size=EMAIL_BCC_CHUNK_SIZE):
+    """
+    SMTP로 보낼 (표시 이름, (봉투 발신자, 봉투 수신자 목록, 메시지)) 튜플을 생성합니다.
+
+    Args:
+        prepared (PreparedMessage): 미리 인코딩한 메시지
+        recipients (iterable): 수신자 주소
+        bcc (bool): 수신자를 묶어 숨은 참조로 보낼지 여부
+        chunk_size (int): 숨은 참조 발송 시 한 통에 담을 최대 수신자 수
+
+    Yields:
+        tuple: send_messages에 넘길 (수신자, 메시지) 튜플
+    """
+    if bcc:
+        # 수신자를 묶어 한 통씩 숨은 참조로 발송 (수신자는 SMTP 봉투에만 포함)
+        for chunk in chunked(recipients, chunk_size):
+            yield ', '.join(chunk), (prepared.sender, chunk, prepared.as_bcc_bytes())
+    else:
+        for recipient in recipients:
+            yield recipient, (prepared.sender, [recipient], prepared.as_bytes(recipient))
+
+
+def gmail_raw_messages(prepared, recipients, bcc=EMAIL_BCC_FANOUT, chunk_size=EMAIL_BCC_CHUNK_SIZE):
+    """
+    Gmail API로 보낼 (표시 이름, raw) 튜플을 생성합니다.
+
+    Args:
+        prepared (PreparedMessage): 미리 인코딩한 메시지
+        recipients (iterable): 수신자 주소
+        bcc (bool): 수신자를 묶어 숨은 참조로 보낼지 여부
+        chunk_size (int): 숨은 참조 발송 시 한 통에 담을 최대 수신자 수
+
+    Yields:
+        tuple: send_raw_messages에 넘길 (수신자, raw) 튜플
+    """
+    if bcc:
+        for chunk in chunked(recipients, chunk_size):
+            yield ', '.join(chunk), prepared.as_bcc_raw(chunk)
+    else:
+        for recipient in recipients:
+            yield recipient, prepared.as_raw(recipient)
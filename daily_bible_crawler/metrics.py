@@ -0,0 +1,271 @@
+"""
+크롤링-렌더링-전송 과정의 단계별 소요 시간과 지표를 기록하는 모듈입니다.
+
+실행 한 번을 RunMetrics로 감싸면, 그 안에서 호출되는 stage()와 add()가 현재 실행의
+지표에 기록됩니다. 실행 중인 RunMetrics가 없으면 아무것도 기록하지 않으므로 각 함수를
+단독으로 호출하거나 테스트할 때도 그대로 사용할 수 있습니다.
+
+실행이 끝나면 다음 파일을 씁니다.
+- JSON 실행 보고서 (마지막 실행) 및 실행 기록(JSON Lines, 실행마다 한 줄)
+- Prometheus node_exporter textfile collector 형식 파일
+"""
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from loguru import logger
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() != 'false'
+METRICS_REPORT_PATH = os.environ.get('METRICS_REPORT_PATH', os.path.join('metrics', 'run_report.json'))
+METRICS_HISTORY_PATH = os.environ.get('METRICS_HISTORY_PATH', os.path.join('metrics', 'run_history.jsonl'))
+METRICS_TEXTFILE_PATH = os.environ.get('METRICS_TEXTFILE_PATH', os.path.join('metrics', 'daily_bible_crawler.prom'))
+
+METRIC_PREFIX = 'daily_bible_crawler'
+
+_current = ContextVar('daily_bible_crawler_run_metrics', default=None)
+
+
+def _peak_rss_bytes(who):
+    # ru_maxrss 단위는 리눅스에서 KB, macOS에서 바이트
+    peak = resource.getrusage(who).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _with_labels(path, labels):
+    # 샤드처럼 레이블이 있는 실행은 서로 덮어쓰지 않도록 파일 이름에 레이블을 붙임
+    if not path or not labels:
+        return path
+    root, extension = os.path.splitext(path)
+    return root + ''.join(f".{name}{value}" for name, value in sorted(labels.items())) + extension
+
+
+def _label_text(labels, **extra):
+    items = {**(labels or {}), **extra}
+    if not items:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in sorted(items.items())) + '}'
+
+
+def _write_atomic(path, text, append=False):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if append:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(text)
+        return
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class RunMetrics:
+    """
+    실행 한 번의 단계별 소요 시간(초)과 카운터를 모읍니다.
+
+    사용 예:
+        with RunMetrics() as run_metrics:
+            with stage('render'):
+                html_email = create_html_email(...)
+            add('email_bytes', len(html_email))
+    """
+
+    def __init__(self, report_path=None, history_path=None, textfile_path=None, labels=None):
+        """
+        Args:
+            report_path (str, optional): 종료 시 JSON 보고서를 쓸 경로
+            history_path (str, optional): 종료 시 실행 기록을 한 줄 추가할 JSON Lines 경로
+            textfile_path (str, optional): 종료 시 Prometheus textfile을 쓸 경로
+            labels (dict, optional): 보고서와 모든 Prometheus 지표에 붙일 레이블 (예: {'shard': '0'})
+        """
+        self.report_path = report_path
+        self.history_path = history_path
+        self.textfile_path = textfile_path
+        self.labels = dict(labels or {})
+        self.stages = {}
+        self.counters = {}
+        self.status = 'running'
+        self.started_at = datetime.now()
+        self.duration = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._token = None
+
+    @classmethod
+    def from_env(cls, labels=None):
+        """
+        환경 변수 설정에 따라 보고서를 쓰거나 쓰지 않는 RunMetrics를 만듭니다.
+
+        레이블이 있으면 보고서와 textfile 이름에 레이블을 붙여(예: run_report.shard0.json)
+        여러 샤드가 같은 디렉토리에 써도 서로 덮어쓰지 않습니다. 실행 기록은 한 파일에 함께 추가합니다.
+
+        Args:
+            labels (dict, optional): 실행 레이블
+        """
+        if not METRICS_ENABLED:
+            return cls(labels=labels)
+        return cls(
+            _with_labels(METRICS_REPORT_PATH, labels),
+            METRICS_HISTORY_PATH,
+            _with_labels(METRICS_TEXTFILE_PATH, labels),
+            labels=labels,
+        )
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current.reset(self._token)
+        self.status = 'failed' if exc_type else 'success'
+        self.duration = time.perf_counter() - self._started
+        self.write()
+
+    @contextmanager
+    def stage(self, name):
+        """
+        블록의 소요 시간을 name 단계에 더합니다. 같은 단계가 여러 번 실행되면 합산됩니다.
+
+        Args:
+            name (str): 단계 이름
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def add(self, name, value=1):
+        """카운터 name에 value를 더합니다."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        """카운터 name을 value로 설정합니다."""
+        with self._lock:
+            self.counters[name] = value
+
+    def observe_max(self, name, value):
+        """카운터 name을 지금까지의 값과 value 중 큰 값으로 설정합니다."""
+        with self._lock:
+            self.counters[name] = max(self.counters.get(name, value), value)
+
+    def report(self):
+        """
+        실행 보고서를 반환합니다.
+
+        Returns:
+            dict: 시작 시각, 상태, 전체 소요 시간, 단계별 시간, 카운터, 최대 RSS
+        """
+        duration = self.duration if self.duration is not None else time.perf_counter() - self._started
+        with self._lock:
+            stages = {name: round(seconds, 6) for name, seconds in self.stages.items()}
+            counters = dict(self.counters)
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'labels': dict(self.labels),
+            'status': self.status,
+            'duration_seconds': round(duration, 6),
+            'stages': stages,
+            'counters': counters,
+            'peak_rss_bytes': _peak_rss_bytes(resource.RUSAGE_SELF),
+            'peak_children_rss_bytes': _peak_rss_bytes(resource.RUSAGE_CHILDREN),
+        }
+
+    def to_prometheus(self, report=None):
+        """
+        보고서를 Prometheus 텍스트 형식으로 변환합니다.
+
+        Args:
+            report (dict, optional): report() 결과 (기본값: 현재 보고서)
+
+        Returns:
+            str: textfile collector에 둘 내용
+        """
+        report = report or self.report()
+        labels = _label_text(self.labels)
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_duration_seconds 단계별 소요 시간",
+            f"# TYPE {METRIC_PREFIX}_stage_duration_seconds gauge",
+        ]
+        for name, seconds in sorted(report['stages'].items()):
+            lines.append(f'{METRIC_PREFIX}_stage_duration_seconds{_label_text(self.labels, stage=name)} {seconds}')
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            lines.append(f"{METRIC_PREFIX}_{name}{labels} {value}")
+        lines += [
+            f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge",
+            f"{METRIC_PREFIX}_run_duration_seconds{labels} {report['duration_seconds']}",
+            f"# TYPE {METRIC_PREFIX}_run_success gauge",
+            f"{METRIC_PREFIX}_run_success{labels} {1 if report['status'] == 'success' else 0}",
+            f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_last_run_timestamp_seconds{labels} {self.started_at.timestamp():.0f}",
+            f"# TYPE {METRIC_PREFIX}_peak_rss_bytes gauge",
+            f'{METRIC_PREFIX}_peak_rss_bytes{_label_text(self.labels, process="self")} {report["peak_rss_bytes"]}',
+            f'{METRIC_PREFIX}_peak_rss_bytes{_label_text(self.labels, process="children")} {report["peak_children_rss_bytes"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """설정된 경로에 보고서를 씁니다. 쓰기 실패는 실행 결과에 영향을 주지 않도록 로그만 남깁니다."""
+        report = self.report()
+        stage_summary = ', '.join(f"{name} {seconds:.2f}초" for name, seconds in report['stages'].items())
+        logger.info(f"실행 지표: 전체 {report['duration_seconds']:.2f}초 ({stage_summary})")
+        try:
+            if self.report_path:
+                _write_atomic(self.report_path, json.dumps(report, ensure_ascii=False, indent=2))
+            if self.history_path:
+                _write_atomic(self.history_path, json.dumps(report, ensure_ascii=False) + '\n', append=True)
+            if self.textfile_path:
+                _write_atomic(self.textfile_path, self.to_prometheus(report))
+        except OSError as e:
+            logger.error(f"실행 지표 저장 중 오류 발생: {e}")
+
+
+def current():
+    """
+    현재 실행 중인 RunMetrics를 반환합니다.
+
+    Returns:
+        RunMetrics | None: 실행 중인 지표가 없으면 None
+    """
+    return _current.get()
+
+
+@contextmanager
+def stage(name):
+    """현재 실행의 name 단계 소요 시간을 기록합니다. 실행 중인 지표가 없으면 아무것도 하지 않습니다."""
+    run_metrics = _current.get()
+    if run_metrics is None:
+        yield
+        return
+    with run_metrics.stage(name):
+        yield
+
+
+def add(name, value=1):
+    """현재 실행의 카운터 name에 value를 더합니다."""
+    run_metrics = _current.get()
+    if run_metrics is not None:
+        run_metrics.add(name, value)
+
+
+def set_value(name, value):
+    """현재 실행의 카운터 name을 value로 설정합니다."""
+    run_metrics = _current.get()
+    if run_metrics is not None:
+        run_metrics.set(name, value)
+
+
+def observe_max(name, value):
+    """현재 실행의 카운터 name을 지금까지의 값과 value 중 큰 값으로 설정합니다."""
+    run_metrics = _current.get()
+    if run_metrics is not None:
+        run_metrics.observe_max(name, value)
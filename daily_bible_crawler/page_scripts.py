@@ -0,0 +1,177 @@
+"""
+Playwright 페이지에서 실행하는 추출 스크립트 모음입니다.
+
+동기/비동기 Playwright 경로가 같은 스크립트를 사용하도록 한곳에 모아 둡니다.
+각 스크립트는 page.evaluate()에 그대로 전달할 수 있는 화살표 함수입니다.
+"""
+
+# 웹사이트 구조 분석 (말씀/해설 영역 존재 여부와 요약)
+BIBLE_STRUCTURE_SCRIPT = '''
+() => {
+    // 말씀 영역 분석
+    const bibleContainer = document.querySelector('#font_uparea02');
+    const bibleInfo = {
+        exists: !!bibleContainer,
+        id: bibleContainer ? bibleContainer.id : null,
+        className: bibleContainer ? bibleContainer.className : null,
+        children: bibleContainer ? bibleContainer.children.length : 0,
+        text: bibleContainer ? bibleContainer.innerText.substring(0, 100) + '...' : null
+    };
+
+    // 해설 영역 분석
+    const explanationContainer = document.querySelector('#font_uparea03');
+    const explanationInfo = {
+        exists: !!explanationContainer,
+        id: explanationContainer ? explanationContainer.id : null,
+        className: explanationContainer ? explanationContainer.className : null,
+        children: explanationContainer ? explanationContainer.children.length : 0,
+        text: explanationContainer ? explanationContainer.innerText.substring(0, 100) + '...' : null
+    };
+
+    return {
+        bible: bibleInfo,
+        explanation: explanationInfo
+    };
+}
+'''
+
+# 페이지의 모든 스타일시트 규칙 추출
+CSS_EXTRACTION_SCRIPT = '''
+() => {
+    const styleSheets = Array.from(document.styleSheets);
+    return styleSheets.map(sheet => {
+        try {
+            return Array.from(sheet.cssRules).map(rule => rule.cssText).join('\\n');
+        } catch (e) {
+            return '';
+        }
+    }).join('\\n');
+}
+'''
+
+# 말씀 영역(#font_uparea02)에서 헤더와 구절 추출
+BIBLE_EXTRACTION_SCRIPT = '''
+() => {
+    const bibleDiv = document.querySelector('#font_uparea02');
+    if (!bibleDiv) return { header: '', verses: [] };
+
+    // 텍스트 내용 가져오기
+    const fullText = bibleDiv.innerText;
+    const lines = fullText.split('\\n').filter(line => line.trim());
+
+    // 헤더 정보 (날짜, 제목, 본문 등) 추출
+    let headerEndIndex = 0;
+    while (headerEndIndex < lines.length && !lines[headerEndIndex].match(/^\\d+\\s/)) {
+        headerEndIndex++;
+    }
+
+    const headerLines = lines.slice(0, headerEndIndex);
+    const header = headerLines.join('\\n');
+
+    // 성경 구절 추출 (숫자로 시작하는 줄)
+    const versesLines = lines.slice(headerEndIndex);
+    const verses = [];
+
+    for (let i = 0; i < versesLines.length; i++) {
+        const line = versesLines[i];
+        const match = line.match(/^(\\d+)\\s(.+)$/);
+
+        if (match) {
+            verses.push({
+                number: match[1],
+                text: match[2]
+            });
+        }
+    }
+
+    return { header, verses };
+}
+'''
+
+# 해설 영역(#font_uparea03)에서 제목, 섹션, 정보 추출
+EXPLANATION_EXTRACTION_SCRIPT = '''
+() => {
+    const explanation = {};
+
+    // 제목 추출
+    const titleElement = document.querySelector('.b_text');
+    explanation.title = titleElement ? titleElement.innerText : '';
+
+    // 섹션 추출
+    explanation.sections = [];
+
+    // 더 정확한 섹션 선택자 찾기
+    const explanationDiv = document.querySelector('#font_uparea03');
+    if (explanationDiv) {
+        // 메인 설명 텍스트 영역
+        const mainTextDiv = explanationDiv.querySelector('.body_text');
+
+        // 각 섹션 추출 (g_text는 제목, 다음 형제 요소는 내용)
+        const sectionElements = explanationDiv.querySelectorAll('.g_text');
+
+        for (let i = 0; i < sectionElements.length; i++) {
+            const subtitle = sectionElements[i].innerText.trim();
+            let content = '';
+
+            // 제목 다음 요소에서 실제 내용 찾기
+            let nextElement = sectionElements[i].nextElementSibling;
+            while (nextElement && !nextElement.classList.contains('g_text')) {
+                // text 클래스를 가진 요소만 처리
+                if (nextElement.classList.contains('text')) {
+                    content = nextElement.innerText.trim();
+                    break;
+                }
+                nextElement = nextElement.nextElementSibling;
+            }
+
+            if (subtitle || content) {
+                explanation.sections.push({ subtitle, content });
+            }
+        }
+    }
+
+    // 정보 추출
+    const infoElement = document.querySelector('#dailybible_info2');
+    explanation.info = infoElement ? infoElement.innerText : '';
+
+    return explanation;
+}
+'''
+
+# 한 번의 evaluate 호출로 말씀, CSS, (선택적으로) 구조 분석 결과를 함께 추출
+PAGE_EXTRACTION_SCRIPT = '''
+(probe) => ({
+    structure: probe ? (%s)() : null,
+    css: (%s)(),
+    bible: (%s)()
+})
+''' % (BIBLE_STRUCTURE_SCRIPT.strip(), CSS_EXTRACTION_SCRIPT.strip(), BIBLE_EXTRACTION_SCRIPT.strip())
+
+# 말씀 영역 준비 조건: 숫자로 시작하는 구절 줄이 있어야 함
+BIBLE_READY_SCRIPT = '''
+() => {
+    const bibleDiv = document.querySelector('#font_uparea02');
+    if (!bibleDiv) return false;
+    return bibleDiv.innerText.split('\\n').some(line => /^\\d+\\s/.test(line.trim()));
+}
+'''
+
+# 해설 영역 준비 조건: .g_text 제목이 있고 내용이 채워진 .text 형제 요소가 있어야 함
+EXPLANATION_READY_SCRIPT = '''
+() => {
+    const explanationDiv = document.querySelector('#font_uparea03');
+    if (!explanationDiv) return false;
+    const sectionElements = Array.from(explanationDiv.querySelectorAll('.g_text'));
+    if (sectionElements.length === 0) return false;
+    return sectionElements.some(sectionElement => {
+        let nextElement = sectionElement.nextElementSibling;
+        while (nextElement && !nextElement.classList.contains('g_text')) {
+            if (nextElement.classList.contains('text')) {
+                return nextElement.innerText.trim().length > 0;
+            }
+            nextElement = nextElement.nextElementSibling;
+        }
+        return false;
+    });
+}
+'''
@@ -0,0 +1,384 @@
+"""
+말씀 헤더의 본문 범위를 해석하고, 날짜별 본문 범위를 구간 색인으로 저장하는 모듈입니다.
+
+말씀 헤더에는 '본문 : 누가복음(Luke) 14:25 - 14:35' 같은 줄이 들어 있습니다. parse_reference는
+이 줄을 (책, 시작 장:절, 끝 장:절) 범위로 바꾸고, PassageIndex는 날짜마다 범위 하나를 저장하여
+"누가복음 14:30을 다룬 날은?", "로마서 8장과 겹치는 말씀은?" 같은 질문에 보관소를 읽지 않고 답합니다.
+
+장:절은 장 * 1000 + 절 하나의 정수 위치로 저장하며, (책, 시작 위치)에 색인을 두고 책마다 가장 긴
+범위의 길이를 함께 기록합니다. 그래서 겹치는 범위는 시작 위치가 [질의 시작 - 가장 긴 길이, 질의 끝]
+안에 있는 행만 색인으로 훑어 찾습니다. 책 이름은 한국어(누가복음)와 영어(Luke) 모두로 찾을 수 있습니다.
+
+사용 예:
+    python -m daily_bible_crawler.passages sync            # 보관소의 새 날짜와 바뀐 날짜를 색인
+    python -m daily_bible_crawler.passages find "Luke 14:30"
+    python -m daily_bible_crawler.passages find "로마서 8"
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from datetime import datetime
+
+from loguru import logger
+
+from daily_bible_crawler.archive import archived_days
+
+PASSAGE_INDEX_ENABLED = os.environ.get('PASSAGE_INDEX_ENABLED', 'true').lower() != 'false'
+PASSAGE_INDEX_PATH = os.environ.get('PASSAGE_INDEX_PATH', os.path.join('cache', 'passage_index.sqlite3'))
+
+# 한 장의 최대 절 수보다 큰 값 (시편 119편이 176절)
+VERSES_PER_CHAPTER = 1000
+# 절 없이 장만 지정했을 때의 끝 절
+LAST_VERSE = VERSES_PER_CHAPTER - 1
+
+# '본문 : 누가복음(Luke) 14:25 - 14:35', '본문 : 시편(Psalms) 23:1 - 6', '본문 : 룻기(Ruth) 1'
+HEADER_REFERENCE_PATTERN = re.compile(
+    r'본문\s*:\s*(?P<korean>[^\d(]+?)\s*(?:\((?P<english>[^)]+)\))?\s*'
+    r'(?P<start_chapter>\d+)(?::(?P<start_verse>\d+))?'
+    r'(?:\s*[-~]\s*(?:(?P<end_chapter>\d+):)?(?P<end_verse>\d+))?'
+)
+# 'Luke 14:30', '로마서 8', 'Romans 8:1-11', '1 Corinthians 13', '누가복음 14:25-15:2'
+QUERY_PATTERN = re.compile(
+    r'^\s*(?P<book>.+?)\s*(?P<start_chapter>\d+)(?::(?P<start_verse>\d+))?'
+    r'(?:\s*[-~]\s*(?:(?P<end_chapter>\d+):)?(?P<end_verse>\d+))?\s*$'
+)
+
+
+def verse_position(chapter, verse):
+    """
+    장:절을 비교할 수 있는 정수 위치로 바꿉니다.
+
+    Args:
+        chapter (int): 장
+        verse (int): 절
+
+    Returns:
+        int: chapter * 1000 + verse
+    """
+    return chapter * VERSES_PER_CHAPTER + verse
+
+
+def book_key(name):
+    """
+    책 이름을 비교할 때 쓰는 키로 바꿉니다. (공백 제거, 소문자)
+
+    Args:
+        name (str): 책 이름 ('Luke', '1 Corinthians', '누가복음' 등)
+
+    Returns:
+        str: 비교용 키
+    """
+    return re.sub(r'\s+', '', name).lower()
+
+
+def _range_positions(match):
+    # 정규식 결과에서 (시작 위치, 끝 위치)를 만듦. 끝 장이 없으면 시작 장과 같은 장으로 봄
+    start_chapter = int(match['start_chapter'])
+    if match['start_verse'] is None:
+        # 장만 지정: '8' 또는 '8 - 9'
+        end_chapter = int(match['end_verse']) if match['end_verse'] is not None else start_chapter
+        return verse_position(start_chapter, 1), verse_position(end_chapter, LAST_VERSE)
+    start = verse_position(start_chapter, int(match['start_verse']))
+    if match['end_verse'] is None:
+        return start, start
+    end_chapter = int(match['end_chapter']) if match['end_chapter'] is not None else start_chapter
+    return start, verse_position(end_chapter, int(match['end_verse']))
+
+
+class PassageRange:
+    """책 하나 안의 본문 범위 (시작과 끝은 verse_position 값)"""
+
+    __slots__ = ('korean', 'english', 'start', 'end')
+
+    def __init__(self, korean, english, start, end):
+        """
+        Args:
+            korean (str): 한국어 책 이름 (예: '누가복음')
+            english (str): 영어 책 이름 (예: 'Luke', 없으면 빈 문자열)
+            start (int): 시작 위치
+            end (int): 끝 위치 (포함)
+        """
+        self.korean = korean
+        self.english = english
+        self.start = start
+        self.end = end
+
+    @property
+    def book(self):
+        """색인에서 책을 구분하는 키 (영어 이름이 있으면 영어 이름 기준)"""
+        return book_key(self.english or self.korean)
+
+    def overlaps(self, start, end):
+        """범위가 [start, end]와 겹치는지 확인합니다."""
+        return self.start <= end and self.end >= start
+
+    def __eq__(self, other):
+        return isinstance(other, PassageRange) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __str__(self):
+        start_chapter, start_verse = divmod(self.start, VERSES_PER_CHAPTER)
+        end_chapter, end_verse = divmod(self.end, VERSES_PER_CHAPTER)
+        name = f"{self.korean}({self.english})" if self.english else self.korean
+        if self.start == self.end:
+            return f"{name} {start_chapter}:{start_verse}"
+        if start_chapter == end_chapter:
+            return f"{name} {start_chapter}:{start_verse}-{end_verse}"
+        return f"{name} {start_chapter}:{start_verse}-{end_chapter}:{end_verse}"
+
+    def __repr__(self):
+        return f"PassageRange({self})"
+
+
+def parse_reference(header):
+    """
+    말씀 헤더에서 '본문 : ...' 줄을 찾아 본문 범위로 바꿉니다.
+
+    Args:
+        header (str): 말씀 헤더 (예: '매일성경 2025.03.24(월)\\n제자도\\n본문 : 누가복음(Luke) 14:25 - 14:35')
+
+    Returns:
+        PassageRange | None: '본문' 줄이 없거나 형식이 다르면 None
+    """
+    match = HEADER_REFERENCE_PATTERN.search(header or '')
+    if match is None:
+        return None
+    start, end = _range_positions(match)
+    if end < start:
+        return None
+    return PassageRange(match['korean'].strip(), (match['english'] or '').strip(), start, end)
+
+
+def parse_query(text):
+    """
+    'Luke 14:30', '로마서 8', 'Romans 8:1-11' 같은 검색어를 (책 키, 시작 위치, 끝 위치)로 바꿉니다.
+
+    Args:
+        text (str): 검색어
+
+    Returns:
+        tuple: (책 키(str), 시작 위치(int), 끝 위치(int))
+
+    Raises:
+        ValueError: 형식이 다른 경우
+    """
+    match = QUERY_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"본문 범위 형식이 아닙니다: {text!r} (예: 'Luke 14:30', '로마서 8', 'Romans 8:1-11')")
+    start, end = _range_positions(match)
+    return book_key(match['book']), start, end
+
+
+class PassageIndex:
+    """날짜별 본문 범위를 저장하고 겹치는 범위를 찾는 구간 색인"""
+
+    def __init__(self, path=PASSAGE_INDEX_PATH):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            # book이 NULL인 행은 본문 범위를 해석하지 못한 날짜 (sync에서 다시 읽지 않도록 기록)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS passages (
+                    date TEXT PRIMARY KEY,
+                    book TEXT,
+                    korean TEXT,
+                    english TEXT,
+                    start_pos INTEGER,
+                    end_pos INTEGER,
+                    version REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS passages_book_start ON passages (book, start_pos)')
+            # 책마다 가장 긴 범위의 길이 (겹침 검색에서 훑을 시작 위치의 하한)
+            conn.execute('CREATE TABLE IF NOT EXISTS books (book TEXT PRIMARY KEY, max_span INTEGER NOT NULL)')
+            # 한국어/영어 이름 -> 책 키
+            conn.execute('CREATE TABLE IF NOT EXISTS book_names (name TEXT PRIMARY KEY, book TEXT NOT NULL)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _key(date):
+        return date.strftime('%Y%m%d')
+
+    def add(self, date, passage, version=None):
+        """
+        날짜의 본문 범위를 저장합니다. 같은 날짜가 있으면 바꿉니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+            passage (PassageRange | None): 본문 범위 (해석하지 못했으면 None)
+            version (float, optional): 원본의 저장 시각 (기본값: 지금)
+        """
+        version = version if version is not None else time.time()
+        with closing(self._connect()) as conn, conn:
+            if passage is None:
+                conn.execute(
+                    'INSERT OR REPLACE INTO passages (date, version) VALUES (?, ?)', (self._key(date), version)
+                )
+                return
+            conn.execute(
+                'INSERT OR REPLACE INTO passages (date, book, korean, english, start_pos, end_pos, version) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (self._key(date), passage.book, passage.korean, passage.english, passage.start, passage.end, version),
+            )
+            conn.execute('''
+                INSERT INTO books (book, max_span) VALUES (?, ?)
+                ON CONFLICT (book) DO UPDATE SET max_span = MAX(max_span, excluded.max_span)
+            ''', (passage.book, passage.end - passage.start))
+            conn.executemany(
+                'INSERT OR IGNORE INTO book_names (name, book) VALUES (?, ?)',
+                [(book_key(name), passage.book) for name in (passage.korean, passage.english) if name],
+            )
+
+    def add_reading(self, reading, date=None, version=None):
+        """
+        말씀 헤더의 본문 범위를 해석하여 저장합니다.
+
+        Args:
+            reading (DailyReading): 말씀 모델
+            date (datetime, optional): 말씀 날짜 (기본값: reading.date)
+            version (float, optional): 원본의 저장 시각 (기본값: 지금)
+
+        Returns:
+            PassageRange | None: 저장한 본문 범위 (해석하지 못했으면 None)
+        """
+        date = date or reading.date
+        passage = parse_reference(reading.header)
+        if passage is None:
+            logger.warning(f"{date:%Y-%m-%d}: 말씀 헤더에서 본문 범위를 찾지 못했습니다.")
+        self.add(date, passage, version)
+        return passage
+
+    def get(self, date):
+        """
+        날짜의 본문 범위를 반환합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            PassageRange | None: 없거나 해석하지 못한 날짜이면 None
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT korean, english, start_pos, end_pos FROM passages WHERE date = ? AND book IS NOT NULL',
+                (self._key(date),),
+            ).fetchone()
+        return PassageRange(*row) if row is not None else None
+
+    def overlapping(self, book, start, end):
+        """
+        [start, end]와 겹치는 본문을 다룬 날짜를 찾습니다.
+
+        Args:
+            book (str): 책 이름 (한국어 또는 영어, book_key로 비교)
+            start (int): 시작 위치 (verse_position)
+            end (int): 끝 위치 (포함)
+
+        Returns:
+            list: (datetime, PassageRange) 목록 (날짜 순서)
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT n.book, b.max_span FROM book_names AS n JOIN books AS b ON b.book = n.book WHERE n.name = ?',
+                (book_key(book),),
+            ).fetchone()
+            if row is None:
+                return []
+            book, max_span = row
+            rows = conn.execute('''
+                SELECT date, korean, english, start_pos, end_pos FROM passages
+                WHERE book = ? AND start_pos BETWEEN ? AND ? AND end_pos >= ?
+                ORDER BY date
+            ''', (book, start - max_span, end, start)).fetchall()
+        return [
+            (datetime.strptime(key, '%Y%m%d'), PassageRange(korean, english, start_pos, end_pos))
+            for key, korean, english, start_pos, end_pos in rows
+        ]
+
+    def find(self, query):
+        """
+        'Luke 14:30', '로마서 8' 같은 검색어와 겹치는 본문을 다룬 날짜를 찾습니다. (parse_query 참고)
+
+        Args:
+            query (str): 검색어
+
+        Returns:
+            list: (datetime, PassageRange) 목록 (날짜 순서)
+
+        Raises:
+            ValueError: 검색어 형식이 다른 경우
+        """
+        return self.overlapping(*parse_query(query))
+
+    def versions(self):
+        """
+        색인한 날짜와 색인할 때의 원본 저장 시각을 반환합니다.
+
+        Returns:
+            dict: {datetime: 저장 시각(float)}
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT date, version FROM passages').fetchall()
+        return {datetime.strptime(key, '%Y%m%d'): version for key, version in rows}
+
+
+def sync_index(directory=None, index=None):
+    """
+    보관소(와 이전 방식의 .html 파일)에서 색인에 없거나 색인한 뒤 바뀐 날짜만 색인합니다.
+
+    Args:
+        directory (str, optional): 보관 디렉토리 (기본값: TEXTS_DIR)
+        index (PassageIndex, optional): 색인 (기본값: PASSAGE_INDEX_PATH)
+
+    Returns:
+        int: 새로 색인한 날짜 수
+    """
+    if directory is None:
+        from daily_bible_crawler.main import TEXTS_DIR
+
+        directory = TEXTS_DIR
+    index = index or PassageIndex()
+    indexed = index.versions()
+    count = 0
+    for date, (version, load) in sorted(archived_days(directory).items()):
+        if indexed.get(date, -1.0) >= version:
+            continue
+        index.add_reading(load(), date, version)
+        count += 1
+    logger.info(f"본문 범위 색인 갱신: {count}일")
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="날짜별 본문 범위를 찾습니다.")
+    parser.add_argument('--index', default=PASSAGE_INDEX_PATH, help="색인 파일 경로 (기본값: PASSAGE_INDEX_PATH)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync_parser = commands.add_parser('sync', help="보관소의 새 날짜와 바뀐 날짜를 색인")
+    sync_parser.add_argument('--dir', default=None, help="보관 디렉토리 (기본값: TEXTS_DIR)")
+
+    find_parser = commands.add_parser('find', help="본문 범위와 겹치는 날짜 찾기")
+    find_parser.add_argument('query', help="본문 범위 (예: 'Luke 14:30', '로마서 8', 'Romans 8:1-11')")
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        sync_index(args.dir, PassageIndex(args.index))
+    else:
+        try:
+            results = PassageIndex(args.index).find(args.query)
+        except ValueError as e:
+            sys.exit(str(e))
+        for date, passage in results:
+            print(f"{date:%Y-%m-%d}\t{passage}")
+        print(f"{len(results)}일", file=sys.stderr)
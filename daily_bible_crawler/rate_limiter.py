@@ -0,0 +1,274 @@
+"""
+SMTP와 Gmail API 전송에 함께 쓰는 적응형 토큰 버킷 속도 제한 모듈입니다.
+
+전송 방식마다 초당 전송 수와 하루 전송 수 한도를 두고, 메시지를 보내기 전에 토큰을 받아야
+보낼 수 있습니다. 서버가 429나 SMTP 4xx(일시적 제한)로 응답하면 전송 속도를 절반으로 줄이고
+잠시 멈추며, 연속으로 RATE_LIMIT_INCREASE_AFTER통을 보내는 데 성공하면 설정한 최대 속도까지
+조금씩 다시 올립니다(AIMD). 그래서 수신자가 많아도 중간에 실패하지 않고 할당량이 허용하는
+가장 빠른 속도로 끝까지 보냅니다.
+
+하루 한도는 전송 원장의 오늘 성공 건수에서 시작하므로 같은 날 여러 번 실행해도 합산됩니다.
+전송 중에는 RATE_LIMIT_LOG_INTERVAL초마다 현재 속도 한도, 실제 전송 속도, 대기 중인 메시지 수를
+로그로 남깁니다.
+"""
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+
+from loguru import logger
+
+from daily_bible_crawler import metrics
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() != 'false'
+# 전송 방식별 초당 최대 전송 수와 하루 최대 전송 수 (0이면 제한 없음)
+# Gmail API messages.send는 100 할당량 단위이고 사용자당 초당 250단위이므로 초당 2.5통
+SMTP_RATE_LIMIT = float(os.environ.get('SMTP_RATE_LIMIT', '5'))
+SMTP_DAILY_LIMIT = int(os.environ.get('SMTP_DAILY_LIMIT', '2000'))
+GMAIL_RATE_LIMIT = float(os.environ.get('GMAIL_RATE_LIMIT', '2.5'))
+GMAIL_DAILY_LIMIT = int(os.environ.get('GMAIL_DAILY_LIMIT', '2000'))
+# 제한 응답을 받았을 때 줄일 비율, 최저 속도(초당), 다시 올리기 전 연속 성공 수
+RATE_LIMIT_DECREASE_FACTOR = float(os.environ.get('RATE_LIMIT_DECREASE_FACTOR', '0.5'))
+RATE_LIMIT_MIN_RATE = float(os.environ.get('RATE_LIMIT_MIN_RATE', '0.2'))
+RATE_LIMIT_INCREASE_AFTER = int(os.environ.get('RATE_LIMIT_INCREASE_AFTER', '20'))
+RATE_LIMIT_LOG_INTERVAL = float(os.environ.get('RATE_LIMIT_LOG_INTERVAL', '10'))
+
+BACKEND_LIMITS = {
+    'smtp': (SMTP_RATE_LIMIT, SMTP_DAILY_LIMIT),
+    'gmail': (GMAIL_RATE_LIMIT, GMAIL_DAILY_LIMIT),
+}
+
+
+class DailyLimitReached(RuntimeError):
+    """하루 전송 한도에 도달하여 더 보낼 수 없을 때 발생하는 예외"""
+
+
+class AdaptiveRateLimiter:
+    """
+    제한 응답에 따라 속도를 조절하는 토큰 버킷입니다. 여러 스레드와 이벤트 루프에서 함께 사용할 수 있습니다.
+
+    사용 예:
+        limiter.acquire()
+        try:
+            send(message)
+        except ThrottledError:
+            limiter.on_throttle()
+        else:
+            limiter.on_success()
+    """
+
+    def __init__(self, backend, max_rate, daily_limit=0, sent_today=0, burst=None,
+                 min_rate=RATE_LIMIT_MIN_RATE, decrease_factor=RATE_LIMIT_DECREASE_FACTOR,
+                 increase_after=RATE_LIMIT_INCREASE_AFTER, log_interval=RATE_LIMIT_LOG_INTERVAL):
+        """
+        Args:
+            backend (str): 전송 방식 이름 (로그와 지표용)
+            max_rate (float): 초당 최대 전송 수 (처음에는 이 속도로 시작)
+            daily_limit (int): 하루 최대 전송 수 (0이면 제한 없음)
+            sent_today (int): 오늘 이미 보낸 수 (전송 원장 기준)
+            burst (float, optional): 한 번에 몰아 보낼 수 있는 최대 수 (기본값: 1초 분량, 최소 1)
+            min_rate (float): 제한 응답을 받아도 내려가지 않는 최저 속도
+            decrease_factor (float): 제한 응답을 받았을 때 속도에 곱할 값
+            increase_after (int): 속도를 다시 올리기 전에 필요한 연속 성공 수
+            log_interval (float): 상태 로그 간격(초, 0이면 남기지 않음)
+        """
+        self.backend = backend
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst if burst is not None else max(1.0, max_rate)
+        self.min_rate = min(min_rate, max_rate)
+        self.decrease_factor = decrease_factor
+        self.increase_after = increase_after
+        self.daily_limit = daily_limit
+        self.log_interval = log_interval
+
+        self.sent = 0
+        self.throttled = 0
+        self.queued = 0
+        self._used_today = sent_today
+        self._day = datetime.now().date()
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._successes = 0
+        self._window_started = self._updated_at
+        self._window_sent = 0
+        self._logged_at = self._updated_at
+        self._lock = threading.Lock()
+
+    def reserve(self, count=1):
+        """
+        토큰 count개를 예약하고, 보내기 전에 기다려야 할 시간(초)을 반환합니다.
+
+        Args:
+            count (int): 보낼 메시지 수
+
+        Returns:
+            float: 기다릴 시간(초)
+
+        Raises:
+            DailyLimitReached: 하루 한도를 넘게 되는 경우
+        """
+        with self._lock:
+            today = datetime.now().date()
+            if today != self._day:
+                # 오래 떠 있는 프로세스는 날짜가 바뀌면 하루 전송 수를 새로 셈
+                self._day = today
+                self._used_today = 0
+            if self.daily_limit and self._used_today + count > self.daily_limit:
+                raise DailyLimitReached(
+                    f"{self.backend} 하루 전송 한도({self.daily_limit}통)에 도달했습니다. (오늘 {self._used_today}통)"
+                )
+            self._used_today += count
+            self.queued += count
+
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= count
+            return max(0.0, -self._tokens / self.rate, self._paused_until - now)
+
+    def acquire(self, count=1):
+        """
+        보낼 수 있을 때까지 기다립니다.
+
+        Args:
+            count (int): 보낼 메시지 수
+
+        Raises:
+            DailyLimitReached: 하루 한도를 넘게 되는 경우
+        """
+        wait = self.reserve(count)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, count=1):
+        """acquire의 비동기 버전입니다. 기다리는 동안 이벤트 루프를 막지 않습니다."""
+        wait = self.reserve(count)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self, count=1):
+        """
+        전송 성공을 알립니다. 연속 성공이 increase_after통에 이르면 속도를 올립니다.
+
+        Args:
+            count (int): 성공한 메시지 수
+        """
+        with self._lock:
+            self.queued -= count
+            self.sent += count
+            self._window_sent += count
+            self._successes += count
+            if self._successes >= self.increase_after and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate * 1.25)
+                self._successes = 0
+                logger.info(f"{self.backend} 전송 속도 한도를 올립니다: {self.rate:.2f}통/초")
+        self._maybe_log()
+
+    def on_throttle(self, retry_after=None, count=1):
+        """
+        제한 응답(429, SMTP 4xx)을 알립니다. 속도를 줄이고 잠시 멈추며, 해당 메시지는 다시 보낼 수 있도록
+        하루 전송 수에서 뺍니다.
+
+        Args:
+            retry_after (float, optional): 서버가 알려 준 재시도 대기 시간(초) (기본값: 1 / 줄인 속도)
+            count (int): 제한된 메시지 수
+        """
+        with self._lock:
+            self.queued -= count
+            self._used_today -= count
+            self.throttled += count
+            self._successes = 0
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            pause = retry_after if retry_after is not None else 1.0 / self.rate
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            # 이미 쌓인 토큰으로 바로 몰아 보내지 않도록 비움
+            self._tokens = min(self._tokens, 0.0)
+        metrics.add('messages_throttled', count)
+        logger.warning(f"{self.backend} 전송 제한 응답: 속도 한도 {self.rate:.2f}통/초로 줄이고 {pause:.1f}초 대기")
+
+    def on_failure(self, count=1):
+        """
+        제한과 무관한 전송 실패를 알립니다. 보내지 못했으므로 하루 전송 수에서 뺍니다.
+
+        Args:
+            count (int): 실패한 메시지 수
+        """
+        with self._lock:
+            self.queued -= count
+            self._used_today -= count
+
+    def status(self):
+        """
+        현재 상태를 반환합니다.
+
+        Returns:
+            dict: {'backend', 'rate_limit', 'send_rate', 'queued', 'sent', 'throttled', 'sent_today', 'daily_limit'}
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._window_started
+            return {
+                'backend': self.backend,
+                'rate_limit': round(self.rate, 3),
+                'send_rate': round(self._window_sent / elapsed, 3) if elapsed > 0 else 0.0,
+                'queued': self.queued,
+                'sent': self.sent,
+                'throttled': self.throttled,
+                'sent_today': self._used_today,
+                'daily_limit': self.daily_limit,
+            }
+
+    def _maybe_log(self):
+        if not self.log_interval or time.monotonic() - self._logged_at < self.log_interval:
+            return
+        self.log_status()
+
+    def log_status(self):
+        """현재 속도 한도, 실제 전송 속도, 대기 중인 메시지 수를 로그와 실행 지표로 남깁니다."""
+        status = self.status()
+        with self._lock:
+            now = time.monotonic()
+            self._logged_at = self._window_started = now
+            self._window_sent = 0
+        daily = f"/{status['daily_limit']}" if status['daily_limit'] else ''
+        logger.info(
+            f"{self.backend} 전송 상태: 속도 한도 {status['rate_limit']:.2f}통/초, 실제 {status['send_rate']:.2f}통/초, "
+            f"대기 {status['queued']}통, 전송 {status['sent']}통, 제한 응답 {status['throttled']}건, "
+            f"오늘 {status['sent_today']}{daily}통"
+        )
+        metrics.set_value(f'{self.backend}_rate_limit', status['rate_limit'])
+        metrics.set_value(f'{self.backend}_send_rate', status['send_rate'])
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(backend, enabled=RATE_LIMIT_ENABLED):
+    """
+    전송 방식별로 프로세스 안에서 함께 쓰는 속도 제한기를 반환합니다.
+
+    처음 만들 때 전송 원장(사용 중이면)에서 오늘 보낸 수를 읽어 하루 한도에 반영합니다.
+
+    Args:
+        backend (str): 'smtp' 또는 'gmail'
+        enabled (bool): 속도 제한을 사용할지 여부
+
+    Returns:
+        AdaptiveRateLimiter | None: 사용하지 않으면 None
+    """
+    if not enabled:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(backend)
+        if limiter is None:
+            from daily_bible_crawler.ledger import LEDGER_ENABLED, DeliveryLedger, STATUS_SENT
+
+            max_rate, daily_limit = BACKEND_LIMITS[backend]
+            sent_today = 0
+            if LEDGER_ENABLED and daily_limit:
+                sent_today = DeliveryLedger().summary(datetime.now()).get((backend, STATUS_SENT), 0)
+            limiter = _limiters[backend] = AdaptiveRateLimiter(backend, max_rate, daily_limit, sent_today)
+        return limiter
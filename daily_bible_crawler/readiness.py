@@ -0,0 +1,130 @@
+"""
+Playwright 캡처의 영역별 준비 상태를 기다리는 모듈입니다.
+
+networkidle(500ms 동안 네트워크 요청 없음)을 기다리는 대신, 말씀/해설 영역마다
+필요한 요소와 내용이 채워졌는지를 직접 확인합니다. 캡처 전체에는 시간 예산을 두어
+한 영역이 늦어지더라도 정해진 시간 안에 캡처가 끝나도록 합니다.
+"""
+import time
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+from daily_bible_crawler.http_fetcher import parse_explanation_data
+from daily_bible_crawler.page_scripts import BIBLE_READY_SCRIPT, EXPLANATION_READY_SCRIPT
+
+# 영역별 준비 조건 스크립트
+SECTION_READY_SCRIPTS = {
+    'bible': BIBLE_READY_SCRIPT,
+    'explanation': EXPLANATION_READY_SCRIPT,
+}
+
+SECTION_LABELS = {
+    'bible': '말씀',
+    'explanation': '해설',
+}
+
+
+class CaptureDeadline:
+    """
+    캡처 전체의 시간 예산을 관리합니다.
+
+    각 대기 단계는 영역별 제한 시간과 남은 예산 중 짧은 쪽을 타임아웃으로 사용합니다.
+    """
+
+    def __init__(self, budget_seconds):
+        """
+        Args:
+            budget_seconds (float): 캡처 전체에 허용할 시간(초)
+        """
+        self.budget_seconds = budget_seconds
+        self.started_at = time.monotonic()
+
+    def remaining(self):
+        """남은 시간(초)을 반환합니다. 예산을 모두 썼으면 0을 반환합니다."""
+        return max(0.0, self.budget_seconds - (time.monotonic() - self.started_at))
+
+    def timeout_ms(self, limit_seconds=None):
+        """
+        Playwright API에 넘길 타임아웃(ms)을 계산합니다.
+
+        Args:
+            limit_seconds (float, optional): 단계별 제한 시간(초)
+
+        Returns:
+            float: 타임아웃(ms). 최소 1ms (0은 Playwright에서 무제한을 뜻하므로 사용하지 않음)
+        """
+        remaining = self.remaining()
+        if limit_seconds is not None:
+            remaining = min(remaining, limit_seconds)
+        return max(1.0, remaining * 1000)
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+
+def wait_for_section(page, section, deadline, limit_seconds=None):
+    """
+    영역의 준비 조건이 만족될 때까지 기다립니다.
+
+    시간 안에 준비되지 않으면 경고를 남기고 False를 반환합니다. 호출자는 이 경우에도
+    현재 상태로 추출을 계속할 수 있습니다.
+
+    Args:
+        page (Page): Playwright 페이지
+        section (str): 'bible' 또는 'explanation'
+        deadline (CaptureDeadline): 캡처 시간 예산
+        limit_seconds (float, optional): 이 영역에 허용할 최대 대기 시간(초)
+
+    Returns:
+        bool: 준비 조건 만족 여부
+    """
+    label = SECTION_LABELS.get(section, section)
+    if deadline.expired:
+        logger.warning(f"캡처 시간 예산을 모두 사용하여 {label} 영역 대기를 건너뜁니다.")
+        return False
+
+    started_at = time.perf_counter()
+    try:
+        page.wait_for_function(SECTION_READY_SCRIPTS[section], timeout=deadline.timeout_ms(limit_seconds))
+    except Exception as e:
+        logger.warning(f"{label} 영역 준비 대기 시간 초과: {e}, 계속 진행합니다.")
+        return False
+
+    logger.info(f"{label} 영역 준비 완료 ({time.perf_counter() - started_at:.2f}초)")
+    return True
+
+
+def fetch_explanation_via_xhr(page, url, deadline, limit_seconds=None):
+    """
+    해설 탭을 클릭하는 대신 탭이 호출하는 요청을 페이지의 세션으로 직접 보냅니다.
+
+    page.request를 사용하므로 페이지와 쿠키를 공유합니다. 응답에서 해설 섹션을
+    찾지 못하면 None을 반환하여 호출자가 탭 클릭 방식으로 대체하도록 합니다.
+
+    Args:
+        page (Page): Playwright 페이지
+        url (str): 해설 영역을 반환하는 요청 URL
+        deadline (CaptureDeadline): 캡처 시간 예산
+        limit_seconds (float, optional): 요청에 허용할 최대 시간(초)
+
+    Returns:
+        dict | None: {'title': str, 'sections': list, 'info': str} 또는 None
+    """
+    try:
+        response = page.request.get(url, timeout=deadline.timeout_ms(limit_seconds))
+        if not response.ok:
+            logger.warning(f"해설 요청 실패: HTTP {response.status}")
+            return None
+        explanation_data = parse_explanation_data(BeautifulSoup(response.text(), 'html.parser'))
+    except Exception as e:
+        logger.warning(f"해설 요청 중 오류 발생: {e}")
+        return None
+
+    if not explanation_data['sections']:
+        logger.warning("해설 요청 응답에 섹션이 없어 탭 클릭으로 대체합니다.")
+        return None
+
+    logger.info("해설 요청으로 해설 데이터 추출 완료")
+    return explanation_data
@@ -0,0 +1,243 @@
+"""
+하루치 말씀과 해설을 담는 데이터 모델과 바이너리 직렬화 모듈입니다.
+
+추출 결과는 DailyReading 하나로 다루며, 구절(Verse)과 해설 섹션(Section)은 __slots__를 쓰는
+작은 레코드이므로 여러 달 치 말씀을 메모리에 올려도 딕셔너리보다 훨씬 적게 차지합니다.
+
+to_bytes()/from_bytes()는 스키마 버전이 붙은 간결한 바이너리 형식을 사용합니다.
+(매직 바이트 'DBR', 스키마 버전 1바이트, 이어서 가변 길이 정수로 길이를 붙인 UTF-8 문자열과 개수)
+JSON보다 작고 빠르게 읽고 쓸 수 있으며, 외부 패키지가 필요하지 않습니다.
+스키마가 바뀌면 SCHEMA_VERSION을 올리고 from_bytes에서 이전 버전을 변환합니다.
+"""
+from datetime import datetime
+
+MAGIC = b'DBR'
+SCHEMA_VERSION = 1
+
+
+class Verse:
+    """말씀 구절 하나 (절 번호와 본문)"""
+
+    __slots__ = ('number', 'text')
+
+    def __init__(self, number, text):
+        self.number = number
+        self.text = text
+
+    def __eq__(self, other):
+        return isinstance(other, Verse) and (self.number, self.text) == (other.number, other.text)
+
+    def __repr__(self):
+        return f"Verse({self.number!r}, {self.text[:20]!r})"
+
+
+class Section:
+    """해설 섹션 하나 (소제목과 내용)"""
+
+    __slots__ = ('subtitle', 'content')
+
+    def __init__(self, subtitle, content):
+        self.subtitle = subtitle
+        self.content = content
+
+    def __eq__(self, other):
+        return isinstance(other, Section) and (self.subtitle, self.content) == (other.subtitle, other.content)
+
+    def __repr__(self):
+        return f"Section({self.subtitle!r})"
+
+
+class DailyReading:
+    """하루치 말씀(헤더, 구절)과 해설(제목, 섹션, 정보), 사이트 CSS"""
+
+    __slots__ = ('date', 'header', 'verses', 'title', 'sections', 'info', 'css')
+
+    def __init__(self, date=None, header='', verses=(), title='', sections=(), info='', css=''):
+        """
+        Args:
+            date (date, optional): 말씀 날짜
+            header (str): 말씀 헤더 (날짜, 제목, 본문 범위)
+            verses (iterable): Verse 목록
+            title (str): 해설 제목
+            sections (iterable): Section 목록
+            info (str): 해설 정보
+            css (str): 사이트에서 추출한 CSS
+        """
+        # datetime이 주어져도 날짜만 저장
+        self.date = date.date() if isinstance(date, datetime) else date
+        self.header = header
+        self.verses = tuple(verses)
+        self.title = title
+        self.sections = tuple(sections)
+        self.info = info
+        self.css = css
+
+    def __eq__(self, other):
+        return isinstance(other, DailyReading) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        return f"DailyReading({self.date}, {len(self.verses)}절, {len(self.sections)}섹션)"
+
+    @classmethod
+    def from_dicts(cls, bible_data, explanation_data, css='', date=None):
+        """
+        추출 함수가 반환하는 딕셔너리로 만듭니다.
+
+        Args:
+            bible_data (dict): {'header': str, 'verses': [{'number': str, 'text': str}, ...]}
+            explanation_data (dict): {'title': str, 'sections': [{'subtitle': str, 'content': str}, ...], 'info': str}
+            css (str): 사이트 CSS
+            date (datetime, optional): 말씀 날짜
+
+        Returns:
+            DailyReading: 말씀 모델
+        """
+        return cls(
+            date=date,
+            header=bible_data.get('header', ''),
+            verses=(Verse(verse.get('number', ''), verse.get('text', '')) for verse in bible_data.get('verses', [])),
+            title=explanation_data.get('title', ''),
+            sections=(
+                Section(section.get('subtitle', ''), section.get('content', ''))
+                for section in explanation_data.get('sections', [])
+            ),
+            info=explanation_data.get('info', ''),
+            css=css or '',
+        )
+
+    def to_dicts(self):
+        """
+        from_dicts의 반대로, 추출 함수와 같은 형식의 딕셔너리를 반환합니다.
+
+        Returns:
+            tuple: (bible_data(dict), explanation_data(dict), CSS 내용(str))
+        """
+        bible_data = {
+            'header': self.header,
+            'verses': [{'number': verse.number, 'text': verse.text} for verse in self.verses],
+        }
+        explanation_data = {
+            'title': self.title,
+            'sections': [{'subtitle': section.subtitle, 'content': section.content} for section in self.sections],
+            'info': self.info,
+        }
+        return bible_data, explanation_data, self.css
+
+    def to_bytes(self):
+        """
+        스키마 버전이 붙은 바이너리로 직렬화합니다.
+
+        Returns:
+            bytes: 직렬화된 말씀
+        """
+        buffer = bytearray(MAGIC)
+        buffer.append(SCHEMA_VERSION)
+        _write_str(buffer, self.date.strftime('%Y%m%d') if self.date else '')
+        _write_str(buffer, self.header)
+        _write_varint(buffer, len(self.verses))
+        for verse in self.verses:
+            _write_str(buffer, verse.number)
+            _write_str(buffer, verse.text)
+        _write_str(buffer, self.title)
+        _write_varint(buffer, len(self.sections))
+        for section in self.sections:
+            _write_str(buffer, section.subtitle)
+            _write_str(buffer, section.content)
+        _write_str(buffer, self.info)
+        _write_str(buffer, self.css)
+        return bytes(buffer)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        to_bytes로 직렬화한 바이너리를 읽습니다.
+
+        Args:
+            data (bytes): 직렬화된 말씀
+
+        Returns:
+            DailyReading: 말씀 모델
+
+        Raises:
+            ValueError: 형식이 다르거나 지원하지 않는 스키마 버전인 경우
+        """
+        if not is_serialized_reading(data):
+            raise ValueError("말씀 바이너리 형식이 아닙니다.")
+        version = data[len(MAGIC)]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"지원하지 않는 말씀 스키마 버전입니다: {version} (최대 {SCHEMA_VERSION})")
+
+        reader = _Reader(data, len(MAGIC) + 1)
+        date = reader.string()
+        header = reader.string()
+        verses = [Verse(reader.string(), reader.string()) for _ in range(reader.varint())]
+        title = reader.string()
+        sections = [Section(reader.string(), reader.string()) for _ in range(reader.varint())]
+        info = reader.string()
+        css = reader.string()
+        return cls(
+            date=datetime.strptime(date, '%Y%m%d').date() if date else None,
+            header=header, verses=verses, title=title, sections=sections, info=info, css=css,
+        )
+
+
+def is_serialized_reading(data):
+    """
+    to_bytes로 직렬화한 바이너리인지 확인합니다. (이전 JSON 형식과 구분할 때 사용)
+
+    Args:
+        data (bytes | str): 저장된 값
+
+    Returns:
+        bool: 말씀 바이너리 여부
+    """
+    return (isinstance(data, (bytes, bytearray, memoryview))
+            and len(data) > len(MAGIC) and bytes(data[:len(MAGIC)]) == MAGIC)
+
+
+def _write_varint(buffer, value):
+    # LEB128: 7비트씩 낮은 자리부터, 이어지는 바이트가 있으면 최상위 비트를 켬
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _write_str(buffer, value):
+    encoded = (value or '').encode('utf-8')
+    _write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+class _Reader:
+    """바이너리에서 가변 길이 정수와 문자열을 차례로 읽는 커서"""
+
+    __slots__ = ('data', 'offset')
+
+    def __init__(self, data, offset):
+        self.data = memoryview(data)
+        self.offset = offset
+
+    def varint(self):
+        value = shift = 0
+        try:
+            while True:
+                byte = self.data[self.offset]
+                self.offset += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    return value
+                shift += 7
+        except IndexError:
+            raise ValueError("말씀 바이너리가 잘렸습니다.") from None
+
+    def string(self):
+        length = self.varint()
+        end = self.offset + length
+        if end > len(self.data):
+            raise ValueError("말씀 바이너리가 잘렸습니다.")
+        value = str(self.data[self.offset:end], 'utf-8')
+        self.offset = end
+        return value
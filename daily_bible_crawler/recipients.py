@@ -0,0 +1,262 @@
+"""
+이메일 수신자 목록을 환경 변수, CSV, JSONL, SQLite에서 차례로 읽어 오는 수신자 원본 모듈입니다.
+
+수신자 원본은 반복할 때마다 파일이나 DB를 처음부터 한 줄(한 행)씩 읽으므로, 전체 목록을
+메모리에 올리지 않습니다. 여러 컨테이너나 프로세스가 같은 목록을 나누어 보낼 때는
+샤드 번호와 샤드 수를 지정하면, 주소의 해시로 나누어 각 수신자가 정확히 한 샤드에만 속합니다.
+(목록에 주소를 추가하거나 순서를 바꿔도 기존 수신자의 샤드는 바뀌지 않습니다)
+
+RECIPIENT_SOURCE 형식:
+    (비어 있음)             EMAIL_RECIPIENT 환경 변수 (콤마로 구분)
+    recipients.csv          CSV 파일 (RECIPIENT_FIELD 열, 헤더가 없으면 첫 번째 열)
+    recipients.jsonl        JSON Lines 파일 (RECIPIENT_FIELD 키 또는 문자열 한 줄)
+    recipients.sqlite3      SQLite 파일 (RECIPIENT_SQLITE_QUERY의 첫 번째 열)
+    csv:/path/to/list.txt   확장자와 다르게 형식을 지정할 때
+
+사용 예:
+    python -m daily_bible_crawler.recipients --shard-count 4    # 샤드별 수신자 수 확인
+"""
+import argparse
+import csv
+import json
+import os
+import zlib
+
+RECIPIENT_SOURCE = os.environ.get('RECIPIENT_SOURCE', '')
+RECIPIENT_FIELD = os.environ.get('RECIPIENT_FIELD', 'email')  # CSV 열 이름 / JSONL 키
+RECIPIENT_SQLITE_QUERY = os.environ.get('RECIPIENT_SQLITE_QUERY', 'SELECT email FROM recipients')
+SHARD_INDEX = int(os.environ.get('SHARD_INDEX', '0'))
+SHARD_COUNT = int(os.environ.get('SHARD_COUNT', '1'))
+
+FORMAT_EXTENSIONS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.sqlite': 'sqlite',
+    '.sqlite3': 'sqlite',
+    '.db': 'sqlite',
+}
+
+
+def shard_of(address, shard_count):
+    """
+    주소가 속한 샤드 번호를 반환합니다. 대소문자와 앞뒤 공백은 구분하지 않습니다.
+
+    Args:
+        address (str): 이메일 주소
+        shard_count (int): 샤드 수
+
+    Returns:
+        int: 0 이상 shard_count 미만의 샤드 번호
+    """
+    # hash()는 프로세스마다 달라지므로 어느 컨테이너에서나 같은 값을 주는 CRC32 사용
+    return zlib.crc32(address.strip().lower().encode('utf-8')) % shard_count
+
+
+class RecipientSource:
+    """반복할 때마다 이 샤드의 수신자 주소를 처음부터 차례로 생성하는 수신자 원본"""
+
+    def __init__(self, shard_index=SHARD_INDEX, shard_count=SHARD_COUNT):
+        """
+        Args:
+            shard_index (int): 이 프로세스가 맡을 샤드 번호 (0부터)
+            shard_count (int): 전체 샤드 수
+        """
+        self.select_shard(shard_index, shard_count)
+
+    def select_shard(self, shard_index, shard_count):
+        """
+        이 프로세스가 맡을 샤드를 지정합니다.
+
+        Args:
+            shard_index (int): 샤드 번호 (0부터)
+            shard_count (int): 전체 샤드 수
+
+        Raises:
+            ValueError: 샤드 번호가 범위를 벗어난 경우
+        """
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError(f"잘못된 샤드 설정입니다: {shard_index}/{shard_count}")
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+
+    def shard_labels(self):
+        """
+        실행 지표에 붙일 샤드 레이블을 반환합니다.
+
+        Returns:
+            dict: 샤드가 하나이면 빈 딕셔너리, 아니면 {'shard': '<번호>'}
+        """
+        return {'shard': str(self.shard_index)} if self.shard_count > 1 else {}
+
+    def _addresses(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        for address in self._addresses():
+            address = (address or '').strip()
+            if not address:
+                continue
+            if self.shard_count > 1 and shard_of(address, self.shard_count) != self.shard_index:
+                continue
+            yield address
+
+    def __bool__(self):
+        # 수신자가 한 명이라도 있는지 확인 (처음 한 명까지만 읽음)
+        return next(iter(self), None) is not None
+
+    def __repr__(self):
+        shard = f", shard={self.shard_index}/{self.shard_count}" if self.shard_count > 1 else ''
+        return f"{type(self).__name__}({self.describe()}{shard})"
+
+    def describe(self):
+        """로그에 남길 원본 설명을 반환합니다."""
+        return ''
+
+
+class EnvRecipientSource(RecipientSource):
+    """콤마로 구분된 문자열(EMAIL_RECIPIENT)의 수신자"""
+
+    def __init__(self, value, **kwargs):
+        super().__init__(**kwargs)
+        self.value = value or ''
+
+    def _addresses(self):
+        return self.value.split(',')
+
+    def describe(self):
+        return 'EMAIL_RECIPIENT'
+
+
+class CsvRecipientSource(RecipientSource):
+    """CSV 파일의 수신자. field 열이 있으면 그 열을, 헤더가 없으면 첫 번째 열을 사용"""
+
+    def __init__(self, path, field=RECIPIENT_FIELD, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.field = field
+
+    def _addresses(self):
+        with open(self.path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            if self.field in header:
+                column = header.index(self.field)
+            else:
+                # field 열이 없으면 첫 번째 열 사용 (헤더 없이 주소만 있는 파일이면 첫 줄도 주소)
+                column = 0
+                if header and '@' in header[0]:
+                    yield header[0]
+            for row in reader:
+                if len(row) > column:
+                    yield row[column]
+
+    def describe(self):
+        return self.path
+
+
+class JsonlRecipientSource(RecipientSource):
+    """JSON Lines 파일의 수신자. 한 줄이 객체이면 field 키를, 문자열이면 그 값을 사용"""
+
+    def __init__(self, path, field=RECIPIENT_FIELD, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.field = field
+
+    def _addresses(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                yield item.get(self.field) if isinstance(item, dict) else item
+
+    def describe(self):
+        return self.path
+
+
+class SqliteRecipientSource(RecipientSource):
+    """SQLite 쿼리 결과 첫 번째 열의 수신자. 커서에서 한 행씩 읽음"""
+
+    def __init__(self, path, query=RECIPIENT_SQLITE_QUERY, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.query = query
+
+    def _addresses(self):
+        import sqlite3
+        from contextlib import closing
+
+        # 읽기 전용으로 열어 없는 파일을 새로 만들지 않음
+        with closing(sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)) as conn:
+            for row in conn.execute(self.query):
+                yield row[0]
+
+    def describe(self):
+        return self.path
+
+
+def add_shard_arguments(parser):
+    """
+    명령줄 파서에 --shard-index/--shard-count 인자를 추가합니다.
+
+    Args:
+        parser (argparse.ArgumentParser): 인자를 추가할 파서
+    """
+    parser.add_argument('--shard-index', type=int, default=SHARD_INDEX,
+                        help="이 프로세스가 보낼 수신자 샤드 번호 (0부터, 기본값: SHARD_INDEX)")
+    parser.add_argument('--shard-count', type=int, default=SHARD_COUNT,
+                        help="수신자 목록을 나눌 샤드 수 (기본값: SHARD_COUNT)")
+
+
+SOURCE_TYPES = {
+    'csv': CsvRecipientSource,
+    'jsonl': JsonlRecipientSource,
+    'sqlite': SqliteRecipientSource,
+}
+
+
+def open_recipient_source(spec=RECIPIENT_SOURCE, env_value=None, shard_index=SHARD_INDEX, shard_count=SHARD_COUNT):
+    """
+    RECIPIENT_SOURCE 형식의 문자열로 수신자 원본을 만듭니다. 파일은 반복할 때 엽니다.
+
+    Args:
+        spec (str): 원본 경로 또는 '<형식>:<경로>' (비어 있으면 env_value 사용)
+        env_value (str, optional): 콤마로 구분된 수신자 문자열 (기본값: EMAIL_RECIPIENT 환경 변수)
+        shard_index (int): 이 프로세스가 맡을 샤드 번호
+        shard_count (int): 전체 샤드 수
+
+    Returns:
+        RecipientSource: 수신자 원본
+
+    Raises:
+        ValueError: 형식을 알 수 없는 경우
+    """
+    shard = {'shard_index': shard_index, 'shard_count': shard_count}
+    if not spec:
+        return EnvRecipientSource(os.environ.get('EMAIL_RECIPIENT') if env_value is None else env_value, **shard)
+
+    source_format, separator, path = spec.partition(':')
+    if not separator or source_format not in SOURCE_TYPES:
+        path = spec
+        source_format = FORMAT_EXTENSIONS.get(os.path.splitext(spec)[1].lower())
+    if source_format is None:
+        raise ValueError(f"수신자 원본 형식을 알 수 없습니다: {spec} (csv, jsonl, sqlite 중 하나)")
+    return SOURCE_TYPES[source_format](path, **shard)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="수신자 원본을 읽어 샤드별 수신자 수를 출력합니다.")
+    parser.add_argument('source', nargs='?', default=RECIPIENT_SOURCE, help="수신자 원본 (기본값: RECIPIENT_SOURCE)")
+    parser.add_argument('--shard-count', type=int, default=SHARD_COUNT, help="전체 샤드 수")
+    args = parser.parse_args()
+
+    # 목록을 한 번만 읽으며 샤드별로 셈
+    counts = [0] * args.shard_count
+    for address in open_recipient_source(args.source, shard_count=1):
+        counts[shard_of(address, args.shard_count)] += 1
+    for index, count in enumerate(counts):
+        print(f"shard {index}/{args.shard_count}\t{count}")
+    print(f"total\t{sum(counts)}")
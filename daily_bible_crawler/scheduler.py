@@ -0,0 +1,498 @@
+"""
+정해진 시각에 메일을 보내는 상주 스케줄러입니다.
+
+cron으로 main을 실행하면 실행할 때마다 모듈을 가져오고 말씀을 추출하고 렌더링한 뒤에야 첫 메일을
+보낼 수 있습니다. 스케줄러는 프로세스를 계속 띄워 두고 하루 일정을 직접 관리합니다.
+
+- 첫 전송 시각 SCHEDULE_PREPARE_LEAD초 전에 말씀을 추출하여 렌더링, 보관, 색인까지 끝내고,
+  전송 시각마다 본문과 첨부 파일을 미리 인코딩한 메시지(PreparedMessage)를 만들어 둡니다.
+- 전송 시각 SCHEDULE_WARMUP_LEAD초 전에 SMTP 연결을 미리 열어 두고, 전송 시각이 되면 수신자별
+  헤더만 붙여 바로 보냅니다. 전송 시각과 전송 시작 사이의 지연은 schedule_lag_seconds 지표로 남깁니다.
+- 수신자 묶음마다 전송 시각을 따로 정할 수 있으며, 묶음마다 별도 스레드에서 보내므로 앞 묶음의
+  전송이 길어져도 다음 묶음이 늦어지지 않습니다.
+- 추출에 실패하거나 사이트가 아직 어제 말씀을 보여 주면 SCHEDULE_RETRY_INTERVAL초마다 다시 시도합니다.
+  Playwright로 캡처해야 하면 스케줄러가 떠 있는 동안 브라우저 풀(browser_pool.py) 하나를 재사용하므로
+  재시도나 다음 날 캡처에서 브라우저를 새로 띄우지 않습니다.
+  전송 시각까지 준비하지 못하면 보관소에 저장된 오늘 말씀을 사용하고, 그것도 없으면 계속 다시 시도하여
+  준비되는 즉시 늦게라도 보냅니다. (그날 자정까지)
+- 전송 원장(ledger.py)이 받은 수신자를 기록하므로, 스케줄러를 다시 시작하면 이미 지난 전송 시각의
+  남은 수신자에게 바로 보냅니다. (원장을 끄면 지난 전송 시각은 건너뜀)
+
+SCHEDULE_WINDOWS 형식 (세미콜론으로 구분):
+    06:00                                   EMAIL_RECIPIENTS에게 06:00에 전송
+    06:00=recipients_a.csv;07:30=jsonl:b    묶음마다 전송 시각과 RECIPIENT_SOURCE 형식의 수신자 원본 지정
+    06:00;07:30=recipients_b.csv            원본을 생략한 묶음은 EMAIL_RECIPIENTS
+
+사용 예:
+    python -m daily_bible_crawler.scheduler
+    python -m daily_bible_crawler.scheduler --windows "06:00;07:30=recipients_b.csv"
+    python -m daily_bible_crawler.scheduler --once    # 오늘 일정만 실행하고 종료
+"""
+import argparse
+import contextvars
+import os
+import signal
+import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+
+from loguru import logger
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.browser_pool import BROWSER_POOL_ENABLED, BrowserPool, record_pool_stats
+from daily_bible_crawler.cache import ContentCache
+from daily_bible_crawler.ledger import LEDGER_ENABLED
+from daily_bible_crawler.recipients import add_shard_arguments, open_recipient_source
+from daily_bible_crawler.main import (
+    ARCHIVE_BACKEND,
+    CACHE_ENABLED,
+    CHANGE_DETECTION_ENABLED,
+    EMAIL_APP_PASSWORD,
+    EMAIL_RECIPIENTS,
+    EMAIL_SENDER,
+    OAUTH_CREDENTIALS_PATH,
+    TEXTS_DIR,
+    archive_file_path,
+    capture_reading,
+    create_html_email,
+    init,
+    render_reading,
+    save_html_file,
+    save_reading,
+    save_text_file,
+    send_email,
+    update_indexes,
+)
+
+SCHEDULE_WINDOWS = os.environ.get('SCHEDULE_WINDOWS', '06:00')
+# 첫 전송 시각보다 몇 초 먼저 추출과 렌더링을 시작할지
+SCHEDULE_PREPARE_LEAD = float(os.environ.get('SCHEDULE_PREPARE_LEAD', '1800'))
+# 추출에 실패했을 때 다시 시도할 간격(초)
+SCHEDULE_RETRY_INTERVAL = float(os.environ.get('SCHEDULE_RETRY_INTERVAL', '60'))
+# 전송 시각보다 몇 초 먼저 SMTP 연결을 열어 둘지
+SCHEDULE_WARMUP_LEAD = float(os.environ.get('SCHEDULE_WARMUP_LEAD', '20'))
+# 오래 기다릴 때 한 번에 기다릴 최대 시간(초). 시스템 시계가 바뀌어도 다시 계산하도록 나누어 기다림
+SCHEDULE_MAX_WAIT = 60
+
+
+class DeliveryWindow:
+    """수신자 묶음과 그 묶음에 보낼 하루 중 시각"""
+
+    __slots__ = ('at', 'recipients')
+
+    def __init__(self, at, recipients=None):
+        """
+        Args:
+            at (datetime.time): 전송 시각
+            recipients (RecipientSource, optional): 수신자 원본 (기본값: EMAIL_RECIPIENTS)
+        """
+        self.at = at
+        self.recipients = EMAIL_RECIPIENTS if recipients is None else recipients
+
+    def scheduled(self, day):
+        """
+        Args:
+            day (date): 날짜
+
+        Returns:
+            datetime: 그날의 전송 예정 시각
+        """
+        return datetime.combine(day, self.at)
+
+    def __repr__(self):
+        return f"DeliveryWindow({self.at.strftime('%H:%M')}, {self.recipients!r})"
+
+
+def parse_windows(value, shard_index=None, shard_count=None):
+    """
+    SCHEDULE_WINDOWS 형식의 문자열을 전송 시각 순서로 읽습니다.
+
+    Args:
+        value (str): '<HH:MM>[=<수신자 원본>]'을 세미콜론으로 구분한 문자열
+        shard_index (int, optional): 수신자 원본에 적용할 샤드 번호 (기본값: EMAIL_RECIPIENTS의 샤드)
+        shard_count (int, optional): 전체 샤드 수 (기본값: EMAIL_RECIPIENTS의 샤드 수)
+
+    Returns:
+        list: 전송 시각 순서의 DeliveryWindow 목록
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 전송 시각이 없는 경우
+    """
+    shard = {
+        'shard_index': EMAIL_RECIPIENTS.shard_index if shard_index is None else shard_index,
+        'shard_count': EMAIL_RECIPIENTS.shard_count if shard_count is None else shard_count,
+    }
+    windows = []
+    for item in value.split(';'):
+        at, _, spec = item.strip().partition('=')
+        if not at:
+            continue
+        try:
+            at = datetime.strptime(at.strip(), '%H:%M').time()
+        except ValueError:
+            raise ValueError(f"잘못된 전송 시각입니다: {item!r} (HH:MM 형식)") from None
+        spec = spec.strip()
+        windows.append(DeliveryWindow(at, open_recipient_source(spec, **shard) if spec else None))
+    if not windows:
+        raise ValueError(f"전송 시각이 없습니다: {value!r}")
+    return sorted(windows, key=lambda window: window.at)
+
+
+class ScheduledReading:
+    """전송 시각까지 준비해 둔 말씀, HTML, 전송 시각별로 미리 인코딩한 메시지"""
+
+    __slots__ = ('date', 'reading', 'subject', 'html_email', 'messages', 'source')
+
+    def __init__(self, date, reading, subject, html_email, source):
+        self.date = date
+        self.reading = reading
+        self.subject = subject
+        self.html_email = html_email
+        self.messages = {}
+        self.source = source
+
+
+class Scheduler:
+    """하루 일정에 따라 말씀을 미리 준비하고 전송 시각마다 수신자 묶음에 보냅니다."""
+
+    def __init__(self, windows, prepare_lead=SCHEDULE_PREPARE_LEAD, retry_interval=SCHEDULE_RETRY_INTERVAL,
+                 warmup_lead=SCHEDULE_WARMUP_LEAD, capture=None, send=send_email, detector=None, now=datetime.now,
+                 browser_pool=None):
+        """
+        Args:
+            windows (list): DeliveryWindow 목록
+            prepare_lead (float): 첫 전송 시각보다 먼저 준비를 시작할 시간(초)
+            retry_interval (float): 추출에 실패했을 때 다시 시도할 간격(초)
+            warmup_lead (float): 전송 시각보다 먼저 SMTP 연결을 열어 둘 시간(초)
+            capture (callable, optional): capture(date, force_refresh)로 말씀을 추출하는 함수
+                (기본값: 캐시를 사용하는 capture_reading)
+            send (callable): send_email과 같은 인자로 메일을 보내는 함수
+            detector (ChangeDetector, optional): 어제 말씀을 다시 보내지 않도록 확인할 변경 감지기
+                (기본값: CHANGE_DETECTION_ENABLED이면 새로 만듦)
+            now (callable): 현재 시각 함수 (테스트에서 바꿀 수 있음)
+            browser_pool (BrowserPool, optional): 기본 capture가 Playwright 경로에서 재사용할 브라우저 풀
+                (기본값: BROWSER_POOL_ENABLED이면 새로 만들고 close에서 닫음. 준비는 생성한 스레드에서 실행)
+        """
+        self.windows = sorted(windows, key=lambda window: window.at)
+        self.prepare_lead = prepare_lead
+        self.retry_interval = retry_interval
+        self.warmup_lead = warmup_lead
+        self.send = send
+        self.now = now
+        self.cache = ContentCache() if CACHE_ENABLED else None
+        self.capture = capture or self._capture
+        if detector is None and CHANGE_DETECTION_ENABLED:
+            from daily_bible_crawler.change_detection import ChangeDetector
+
+            detector = ChangeDetector()
+        self.detector = detector
+        if browser_pool is None and capture is None and BROWSER_POOL_ENABLED:
+            # 브라우저는 Playwright 경로가 처음 필요할 때 띄움
+            browser_pool = BrowserPool()
+        self.browser_pool = browser_pool
+        self._stop = threading.Event()
+
+    def stop(self):
+        """기다리는 중이면 바로 멈추고, 보내는 중인 묶음은 끝까지 보낸 뒤 종료합니다."""
+        self._stop.set()
+
+    def close(self):
+        """브라우저 풀을 띄웠다면 종료합니다. (run이 끝난 뒤 같은 스레드에서 호출)"""
+        if self.browser_pool is not None:
+            self.browser_pool.close()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def wait_until(self, moment):
+        """
+        지정한 시각까지 기다립니다.
+
+        Args:
+            moment (datetime): 기다릴 시각
+
+        Returns:
+            bool: 시각에 도달하면 True, 그 전에 멈추면 False
+        """
+        while not self._stop.is_set():
+            remaining = (moment - self.now()).total_seconds()
+            if remaining <= 0:
+                return True
+            self._stop.wait(min(remaining, SCHEDULE_MAX_WAIT))
+        return False
+
+    def _capture(self, date, force_refresh):
+        return capture_reading(pool=self.browser_pool, cache=self.cache, date=date, force_refresh=force_refresh)
+
+    def _is_stale(self, reading, date):
+        # 마지막으로 보낸 말씀과 같고 그게 오늘이 아니면 사이트가 아직 어제 말씀을 보여 주는 것
+        if self.detector is None or self.detector.is_new(reading):
+            return False
+        return self.detector.state.get('completed_on') != date.strftime('%Y%m%d')
+
+    def _build(self, reading, date, source):
+        with metrics.stage('build_content'):
+            content, html_content = render_reading(reading)
+        if source == 'crawl':
+            # 보관과 색인에 실패해도 전송은 계속함 (다음 실행이나 sync 명령으로 다시 만들 수 있음)
+            try:
+                if ARCHIVE_BACKEND == 'store':
+                    with metrics.stage('save_archive'):
+                        save_reading(reading, date)
+                else:
+                    with metrics.stage('save_text'):
+                        save_text_file(content, date)
+            except Exception as e:
+                logger.error(f"보관 중 오류 발생 (전송은 계속함): {str(e)}")
+        with metrics.stage('render'):
+            html_email = create_html_email(content, html_content, reading.css, date)
+        metrics.set_value('html_bytes', len(html_email.encode('utf-8')))
+        if source == 'crawl':
+            if ARCHIVE_BACKEND != 'store':
+                try:
+                    with metrics.stage('save_html'):
+                        save_html_file(html_email, date)
+                except Exception as e:
+                    logger.error(f"HTML 저장 중 오류 발생 (전송은 계속함): {str(e)}")
+            with metrics.stage('update_indexes'):
+                update_indexes(reading, date)
+
+        subject = f"[매일성경] 오늘의 말씀 - {date.strftime('%Y-%m-%d (%A)')}"
+        scheduled = ScheduledReading(date, reading, subject, html_email, source)
+        if EMAIL_SENDER:
+            from daily_bible_crawler.message_builder import PreparedMessage
+
+            # Date 헤더가 전송 시각을 가리키도록 전송 시각마다 미리 인코딩해 둠
+            with metrics.stage('mime_build'):
+                for at in {window.at for window in self.windows}:
+                    scheduled.messages[at] = PreparedMessage(EMAIL_SENDER, subject, html_email, date=date,
+                                                             sent_at=datetime.combine(date.date(), at))
+        return scheduled
+
+    def prepare(self, date, force_refresh=False):
+        """
+        말씀을 추출하고 렌더링, 보관, 색인을 마친 뒤 메시지를 미리 인코딩합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+            force_refresh (bool): 캐시를 무시하고 다시 추출할지 여부
+
+        Returns:
+            ScheduledReading | None: 준비한 말씀. 추출에 실패했거나 아직 어제 말씀이면 None
+        """
+        try:
+            with metrics.stage('capture'):
+                reading = self.capture(date, force_refresh)
+        except Exception as e:
+            logger.error(f"말씀 추출 실패: {str(e)}")
+            metrics.add('schedule_capture_failures')
+            return None
+        if self._is_stale(reading, date):
+            logger.info("사이트에 아직 새 말씀이 올라오지 않았습니다.")
+            return None
+        return self._build(reading, date, 'crawl')
+
+    def load_archived(self, date):
+        """
+        보관소(또는 'files'이면 HTML 파일)에 이미 저장된 오늘 말씀으로 메시지를 준비합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            ScheduledReading | None: 준비한 말씀. 저장된 말씀이 없으면 None
+        """
+        try:
+            if ARCHIVE_BACKEND == 'store':
+                from daily_bible_crawler.archive import ArchiveStore
+
+                reading = ArchiveStore(TEXTS_DIR).get(date)
+            else:
+                from daily_bible_crawler.archive import parse_archived_html
+
+                path = archive_file_path(date, 'html')
+                if not os.path.exists(path):
+                    return None
+                with open(path, encoding='utf-8') as f:
+                    reading = parse_archived_html(f.read(), date)
+        except Exception as e:
+            logger.error(f"보관된 말씀을 읽지 못했습니다: {str(e)}")
+            return None
+        if reading is None:
+            return None
+        logger.info(f"보관소에 저장된 말씀으로 전송을 준비합니다. ({date.strftime('%Y-%m-%d')})")
+        return self._build(reading, date, 'archive')
+
+    def prepare_until(self, date, deadline):
+        """
+        deadline까지 준비를 다시 시도하고, 그때까지 실패하면 보관된 말씀을 사용합니다.
+
+        다음 재시도가 deadline을 넘기면 기다리지 않고 바로 보관된 말씀을 찾으므로, 보관된 말씀이
+        있으면 전송 시각 전에 준비가 끝납니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+            deadline (datetime): 첫 전송 시각
+
+        Returns:
+            ScheduledReading | None: 준비한 말씀
+        """
+        attempt = 0
+        while not self.stopped:
+            scheduled = self.prepare(date, force_refresh=attempt > 0)
+            if scheduled is not None:
+                return scheduled
+            attempt += 1
+            retry_at = self.now() + timedelta(seconds=self.retry_interval)
+            if retry_at >= deadline:
+                break
+            logger.info(f"{self.retry_interval:.0f}초 후 다시 추출합니다. ({attempt}회 실패)")
+            self.wait_until(retry_at)
+        return None if self.stopped else self.load_archived(date)
+
+    def _open_pool(self):
+        # 앱 비밀번호로 보낼 때만 연결을 미리 엶 (Gmail API 서비스는 프로세스 안에서 재사용됨)
+        if os.path.exists(OAUTH_CREDENTIALS_PATH) or not EMAIL_SENDER or not EMAIL_APP_PASSWORD:
+            return None
+        from daily_bible_crawler.smtp_sender import SmtpConnectionPool
+
+        pool = SmtpConnectionPool(EMAIL_SENDER, EMAIL_APP_PASSWORD)
+        try:
+            pool.warm_up()
+        except (smtplib.SMTPException, OSError) as e:
+            logger.warning(f"SMTP 연결을 미리 열지 못했습니다. 전송할 때 다시 연결합니다: {e}")
+        return pool
+
+    def deliver(self, scheduled, window, pool=None):
+        """
+        준비한 메시지를 수신자 묶음에 보냅니다.
+
+        Args:
+            scheduled (ScheduledReading): 준비한 말씀
+            window (DeliveryWindow): 전송 시각과 수신자 묶음
+            pool (SmtpConnectionPool, optional): 미리 연결해 둔 연결 풀 (보낸 뒤 닫음)
+
+        Returns:
+            bool: 모든 수신자에게 보냈으면 True
+        """
+        lag = (self.now() - window.scheduled(scheduled.date.date())).total_seconds()
+        metrics.observe_max('schedule_lag_seconds', lag)
+        logger.info(f"{window.at.strftime('%H:%M')} 전송 시작 ({window.recipients!r}, 예정 시각 대비 {lag:.3f}초)")
+        try:
+            self.send(scheduled.subject, scheduled.html_email, raise_errors=True, date=scheduled.date,
+                      recipients=window.recipients, prepared=scheduled.messages.get(window.at), pool=pool)
+        except Exception as e:
+            logger.error(f"{window.at.strftime('%H:%M')} 전송 중 오류 발생: {str(e)}")
+            return False
+        finally:
+            if pool is not None:
+                pool.close()
+        return True
+
+    def run_day(self, day, catch_up=LEDGER_ENABLED):
+        """
+        하루 일정을 실행합니다. 모든 묶음에 보내거나 그날이 끝나면 돌아옵니다.
+
+        Args:
+            day (date): 날짜
+            catch_up (bool): 이미 지난 전송 시각의 묶음에도 바로 보낼지 여부 (전송 원장이 있을 때만 안전)
+
+        Returns:
+            bool: 모든 묶음에 보냈으면 True
+        """
+        date = datetime.combine(day, time())
+        end_of_day = date + timedelta(days=1)
+        now = self.now()
+        windows = [window for window in self.windows if catch_up or window.scheduled(day) > now]
+        if not windows:
+            return True
+
+        first = windows[0].scheduled(day)
+        if not self.wait_until(first - timedelta(seconds=self.prepare_lead)):
+            return False
+        logger.info(f"{day.strftime('%Y-%m-%d')} 전송 준비 시작 (첫 전송 {first.strftime('%H:%M')})")
+        scheduled = self.prepare_until(date, first)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=len(windows), thread_name_prefix='scheduled-send') as executor:
+            for window in windows:
+                # 준비하지 못했으면 그날이 끝날 때까지 다시 시도하고 준비되는 즉시 보냄
+                while scheduled is None and not self.stopped:
+                    if self.now() + timedelta(seconds=self.retry_interval) >= end_of_day:
+                        break
+                    logger.warning(f"{window.at.strftime('%H:%M')} 전송 시각까지 말씀을 준비하지 못해 계속 다시 시도합니다.")
+                    self.wait_until(self.now() + timedelta(seconds=self.retry_interval))
+                    scheduled = self.prepare(date, force_refresh=True)
+                if scheduled is None:
+                    logger.error(f"{day.strftime('%Y-%m-%d')} 말씀을 준비하지 못해 전송하지 못했습니다.")
+                    metrics.set_value('schedule_missed', 1)
+                    break
+
+                at = window.scheduled(day)
+                if not self.wait_until(at - timedelta(seconds=self.warmup_lead)):
+                    break
+                pool = self._open_pool()
+                if not self.wait_until(at):
+                    if pool is not None:
+                        pool.close()
+                    break
+                # 지표는 현재 실행(RunMetrics)에 기록되도록 컨텍스트를 복사하여 작업 스레드에서 실행
+                context = contextvars.copy_context()
+                results.append(executor.submit(context.run, self.deliver, scheduled, window, pool))
+        delivered = len(results) == len(windows) and all(future.result() for future in results)
+
+        if delivered and self.detector is not None:
+            self.detector.record(scheduled.reading)
+        return delivered
+
+    def run(self, once=False):
+        """
+        멈출 때까지 날마다 일정을 실행합니다.
+
+        Args:
+            once (bool): 오늘 일정만 실행하고 돌아올지 여부
+        """
+        day = self.now().date()
+        catch_up = LEDGER_ENABLED
+        while not self.stopped:
+            with metrics.RunMetrics.from_env(labels=EMAIL_RECIPIENTS.shard_labels()):
+                self.run_day(day, catch_up=catch_up)
+                # 브라우저 풀 통계는 스케줄러를 시작한 뒤의 누적값
+                record_pool_stats(self.browser_pool)
+            if once:
+                break
+            day += timedelta(days=1)
+            catch_up = True
+
+
+def main(windows=SCHEDULE_WINDOWS, once=False):
+    """
+    스케줄러를 실행합니다. SIGTERM이나 Ctrl+C를 받으면 보내는 중인 묶음을 마친 뒤 종료합니다.
+
+    Args:
+        windows (str): SCHEDULE_WINDOWS 형식의 전송 일정
+        once (bool): 오늘 일정만 실행하고 종료할지 여부
+    """
+    scheduler = Scheduler(parse_windows(windows))
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: scheduler.stop())
+    logger.info(f"스케줄러 시작: {scheduler.windows!r}")
+    try:
+        scheduler.run(once=once)
+    finally:
+        scheduler.close()
+    logger.info("스케줄러 종료")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="정해진 시각에 미리 준비한 말씀을 수신자 묶음별로 보내는 상주 스케줄러입니다.")
+    parser.add_argument('--windows', default=SCHEDULE_WINDOWS,
+                        help="전송 일정 (예: '06:00;07:30=recipients_b.csv', 기본값: SCHEDULE_WINDOWS)")
+    parser.add_argument('--once', action='store_true', help="오늘 일정만 실행하고 종료")
+    add_shard_arguments(parser)
+    args = parser.parse_args()
+    EMAIL_RECIPIENTS.select_shard(args.shard_index, args.shard_count)
+    init()
+    main(windows=args.windows, once=args.once)
@@ -0,0 +1,313 @@
+"""
+보관한 말씀과 해설을 SQLite FTS5로 검색하는 전문 검색 색인 모듈입니다.
+
+날짜마다 말씀 구절 하나당 한 행, 해설 섹션 하나당 한 행을 FTS5 테이블에 넣습니다. 한국어는
+띄어쓰기 단위로 조사가 붙어 단어 단위 토크나이저로는 찾기 어려우므로 trigram 토크나이저를 사용해
+세 글자 이상의 부분 문자열을 색인으로 바로 찾습니다. ('제자도'는 '제자도를'에서도 찾음)
+두 글자 이하 검색어는 trigram으로 찾을 수 없으므로 LIKE로 거릅니다.
+
+main은 저장한 날짜를 바로 색인에 넣고(SEARCH_ENABLED), sync는 보관소나 texts/의 파일 중
+색인한 뒤 바뀐 날짜만 다시 색인합니다. 검색 결과는 bm25 점수 순서로 반환합니다.
+
+사용 예:
+    python -m daily_bible_crawler.search sync                  # 보관소의 새 날짜와 바뀐 날짜를 색인
+    python -m daily_bible_crawler.search query 십자가 --kind section --limit 5
+    python -m daily_bible_crawler.search query "제자도 대가" --from 2024-01-01
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from datetime import datetime
+
+from loguru import logger
+
+from daily_bible_crawler.archive import archived_days
+
+SEARCH_ENABLED = os.environ.get('SEARCH_ENABLED', 'true').lower() != 'false'
+SEARCH_INDEX_PATH = os.environ.get('SEARCH_INDEX_PATH', os.path.join('cache', 'search_index.sqlite3'))
+SEARCH_SNIPPET_CHARS = 30  # 검색어 앞뒤로 보여 줄 글자 수
+
+KIND_VERSE = 'verse'
+KIND_SECTION = 'section'
+# trigram 토크나이저가 색인으로 찾을 수 있는 최소 검색어 길이
+TRIGRAM_MIN_CHARS = 3
+
+
+class SearchHit:
+    """검색 결과 하나 (날짜, 종류, 구절 번호 또는 섹션 순서, 제목, 본문 일부, 점수)"""
+
+    __slots__ = ('date', 'kind', 'ref', 'label', 'snippet', 'score')
+
+    def __init__(self, date, kind, ref, label, snippet, score):
+        self.date = date
+        self.kind = kind
+        self.ref = ref
+        self.label = label
+        self.snippet = snippet
+        self.score = score
+
+    def __repr__(self):
+        return f"SearchHit({self.date:%Y-%m-%d}, {self.kind}, {self.ref!r}, {self.snippet[:20]!r})"
+
+
+class SearchIndex:
+    """날짜별 말씀 구절과 해설 섹션의 FTS5 전문 검색 색인"""
+
+    def __init__(self, path=SEARCH_INDEX_PATH):
+        """
+        Args:
+            path (str): SQLite 파일 경로
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            # 본문은 일반 테이블(날짜 색인 포함)에 두고 FTS5는 그 행을 가리키는 외부 내용 색인으로 만듦
+            # label: 구절은 말씀 헤더의 제목 줄, 섹션은 소제목 / body: 구절 본문 또는 섹션 내용
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS passages (
+                    id INTEGER PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    ref TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    body TEXT NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS passages_date ON passages (date)')
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+                    label, body, content = 'passages', content_rowid = 'id', tokenize = 'trigram'
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS indexed_days (
+                    date TEXT PRIMARY KEY,
+                    version REAL NOT NULL
+                )
+            ''')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _key(date):
+        return date.strftime('%Y%m%d')
+
+    def add_reading(self, reading, date=None, version=None):
+        """
+        하루치 말씀을 색인합니다. 같은 날짜가 이미 있으면 바꿉니다.
+
+        Args:
+            reading (DailyReading): 말씀 모델
+            date (datetime, optional): 말씀 날짜 (기본값: reading.date)
+            version (float, optional): 원본의 저장 시각 (기본값: 지금)
+        """
+        key = self._key(date or reading.date)
+        # 헤더의 둘째 줄이 제목 (예: '매일성경 2025.03.24(월)\n제자도\n본문 : ...')
+        header_lines = reading.header.split('\n')
+        heading = header_lines[1] if len(header_lines) > 1 else header_lines[0]
+        rows = [(key, KIND_VERSE, verse.number, heading, verse.text) for verse in reading.verses]
+        rows += [
+            (key, KIND_SECTION, str(index), section.subtitle, section.content)
+            for index, section in enumerate(reading.sections, 1)
+        ]
+        with closing(self._connect()) as conn, conn:
+            self._delete_day(conn, key)
+            for row in rows:
+                rowid = conn.execute(
+                    'INSERT INTO passages (date, kind, ref, label, body) VALUES (?, ?, ?, ?, ?)', row
+                ).lastrowid
+                conn.execute('INSERT INTO entries (rowid, label, body) VALUES (?, ?, ?)', (rowid, row[3], row[4]))
+            conn.execute(
+                'INSERT OR REPLACE INTO indexed_days (date, version) VALUES (?, ?)',
+                (key, version if version is not None else time.time()),
+            )
+
+    def remove(self, date):
+        """
+        날짜를 색인에서 뺍니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+        """
+        key = self._key(date)
+        with closing(self._connect()) as conn, conn:
+            self._delete_day(conn, key)
+            conn.execute('DELETE FROM indexed_days WHERE date = ?', (key,))
+
+    @staticmethod
+    def _delete_day(conn, key):
+        # 외부 내용 색인은 지울 행의 원래 값을 'delete' 명령으로 알려 주어야 함
+        conn.execute('''
+            INSERT INTO entries (entries, rowid, label, body)
+            SELECT 'delete', id, label, body FROM passages WHERE date = ?
+        ''', (key,))
+        conn.execute('DELETE FROM passages WHERE date = ?', (key,))
+
+    def versions(self):
+        """
+        색인한 날짜와 색인할 때의 원본 저장 시각을 반환합니다.
+
+        Returns:
+            dict: {datetime: 저장 시각(float)}
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT date, version FROM indexed_days').fetchall()
+        return {datetime.strptime(key, '%Y%m%d'): version for key, version in rows}
+
+    def search(self, query, kind=None, start=None, end=None, limit=20):
+        """
+        검색어를 모두 포함하는 구절과 해설 섹션을 관련도 순서로 찾습니다.
+
+        검색어는 공백으로 나누며, 세 글자 이상은 FTS5 색인으로 찾고 bm25 점수(제목 가중치 2배)로
+        정렬합니다. 모든 검색어가 두 글자 이하이면 LIKE로 찾고 최근 날짜부터 반환합니다.
+
+        Args:
+            query (str): 검색어
+            kind (str, optional): 'verse' 또는 'section'만 찾을 때 지정
+            start (datetime, optional): 시작일 (포함)
+            end (datetime, optional): 종료일 (포함)
+            limit (int): 최대 결과 수
+
+        Returns:
+            list: SearchHit 목록 (점수가 낮을수록 관련도가 높음)
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        long_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_CHARS]
+        short_terms = [term for term in terms if len(term) < TRIGRAM_MIN_CHARS]
+
+        conditions, params = [], []
+        if long_terms:
+            # 각 검색어를 FTS5 문자열로 감싸 연산자로 해석되지 않게 함
+            conditions.append('entries MATCH ?')
+            params.append(' AND '.join('"' + term.replace('"', '""') + '"' for term in long_terms))
+        for term in short_terms:
+            conditions.append("(p.label LIKE ? ESCAPE '\\' OR p.body LIKE ? ESCAPE '\\')")
+            pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            params += [pattern, pattern]
+        if kind is not None:
+            conditions.append('p.kind = ?')
+            params.append(kind)
+        if start is not None:
+            conditions.append('p.date >= ?')
+            params.append(self._key(start))
+        if end is not None:
+            conditions.append('p.date <= ?')
+            params.append(self._key(end))
+
+        if long_terms:
+            sql = ('SELECT p.date, p.kind, p.ref, p.label, p.body, bm25(entries, 2.0, 1.0) AS score '
+                   'FROM entries JOIN passages AS p ON p.id = entries.rowid '
+                   f'WHERE {" AND ".join(conditions)} ORDER BY score, p.date DESC LIMIT ?')
+        else:
+            sql = ('SELECT p.date, p.kind, p.ref, p.label, p.body, 0.0 AS score FROM passages AS p '
+                   f'WHERE {" AND ".join(conditions)} ORDER BY p.date DESC, p.id LIMIT ?')
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        return [
+            SearchHit(datetime.strptime(key, '%Y%m%d'), row_kind, ref, label, make_snippet(body, terms), score)
+            for key, row_kind, ref, label, body, score in rows
+        ]
+
+    def stats(self):
+        """
+        색인한 날짜 수와 행 수를 반환합니다.
+
+        Returns:
+            dict: {'days': int, 'verses': int, 'sections': int}
+        """
+        with closing(self._connect()) as conn:
+            days = conn.execute('SELECT COUNT(*) FROM indexed_days').fetchone()[0]
+            counts = dict(conn.execute('SELECT kind, COUNT(*) FROM passages GROUP BY kind').fetchall())
+        return {'days': days, 'verses': counts.get(KIND_VERSE, 0), 'sections': counts.get(KIND_SECTION, 0)}
+
+
+def make_snippet(text, terms, width=SEARCH_SNIPPET_CHARS):
+    """
+    본문에서 처음 나오는 검색어 주변만 잘라 검색어를 [ ]로 표시합니다.
+
+    Args:
+        text (str): 본문
+        terms (list): 검색어 목록
+        width (int): 검색어 앞뒤로 남길 글자 수
+
+    Returns:
+        str: 본문 일부 (검색어가 본문에 없으면 앞부분)
+    """
+    lowered = text.lower()
+    found = [(lowered.find(term.lower()), term) for term in terms if term.lower() in lowered]
+    if not found:
+        return text[:width * 2] + ('…' if len(text) > width * 2 else '')
+    position, term = min(found)
+    begin, end = max(0, position - width), min(len(text), position + len(term) + width)
+    return (
+        ('…' if begin > 0 else '') + text[begin:position]
+        + '[' + text[position:position + len(term)] + ']'
+        + text[position + len(term):end] + ('…' if end < len(text) else '')
+    ).replace('\n', ' ')
+
+
+def sync_index(directory=None, index=None):
+    """
+    보관소(와 이전 방식의 .html 파일)에서 색인에 없거나 색인한 뒤 바뀐 날짜만 색인합니다.
+
+    Args:
+        directory (str, optional): 보관 디렉토리 (기본값: TEXTS_DIR)
+        index (SearchIndex, optional): 색인 (기본값: SEARCH_INDEX_PATH)
+
+    Returns:
+        int: 새로 색인한 날짜 수
+    """
+    if directory is None:
+        from daily_bible_crawler.main import TEXTS_DIR
+
+        directory = TEXTS_DIR
+    index = index or SearchIndex()
+    indexed = index.versions()
+    started_at = time.perf_counter()
+    count = 0
+    for date, (version, load) in sorted(archived_days(directory).items()):
+        if indexed.get(date, -1.0) >= version:
+            continue
+        index.add_reading(load(), date, version)
+        count += 1
+    logger.info(f"검색 색인 갱신: {count}일 ({time.perf_counter() - started_at:.2f}초)")
+    return count
+
+
+if __name__ == "__main__":
+    def parse_date(value):
+        return datetime.strptime(value, '%Y-%m-%d')
+
+    parser = argparse.ArgumentParser(description="보관한 말씀과 해설을 검색합니다.")
+    parser.add_argument('--index', default=SEARCH_INDEX_PATH, help="색인 파일 경로 (기본값: SEARCH_INDEX_PATH)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sync_parser = commands.add_parser('sync', help="보관소의 새 날짜와 바뀐 날짜를 색인")
+    sync_parser.add_argument('--dir', default=None, help="보관 디렉토리 (기본값: TEXTS_DIR)")
+    sync_parser.add_argument('--rebuild', action='store_true', help="색인을 지우고 처음부터 다시 만듦")
+
+    query_parser = commands.add_parser('query', help="검색어로 찾기")
+    query_parser.add_argument('query', help="검색어 (공백으로 나눈 검색어를 모두 포함하는 항목을 찾음)")
+    query_parser.add_argument('--kind', choices=(KIND_VERSE, KIND_SECTION), default=None)
+    query_parser.add_argument('--from', dest='start', type=parse_date, default=None, help="시작일 (YYYY-MM-DD)")
+    query_parser.add_argument('--to', dest='end', type=parse_date, default=None, help="종료일 (YYYY-MM-DD)")
+    query_parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'sync':
+        if args.rebuild and os.path.exists(args.index):
+            os.remove(args.index)
+        sync_index(args.dir, SearchIndex(args.index))
+    else:
+        started_at = time.perf_counter()
+        hits = SearchIndex(args.index).search(args.query, args.kind, args.start, args.end, args.limit)
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        for hit in hits:
+            print(f"{hit.date:%Y-%m-%d}\t{hit.kind}\t{hit.ref}\t{hit.label}\t{hit.snippet}")
+        print(f"{len(hits)}건 ({elapsed_ms:.1f}ms)", file=sys.stderr)
@@ -0,0 +1,419 @@
+"""
+오늘과 지난 날짜의 말씀을 HTTP로 제공하는 읽기 전용 API 서버입니다.
+
+챗봇이나 키오스크처럼 말씀이 필요한 다른 프로그램이 각자 크롤링하거나 texts/ 파일을 직접 읽지 않도록,
+보관소(archive.py, 'files'이면 .html 파일)에 저장된 말씀을 날짜별로 제공합니다. 서버는 사이트에
+접속하지 않으며, main이나 스케줄러가 한 번 추출하여 보관한 말씀만 사용합니다.
+
+- 최근에 요청한 SERVER_CACHE_DAYS일의 응답(JSON, HTML, 텍스트)을 미리 인코딩하여 메모리에 LRU로 둡니다.
+  캐시에 있는 날짜는 보관소를 읽지 않고 인코딩해 둔 바이트를 그대로 보냅니다.
+- 응답마다 내용 해시로 만든 ETag를 붙이고, If-None-Match가 같으면 본문 없이 304로 응답합니다.
+- 백그라운드 스레드가 SERVER_REFRESH_INTERVAL초마다 보관소의 날짜별 저장 시각을 확인하여, 새로 저장된
+  가장 최근 날짜와 다시 저장된 캐시 날짜를 미리 렌더링하여 캐시를 채웁니다. 새 말씀이 저장된 뒤 첫 요청도
+  렌더링을 기다리지 않습니다.
+
+경로:
+    GET /readings                  저장된 날짜 목록 (JSON)
+    GET /readings/today            오늘 말씀 (JSON)
+    GET /readings/latest           가장 최근에 저장된 말씀
+    GET /readings/2025-03-24       날짜의 말씀
+    GET /readings/today.html       이메일 첨부와 같은 HTML
+    GET /readings/today.txt        텍스트 파일과 같은 텍스트
+    GET /healthz                   저장된 날짜 수와 캐시 적중률
+
+사용 예:
+    python -m daily_bible_crawler.server
+    python -m daily_bible_crawler.server --host 0.0.0.0 --port 8080
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from daily_bible_crawler.archive import archived_days
+
+SERVER_HOST = os.environ.get('SERVER_HOST', '127.0.0.1')
+SERVER_PORT = int(os.environ.get('SERVER_PORT', '8080'))
+SERVER_CACHE_DAYS = int(os.environ.get('SERVER_CACHE_DAYS', '32'))  # 메모리에 둘 최대 날짜 수
+SERVER_REFRESH_INTERVAL = float(os.environ.get('SERVER_REFRESH_INTERVAL', '30'))  # 보관소 확인 간격(초)
+
+CONTENT_TYPES = {
+    'json': 'application/json; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+    'txt': 'text/plain; charset=utf-8',
+}
+
+
+def _position_text(position):
+    # passages.verse_position의 반대 (장 * 1000 + 절 -> '장:절')
+    return f"{position // 1000}:{position % 1000}"
+
+
+def reading_document(reading, date):
+    """
+    말씀을 API가 돌려주는 JSON 문서로 바꿉니다. (사이트 CSS는 넣지 않음)
+
+    Args:
+        reading (DailyReading): 말씀 모델
+        date (datetime): 말씀 날짜
+
+    Returns:
+        dict: 날짜, 본문 범위, 추출 함수와 같은 형식의 말씀과 해설
+    """
+    from daily_bible_crawler.passages import parse_reference
+
+    bible_data, explanation_data, _ = reading.to_dicts()
+    passage = parse_reference(reading.header)
+    return {
+        'date': date.strftime('%Y-%m-%d'),
+        'passage': passage and {
+            'korean': passage.korean,
+            'english': passage.english,
+            'start': _position_text(passage.start),
+            'end': _position_text(passage.end),
+        },
+        **bible_data,
+        **explanation_data,
+    }
+
+
+class Representation:
+    """미리 인코딩한 응답 본문과 ETag"""
+
+    __slots__ = ('body', 'etag', 'content_type')
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.content_type = content_type
+
+    @classmethod
+    def json(cls, document):
+        return cls(json.dumps(document, ensure_ascii=False).encode('utf-8'), CONTENT_TYPES['json'])
+
+
+class CachedDay:
+    """한 날짜의 응답 형식별 Representation과 렌더링한 보관소 저장 시각"""
+
+    __slots__ = ('date', 'version', 'representations')
+
+    def __init__(self, date, version, representations):
+        self.date = date
+        self.version = version
+        self.representations = representations
+
+    @classmethod
+    def render(cls, reading, date, version):
+        """
+        말씀을 JSON, HTML, 텍스트로 렌더링하여 인코딩합니다.
+
+        Args:
+            reading (DailyReading): 말씀 모델
+            date (datetime): 말씀 날짜
+            version (float): 보관소 저장 시각
+
+        Returns:
+            CachedDay: 캐시 항목
+        """
+        from daily_bible_crawler.main import create_html_email, format_text_content, render_reading
+
+        content, html_content = render_reading(reading)
+        html_email = create_html_email(content, html_content, reading.css, date)
+        return cls(date, version, {
+            'json': Representation.json(reading_document(reading, date)),
+            'html': Representation(html_email.encode('utf-8'), CONTENT_TYPES['html']),
+            'txt': Representation(format_text_content(content).encode('utf-8'), CONTENT_TYPES['txt']),
+        })
+
+
+class ReadingCache:
+    """보관소의 날짜 목록과 최근 날짜의 렌더링 결과를 LRU로 들고 있는 캐시"""
+
+    def __init__(self, directory=None, capacity=SERVER_CACHE_DAYS):
+        """
+        Args:
+            directory (str, optional): 보관 디렉토리 (기본값: TEXTS_DIR)
+            capacity (int): 메모리에 둘 최대 날짜 수
+        """
+        if directory is None:
+            from daily_bible_crawler.main import TEXTS_DIR
+
+            directory = TEXTS_DIR
+        self.directory = directory
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._days = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+        self.refresh()
+
+    def refresh(self):
+        """
+        보관소의 날짜별 저장 시각을 다시 읽고, 가장 최근 날짜와 바뀐 캐시 날짜를 다시 렌더링합니다.
+
+        Returns:
+            list: 새로 저장되었거나 다시 저장된 날짜
+        """
+        days = archived_days(self.directory)
+        previous = self._days
+        changed = sorted(date for date, (version, _) in days.items()
+                         if date not in previous or previous[date][0] != version)
+        with self._lock:
+            self._days = days
+            for date in [date for date in self._entries if date not in days]:
+                del self._entries[date]
+            refill = [date for date in changed if date in self._entries]
+        if days and max(days) in changed and max(days) not in refill:
+            refill.append(max(days))
+        for date in refill:
+            try:
+                self._load(date)
+            except Exception as e:
+                logger.error(f"{date.strftime('%Y-%m-%d')} 말씀을 캐시에 올리지 못했습니다: {str(e)}")
+        if changed:
+            logger.info(f"보관소 갱신: {len(changed)}일 변경, {len(refill)}일 미리 렌더링")
+        return changed
+
+    def _load(self, date):
+        version, load = self._days[date]
+        reading = load()
+        if reading is None:
+            return None
+        entry = CachedDay.render(reading, date, version)
+        with self._lock:
+            # 렌더링하는 사이에 더 새로 저장되었으면 다음 갱신에서 다시 렌더링함
+            self._entries[date] = entry
+            self._entries.move_to_end(date)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get(self, date):
+        """
+        날짜의 캐시 항목을 반환합니다. 캐시에 없으면 보관소에서 읽어 렌더링합니다.
+
+        Args:
+            date (datetime): 말씀 날짜
+
+        Returns:
+            CachedDay | None: 보관소에 없는 날짜이면 None
+        """
+        with self._lock:
+            entry = self._entries.get(date)
+            if entry is not None:
+                self._entries.move_to_end(date)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            if date not in self._days:
+                return None
+        return self._load(date)
+
+    def latest(self):
+        """가장 최근에 저장된 날짜 (없으면 None)"""
+        days = self._days
+        return max(days) if days else None
+
+    def dates(self):
+        """저장된 날짜를 오래된 순서로 반환합니다."""
+        return sorted(self._days)
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'days', 'cached', 'hits', 'misses', 'latest'}
+        """
+        latest = self.latest()
+        with self._lock:
+            return {
+                'days': len(self._days),
+                'cached': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'latest': latest and latest.strftime('%Y-%m-%d'),
+            }
+
+    def start_refresher(self, interval=SERVER_REFRESH_INTERVAL):
+        """
+        interval초마다 refresh를 실행하는 백그라운드 스레드를 시작합니다.
+
+        Returns:
+            threading.Thread: 시작한 스레드
+        """
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"보관소 갱신 중 오류 발생: {str(e)}")
+
+        thread = threading.Thread(target=run, name='reading-cache-refresher', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """백그라운드 갱신을 멈춥니다."""
+        self._stop.set()
+
+
+def etag_matches(header, etag):
+    """
+    If-None-Match 헤더가 ETag와 맞는지 확인합니다. (약한 비교, '*' 포함)
+
+    Args:
+        header (str | None): If-None-Match 헤더 값
+        etag (str): 응답의 ETag
+
+    Returns:
+        bool: 304로 응답할 수 있으면 True
+    """
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or any(value.removeprefix('W/') == etag for value in candidates)
+
+
+class ReadingRequestHandler(BaseHTTPRequestHandler):
+    """/readings와 /healthz 요청을 처리합니다. (server.cache의 ReadingCache 사용)"""
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'DailyBibleCrawler'
+    # 헤더와 본문을 따로 쓰므로, 연결을 유지할 때 지연 ACK를 기다리며 멈추지 않도록 Nagle 알고리즘을 끔
+    disable_nagle_algorithm = True
+
+    def log_request(self, code='-', size='-'):
+        # 초당 수천 건의 정상 요청은 로그로 남기지 않음
+        pass
+
+    def log_message(self, format, *args):
+        logger.warning(f"{self.address_string()} {format % args}")
+
+    def _send(self, status, representation=None, head=False):
+        if representation is None:
+            representation = Representation.json({'error': status.phrase})
+        if status == HTTPStatus.OK and etag_matches(self.headers.get('If-None-Match'), representation.etag):
+            status = HTTPStatus.NOT_MODIFIED
+        self.send_response(status)
+        self.send_header('ETag', representation.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        if status == HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_header('Content-Type', representation.content_type)
+        self.send_header('Content-Length', str(len(representation.body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(representation.body)
+
+    def _resolve_date(self, key):
+        cache = self.server.cache
+        if key == 'today':
+            return datetime.combine(datetime.now().date(), datetime.min.time())
+        if key == 'latest':
+            return cache.latest()
+        try:
+            return datetime.strptime(key, '%Y-%m-%d')
+        except ValueError:
+            return None
+
+    def _handle(self, head=False):
+        path = urlsplit(self.path).path.rstrip('/')
+        cache = self.server.cache
+        if path == '/healthz':
+            self._send(HTTPStatus.OK, Representation.json({'status': 'ok', **cache.stats()}), head)
+            return
+        if path == '/readings':
+            dates = [date.strftime('%Y-%m-%d') for date in cache.dates()]
+            self._send(HTTPStatus.OK, Representation.json({'dates': dates}), head)
+            return
+
+        prefix, _, name = path.rpartition('/')
+        key, _, extension = name.partition('.')
+        extension = extension or 'json'
+        if prefix != '/readings' or extension not in CONTENT_TYPES:
+            self._send(HTTPStatus.NOT_FOUND, head=head)
+            return
+        date = self._resolve_date(key)
+        try:
+            entry = cache.get(date) if date is not None else None
+        except Exception as e:
+            logger.error(f"{key} 말씀을 읽지 못했습니다: {str(e)}")
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, head=head)
+            return
+        if entry is None:
+            self._send(HTTPStatus.NOT_FOUND, head=head)
+            return
+        self._send(HTTPStatus.OK, entry.representations[extension], head)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_HEAD(self):
+        self._handle(head=True)
+
+
+class ReadingServer(ThreadingHTTPServer):
+    """연결마다 스레드에서 요청을 처리하는 HTTP 서버 (ReadingCache를 공유)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, cache):
+        """
+        Args:
+            address (tuple): (호스트, 포트)
+            cache (ReadingCache): 응답 캐시
+        """
+        self.cache = cache
+        super().__init__(address, ReadingRequestHandler)
+
+
+def serve(host=SERVER_HOST, port=SERVER_PORT, directory=None, capacity=SERVER_CACHE_DAYS,
+          refresh_interval=SERVER_REFRESH_INTERVAL):
+    """
+    서버를 실행합니다. SIGTERM이나 Ctrl+C를 받으면 종료합니다.
+
+    Args:
+        host (str): 주소
+        port (int): 포트
+        directory (str, optional): 보관 디렉토리 (기본값: TEXTS_DIR)
+        capacity (int): 메모리에 둘 최대 날짜 수
+        refresh_interval (float): 보관소 확인 간격(초)
+    """
+    cache = ReadingCache(directory, capacity)
+    cache.start_refresher(refresh_interval)
+    with ReadingServer((host, port), cache) as server:
+        # serve_forever가 도는 스레드에서 shutdown을 부르면 멈추므로 다른 스레드에서 부름
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+        logger.info(f"말씀 API 서버 시작: http://{host}:{server.server_port} ({cache.stats()['days']}일)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            cache.stop()
+    logger.info("말씀 API 서버 종료")
+
+
+if __name__ == "__main__":
+    from daily_bible_crawler.main import init
+
+    parser = argparse.ArgumentParser(description="보관한 말씀을 날짜별 JSON, HTML, 텍스트로 제공하는 HTTP 서버입니다.")
+    parser.add_argument('--host', default=SERVER_HOST, help="주소 (기본값: SERVER_HOST)")
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help="포트 (기본값: SERVER_PORT)")
+    parser.add_argument('--dir', default=None, help="보관 디렉토리 (기본값: TEXTS_DIR)")
+    parser.add_argument('--cache-days', type=int, default=SERVER_CACHE_DAYS, help="메모리에 둘 최대 날짜 수")
+    args = parser.parse_args()
+    init()
+    serve(args.host, args.port, args.dir, args.cache_days)
@@ -0,0 +1,433 @@
+"""
+인증된 SMTP 연결을 풀로 유지하며 여러 통의 메일을 보내는 모듈입니다.
+
+수신자마다 TLS 연결과 로그인을 새로 하는 대신, 작은 수의 연결을 만들어 여러
+메시지를 보내고, 서버가 연결을 끊으면 다시 연결합니다. 수신자는 제한된 수의
+작업 스레드에 나누어 보냅니다. 비동기 코드에서는 send_messages_async로 동시 전송 수를
+제한하며 보낼 수 있습니다.
+
+속도 제한기(rate_limiter.py)를 넘기면 메시지마다 토큰을 받은 뒤 보내고, 서버가 4xx로
+일시적인 제한을 알리면 속도를 줄여 같은 메시지를 다시 보냅니다. 하루 전송 한도에 이르면
+남은 메시지는 보내지 않고 멈춥니다. (다음 실행에서 전송 원장이 남은 수신자에게만 보냄)
+"""
+import asyncio
+import os
+import queue
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from loguru import logger
+
+SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '465'))
+SMTP_USE_SSL = os.environ.get('SMTP_USE_SSL', 'true').lower() != 'false'
+SMTP_POOL_SIZE = int(os.environ.get('SMTP_POOL_SIZE', '3'))  # 연결 수이자 작업 스레드 수
+SMTP_MAX_MESSAGES_PER_CONNECTION = int(os.environ.get('SMTP_MAX_MESSAGES_PER_CONNECTION', '100'))
+SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', '30'))
+SMTP_THROTTLE_RETRIES = int(os.environ.get('SMTP_THROTTLE_RETRIES', '5'))  # 4xx 제한 응답 시 메시지당 재시도 횟수
+
+
+class PooledConnection:
+    """풀에서 관리하는 SMTP 연결과 보낸 메시지 수"""
+
+    __slots__ = ('server', 'sent')
+
+    def __init__(self, server):
+        self.server = server
+        self.sent = 0
+
+
+class SmtpConnectionPool:
+    """
+    인증된 SMTP 연결을 최대 size개까지 유지하는 풀입니다.
+
+    연결은 필요할 때 만들어지며, 한 연결로 max_messages_per_connection통을 보내면
+    서버의 연결당 제한에 걸리기 전에 새로 연결합니다. 여러 스레드에서 동시에 사용할 수
+    있습니다.
+    """
+
+    def __init__(self, username=None, password=None, host=SMTP_HOST, port=SMTP_PORT, use_ssl=SMTP_USE_SSL,
+                 size=SMTP_POOL_SIZE, max_messages_per_connection=SMTP_MAX_MESSAGES_PER_CONNECTION,
+                 timeout=SMTP_TIMEOUT):
+        """
+        Args:
+            username (str, optional): 로그인 계정 (password와 함께 주어지면 로그인)
+            password (str, optional): 로그인 비밀번호 (Gmail 앱 비밀번호 등)
+            host (str): SMTP 서버 주소
+            port (int): SMTP 서버 포트
+            use_ssl (bool): SMTP_SSL 사용 여부 (False이면 평문 SMTP, 로컬 테스트용)
+            size (int): 최대 연결 수
+            max_messages_per_connection (int): 연결당 최대 전송 수
+            timeout (float): 소켓 타임아웃(초)
+        """
+        self.username = username
+        self.password = password
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.size = size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.reconnects = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _connect(self):
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        if self.username and self.password:
+            server.login(self.username, self.password)
+        with self._lock:
+            self.connects += 1
+        return PooledConnection(server)
+
+    @staticmethod
+    def _quit(connection):
+        try:
+            connection.server.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.server.close()
+
+    @staticmethod
+    def _discard(connection):
+        # 끊어진 연결은 풀에 돌려놓지 않음
+        if connection is not None:
+            connection.server.close()
+
+    @contextmanager
+    def connection(self):
+        """
+        풀에서 연결을 빌립니다. 모든 연결이 사용 중이면 반납될 때까지 기다립니다.
+
+        Yields:
+            PooledConnection: SMTP 연결
+        """
+        self._slots.acquire()
+        connection = None
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+            yield connection
+        except smtplib.SMTPServerDisconnected:
+            self._discard(connection)
+            connection = None
+            raise
+        except smtplib.SMTPException:
+            # 수신 거부 등 메시지 단위 오류는 연결을 계속 사용할 수 있음
+            raise
+        except OSError:
+            self._discard(connection)
+            connection = None
+            raise
+        finally:
+            if connection is not None:
+                if connection.sent >= self.max_messages_per_connection:
+                    self._quit(connection)
+                else:
+                    self._idle.put(connection)
+            self._slots.release()
+
+    def warm_up(self, count=None):
+        """
+        연결을 미리 만들어 유휴 연결로 둡니다. 정해진 시각에 바로 보내야 할 때 TLS 연결과 로그인을
+        미리 해 둡니다. (미리 만든 연결이 그사이 끊어지면 send가 다시 연결함)
+
+        Args:
+            count (int, optional): 유휴 연결 수 (기본값: 풀 크기)
+
+        Returns:
+            int: 새로 만든 연결 수
+        """
+        count = min(count or self.size, self.size)
+        created = 0
+        while self._idle.qsize() < count:
+            self._idle.put(self._connect())
+            created += 1
+        return created
+
+    def send(self, msg, from_addr=None, to_addrs=None):
+        """
+        메시지를 보냅니다. 서버가 연결을 끊었으면 한 번 다시 연결하여 재전송합니다.
+
+        Args:
+            msg (Message | bytes): 보낼 메시지. bytes이면 from_addr와 to_addrs가 필요합니다.
+            from_addr (str, optional): 봉투 발신자
+            to_addrs (list, optional): 봉투 수신자 목록
+        """
+        for attempt in range(2):
+            try:
+                with self.connection() as connection:
+                    if isinstance(msg, (bytes, str)):
+                        connection.server.sendmail(from_addr, to_addrs, msg)
+                    else:
+                        connection.server.send_message(msg, from_addr=from_addr, to_addrs=to_addrs)
+                    connection.sent += 1
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                if attempt:
+                    raise
+                with self._lock:
+                    self.reconnects += 1
+                logger.warning(f"SMTP 연결이 끊어져 다시 연결합니다: {e}")
+
+    def close(self):
+        """유휴 연결을 모두 종료합니다."""
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+def _send(pool, message):
+    if isinstance(message, tuple):
+        from_addr, to_addrs, payload = message
+        pool.send(payload, from_addr=from_addr, to_addrs=to_addrs)
+    else:
+        pool.send(message)
+
+
+def is_throttling_error(error):
+    """
+    서버가 4xx(421, 450, 451, 452 등)로 응답한 일시적인 제한인지 확인합니다.
+
+    Args:
+        error (Exception): 전송 오류
+
+    Returns:
+        bool: 속도를 줄여 다시 보낼 수 있는 오류 여부
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    return isinstance(error, smtplib.SMTPResponseException) and 400 <= error.smtp_code < 500
+
+
+def is_daily_quota_error(error):
+    """
+    Gmail의 하루 전송 한도 초과 응답(550 5.4.5 Daily user sending limit exceeded)인지 확인합니다.
+
+    Args:
+        error (Exception): 전송 오류
+
+    Returns:
+        bool: 하루 한도 초과 여부
+    """
+    if not isinstance(error, smtplib.SMTPResponseException) or error.smtp_code < 500:
+        return False
+    message = error.smtp_error
+    if isinstance(message, bytes):
+        message = message.decode('utf-8', 'replace')
+    return '5.4.5' in message
+
+
+def _handle_limited_error(limiter, error, attempt, max_retries):
+    """
+    속도 제한기로 보낸 메시지의 오류를 제한기에 알리고, 다시 보낼지 여부를 반환합니다.
+
+    Raises:
+        DailyLimitReached: 하루 전송 한도 초과 응답인 경우
+    """
+    from daily_bible_crawler.rate_limiter import DailyLimitReached
+
+    if is_throttling_error(error):
+        limiter.on_throttle()
+        return attempt < max_retries
+    limiter.on_failure()
+    if is_daily_quota_error(error):
+        raise DailyLimitReached(f"SMTP 서버가 하루 전송 한도 초과를 알렸습니다: {error}") from error
+    return False
+
+
+def _send_limited(pool, message, limiter, max_retries=SMTP_THROTTLE_RETRIES):
+    """
+    속도 제한기에서 토큰을 받아 메시지를 보냅니다. 4xx 제한 응답이면 속도를 줄여 다시 보냅니다.
+
+    Raises:
+        DailyLimitReached: 하루 전송 한도에 도달한 경우
+    """
+    for attempt in range(max_retries + 1):
+        limiter.acquire()
+        try:
+            _send(pool, message)
+        except Exception as e:
+            if _handle_limited_error(limiter, e, attempt, max_retries):
+                continue
+            raise
+        limiter.on_success()
+        return
+
+
+async def _send_limited_async(pool, message, limiter, max_retries=SMTP_THROTTLE_RETRIES):
+    """_send_limited의 비동기 버전입니다. 토큰은 이벤트 루프에서 기다리고 전송만 작업 스레드에서 합니다."""
+    for attempt in range(max_retries + 1):
+        await limiter.acquire_async()
+        try:
+            await asyncio.to_thread(_send, pool, message)
+        except Exception as e:
+            if _handle_limited_error(limiter, e, attempt, max_retries):
+                continue
+            raise
+        limiter.on_success()
+        return
+
+
+def _log_stats(pool, stats):
+    logger.info(
+        f"SMTP 전송 완료: 성공 {stats['sent']}건, 실패 {stats['failed']}건, "
+        f"{stats['elapsed']:.2f}초 ({stats['rate']:.1f}통/초), 연결 {pool.connects}회, 재연결 {pool.reconnects}회"
+    )
+    if stats['limit_reached']:
+        logger.warning("하루 전송 한도에 도달하여 남은 수신자에게는 보내지 않았습니다.")
+
+
+def send_messages(pool, messages, workers=None, on_result=None, limiter=None):
+    """
+    (수신자, 메시지) 목록을 작업 스레드에 나누어 풀의 연결로 보냅니다.
+
+    작업 스레드는 목록에서 메시지를 하나씩 가져가므로 수신자가 많아도 전체 목록을 메모리에
+    올리지 않습니다. 한 수신자에게 보내다 실패해도 나머지 수신자에게는 계속 보냅니다.
+
+    Args:
+        pool (SmtpConnectionPool): SMTP 연결 풀
+        messages (iterable): (수신자, 메시지) 튜플. 메시지는 Message 객체 또는
+            (from_addr, to_addrs, bytes) 튜플
+        workers (int, optional): 작업 스레드 수 (기본값: 풀 크기)
+        on_result (callable, optional): 메시지마다 (수신자, 메시지 ID, 오류)로 호출할 함수.
+            SMTP는 메시지 ID를 돌려주지 않으므로 메시지 ID는 항상 None, 성공하면 오류가 None
+        limiter (AdaptiveRateLimiter, optional): 전송 속도와 하루 전송 수를 제한할 속도 제한기
+
+    Returns:
+        dict: {'sent': int, 'failed': int, 'failed_recipients': list, 'limit_reached': bool,
+               'elapsed': float, 'rate': float}
+    """
+    from daily_bible_crawler.rate_limiter import DailyLimitReached
+
+    stats = {'sent': 0, 'failed': 0, 'failed_recipients': [], 'limit_reached': False}
+    lock = threading.Lock()
+    pending = iter(messages)
+
+    def next_message():
+        # 여러 스레드가 같은 반복자에서 다음 메시지를 가져감 (한도에 이르면 더 꺼내지 않음)
+        with lock:
+            if stats['limit_reached']:
+                return None
+            return next(pending, None)
+
+    def deliver(recipient, message):
+        try:
+            if limiter is None:
+                _send(pool, message)
+            else:
+                _send_limited(pool, message, limiter)
+        except DailyLimitReached as e:
+            logger.warning(str(e))
+            with lock:
+                stats['limit_reached'] = True
+            return
+        except Exception as e:
+            logger.error(f"SMTP 전송 실패: {recipient} ({e})")
+            with lock:
+                stats['failed'] += 1
+                stats['failed_recipients'].append(recipient)
+            if on_result is not None:
+                on_result(recipient, None, e)
+            return
+        with lock:
+            stats['sent'] += 1
+        if on_result is not None:
+            on_result(recipient, None, None)
+
+    def work():
+        while (item := next_message()) is not None:
+            deliver(*item)
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers or pool.size, thread_name_prefix='smtp-sender') as executor:
+        # 결과를 기다리며 예외가 작업 안에서 처리되었는지 확인
+        for future in [executor.submit(work) for _ in range(workers or pool.size)]:
+            future.result()
+
+    stats['elapsed'] = time.perf_counter() - started_at
+    stats['rate'] = stats['sent'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+    _log_stats(pool, stats)
+    if limiter is not None:
+        limiter.log_status()
+    return stats
+
+
+async def send_messages_async(pool, messages, concurrency=None, on_result=None, limiter=None):
+    """
+    send_messages의 비동기 버전입니다. 최대 concurrency통을 동시에 보냅니다.
+
+    전송은 작업 스레드에서 이루어지며, 작업이 취소되면 새 메시지를 더 보내지 않습니다
+    (이미 서버로 보내고 있는 메시지는 소켓 타임아웃 안에서 끝납니다).
+
+    Args:
+        pool (SmtpConnectionPool): SMTP 연결 풀
+        messages (iterable): (수신자, 메시지) 튜플. 메시지는 Message 객체 또는
+            (from_addr, to_addrs, bytes) 튜플
+        concurrency (int, optional): 동시 전송 수 (기본값: 풀 크기)
+        on_result (callable, optional): 메시지마다 (수신자, 메시지 ID, 오류)로 호출할 함수
+        limiter (AdaptiveRateLimiter, optional): 전송 속도와 하루 전송 수를 제한할 속도 제한기
+
+    Returns:
+        dict: {'sent': int, 'failed': int, 'failed_recipients': list, 'limit_reached': bool,
+               'elapsed': float, 'rate': float}
+    """
+    from daily_bible_crawler.rate_limiter import DailyLimitReached
+
+    stats = {'sent': 0, 'failed': 0, 'failed_recipients': [], 'limit_reached': False}
+    pending = iter(messages)
+
+    async def send(message):
+        if limiter is None:
+            await asyncio.to_thread(_send, pool, message)
+        else:
+            await _send_limited_async(pool, message, limiter)
+
+    async def worker():
+        # 모든 작업이 같은 반복자에서 다음 메시지를 가져감 (이벤트 루프 스레드에서만 접근)
+        for recipient, message in pending:
+            if stats['limit_reached']:
+                break
+            try:
+                await send(message)
+            except DailyLimitReached as e:
+                logger.warning(str(e))
+                stats['limit_reached'] = True
+                break
+            except Exception as e:
+                logger.error(f"SMTP 전송 실패: {recipient} ({e})")
+                stats['failed'] += 1
+                stats['failed_recipients'].append(recipient)
+                error = e
+            else:
+                stats['sent'] += 1
+                error = None
+            if on_result is not None:
+                on_result(recipient, None, error)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency or pool.size)))
+
+    stats['elapsed'] = time.perf_counter() - started_at
+    stats['rate'] = stats['sent'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+    _log_stats(pool, stats)
+    if limiter is not None:
+        limiter.log_status()
+    return stats
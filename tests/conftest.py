@@ -0,0 +1,30 @@
+import socket
+
+import pytest
+from aiosmtpd.controller import Controller
+
+
+class CollectingHandler:
+    def __init__(self):
+        self.envelopes = []
+        self.throttle = 0  # 처음 몇 통을 일시적 제한(451)으로 거절
+    
+    async def handle_DATA(self, server, session, envelope):
+        if self.throttle:
+            self.throttle -= 1
+            return '451 4.7.0 Temporary System Problem. Try again later.'
+        self.envelopes.append(envelope)
+        return '250 OK'
+
+
+@pytest.fixture
+def smtp_server():
+    # 로컬 SMTP 대역 서버
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    handler = CollectingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=port)
+    controller.start()
+    yield handler, port
+    controller.stop()
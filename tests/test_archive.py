@@ -0,0 +1,81 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from daily_bible_crawler.archive import ArchiveStore, migrate_texts_dir, parse_archived_html
+from daily_bible_crawler.main import create_html_email, render_reading, save_html_file, save_text_file
+from daily_bible_crawler.reading import DailyReading, Section, Verse
+
+SITE_CSS = '.bible-verse { color: #333; }\n.verse-number { font-weight: bold; }\n' * 20
+
+
+def make_reading(day):
+    return DailyReading(
+        date=datetime(2025, 3, day),
+        header=f"매일성경 2025.03.{day:02d}(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35",
+        verses=[Verse('25', '수많은 무리가 함께 갈새'), Verse('26', '무릇 내게 오는 자가')],
+        title='제자가 되려면 분명한 대가가 있음을 알고 따라야 합니다.',
+        sections=[Section('예수님은 어떤 분입니까?', '진정한 제자를 원하십니다.\n둘째 줄')],
+        info=f"매일성경 2025.03.{day:02d}(월)",
+        css=SITE_CSS,
+    )
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # CSS 정리 캐시가 작업 디렉토리에 만들어지지 않도록 임시 디렉토리에서 실행
+    monkeypatch.chdir(tmp_path)
+    return ArchiveStore(str(tmp_path / 'texts'))
+
+
+def test_put_get_round_trip_shares_css(store):
+    for day in (24, 25):
+        store.put(datetime(2025, 3, day), make_reading(day))
+
+    assert store.get(datetime(2025, 3, 24)) == make_reading(24)
+    assert store.get(datetime(2025, 3, 26)) is None
+    assert datetime(2025, 3, 25) in store
+    assert [date.day for date in store.dates(start=datetime(2025, 3, 25))] == [25]
+    # 같은 CSS는 한 번만 저장하고 압축하여 원본보다 작게 저장
+    stats = store.stats()
+    assert stats['days'] == 2 and stats['assets'] == 1
+    assert stats['stored_bytes'] < stats['raw_bytes']
+
+
+def test_render_matches_legacy_files(store, tmp_path):
+    date = datetime(2025, 3, 24)
+    reading = make_reading(24)
+    store.put(date, reading)
+    content, html_content = render_reading(reading)
+    text_path = save_text_file(content, date, str(tmp_path / 'files'))
+
+    with open(text_path, encoding='utf-8') as f:
+        assert store.render_text(date) == f.read()
+    assert store.render_html(date) == create_html_email(content, html_content, reading.css, date)
+
+
+def test_migrate_texts_dir_removes_verified_files(store, tmp_path):
+    legacy_dir = tmp_path / 'texts'
+    html_files = {}
+    for day in (24, 25):
+        date = datetime(2025, 3, day)
+        content, html_content = render_reading(make_reading(day))
+        save_text_file(content, date, str(legacy_dir))
+        html_files[date] = create_html_email(content, html_content, SITE_CSS, date)
+        save_html_file(html_files[date], date, str(legacy_dir))
+    # HTML 없이 텍스트만 있는 날짜는 되살릴 수 없으므로 남김
+    save_text_file("텍스트만 있음", datetime(2025, 3, 26), str(legacy_dir))
+
+    stats = migrate_texts_dir(str(legacy_dir), store, remove=True)
+
+    assert stats['migrated'] == 2 and stats['skipped'] == 1 and stats['mismatched'] == 0
+    assert sorted(os.listdir(legacy_dir)) == ['archive.sqlite3', 'bible_content_20250326.txt']
+    # HTML에는 정리된 CSS가 들어 있으므로 다시 만든 HTML이 원본과 같은지 확인
+    for date, html in html_files.items():
+        assert store.render_html(date) == html
+
+
+def test_parse_archived_html_requires_bible_section():
+    with pytest.raises(ValueError):
+        parse_archived_html('<html><body>내용 없음</body></html>')
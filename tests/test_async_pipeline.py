@@ -0,0 +1,93 @@
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.async_pipeline import run_pipeline
+
+BIBLE_RESULT = (
+    {'header': '매일성경 2025.03.24(월)\n제자도', 'verses': [{'number': '25', 'text': '말씀'}]},
+    {'title': '해설', 'sections': [{'subtitle': '소제목', 'content': '내용'}], 'info': ''},
+    '.bible-verse { color: #333; }',
+)
+
+
+@pytest.fixture
+def pipeline_env(tmp_path, monkeypatch):
+    # CSS 정리 캐시가 작업 디렉토리에 만들어지지 않도록 임시 디렉토리에서 실행
+    monkeypatch.chdir(tmp_path)
+    # 기본은 파일 보관 방식으로 확인하고, 보관소 방식은 따로 확인
+    monkeypatch.setattr('daily_bible_crawler.async_pipeline.ARCHIVE_BACKEND', 'files')
+    with patch('daily_bible_crawler.async_pipeline.CACHE_ENABLED', False), \
+            patch('daily_bible_crawler.http_fetcher.fetch_bible_data', return_value=BIBLE_RESULT):
+        yield tmp_path
+
+
+def test_run_pipeline_archives_while_sending(pipeline_env):
+    events = []
+    
+    async def fake_send(subject, html_email, date=None):
+        events.append('send-start')
+        await asyncio.sleep(0.05)
+        # 전송 중에 HTML 보관이 끝남
+        events.append('html-saved' if list(pipeline_env.glob('texts/*.html')) else 'html-missing')
+    
+    with patch('daily_bible_crawler.async_pipeline.send_email_async', side_effect=fake_send):
+        asyncio.run(run_pipeline(date=None, output_dir=str(pipeline_env / "texts")))
+    
+    assert events == ['send-start', 'html-saved']
+    assert len(list(pipeline_env.glob('texts/*.txt'))) == 1
+
+
+def test_run_pipeline_archive_failure_does_not_cancel_delivery(pipeline_env):
+    sent = []
+    
+    async def fake_send(subject, html_email, date=None):
+        await asyncio.sleep(0.01)
+        sent.append(subject)
+    
+    with patch('daily_bible_crawler.async_pipeline.send_email_async', side_effect=fake_send), \
+            patch('daily_bible_crawler.async_pipeline.save_text_file', side_effect=OSError("디스크 공간 부족")):
+        with pytest.raises(OSError):
+            asyncio.run(run_pipeline(output_dir=str(pipeline_env / "texts")))
+    
+    assert len(sent) == 1
+
+
+def test_run_pipeline_delivery_timeout_cancels_sending(pipeline_env):
+    cancelled = []
+    
+    async def slow_send(subject, html_email, date=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(subject)
+            raise
+    
+    with patch('daily_bible_crawler.async_pipeline.send_email_async', side_effect=slow_send):
+        asyncio.run(run_pipeline(output_dir=str(pipeline_env / "texts"), delivery_timeout=0.05))
+    
+    # 전송 시간 제한이 지나도 보관은 끝나고 실행은 실패하지 않음
+    assert len(cancelled) == 1
+    assert len(list(pipeline_env.glob('texts/*.html'))) == 1
+
+
+def test_run_pipeline_saves_to_archive_store(pipeline_env, monkeypatch):
+    monkeypatch.setattr('daily_bible_crawler.async_pipeline.ARCHIVE_BACKEND', 'store')
+    subjects = []
+    
+    async def fake_send(subject, html_email, date=None):
+        await asyncio.sleep(0.01)
+        subjects.append(subject)
+    
+    date = datetime(2025, 3, 24)
+    with patch('daily_bible_crawler.async_pipeline.send_email_async', side_effect=fake_send):
+        asyncio.run(run_pipeline(date=date, output_dir=str(pipeline_env / "texts")))
+    
+    # 날짜별 파일 대신 보관소에만 저장
+    assert not list(pipeline_env.glob('texts/*.txt')) and not list(pipeline_env.glob('texts/*.html'))
+    assert "===== 말씀 =====" in ArchiveStore(str(pipeline_env / "texts")).render_text(date)
+    # 제목도 실행한 날이 아닌 말씀 날짜를 사용
+    assert subjects == ["[매일성경] 오늘의 말씀 - 2025-03-24 (Monday)"]
@@ -0,0 +1,76 @@
+import asyncio
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.backfill import backfill, date_range
+
+
+def fake_fetch(url, session=None, explanation_url=None):
+    # URL의 날짜를 헤더에 넣어 날짜별로 다른 말씀을 반환
+    date = datetime.strptime(url.rsplit('=', 1)[1], '%Y-%m-%d')
+    return (
+        {'header': f"매일성경 {date:%Y.%m.%d}\n제자도", 'verses': [{'number': '1', 'text': '말씀'}]},
+        {'title': '해설', 'sections': [{'subtitle': '소제목', 'content': '내용'}], 'info': ''},
+        '',
+    )
+
+
+def test_date_range_includes_end_date():
+    dates = list(date_range(datetime(2024, 2, 28), datetime(2024, 3, 1)))
+    assert [date.day for date in dates] == [28, 29, 1]
+
+
+@patch('daily_bible_crawler.backfill.fetch_bible_data', side_effect=fake_fetch)
+def test_backfill_skips_archived_dates(mock_fetch, tmp_path, monkeypatch):
+    # CSS 정리 캐시가 작업 디렉토리에 만들어지지 않도록 임시 디렉토리에서 실행
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('daily_bible_crawler.backfill.ARCHIVE_BACKEND', 'files')
+    # 이미 저장된 날짜는 다시 요청하지 않음
+    (tmp_path / "bible_content_20240102.txt").write_text("저장됨", encoding="utf-8")
+    (tmp_path / "bible_content_20240102.html").write_text("저장됨", encoding="utf-8")
+    
+    stats = asyncio.run(backfill(
+        datetime(2024, 1, 1), datetime(2024, 1, 3),
+        concurrency=2, requests_per_second=0, output_dir=str(tmp_path), use_browser=False,
+    ))
+    
+    assert stats['saved'] == 2
+    assert stats['skipped'] == 1
+    assert stats['failed'] == 0
+    assert mock_fetch.call_count == 2
+    assert "매일성경 2024.01.03" in (tmp_path / "bible_content_20240103.txt").read_text(encoding="utf-8")
+    assert not any(name.endswith('.tmp') for name in os.listdir(tmp_path))
+
+
+@patch('daily_bible_crawler.backfill.fetch_bible_data', side_effect=fake_fetch)
+def test_backfill_saves_to_archive_store(mock_fetch, tmp_path, monkeypatch):
+    # 보관소에 이미 있는 날짜는 건너뛰고 나머지만 보관소에 저장
+    monkeypatch.chdir(tmp_path)
+    store = ArchiveStore(str(tmp_path))
+    asyncio.run(backfill(datetime(2024, 1, 1), datetime(2024, 1, 1), requests_per_second=0,
+                         output_dir=str(tmp_path), use_browser=False))
+    
+    stats = asyncio.run(backfill(
+        datetime(2024, 1, 1), datetime(2024, 1, 2), requests_per_second=0, output_dir=str(tmp_path), use_browser=False,
+    ))
+    
+    assert stats == {'saved': 1, 'skipped': 1, 'failed': 0, 'failed_dates': []}
+    assert mock_fetch.call_count == 2
+    assert [date.day for date in store.dates()] == [1, 2]
+    assert "매일성경 2024.01.02" in store.get(datetime(2024, 1, 2)).header
+    assert not any(name.endswith('.txt') for name in os.listdir(tmp_path))
+
+
+@patch('daily_bible_crawler.backfill.fetch_bible_data', side_effect=lambda url, **kwargs: fake_fetch(url.replace('2024-01-05', '2024-01-04')))
+def test_backfill_rejects_mismatched_date(mock_fetch, tmp_path):
+    # 사이트가 날짜 파라미터를 무시하고 다른 날의 말씀을 주면 저장하지 않음
+    stats = asyncio.run(backfill(
+        datetime(2024, 1, 5), datetime(2024, 1, 5),
+        requests_per_second=0, output_dir=str(tmp_path), use_browser=False,
+    ))
+    
+    assert stats['failed'] == 1
+    assert stats['failed_dates'] == ['2024-01-05']
+    assert not (tmp_path / "bible_content_20240105.txt").exists()
@@ -0,0 +1,41 @@
+import json
+
+from benchmarks.run import check_thresholds, main, run_benchmarks
+
+
+def test_run_benchmarks_with_fixture_page():
+    results = run_benchmarks(recipient_counts=(1, 5), repeat=1, include_playwright=False)
+
+    assert set(results) == {
+        'startup_interpreter', 'startup_import',
+        'capture_http', 'build_content', 'render_email', 'archive_write',
+        'mime_1', 'ledger_1', 'smtp_1',
+        'mime_5', 'ledger_5', 'smtp_5',
+    }
+    assert all(result['median'] >= 0 for result in results.values())
+    assert results['smtp_5']['rate'] > 0
+
+
+def test_check_thresholds():
+    results = {
+        'render_email': {'median': 0.3},
+        'capture_http': {'median': 0.1},
+        'capture_playwright': {'skipped': '없음'},
+    }
+    thresholds = {'render_email': 0.2, 'capture_http': 0.5, 'capture_playwright': 15.0}
+    assert check_thresholds(results, thresholds) == [('render_email', 0.3, 0.2)]
+
+
+def test_main_saves_results_and_fails_over_threshold(tmp_path):
+    thresholds_path = tmp_path / "thresholds.json"
+    thresholds_path.write_text(json.dumps({'render_email': 0}), encoding="utf-8")
+
+    exit_code = main([
+        '--recipients', '1', '--repeat', '1', '--no-playwright',
+        '--thresholds', str(thresholds_path), '--results-dir', str(tmp_path / "results"),
+    ])
+
+    assert exit_code == 1
+    saved = list((tmp_path / "results").glob('*.json'))
+    assert len(saved) == 1
+    assert 'smtp_1' in json.loads(saved[0].read_text(encoding="utf-8"))['results']
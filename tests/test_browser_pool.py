@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.browser_pool import AsyncBrowserFallback, BrowserPool, shared_browser_pool
+
+
+@patch('daily_bible_crawler.browser_pool.descendant_rss_mb', return_value=100.0)
+@patch('playwright.sync_api.sync_playwright')
+def test_browser_pool_reuses_contexts(mock_playwright, mock_rss):
+    mock_browser = mock_playwright.return_value.start.return_value.chromium.launch.return_value
+    mock_browser.new_context.side_effect = lambda **kwargs: Mock()
+    
+    with BrowserPool(max_contexts=1, max_uses_per_context=2) as pool:
+        for _ in range(3):
+            with pool.page() as page:
+                assert page is not None
+        stats = pool.stats()
+    
+    # 브라우저는 한 번만 실행되고, 두 번 사용한 컨텍스트는 재생성됨
+    mock_playwright.return_value.start.return_value.chromium.launch.assert_called_once()
+    assert mock_browser.new_context.call_count == 2
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['recycled'] == 1
+    assert stats['cold']['count'] == 1
+    assert stats['warm']['count'] == 2
+
+
+@patch('daily_bible_crawler.browser_pool.descendant_rss_mb', return_value=4096.0)
+@patch('playwright.sync_api.sync_playwright')
+def test_browser_pool_recycles_on_memory_limit(mock_playwright, mock_rss):
+    mock_browser = mock_playwright.return_value.start.return_value.chromium.launch.return_value
+    mock_browser.new_context.side_effect = lambda **kwargs: Mock()
+    
+    with BrowserPool(max_rss_mb=1024) as pool:
+        with pool.page():
+            pass
+        with pool.page():
+            pass
+        stats = pool.stats()
+    
+    assert stats['hits'] == 0
+    assert stats['misses'] == 2
+    assert stats['recycled'] == 2
+
+
+@patch('daily_bible_crawler.browser_pool.descendant_rss_mb', return_value=100.0)
+@patch('playwright.sync_api.sync_playwright')
+def test_shared_browser_pool_launches_on_first_capture_and_reports(mock_playwright, mock_rss, tmp_path):
+    launch = mock_playwright.return_value.start.return_value.chromium.launch
+    launch.return_value.new_context.side_effect = lambda **kwargs: Mock()
+
+    with metrics.RunMetrics(report_path=str(tmp_path / "run_report.json")) as run_metrics:
+        # HTTP로 추출하여 브라우저가 필요 없으면 띄우지 않음
+        with shared_browser_pool() as pool:
+            pass
+        launch.assert_not_called()
+
+        # 재시도처럼 여러 번 캡처해도 브라우저는 한 번만 띄우고, 끝나면 닫음
+        with shared_browser_pool() as pool:
+            for _ in range(3):
+                with pool.page():
+                    pass
+        launch.assert_called_once()
+        launch.return_value.close.assert_called_once()
+        assert not pool.started
+
+    counters = run_metrics.report()['counters']
+    assert counters['browser_pool_hits'] == 2 and counters['browser_pool_misses'] == 1
+    assert counters['browser_capture_cold_count'] == 1 and counters['browser_capture_warm_count'] == 2
+
+    with shared_browser_pool(enabled=False) as pool:
+        assert pool is None
+
+
+@patch('daily_bible_crawler.browser_pool.descendant_rss_mb', return_value=100.0)
+@patch('playwright.sync_api.sync_playwright')
+def test_browser_pool_relaunches_disconnected_browser(mock_playwright, mock_rss):
+    launch = mock_playwright.return_value.start.return_value.chromium.launch
+    launch.side_effect = lambda **kwargs: Mock()
+
+    with BrowserPool() as pool:
+        with pool.page():
+            pass
+        pool._browser.is_connected.return_value = False
+        with pool.page():
+            pass
+
+    # 끊어진 브라우저의 컨텍스트는 버리고 새 브라우저에서 다시 만듦
+    assert launch.call_count == 2
+    assert pool.stats()['misses'] == 2
+
+
+def make_async_playwright():
+    # 비동기 Playwright 대역: 페이지 메서드는 코루틴, locator()만 일반 함수
+    page = Mock(route=AsyncMock(), goto=AsyncMock(), wait_for_function=AsyncMock())
+    page.evaluate = AsyncMock(side_effect=[
+        {'bible': {'header': '오늘', 'verses': []}, 'css': 'body {}'},
+        {'title': '해설', 'sections': [], 'info': ''},
+    ])
+    page.locator.return_value.click = AsyncMock()
+    context = Mock(new_page=AsyncMock(return_value=page), close=AsyncMock())
+    browser = Mock(new_context=AsyncMock(return_value=context), close=AsyncMock())
+    playwright = Mock(stop=AsyncMock())
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+    manager = Mock(start=AsyncMock(return_value=playwright))
+    return manager, playwright, browser, context
+
+
+def test_async_browser_fallback_collects_and_closes():
+    manager, playwright, browser, context = make_async_playwright()
+
+    async def run():
+        fallback = AsyncBrowserFallback()
+        try:
+            return await fallback.collect('https://example.com/today')
+        finally:
+            await fallback.close()
+
+    with patch('playwright.async_api.async_playwright', return_value=manager):
+        bible_data, explanation_data, css = asyncio.run(run())
+
+    assert bible_data == {'header': '오늘', 'verses': []}
+    assert explanation_data['title'] == '해설'
+    assert css == 'body {}'
+    context.close.assert_awaited_once()
+    browser.close.assert_awaited_once()
+    playwright.stop.assert_awaited_once()
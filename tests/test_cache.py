@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from daily_bible_crawler.cache import ContentCache
+
+BIBLE_DATA = {'header': '매일성경 2025.03.24(월)', 'verses': [{'number': '25', 'text': '말씀'}]}
+EXPLANATION_DATA = {'title': '해설', 'sections': [{'subtitle': '소제목', 'content': '내용'}], 'info': ''}
+
+
+def test_cache_round_trip_and_stats(tmp_path):
+    cache = ContentCache(path=str(tmp_path / "cache.sqlite3"))
+    date = datetime(2025, 3, 24)
+    
+    assert cache.get(date) is None
+    cache.put(date, BIBLE_DATA, EXPLANATION_DATA, ".a { color: red; }")
+    assert cache.get(date) == (BIBLE_DATA, EXPLANATION_DATA, ".a { color: red; }")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_today_entry_expires(tmp_path):
+    cache = ContentCache(path=str(tmp_path / "cache.sqlite3"), today_ttl=60)
+    today = datetime.now()
+    cache.put(today, BIBLE_DATA, EXPLANATION_DATA, "")
+    assert cache.get(today) is not None
+    
+    with patch('daily_bible_crawler.cache.time.time', return_value=datetime.now().timestamp() + 120):
+        assert cache.get(today) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ContentCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2)
+    dates = [datetime(2024, 1, 1) + timedelta(days=offset) for offset in range(3)]
+    cache.put(dates[0], BIBLE_DATA, EXPLANATION_DATA, "")
+    cache.put(dates[1], BIBLE_DATA, EXPLANATION_DATA, "")
+    # 첫 번째 항목을 사용하여 두 번째 항목이 가장 오래 사용하지 않은 항목이 됨
+    with patch('daily_bible_crawler.cache.time.time', return_value=datetime.now().timestamp() + 10):
+        cache.get(dates[0])
+        cache.put(dates[2], BIBLE_DATA, EXPLANATION_DATA, "")
+    
+    assert cache.get(dates[0]) is not None
+    assert cache.get(dates[1]) is None
+    assert cache.get(dates[2]) is not None
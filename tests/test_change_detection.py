@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from daily_bible_crawler import checkpoint, main
+from daily_bible_crawler.change_detection import ChangeDetector, reading_fingerprint
+from daily_bible_crawler.main import DeliveryError
+from tests.test_checkpoint import BIBLE_DATA, EXPLANATION_DATA
+from daily_bible_crawler.reading import DailyReading, Verse
+
+YESTERDAY = DailyReading(header='매일성경 2025.03.23(주일)\n어제', verses=[Verse('1', '어제 말씀')])
+TODAY = DailyReading(header='매일성경 2025.03.24(월)\n오늘', verses=[Verse('1', '오늘 말씀')])
+
+
+def response(status_code, etag=None):
+    return Mock(status_code=status_code, ok=status_code < 400, headers={'ETag': etag} if etag else {})
+
+
+def make_detector(tmp_path, responses, completed_on=None, **kwargs):
+    path = str(tmp_path / 'change_state.json')
+    session = Mock()
+    session.head.side_effect = responses
+    detector = ChangeDetector(path=path, session=session, sleep=Mock(), **kwargs)
+    if completed_on is not None:
+        # 지난 실행에서 YESTERDAY를 처리했고 검증값 "v1"을 받은 상태
+        detector._validators = {'etag': '"v1"', 'last_modified': None}
+        detector.record(YESTERDAY)
+        detector.state['completed_on'] = completed_on.strftime('%Y%m%d')
+        detector._save()
+        detector = ChangeDetector(path=path, session=session, sleep=detector.sleep, **kwargs)
+    return detector, session
+
+
+def test_fingerprint_ignores_whitespace_and_css():
+    spaced = DailyReading(header='매일성경 2025.03.23(주일)\n 어제 ', verses=[Verse('1', '어제  말씀')], css='body {}')
+    assert reading_fingerprint(spaced) == reading_fingerprint(YESTERDAY)
+    assert reading_fingerprint(TODAY) != reading_fingerprint(YESTERDAY)
+
+
+def test_first_run_captures_without_probe(tmp_path):
+    detector, session = make_detector(tmp_path, [])
+    capture = Mock(return_value=TODAY)
+
+    assert detector.wait_for_new_reading(capture) is TODAY
+    session.head.assert_not_called()
+
+
+def test_not_modified_after_completing_today_skips_without_capture(tmp_path):
+    detector, session = make_detector(tmp_path, [response(304)], completed_on=datetime.now())
+    capture = Mock()
+
+    assert detector.wait_for_new_reading(capture) is None
+    capture.assert_not_called()
+    assert session.head.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+
+
+def test_polls_until_new_reading_appears(tmp_path):
+    # 304 -> 200이지만 어제 말씀 -> 200 새 말씀
+    detector, session = make_detector(
+        tmp_path, [response(304), response(200, '"v2"'), response(200, '"v3"')],
+        completed_on=datetime.now() - timedelta(days=1), poll_interval=60, poll_timeout=600,
+    )
+    capture = Mock(side_effect=[YESTERDAY, TODAY])
+
+    assert detector.wait_for_new_reading(capture) is TODAY
+    assert detector.sleep.call_count == 2
+    # 확인은 HEAD로만 하고 본문은 capture에서 한 번만 받음
+    session.get.assert_not_called()
+    assert session.head.call_count == 3
+    # 다시 확인할 때는 캐시를 쓰지 않음
+    assert [call.args for call in capture.call_args_list] == [(True,), (True,)]
+
+    detector.record(TODAY)
+    state = ChangeDetector(path=detector.path).state
+    assert state['fingerprint'] == reading_fingerprint(TODAY)
+    assert state['validators']['etag'] == '"v3"'
+
+
+def test_changed_page_is_captured_without_cache(tmp_path):
+    detector, _ = make_detector(tmp_path, [response(200, '"v2"')], completed_on=datetime.now() - timedelta(days=1))
+    capture = Mock(return_value=TODAY)
+
+    assert detector.wait_for_new_reading(capture) is TODAY
+    # 오늘 날짜로 캐시된 어제 내용과 비교하지 않도록 첫 추출부터 캐시를 쓰지 않음
+    capture.assert_called_once_with(True)
+
+
+def test_gives_up_after_poll_timeout(tmp_path):
+    detector, _ = make_detector(
+        tmp_path, [response(304)] * 3, completed_on=datetime.now() - timedelta(days=1),
+        poll_interval=60, poll_timeout=150,
+    )
+
+    assert detector.wait_for_new_reading(Mock()) is None
+    assert detector.sleep.call_count == 2
+
+
+@patch('daily_bible_crawler.checkpoint.send_email')
+@patch('daily_bible_crawler.http_fetcher.fetch_bible_data')
+def test_failed_delivery_is_not_recorded_and_rerun_sends(mock_fetch, mock_send, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'CHECKPOINT_ENABLED', True)
+    monkeypatch.setattr(main, 'CHANGE_DETECTION_ENABLED', True)
+    for stage, policy in checkpoint.STAGE_RETRY_POLICIES.items():
+        monkeypatch.setitem(checkpoint.STAGE_RETRY_POLICIES, stage, {**policy, 'wait_min': 0, 'wait_max': 0})
+    mock_fetch.return_value = (BIBLE_DATA, EXPLANATION_DATA, '')
+    attempts = checkpoint.STAGE_RETRY_POLICIES['delivery']['attempts']
+    mock_send.side_effect = [DeliveryError(0, ['a@example.com'])] * attempts + [None]
+
+    main.main()
+
+    # 전송에 실패했으므로 처리 완료로 기록하지 않음
+    assert mock_send.call_count == attempts
+    assert ChangeDetector().state == {}
+
+    main.main()
+
+    # 다시 실행하면 건너뛰지 않고 전송하며, 성공한 뒤에만 기록
+    assert mock_send.call_count == attempts + 1
+    assert ChangeDetector().state['completed_on'] == datetime.now().strftime('%Y%m%d')
+
+
+@patch('daily_bible_crawler.main.send_email_with_app_password')
+@patch('daily_bible_crawler.http_fetcher.fetch_bible_data')
+def test_failed_delivery_without_checkpoint_is_not_recorded(mock_fetch, mock_send, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'CHECKPOINT_ENABLED', False)
+    monkeypatch.setattr(main, 'CHANGE_DETECTION_ENABLED', True)
+    monkeypatch.setattr(main, 'OAUTH_CREDENTIALS_PATH', str(tmp_path / 'missing.json'))
+    monkeypatch.setattr(main, 'EMAIL_APP_PASSWORD', 'app-password')
+    mock_fetch.return_value = (BIBLE_DATA, EXPLANATION_DATA, '')
+    mock_send.side_effect = [DeliveryError(0, ['a@example.com']), None]
+
+    main.main()
+    assert ChangeDetector().state == {}
+
+    main.main()
+    assert mock_send.call_count == 2
+    assert ChangeDetector().state['completed_on'] == datetime.now().strftime('%Y%m%d')
@@ -0,0 +1,135 @@
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from daily_bible_crawler import checkpoint
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.checkpoint import CheckpointStore, prune_checkpoints, run_stages
+from daily_bible_crawler.main import DeliveryError
+
+BIBLE_DATA = {
+    'header': '매일성경 2025.03.24(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35',
+    'verses': [{'number': '25', 'text': '수많은 무리가 함께 갈새 예수께서 돌이키사 이르시되'}]
+}
+
+EXPLANATION_DATA = {
+    'title': '제자가 되려면 분명한 대가가 있음을 알고 따라야 합니다.',
+    'sections': [{'subtitle': '예수님은 어떤 분입니까?', 'content': '진정한 제자를 원하십니다.'}],
+    'info': '매일성경 2025.03.24(월)'
+}
+
+EMPTY_EXPLANATION = {'title': '', 'sections': [], 'info': ''}
+DATE = datetime(2025, 3, 24)
+
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch, tmp_path):
+    # 재시도 대기 없이 단계별 시도 횟수만 확인
+    monkeypatch.chdir(tmp_path)
+    for stage, policy in checkpoint.STAGE_RETRY_POLICIES.items():
+        monkeypatch.setitem(checkpoint.STAGE_RETRY_POLICIES, stage, {**policy, 'wait_min': 0, 'wait_max': 0})
+
+
+@patch('daily_bible_crawler.checkpoint.send_email')
+@patch('daily_bible_crawler.checkpoint.collect_bible_data_with_playwright')
+@patch('daily_bible_crawler.http_fetcher.fetch_page_sections')
+def test_resume_fetches_only_failed_explanation(mock_fetch, mock_playwright, mock_send, tmp_path):
+    store = CheckpointStore(DATE, str(tmp_path / 'checkpoints'))
+    mock_fetch.return_value = (BIBLE_DATA, EMPTY_EXPLANATION, ".bible-verse { color: #333; }")
+    mock_playwright.side_effect = TimeoutError("해설 탭 클릭 실패")
+
+    with pytest.raises(TimeoutError):
+        run_stages(date=DATE, store=store, output_dir=str(tmp_path / 'texts'))
+    # 말씀은 한 번만 받고, 해설은 정책의 시도 횟수만큼 재시도
+    assert mock_fetch.call_count == 1 + checkpoint.STAGE_RETRY_POLICIES['explanation']['attempts']
+    assert store.load('bible')['bible'] == BIBLE_DATA
+    assert store.load('explanation') is None
+    mock_send.assert_not_called()
+
+    # 다시 실행하면 말씀 단계는 건너뛰고 해설만 추출
+    mock_fetch.reset_mock()
+    mock_fetch.return_value = (EMPTY_EXPLANATION, EXPLANATION_DATA, '')
+    results = run_stages(date=DATE, store=store, output_dir=str(tmp_path / 'texts'))
+
+    mock_fetch.assert_called_once_with("https://sum.su.or.kr:8888/bible/today", include_css=False)
+    assert "진정한 제자를 원하십니다." in results['render']['content']['해설']
+    assert ".bible-verse" in results['render']['html_email']
+    assert ArchiveStore(str(tmp_path / 'texts')).get(DATE).sections[0].content == "진정한 제자를 원하십니다."
+    mock_send.assert_called_once()
+    assert store.load('delivery') == {'failed_recipients': []}
+
+
+@patch('daily_bible_crawler.ledger.LEDGER_ENABLED', False)
+@patch('daily_bible_crawler.checkpoint.send_email')
+@patch('daily_bible_crawler.http_fetcher.fetch_page_sections')
+def test_delivery_is_not_retried_after_partial_send_without_ledger(mock_fetch, mock_send, tmp_path):
+    store = CheckpointStore(DATE, str(tmp_path / 'checkpoints'))
+    mock_fetch.return_value = (BIBLE_DATA, EXPLANATION_DATA, '')
+    mock_send.side_effect = DeliveryError(1, ['b@example.com'])
+
+    results = run_stages(date=DATE, store=store, output_dir=str(tmp_path / 'texts'))
+
+    # 해설도 말씀 단계에서 함께 저장되어 요청은 한 번뿐
+    mock_fetch.assert_called_once()
+    mock_send.assert_called_once()
+    assert results['delivery'] == {'sent': 1, 'failed_recipients': ['b@example.com']}
+
+    # 다시 실행해도 다시 보내지 않음
+    run_stages(date=DATE, store=store, output_dir=str(tmp_path / 'texts'))
+    mock_fetch.assert_called_once()
+    mock_send.assert_called_once()
+
+
+@patch('daily_bible_crawler.checkpoint.send_email')
+@patch('daily_bible_crawler.http_fetcher.fetch_page_sections')
+def test_delivery_retries_partial_send_with_ledger(mock_fetch, mock_send, tmp_path):
+    # 원장이 이미 받은 수신자를 걸러 주므로 일부만 보냈어도 다시 시도
+    store = CheckpointStore(DATE, str(tmp_path / 'checkpoints'))
+    mock_fetch.return_value = (BIBLE_DATA, EXPLANATION_DATA, '')
+    mock_send.side_effect = [DeliveryError(1, ['b@example.com']), None]
+
+    results = run_stages(date=DATE, store=store, output_dir=str(tmp_path / 'texts'))
+
+    assert mock_send.call_count == 2
+    assert mock_send.call_args.kwargs['date'] == DATE
+    assert results['delivery'] == {'failed_recipients': []}
+
+
+@patch('daily_bible_crawler.checkpoint.send_email')
+@patch('daily_bible_crawler.http_fetcher.fetch_page_sections')
+def test_delivery_retries_when_nothing_was_sent(mock_fetch, mock_send, tmp_path):
+    store = CheckpointStore(DATE, str(tmp_path / 'checkpoints'))
+    mock_fetch.return_value = (BIBLE_DATA, EXPLANATION_DATA, '')
+    mock_send.side_effect = DeliveryError(0, ['a@example.com'])
+
+    results = run_stages(date=DATE, store=store, output_dir=str(tmp_path / 'texts'))
+
+    # 전송 실패는 실행을 실패시키지 않고 체크포인트도 남기지 않음
+    assert mock_send.call_count == checkpoint.STAGE_RETRY_POLICIES['delivery']['attempts']
+    assert 'delivery' not in results
+    assert store.load('delivery') is None
+    assert store.load('render') is not None
+
+
+def test_cache_hit_seeds_extraction_stages(tmp_path):
+    store = CheckpointStore(DATE, str(tmp_path / 'checkpoints'))
+    cache = Mock()
+    cache.get.return_value = (BIBLE_DATA, EXPLANATION_DATA, '')
+
+    with patch('daily_bible_crawler.http_fetcher.fetch_page_sections') as mock_fetch, \
+            patch('daily_bible_crawler.checkpoint.send_email'):
+        run_stages(date=DATE, store=store, cache=cache, output_dir=str(tmp_path / 'texts'))
+
+    mock_fetch.assert_not_called()
+    cache.put.assert_not_called()
+    assert store.load('explanation') == {'explanation': EXPLANATION_DATA}
+
+
+def test_prune_checkpoints(tmp_path):
+    directory = tmp_path / 'checkpoints'
+    for name in ('20250301', '20250320', 'notes'):
+        (directory / name).mkdir(parents=True)
+
+    assert prune_checkpoints(str(directory), retention_days=7, today=DATE) == 1
+    assert sorted(path.name for path in directory.iterdir()) == ['20250320', 'notes']
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+from daily_bible_crawler import css_pruner
+from daily_bible_crawler.css_pruner import prune_css, prune_css_cached
+
+HTML = '''
+<html><body>
+<div class="bible-wrapper"><div class="bible-verse"><span class="verse-number">1</span></div></div>
+<div id="main" class="explanation-container"><p>해설</p></div>
+</body></html>
+'''
+
+SITE_CSS = '''
+/* 사이트 공통 */
+.bible-verse  {  color : red ;  margin: 0 0  4px ; }
+.nav, .bible-wrapper > .bible-verse:hover { font-weight: bold; }
+#sidebar .menu { display: none; }
+.bible-verse  {  color : red ;  margin: 0 0  4px ; }
+@font-face { font-family: Nanum; src: url(nanum.woff); }
+@media (max-width: 600px) {
+    .verse-number { font-size: 12px; }
+    .gnb { display: none; }
+}
+@media print { .ad { display: none; } }
+p:not(.hidden)::first-line { line-height: 1.8 }
+div#main { padding: 0 }
+table td { border: 0 }
+'''
+
+
+def test_prune_css_keeps_only_matching_rules():
+    pruned = prune_css(SITE_CSS, HTML)
+
+    assert pruned == (
+        '.bible-wrapper>.bible-verse:hover{font-weight:bold}'
+        '.bible-verse{color:red;margin:0 0 4px}'
+        '@media (max-width: 600px){.verse-number{font-size:12px}}'
+        'p:not(.hidden)::first-line{line-height:1.8}'
+        'div#main{padding:0}'
+    )
+
+
+def test_prune_css_cached_reuses_result(tmp_path):
+    css_pruner._memory_cache.clear()
+    first = prune_css_cached(SITE_CSS, HTML, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob('*.css'))) == 1
+
+    # 메모리 캐시를 비워도 디스크 캐시에서 읽어 다시 계산하지 않음
+    css_pruner._memory_cache.clear()
+    with patch('daily_bible_crawler.css_pruner.prune_css') as prune:
+        assert prune_css_cached(SITE_CSS, HTML, cache_dir=str(tmp_path)) == first
+        prune.assert_not_called()
+
+    # 스타일시트가 바뀌면 새로 계산
+    assert prune_css_cached(SITE_CSS + '.bible-wrapper{color:blue}', HTML, cache_dir=str(tmp_path)).endswith(
+        '.bible-wrapper{color:blue}'
+    )
+
+
+def test_prune_css_splits_only_at_top_level():
+    css = '''
+    .bible-verse { background: url("data:image/png;base64,iVBOR,w0KGgo="); color: red }
+    p:is(.a, .bible-verse), .nav { color: blue }
+    p:not(:is(.nav, .gnb)) span { margin: 0 }
+    @import url("print.css;v=2");
+    '''
+
+    assert prune_css(css, HTML) == (
+        '.bible-verse{background:url("data:image/png;base64,iVBOR,w0KGgo=");color:red}'
+        'p:is(.a,.bible-verse){color:blue}'
+        'p:not(:is(.nav,.gnb)) span{margin:0}'
+    )
+
+
+def test_prune_css_keeps_other_block_at_rules():
+    css = '''
+    @layer base { .bible-verse { color: red } .gnb { color: blue } }
+    @container sidebar (min-width: 400px) { .verse-number { font-size: 12px } }
+    @layer unused { .gnb { color: blue } }
+    @page { margin: 1cm }
+    @keyframes fade { from { opacity: 0 } }
+    '''
+
+    assert prune_css(css, HTML) == (
+        '@layer base{.bible-verse{color:red}}'
+        '@container sidebar (min-width: 400px){.verse-number{font-size:12px}}'
+        '@page{margin: 1cm}'
+    )
@@ -0,0 +1,115 @@
+import json
+import time
+from unittest.mock import Mock
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from daily_bible_crawler.gmail_sender import send_raw_messages, is_retryable_error
+from daily_bible_crawler.rate_limiter import AdaptiveRateLimiter
+
+
+def http_error(status, reason=''):
+    content = json.dumps({'error': {'errors': [{'reason': reason}]}}).encode('utf-8')
+    return HttpError(httplib2.Response({'status': status}), content)
+
+
+class FakeBatch:
+    """배치 요청을 흉내 내며, 정해진 수신자에게 정해진 오류를 반환"""
+    
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+    
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+    
+    def execute(self):
+        self.service.batch_sizes.append(len(self.requests))
+        for request_id, raw in self.requests:
+            errors = self.service.errors.get(raw, [])
+            if errors:
+                self.callback(request_id, None, errors.pop(0))
+            else:
+                self.service.sent.append(raw)
+                self.callback(request_id, {'id': f"id-{raw}"}, None)
+
+
+def fake_service(errors=None):
+    service = Mock()
+    service.errors = errors or {}
+    service.sent = []
+    service.batch_sizes = []
+    service.new_batch_http_request.side_effect = lambda callback: FakeBatch(service, callback)
+    # send()가 반환하는 요청 객체 대신 raw 값을 그대로 사용
+    service.users.return_value.messages.return_value.send.side_effect = lambda userId, body: body['raw']
+    return service
+
+
+def test_send_raw_messages_in_chunks():
+    service = fake_service()
+    messages = [(f"user{index}@example.com", f"raw{index}") for index in range(120)]
+    
+    stats = send_raw_messages(service, messages, batch_size=50, backoff_base=0)
+    
+    assert service.batch_sizes == [50, 50, 20]
+    assert stats['sent'] == 120
+    assert stats['message_ids']['user0@example.com'] == 'id-raw0'
+
+
+def test_send_raw_messages_retries_only_quota_failures():
+    service = fake_service({
+        'raw1': [http_error(429)],
+        'raw2': [http_error(403, 'userRateLimitExceeded'), http_error(403, 'rateLimitExceeded')],
+        'raw3': [http_error(400, 'invalidArgument')],
+    })
+    messages = [(f"user{index}@example.com", f"raw{index}") for index in range(4)]
+    
+    stats = send_raw_messages(service, messages, batch_size=10, backoff_base=0)
+    
+    # 성공한 메시지는 다시 보내지 않고, 할당량 오류만 재시도
+    assert service.batch_sizes == [4, 2, 1]
+    assert sorted(service.sent) == ['raw0', 'raw1', 'raw2']
+    assert stats['sent'] == 3
+    assert stats['failed_recipients'] == ['user3@example.com']
+
+
+def test_is_retryable_error():
+    assert is_retryable_error(http_error(503))
+    assert is_retryable_error(http_error(403, 'rateLimitExceeded'))
+    assert not is_retryable_error(http_error(403, 'insufficientPermissions'))
+    assert not is_retryable_error(ValueError("not an http error"))
+
+
+def test_send_raw_messages_with_rate_limiter():
+    service = fake_service({
+        'raw1': [http_error(429)],
+        'raw4': [http_error(403, 'dailyLimitExceeded')],
+    })
+    messages = [(f"user{index}@example.com", f"raw{index}") for index in range(8)]
+    limiter = AdaptiveRateLimiter('gmail', max_rate=1000, burst=3, log_interval=0)
+    
+    stats = send_raw_messages(service, messages, batch_size=4, on_result=None, limiter=limiter)
+    
+    # 배치는 버스트보다 커도 줄이지 않고, 할당량 오류는 속도를 줄여 재시도하며, 하루 한도 오류가 나면 멈춤
+    assert service.batch_sizes == [4, 1, 4]
+    assert limiter.throttled == 1
+    assert limiter.rate == 500
+    assert stats['limit_reached']
+    assert stats['sent'] == 7
+    assert stats['failed_recipients'] == ['user4@example.com']
+
+
+def test_send_raw_messages_paces_full_batches_with_tokens():
+    service = fake_service()
+    messages = [(f"user{index}@example.com", f"raw{index}") for index in range(6)]
+    limiter = AdaptiveRateLimiter('gmail', max_rate=20, burst=2, log_interval=0)
+    
+    started = time.monotonic()
+    stats = send_raw_messages(service, messages, batch_size=3, limiter=limiter)
+    
+    # 배치는 3건씩 그대로 보내고, 메시지마다 토큰을 받아 초당 20통을 넘지 않음 (버스트 2통 이후 4통 = 0.2초)
+    assert service.batch_sizes == [3, 3]
+    assert stats['sent'] == 6
+    assert time.monotonic() - started >= 0.19
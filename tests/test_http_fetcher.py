@@ -0,0 +1,73 @@
+from unittest.mock import Mock, patch
+
+from daily_bible_crawler.http_fetcher import parse_bible_page, fetch_bible_data
+
+SAMPLE_PAGE = """
+<html>
+<head>
+    <style>.bible-verse { color: #333; }</style>
+</head>
+<body>
+    <div id="font_uparea02">
+        <div class="date">매일성경 2025.03.24(월)</div>
+        <div class="title">제자도</div>
+        <div class="bible_text">본문 : 누가복음(Luke) 14:25 - 14:35</div>
+        <ul>
+            <li><span class="num">25</span> <span class="info">수많은 무리가 함께 갈새 예수께서 돌이키사 이르시되</span></li>
+            <li><span class="num">26</span> <span class="info">무릇 내게 오는 자가 능히 내 제자가 되지 못하고</span></li>
+        </ul>
+    </div>
+    <div id="font_uparea03">
+        <div class="b_text">제자가 되려면 분명한 대가가 있음을 알고 따라야 합니다.</div>
+        <div class="body_text">
+            <div class="g_text">예수님은 어떤 분입니까?</div>
+            <div class="text"><p>전체 예수님이 원하시는 것은</p><p>진정한 제자입니다.</p></div>
+            <div class="g_text">내게 주시는 교훈은 무엇입니까?</div>
+            <div class="memo">메모</div>
+            <div class="text">26-33절 세 가지 덕목이 있습니다.</div>
+        </div>
+        <div id="dailybible_info2">매일성경 2025.03.24(월)</div>
+    </div>
+</body>
+</html>
+"""
+
+
+def test_parse_bible_page():
+    bible_data, explanation_data, css_content = parse_bible_page(SAMPLE_PAGE, "https://example.com/bible/today")
+    
+    assert bible_data['header'] == '매일성경 2025.03.24(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35'
+    assert bible_data['verses'] == [
+        {'number': '25', 'text': '수많은 무리가 함께 갈새 예수께서 돌이키사 이르시되'},
+        {'number': '26', 'text': '무릇 내게 오는 자가 능히 내 제자가 되지 못하고'},
+    ]
+    assert explanation_data['title'] == '제자가 되려면 분명한 대가가 있음을 알고 따라야 합니다.'
+    assert explanation_data['sections'] == [
+        {'subtitle': '예수님은 어떤 분입니까?', 'content': '전체 예수님이 원하시는 것은\n\n진정한 제자입니다.'},
+        {'subtitle': '내게 주시는 교훈은 무엇입니까?', 'content': '26-33절 세 가지 덕목이 있습니다.'},
+    ]
+    assert explanation_data['info'] == '매일성경 2025.03.24(월)'
+    assert css_content == '.bible-verse { color: #333; }'
+
+
+def test_parse_bible_page_without_explanation_falls_back():
+    # 해설 섹션이 비어 있으면 Playwright 경로로 대체하도록 None을 반환
+    page = SAMPLE_PAGE.replace('class="g_text"', 'class="other"')
+    assert parse_bible_page(page, "https://example.com/bible/today") is None
+
+
+def test_fetch_bible_data_request_error():
+    import requests
+    
+    session = Mock()
+    session.get.side_effect = requests.ConnectionError("connection refused")
+    assert fetch_bible_data("https://example.com/bible/today", session=session) is None
+
+
+def test_fetch_bible_data_uses_page_sections():
+    sections = ({'header': '', 'verses': []}, {'title': '', 'sections': [], 'info': ''}, '')
+    # 말씀과 해설의 추출은 fetch_page_sections 한 곳에서 하고, 비어 있으면 브라우저로 넘김
+    with patch('daily_bible_crawler.http_fetcher.fetch_page_sections', return_value=sections) as fetch:
+        assert fetch_bible_data("https://example.com/bible/today", explanation_url="https://example.com/x") is None
+    fetch.assert_called_once()
+    assert fetch.call_args.kwargs['explanation_url'] == "https://example.com/x"
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from daily_bible_crawler import ledger as ledger_module
+from daily_bible_crawler.gmail_sender import send_raw_messages
+from daily_bible_crawler.ledger import DeliveryLedger, tracked_delivery
+from daily_bible_crawler.smtp_sender import SmtpConnectionPool, send_messages
+from tests.test_gmail_sender import fake_service, http_error
+from tests.test_smtp_sender import make_message
+
+DATE = datetime(2025, 3, 24)
+
+
+def test_ledger_batches_writes(tmp_path):
+    ledger = DeliveryLedger(path=str(tmp_path / "ledger.sqlite3"), flush_size=100, flush_interval=3600)
+
+    for index in range(250):
+        ledger.record(DATE, 'smtp', f"user{index}@example.com")
+    # 100건씩 두 번만 쓰고 나머지는 모아 둠
+    assert ledger.flushes == 2
+
+    ledger.flush()
+    assert ledger.flushes == 3
+    assert ledger.summary(DATE) == {('smtp', 'sent'): 250}
+
+
+def test_pending_skips_delivered_recipients_per_backend(tmp_path):
+    ledger = DeliveryLedger(path=str(tmp_path / "ledger.sqlite3"))
+    ledger.record(DATE, 'smtp', "a@example.com")
+    ledger.record(DATE, 'smtp', "b@example.com", error="550 mailbox unavailable")
+    # 숨은 참조 발송의 표시 이름은 주소마다 기록
+    ledger.record(DATE, 'smtp', "c@example.com, d@example.com")
+    ledger.flush()
+
+    recipients = ["a@example.com", "b@example.com", "c@example.com", "d@example.com", "e@example.com"]
+    assert list(ledger.pending(DATE, 'smtp', recipients)) == ["b@example.com", "e@example.com"]
+    # 전송 방식과 날짜가 다르면 따로 관리
+    assert list(ledger.pending(DATE, 'gmail', recipients)) == recipients
+    assert list(ledger.pending(datetime(2025, 3, 25), 'smtp', recipients)) == recipients
+
+    # 실패했던 수신자가 다시 보내서 성공하면 상태가 바뀜
+    ledger.record(DATE, 'smtp', "b@example.com")
+    assert ledger.summary(DATE) == {('smtp', 'sent'): 4}
+
+
+def test_rerun_sends_only_to_remaining_recipients(tmp_path):
+    ledger = DeliveryLedger(path=str(tmp_path / "ledger.sqlite3"))
+    recipients = [f"user{index}@example.com" for index in range(4)]
+    service = fake_service({'raw-user3@example.com': [http_error(400, 'invalidArgument')]})
+
+    def send():
+        with tracked_delivery(DATE, 'gmail', recipients, ledger=ledger) as (pending, on_result):
+            messages = ((recipient, f"raw-{recipient}") for recipient in pending)
+            return send_raw_messages(service, messages, backoff_base=0, on_result=on_result)
+
+    assert send()['failed_recipients'] == ["user3@example.com"]
+    stats = send()
+
+    # 두 번째 실행은 실패했던 수신자에게만 보냄
+    assert stats['sent'] == 1
+    assert service.sent.count('raw-user0@example.com') == 1
+    assert service.sent.count('raw-user3@example.com') == 1
+
+
+def test_pending_is_consumed_by_smtp_worker_threads(tmp_path, monkeypatch, smtp_server):
+    handler, port = smtp_server
+    # 작업 스레드들이 번갈아 다음 묶음을 조회하도록 묶음을 작게 함
+    monkeypatch.setattr(ledger_module, 'LEDGER_LOOKUP_SIZE', 2)
+    ledger = DeliveryLedger(path=str(tmp_path / "ledger.sqlite3"))
+    recipients = [f"user{index}@example.com" for index in range(10)]
+    ledger.record(DATE, 'smtp', "user0@example.com")
+
+    with tracked_delivery(DATE, 'smtp', recipients, ledger=ledger) as (pending, on_result), \
+            SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=3) as pool:
+        stats = send_messages(pool, ((recipient, make_message(recipient)) for recipient in pending),
+                              on_result=on_result)
+
+    assert stats['sent'] == 9 and stats['failed'] == 0
+    assert sorted(envelope.rcpt_tos[0] for envelope in handler.envelopes) == sorted(recipients[1:])
+    assert ledger.summary(DATE) == {('smtp', 'sent'): 10}
+
+
+def test_tracked_delivery_disabled_passes_recipients_through():
+    recipients = ["a@example.com"]
+    with tracked_delivery(DATE, 'smtp', recipients, enabled=False) as (pending, on_result):
+        assert pending is recipients
+        assert on_result is None
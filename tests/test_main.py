@@ -3,10 +3,35 @@ import pytest
 from unittest.mock import Mock, patch, mock_open
 from datetime import datetime
 
-from daily_bible_crawler.main import capture_bible_content
+from daily_bible_crawler.main import capture_bible_content, collect_bible_data_from_page
 
-@patch('daily_bible_crawler.main.sync_playwright')
-def test_capture_bible_content(mock_playwright):
+BIBLE_DATA = {
+    'header': '매일성경 2025.03.24(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35',
+    'verses': [
+        {'number': '25', 'text': '수많은 무리가 함께 갈새 예수께서 돌이키사 이르시되'},
+        {'number': '26', 'text': '무릇 내게 오는 자가 자기 부모와 처자와 형제와 자매와 더욱이 자기 목숨까지 미워하지 아니하면 능히 내 제자가 되지 못하고'}
+    ]
+}
+
+EXPLANATION_DATA = {
+    'title': '예수님을 따르는 많은 무리를 보시고 제자가 되려면 그에 따르는 분명한 대가가 있음을 알고 따라야 한다고 말씀하십니다.',
+    'sections': [
+        {
+            'subtitle': '예수님은 어떤 분입니까?',
+            'content': '전체 예수님이 원하시는 것은 더 많은 추종자가 아니라 진정한 제자입니다.'
+        },
+        {
+            'subtitle': '내게 주시는 교훈은 무엇입니까?',
+            'content': '26-33절 예수님을 따르는 제자에게 요구되는 세 가지 덕목이 있습니다.'
+        }
+    ],
+    'info': '매일성경 2025.03.24(월)'
+}
+
+
+@patch('daily_bible_crawler.http_fetcher.fetch_bible_data', return_value=None)
+@patch('playwright.sync_api.sync_playwright')
+def test_capture_bible_content(mock_playwright, mock_fetch):
     # Mock Playwright objects
     mock_browser = Mock()
     mock_page = Mock()
@@ -18,38 +43,16 @@ def test_capture_bible_content(mock_playwright):
     # Mock page.content() 메서드
     mock_page.content.return_value = "<html><body>Mock HTML Content</body></html>"
     
-    # Mock page.evaluate 메서드 호출 결과
+    # Mock page.evaluate 메서드 호출 결과 (최적화 모드: 탭 상태마다 한 번씩 호출)
     mock_page.evaluate.side_effect = [
-        # 웹사이트 구조
+        # 말씀 영역과 CSS를 한 번에 추출
         {
-            'bible': {'exists': True, 'id': 'font_uparea02', 'className': '', 'children': 8},
-            'explanation': {'exists': True, 'id': 'font_uparea03', 'className': '', 'children': 5}
-        },
-        # CSS 추출
-        "body { font-family: sans-serif; }",
-        # 성경 말씀 추출
-        {
-            'header': '매일성경 2025.03.24(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35',
-            'verses': [
-                {'number': '25', 'text': '수많은 무리가 함께 갈새 예수께서 돌이키사 이르시되'},
-                {'number': '26', 'text': '무릇 내게 오는 자가 자기 부모와 처자와 형제와 자매와 더욱이 자기 목숨까지 미워하지 아니하면 능히 내 제자가 되지 못하고'}
-            ]
+            'structure': None,
+            'css': "body { font-family: sans-serif; }",
+            'bible': BIBLE_DATA
         },
         # 해설 추출
-        {
-            'title': '예수님을 따르는 많은 무리를 보시고 제자가 되려면 그에 따르는 분명한 대가가 있음을 알고 따라야 한다고 말씀하십니다.',
-            'sections': [
-                {
-                    'subtitle': '예수님은 어떤 분입니까?',
-                    'content': '전체 예수님이 원하시는 것은 더 많은 추종자가 아니라 진정한 제자입니다.'
-                },
-                {
-                    'subtitle': '내게 주시는 교훈은 무엇입니까?',
-                    'content': '26-33절 예수님을 따르는 제자에게 요구되는 세 가지 덕목이 있습니다.'
-                }
-            ],
-            'info': '매일성경 2025.03.24(월)'
-        }
+        EXPLANATION_DATA
     ]
     
     # 해설 탭 클릭 모의
@@ -72,6 +75,141 @@ def test_capture_bible_content(mock_playwright):
     assert "body { font-family: sans-serif; }" == css_content
     
     # 메서드 호출 검증
-    mock_page.goto.assert_called_once_with("https://sum.su.or.kr:8888/bible/today")
-    mock_page.evaluate.assert_called()
-    mock_page.locator.assert_called_with("#mainTitle_3") 
\ No newline at end of file
+    mock_page.goto.assert_called_once()
+    assert mock_page.goto.call_args[0][0] == "https://sum.su.or.kr:8888/bible/today"
+    # networkidle 대신 영역별 준비 조건으로 대기
+    mock_page.wait_for_load_state.assert_not_called()
+    assert mock_page.wait_for_function.call_count == 2
+    assert mock_page.evaluate.call_count == 2
+    mock_page.content.assert_not_called()
+    mock_page.route.assert_called_once()
+    mock_page.locator.assert_called_with("#mainTitle_3") 
+
+@patch('playwright.sync_api.sync_playwright')
+@patch('daily_bible_crawler.http_fetcher.fetch_bible_data')
+def test_capture_bible_content_http_fast_path(mock_fetch, mock_playwright):
+    # HTTP 경로에서 내용을 모두 추출하면 브라우저를 띄우지 않아야 함
+    mock_fetch.return_value = (
+        {
+            'header': '매일성경 2025.03.24(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35',
+            'verses': [{'number': '25', 'text': '수많은 무리가 함께 갈새 예수께서 돌이키사 이르시되'}]
+        },
+        {
+            'title': '제자가 되려면 분명한 대가가 있음을 알고 따라야 합니다.',
+            'sections': [{'subtitle': '예수님은 어떤 분입니까?', 'content': '진정한 제자를 원하십니다.'}],
+            'info': '매일성경 2025.03.24(월)'
+        },
+        ".bible-verse { color: #333; }"
+    )
+    
+    content, html_content, css_content = capture_bible_content()
+    
+    assert "25. 수많은 무리가" in content["말씀"]
+    assert "진정한 제자를 원하십니다." in content["해설"]
+    assert '<span class="verse-number">25</span>' in html_content
+    assert css_content == ".bible-verse { color: #333; }"
+    mock_fetch.assert_called_once_with("https://sum.su.or.kr:8888/bible/today", explanation_url=None)
+    mock_playwright.assert_not_called()
+
+
+def test_collect_bible_data_from_page_legacy_mode():
+    # 최적화 모드를 끄면 기존처럼 내용 확인, 구조 분석, CSS, 말씀, 해설을 따로 호출
+    mock_page = Mock()
+    mock_page.content.return_value = "<html><body>Mock HTML Content</body></html>"
+    mock_page.evaluate.side_effect = [
+        {'bible': {'exists': True}, 'explanation': {'exists': True}},
+        "body { font-family: sans-serif; }",
+        BIBLE_DATA,
+        EXPLANATION_DATA
+    ]
+    
+    bible_data, explanation_data, css_content = collect_bible_data_from_page(mock_page, optimized=False)
+    
+    assert bible_data == BIBLE_DATA
+    assert explanation_data == EXPLANATION_DATA
+    assert css_content == "body { font-family: sans-serif; }"
+    assert mock_page.evaluate.call_count == 4
+    mock_page.route.assert_not_called()
+
+
+@patch('daily_bible_crawler.main.collect_bible_data')
+def test_capture_bible_content_uses_cache(mock_collect):
+    cache = Mock()
+    cache.get.return_value = (BIBLE_DATA, EXPLANATION_DATA, "")
+    
+    content, html_content, css_content = capture_bible_content(cache=cache)
+    assert "매일성경 2025.03.24(월)" in content["말씀"]
+    mock_collect.assert_not_called()
+    
+    # 강제 새로고침 시 다시 크롤링하고 결과를 캐시에 저장
+    mock_collect.return_value = (BIBLE_DATA, EXPLANATION_DATA, "")
+    capture_bible_content(cache=cache, force_refresh=True)
+    mock_collect.assert_called_once()
+    cache.put.assert_called_once()
+
+
+def test_import_does_not_load_backends_or_configure():
+    # 모듈을 가져오기만 해서는 전송/추출 백엔드를 불러오거나 로그 파일, 로캘을 설정하지 않음
+    import subprocess
+    import sys
+    
+    code = (
+        "import locale, sys\n"
+        "import daily_bible_crawler.main\n"
+        "heavy = ['playwright', 'googleapiclient', 'google_auth_oauthlib', 'bs4', 'requests']\n"
+        "print([name for name in heavy if name in sys.modules], locale.setlocale(locale.LC_TIME))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=os.path.dirname(os.path.dirname(__file__)),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert output.strip() == "[] C"
+
+
+def test_send_email_with_app_password_names_attachment_by_reading_date(tmp_path, monkeypatch):
+    from daily_bible_crawler import main
+    from daily_bible_crawler.recipients import EnvRecipientSource
+
+    # 전송 원장이 작업 디렉토리에 만들어지지 않도록 임시 디렉토리에서 실행
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'EMAIL_SENDER', 'sender@example.com')
+    monkeypatch.setattr(main, 'EMAIL_APP_PASSWORD', 'app-password')
+    sent = []
+
+    def fake_send_messages(pool, messages, on_result=None, limiter=None):
+        sent.extend(message for _, (_, _, message) in messages)
+        return {'sent': len(sent), 'failed': 0, 'failed_recipients': []}
+
+    with patch('daily_bible_crawler.smtp_sender.send_messages', side_effect=fake_send_messages):
+        main.send_email_with_app_password('제목', '<p>말씀</p>', date=datetime(2025, 3, 24),
+                                          recipients=EnvRecipientSource('a@example.com'), pool=Mock())
+
+    assert len(sent) == 1
+    assert b'bible_content_20250324.html' in sent[0]
+
+
+def test_cli_shards_recipients_used_by_every_delivery_path(monkeypatch):
+    import runpy
+    import sys
+    import warnings
+
+    from daily_bible_crawler import main
+
+    seen = {}
+
+    def fake_main(force_refresh=False):
+        # checkpoint 등이 가져오는 패키지 모듈의 수신자 원본에 샤드가 적용되어야 함
+        seen['labels'] = main.EMAIL_RECIPIENTS.shard_labels()
+
+    monkeypatch.setattr(sys, 'argv', ['main', '--shard-index', '1', '--shard-count', '2'])
+    monkeypatch.setattr(main, 'init', Mock())
+    monkeypatch.setattr(main, 'main', fake_main)
+    try:
+        with warnings.catch_warnings():
+            # 이미 가져온 모듈을 __main__으로 다시 실행한다는 경고는 무시
+            warnings.simplefilter('ignore', RuntimeWarning)
+            runpy.run_module('daily_bible_crawler.main', run_name='__main__')
+    finally:
+        main.EMAIL_RECIPIENTS.select_shard(0, 1)
+
+    assert seen == {'labels': {'shard': '1'}}
@@ -0,0 +1,48 @@
+import base64
+from datetime import datetime
+from email import message_from_bytes
+from email.policy import default
+
+from daily_bible_crawler.message_builder import PreparedMessage, chunked
+
+HTML_CONTENT = "<html><body><h1>오늘의 말씀</h1></body></html>"
+
+
+def test_prepared_message_per_recipient():
+    prepared = PreparedMessage("sender@example.com", "[매일성경] 오늘의 말씀", HTML_CONTENT, date=datetime(2025, 3, 24))
+    
+    msg = message_from_bytes(prepared.as_bytes("user@example.com"), policy=default)
+    
+    assert msg['To'] == "user@example.com"
+    assert msg['From'] == "sender@example.com"
+    assert msg['Subject'] == "[매일성경] 오늘의 말씀"
+    attachment = next(msg.iter_attachments())
+    assert attachment.get_filename() == "bible_content_20250324.html"
+    assert attachment.get_content() == HTML_CONTENT
+
+
+def test_prepared_message_raw_matches_full_encoding():
+    prepared = PreparedMessage("sender@example.com", "[매일성경] 오늘의 말씀", HTML_CONTENT)
+    
+    # 헤더와 본문을 따로 인코딩해 이어 붙인 결과가 올바른 base64url이어야 함
+    for recipient in ["a@example.com", "ab@example.com", "abc@example.com"]:
+        raw = prepared.as_raw(recipient)
+        decoded = base64.urlsafe_b64decode(raw)
+        assert decoded.endswith(prepared.template)
+        assert message_from_bytes(decoded, policy=default)['To'] == recipient
+
+
+def test_prepared_message_bcc():
+    prepared = PreparedMessage("sender@example.com", "제목", HTML_CONTENT)
+    recipients = [f"user{index}@example.com" for index in range(3)]
+    
+    msg = message_from_bytes(base64.urlsafe_b64decode(prepared.as_bcc_raw(recipients)), policy=default)
+    assert msg['To'] == "sender@example.com"
+    assert [address.addr_spec for address in msg['Bcc'].addresses] == recipients
+    
+    smtp_msg = message_from_bytes(prepared.as_bcc_bytes(), policy=default)
+    assert smtp_msg['Bcc'] is None
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
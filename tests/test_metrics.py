@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from daily_bible_crawler import metrics
+from daily_bible_crawler.metrics import RunMetrics
+
+
+def test_stage_and_counters_are_noop_without_run():
+    with metrics.stage('render'):
+        pass
+    metrics.add('messages_sent', 3)
+    assert metrics.current() is None
+
+
+def test_run_metrics_writes_report_history_and_textfile(tmp_path):
+    paths = {
+        'report_path': str(tmp_path / "run_report.json"),
+        'history_path': str(tmp_path / "run_history.jsonl"),
+        'textfile_path': str(tmp_path / "daily_bible_crawler.prom"),
+    }
+    for _ in range(2):
+        with RunMetrics(**paths):
+            # 같은 단계는 합산되고 카운터는 누적됨
+            with metrics.stage('page_goto'):
+                pass
+            with metrics.stage('page_goto'):
+                pass
+            metrics.add('messages_sent', 2)
+            metrics.add('messages_sent', 1)
+            metrics.set_value('email_bytes', 1024)
+            metrics.observe_max('browser_rss_bytes', 10)
+            metrics.observe_max('browser_rss_bytes', 5)
+
+    report = json.loads((tmp_path / "run_report.json").read_text(encoding="utf-8"))
+    assert report['status'] == 'success'
+    assert set(report['stages']) == {'page_goto'}
+    assert report['counters'] == {'messages_sent': 3, 'email_bytes': 1024, 'browser_rss_bytes': 10}
+    assert report['peak_rss_bytes'] > 0
+    assert len((tmp_path / "run_history.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+    textfile = (tmp_path / "daily_bible_crawler.prom").read_text(encoding="utf-8")
+    assert 'daily_bible_crawler_stage_duration_seconds{stage="page_goto"}' in textfile
+    assert 'daily_bible_crawler_messages_sent 3\n' in textfile
+    assert 'daily_bible_crawler_run_success 1\n' in textfile
+    assert metrics.current() is None
+
+
+def test_run_metrics_records_failure(tmp_path):
+    with pytest.raises(RuntimeError):
+        with RunMetrics(report_path=str(tmp_path / "run_report.json")):
+            raise RuntimeError("크롤링 실패")
+
+    report = json.loads((tmp_path / "run_report.json").read_text(encoding="utf-8"))
+    assert report['status'] == 'failed'
+
+
+def test_sharded_runs_write_separate_labeled_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_REPORT_PATH', str(tmp_path / "run_report.json"))
+    monkeypatch.setattr(metrics, 'METRICS_HISTORY_PATH', str(tmp_path / "run_history.jsonl"))
+    monkeypatch.setattr(metrics, 'METRICS_TEXTFILE_PATH', str(tmp_path / "daily_bible_crawler.prom"))
+    for shard in ('0', '1'):
+        with RunMetrics.from_env(labels={'shard': shard}):
+            with metrics.stage('send_smtp'):
+                pass
+            metrics.add('messages_sent', int(shard) + 1)
+
+    report = json.loads((tmp_path / "run_report.shard1.json").read_text(encoding="utf-8"))
+    assert report['labels'] == {'shard': '1'}
+    assert report['counters'] == {'messages_sent': 2}
+    textfile = (tmp_path / "daily_bible_crawler.shard0.prom").read_text(encoding="utf-8")
+    assert 'daily_bible_crawler_messages_sent{shard="0"} 1\n' in textfile
+    assert 'daily_bible_crawler_stage_duration_seconds{shard="0",stage="send_smtp"}' in textfile
+    # 실행 기록은 한 파일에 함께 추가
+    assert len((tmp_path / "run_history.jsonl").read_text(encoding="utf-8").splitlines()) == 2
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.passages import (
+    PassageIndex,
+    PassageRange,
+    parse_query,
+    parse_reference,
+    sync_index,
+    verse_position,
+)
+from daily_bible_crawler.reading import DailyReading
+
+
+def reading(reference):
+    return DailyReading(header=f"매일성경 2025.03.24(월)\n제자도\n본문 : {reference}")
+
+
+@pytest.mark.parametrize('reference, expected', [
+    ('누가복음(Luke) 14:25 - 14:35', ('누가복음', 'Luke', (14, 25), (14, 35))),
+    ('로마서(Romans) 7:24 - 8:4', ('로마서', 'Romans', (7, 24), (8, 4))),
+    ('시편(Psalms) 23:1 - 6', ('시편', 'Psalms', (23, 1), (23, 6))),
+    ('고린도전서(1 Corinthians) 13:1', ('고린도전서', '1 Corinthians', (13, 1), (13, 1))),
+    ('룻기 1', ('룻기', '', (1, 1), (1, 999))),
+])
+def test_parse_reference(reference, expected):
+    korean, english, start, end = expected
+    assert parse_reference(reading(reference).header) == PassageRange(
+        korean, english, verse_position(*start), verse_position(*end)
+    )
+
+
+def test_parse_reference_without_passage_line():
+    assert parse_reference("매일성경 2025.03.24(월)\n제자도") is None
+
+
+def test_parse_query():
+    assert parse_query('Luke 14:30') == ('luke', verse_position(14, 30), verse_position(14, 30))
+    assert parse_query('로마서 8') == ('로마서', verse_position(8, 1), verse_position(8, 999))
+    assert parse_query('1 Corinthians 13:1-13') == ('1corinthians', verse_position(13, 1), verse_position(13, 13))
+    with pytest.raises(ValueError):
+        parse_query('Luke')
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = PassageIndex(str(tmp_path / 'passages.sqlite3'))
+    for day, reference in enumerate([
+        '누가복음(Luke) 14:25 - 14:35',
+        '누가복음(Luke) 15:1 - 15:10',
+        '로마서(Romans) 7:14 - 7:25',
+        '로마서(Romans) 7:24 - 8:4',
+        '로마서(Romans) 8:31 - 8:39',
+    ], 1):
+        index.add_reading(reading(reference), datetime(2025, 3, day))
+    return index
+
+
+def test_find_overlapping_days(index):
+    assert [date.day for date, _ in index.find('Luke 14:30')] == [1]
+    assert [date.day for date, _ in index.find('누가복음 14:35-15:1')] == [1, 2]
+    # 7장에서 시작해 8장으로 이어지는 범위도 8장과 겹침
+    assert [date.day for date, _ in index.find('로마서 8')] == [4, 5]
+    assert [str(passage) for _, passage in index.find('romans 7:20')] == ['로마서(Romans) 7:14-25']
+    assert index.find('Luke 16:1') == []
+    assert index.find('Genesis 1') == []
+
+
+def test_add_replaces_day_and_records_unparsed(index):
+    index.add_reading(reading('요한복음(John) 3:16'), datetime(2025, 3, 1))
+    index.add_reading(DailyReading(header='본문 없음'), datetime(2025, 3, 9))
+
+    assert index.find('Luke 14:30') == []
+    assert str(index.get(datetime(2025, 3, 1))) == '요한복음(John) 3:16'
+    assert index.get(datetime(2025, 3, 9)) is None
+    assert datetime(2025, 3, 9) in index.versions()
+
+
+def test_sync_index_reads_archive(tmp_path):
+    texts_dir = str(tmp_path / 'texts')
+    ArchiveStore(texts_dir).put(datetime(2025, 3, 24), reading('누가복음(Luke) 14:25 - 14:35'))
+    index = PassageIndex(str(tmp_path / 'passages.sqlite3'))
+
+    assert sync_index(texts_dir, index) == 1
+    assert sync_index(texts_dir, index) == 0
+    assert [date.day for date, _ in index.find('Luke 14')] == [24]
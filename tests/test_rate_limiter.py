@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+from daily_bible_crawler.rate_limiter import AdaptiveRateLimiter, DailyLimitReached
+
+
+def test_reserve_waits_for_tokens_after_burst():
+    limiter = AdaptiveRateLimiter('smtp', max_rate=10, burst=2, log_interval=0)
+
+    # 버스트만큼은 바로 보내고, 그다음부터는 1/속도 간격으로 기다림
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+    assert limiter.reserve() == pytest.approx(0.2, abs=0.01)
+    assert limiter.status()['queued'] == 4
+
+
+def test_throttle_halves_rate_and_successes_restore_it():
+    limiter = AdaptiveRateLimiter('gmail', max_rate=8, min_rate=1, increase_after=3, log_interval=0)
+
+    for _ in range(3):
+        limiter.reserve()
+        limiter.on_throttle(retry_after=0)
+    assert limiter.rate == 1
+    assert limiter.throttled == 3
+
+    # 연속 성공 increase_after통마다 1.25배씩 최대 속도까지 올림
+    for _ in range(30):
+        limiter.reserve()
+        limiter.on_success()
+    assert limiter.rate == 8
+    assert limiter.status()['queued'] == 0
+
+
+def test_daily_limit_counts_only_delivered_messages():
+    limiter = AdaptiveRateLimiter('smtp', max_rate=1000, daily_limit=3, sent_today=1, log_interval=0)
+
+    limiter.acquire()
+    limiter.on_failure()
+    limiter.acquire()
+    limiter.on_success()
+    limiter.acquire()
+    limiter.on_success()
+
+    # 오늘 원장에 있던 1통 + 성공 2통 (실패한 메시지는 한도에서 빠짐)
+    assert limiter.status()['sent_today'] == 3
+    with pytest.raises(DailyLimitReached):
+        limiter.acquire()
+
+
+def test_acquire_async_does_not_block_event_loop():
+    limiter = AdaptiveRateLimiter('smtp', max_rate=20, burst=1, log_interval=0)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        started_at = time.perf_counter()
+        for _ in range(4):
+            await limiter.acquire_async()
+        elapsed = time.perf_counter() - started_at
+        task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(run())
+    assert elapsed == pytest.approx(0.15, abs=0.05)
+    assert ticks > 5
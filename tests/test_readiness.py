@@ -0,0 +1,40 @@
+from unittest.mock import Mock
+
+from daily_bible_crawler.readiness import CaptureDeadline, wait_for_section, fetch_explanation_via_xhr
+
+
+def test_capture_deadline_limits_timeout():
+    deadline = CaptureDeadline(5)
+    assert deadline.timeout_ms(2) <= 2000
+    assert 4000 < deadline.timeout_ms() <= 5000
+    
+    # 예산을 모두 쓰면 대기하지 않고 False 반환
+    expired = CaptureDeadline(0)
+    page = Mock()
+    assert expired.expired
+    assert wait_for_section(page, 'explanation', expired) is False
+    page.wait_for_function.assert_not_called()
+
+
+def test_wait_for_section_timeout_continues():
+    page = Mock()
+    page.wait_for_function.side_effect = TimeoutError("Timeout 10000ms exceeded")
+    assert wait_for_section(page, 'explanation', CaptureDeadline(30), 10) is False
+    assert page.wait_for_function.call_args.kwargs['timeout'] <= 10000
+
+
+def test_fetch_explanation_via_xhr():
+    page = Mock()
+    page.request.get.return_value.ok = True
+    page.request.get.return_value.text.return_value = """
+        <div class="b_text">제자가 되려면 대가가 있습니다.</div>
+        <div id="font_uparea03">
+            <div class="g_text">예수님은 어떤 분입니까?</div>
+            <div class="text">진정한 제자를 원하십니다.</div>
+        </div>
+    """
+    
+    explanation_data = fetch_explanation_via_xhr(page, "https://example.com/explanation", CaptureDeadline(30))
+    
+    assert explanation_data['title'] == '제자가 되려면 대가가 있습니다.'
+    assert explanation_data['sections'] == [{'subtitle': '예수님은 어떤 분입니까?', 'content': '진정한 제자를 원하십니다.'}]
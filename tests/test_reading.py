@@ -0,0 +1,79 @@
+import json
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime
+
+import pytest
+
+from daily_bible_crawler.cache import ContentCache
+from daily_bible_crawler.main import build_bible_content, render_reading
+from daily_bible_crawler.reading import SCHEMA_VERSION, DailyReading, Section, Verse
+
+BIBLE_DATA = {
+    'header': '매일성경 2025.03.24(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35',
+    'verses': [{'number': '25', 'text': '수많은 무리가 함께 갈새'}, {'number': '26', 'text': '무릇 내게 오는 자가' * 20}],
+}
+EXPLANATION_DATA = {
+    'title': '제자가 되려면 분명한 대가가 있음을 알고 따라야 합니다.',
+    'sections': [{'subtitle': '예수님은 어떤 분입니까?', 'content': '진정한 제자를\n\n원하십니다.'}],
+    'info': '매일성경 2025.03.24(월)',
+}
+CSS = ".bible-verse { color: #333; }"
+
+
+def test_binary_round_trip():
+    reading = DailyReading.from_dicts(BIBLE_DATA, EXPLANATION_DATA, CSS, date=datetime(2025, 3, 24, 6, 0))
+    data = reading.to_bytes()
+
+    assert data[:4] == b'DBR' + bytes([SCHEMA_VERSION])
+    restored = DailyReading.from_bytes(data)
+    assert restored == reading
+    assert restored.date == date(2025, 3, 24)
+    assert restored.verses[0] == Verse('25', '수많은 무리가 함께 갈새')
+    assert restored.sections == (Section('예수님은 어떤 분입니까?', '진정한 제자를\n\n원하십니다.'),)
+    assert restored.to_dicts() == (BIBLE_DATA, EXPLANATION_DATA, CSS)
+    # JSON보다 작음
+    assert len(data) < len(json.dumps([BIBLE_DATA, EXPLANATION_DATA, CSS], ensure_ascii=False).encode('utf-8'))
+
+
+def test_from_bytes_rejects_unknown_data():
+    data = DailyReading(header='헤더').to_bytes()
+
+    with pytest.raises(ValueError):
+        DailyReading.from_bytes(b'{"bible": {}}')
+    with pytest.raises(ValueError):
+        DailyReading.from_bytes(data[:3] + bytes([SCHEMA_VERSION + 1]) + data[4:])
+    with pytest.raises(ValueError):
+        DailyReading.from_bytes(data[:-1])
+
+
+def test_records_use_slots():
+    reading = DailyReading.from_dicts(BIBLE_DATA, EXPLANATION_DATA)
+    for record in (reading, reading.verses[0], reading.sections[0]):
+        assert not hasattr(record, '__dict__')
+
+
+def test_render_reading_matches_build_bible_content():
+    reading = DailyReading.from_dicts(BIBLE_DATA, EXPLANATION_DATA)
+    content, html_content = render_reading(reading)
+
+    assert (content, html_content) == build_bible_content(BIBLE_DATA, EXPLANATION_DATA)
+    assert content['말씀'].endswith('26. ' + '무릇 내게 오는 자가' * 20)
+    assert '진정한 제자를<br><br>원하십니다.' in html_content
+
+
+def test_cache_reads_legacy_json_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ContentCache(path=path)
+    payload = json.dumps({'bible': BIBLE_DATA, 'explanation': EXPLANATION_DATA, 'css': CSS}, ensure_ascii=False)
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute("INSERT INTO readings VALUES ('20250324', ?, 0, 0)", (payload,))
+
+    reading = cache.get_reading(datetime(2025, 3, 24))
+    assert reading == DailyReading.from_dicts(BIBLE_DATA, EXPLANATION_DATA, CSS, date=datetime(2025, 3, 24))
+
+    # 다시 저장하면 바이너리 형식으로 저장
+    cache.put_reading(datetime(2025, 3, 24), reading)
+    with closing(sqlite3.connect(path)) as conn:
+        stored = conn.execute("SELECT payload FROM readings").fetchone()[0]
+    assert stored.startswith(b'DBR')
@@ -0,0 +1,53 @@
+import json
+import sqlite3
+
+import pytest
+
+from daily_bible_crawler.recipients import EnvRecipientSource, open_recipient_source, shard_of
+
+ADDRESSES = [f"user{index}@example.com" for index in range(50)]
+
+
+def test_env_source_skips_blanks():
+    source = EnvRecipientSource(" a@example.com, ,b@example.com ")
+    assert list(source) == ["a@example.com", "b@example.com"]
+    assert source
+    assert not EnvRecipientSource("")
+
+
+def test_file_sources(tmp_path):
+    with_header = tmp_path / "recipients.csv"
+    with_header.write_text("name,email\n홍길동,a@example.com\n,\n김철수,b@example.com\n", encoding="utf-8")
+    without_header = tmp_path / "list.txt"
+    without_header.write_text("a@example.com\nb@example.com\n", encoding="utf-8")
+    jsonl = tmp_path / "recipients.jsonl"
+    jsonl.write_text('{"email": "a@example.com"}\n\n"b@example.com"\n', encoding="utf-8")
+    database = tmp_path / "recipients.sqlite3"
+    with sqlite3.connect(database) as conn:
+        conn.execute("CREATE TABLE recipients (email TEXT)")
+        conn.executemany("INSERT INTO recipients VALUES (?)", [("a@example.com",), ("b@example.com",)])
+
+    for spec in (str(with_header), f"csv:{without_header}", str(jsonl), str(database)):
+        assert list(open_recipient_source(spec)) == ["a@example.com", "b@example.com"], spec
+
+    with pytest.raises(ValueError):
+        open_recipient_source(str(tmp_path / "recipients.xlsx"))
+
+
+def test_shards_split_list_without_overlap(tmp_path):
+    path = tmp_path / "recipients.jsonl"
+    path.write_text(''.join(json.dumps({'email': address}) + '\n' for address in ADDRESSES), encoding="utf-8")
+
+    shards = [list(open_recipient_source(str(path), shard_index=index, shard_count=3)) for index in range(3)]
+
+    assert sorted(sum(shards, [])) == sorted(ADDRESSES)
+    assert all(shards)
+    # 순서나 대소문자가 바뀌어도 같은 샤드
+    assert shard_of("User7@Example.com ", 3) == shard_of("user7@example.com", 3)
+    assert open_recipient_source(str(path), shard_index=1, shard_count=3).shard_labels() == {'shard': '1'}
+    assert open_recipient_source(str(path)).shard_labels() == {}
+
+
+def test_invalid_shard():
+    with pytest.raises(ValueError):
+        EnvRecipientSource("a@example.com", shard_index=2, shard_count=2)
@@ -0,0 +1,133 @@
+import time as clock
+from datetime import datetime, time, timedelta
+from email import message_from_bytes
+from unittest.mock import Mock
+
+import pytest
+
+from daily_bible_crawler import scheduler
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.browser_pool import BrowserPool
+from daily_bible_crawler.main import EMAIL_RECIPIENTS
+from daily_bible_crawler.reading import DailyReading, Verse
+from daily_bible_crawler.recipients import CsvRecipientSource, EnvRecipientSource
+from daily_bible_crawler.scheduler import DeliveryWindow, Scheduler, parse_windows
+
+TODAY = DailyReading(header='매일성경 2025.03.24(월)\n오늘', verses=[Verse('1', '오늘 말씀')], title='제목',
+                     css='.bible-verse { color: #333; }')
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # 보관소, 색인, CSS 캐시가 작업 디렉토리에 만들어지므로 임시 디렉토리에서 실행
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scheduler, 'ARCHIVE_BACKEND', 'store')
+    monkeypatch.setattr(scheduler, 'EMAIL_SENDER', 'sender@example.com')
+    monkeypatch.setattr(scheduler, 'CHANGE_DETECTION_ENABLED', False)
+
+
+def window_in(seconds, recipients='a@example.com'):
+    at = datetime.now() + timedelta(seconds=seconds)
+    if at.date() != datetime.now().date():
+        pytest.skip("자정 직전에는 오늘 일정을 만들 수 없음")
+    return DeliveryWindow(at.time(), EnvRecipientSource(recipients))
+
+
+def timed_send():
+    calls = []
+    send = Mock(side_effect=lambda *args, **kwargs: calls.append(datetime.now()))
+    return send, calls
+
+
+def make_scheduler(windows, capture, send, **kwargs):
+    kwargs.setdefault('retry_interval', 10)
+    return Scheduler(windows, prepare_lead=60, warmup_lead=0, capture=capture, send=send, **kwargs)
+
+
+def test_parse_windows_sorts_and_defaults_to_email_recipients():
+    windows = parse_windows('07:30=recipients_b.csv; 06:00')
+
+    assert [window.at for window in windows] == [time(6, 0), time(7, 30)]
+    assert windows[0].recipients is EMAIL_RECIPIENTS
+    assert isinstance(windows[1].recipients, CsvRecipientSource)
+    for value in ('25:00', '', 'csv'):
+        with pytest.raises(ValueError):
+            parse_windows(value)
+
+
+def test_sends_each_group_at_its_window_with_prepared_message():
+    windows = [window_in(0.6, 'b@example.com'), window_in(0.3, 'a@example.com')]
+    send, calls = timed_send()
+    capture = Mock(return_value=TODAY)
+
+    assert make_scheduler(windows, capture, send).run_day(datetime.now().date())
+
+    capture.assert_called_once()
+    assert [call.kwargs['recipients'] for call in send.call_args_list] == [windows[1].recipients, windows[0].recipients]
+    for call, sent_at, window in zip(send.call_args_list, calls, sorted(windows, key=lambda item: item.at)):
+        scheduled = window.scheduled(datetime.now().date())
+        assert timedelta(0) <= sent_at - scheduled < timedelta(seconds=0.5)
+        # 전송 시각마다 미리 인코딩한 메시지의 Date 헤더는 전송 예정 시각
+        prepared = call.kwargs['prepared']
+        date_header = message_from_bytes(prepared.template)['Date']
+        assert abs(datetime.strptime(date_header[:25], '%a, %d %b %Y %H:%M:%S') - scheduled) < timedelta(seconds=1)
+    # 전송 전에 보관소에 저장
+    archived = ArchiveStore('texts').get(datetime.combine(datetime.now().date(), time()))
+    assert archived.verses == TODAY.verses
+
+
+def test_uses_archived_reading_when_crawl_fails():
+    today = datetime.combine(datetime.now().date(), time())
+    ArchiveStore('texts').put(today, TODAY)
+    send, calls = timed_send()
+    capture = Mock(side_effect=RuntimeError("사이트 응답 없음"))
+
+    assert make_scheduler([window_in(0.3)], capture, send).run_day(today.date())
+
+    assert send.call_count == 1
+    assert send.call_args.kwargs['date'] == today
+    assert '오늘 말씀' in send.call_args.args[1]
+
+
+def test_keeps_retrying_and_sends_late_when_nothing_is_archived():
+    send, _ = timed_send()
+    capture = Mock(side_effect=[RuntimeError("실패"), RuntimeError("실패"), TODAY])
+    started = clock.monotonic()
+
+    assert make_scheduler([window_in(0.3)], capture, send, retry_interval=0.2).run_day(datetime.now().date())
+
+    assert send.call_count == 1
+    assert capture.call_count == 3
+    # 다시 시도할 때는 캐시에 남은 내용을 쓰지 않음
+    assert [call.args[1] for call in capture.call_args_list] == [False, True, True]
+    assert clock.monotonic() - started < 5
+
+
+def test_skips_past_windows_without_catch_up():
+    send, _ = timed_send()
+    capture = Mock(return_value=TODAY)
+    past = DeliveryWindow((datetime.now() - timedelta(minutes=1)).time())
+    if past.at > datetime.now().time():
+        pytest.skip("자정 직후에는 지난 전송 시각을 만들 수 없음")
+
+    assert make_scheduler([past], capture, send).run_day(datetime.now().date(), catch_up=False)
+
+    capture.assert_not_called()
+    send.assert_not_called()
+
+
+def test_default_capture_reuses_one_browser_pool_across_retries(monkeypatch):
+    capture = Mock(side_effect=[RuntimeError("실패"), TODAY])
+    monkeypatch.setattr(scheduler, 'capture_reading', capture)
+    runner = Scheduler([window_in(60)], prepare_lead=60, retry_interval=0.05, warmup_lead=0, send=Mock())
+    today = datetime.combine(datetime.now().date(), time())
+
+    assert runner.prepare_until(today, today + timedelta(days=1)) is not None
+
+    # 재시도해도 같은 풀을 넘기며, 풀은 스케줄러를 닫을 때 닫음
+    assert capture.call_count == 2
+    assert isinstance(runner.browser_pool, BrowserPool)
+    assert all(call.kwargs['pool'] is runner.browser_pool for call in capture.call_args_list)
+    runner.browser_pool = Mock()
+    runner.close()
+    runner.browser_pool.close.assert_called_once()
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.reading import DailyReading, Section, Verse
+from daily_bible_crawler.search import SearchIndex, make_snippet, sync_index
+
+
+def make_reading(day, verse_text, section_content):
+    return DailyReading(
+        date=datetime(2025, 3, day),
+        header=f"매일성경 2025.03.{day:02d}(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35",
+        verses=[Verse('25', verse_text), Verse('26', '무릇 내게 오는 자가 자기 부모를 미워하지 아니하면')],
+        title='제자가 되려면',
+        sections=[Section('예수님은 어떤 분입니까?', section_content)],
+        info='',
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.sqlite3'))
+    index.add_reading(make_reading(24, '자기 십자가를 지고 나를 따르지 않는 자도', '진정한 제자를 원하십니다.'))
+    index.add_reading(make_reading(25, '망대를 세우고자 할진대', '십자가의 길은 좁은 길입니다.'))
+    return index
+
+
+def test_search_finds_korean_substrings_ranked(index):
+    hits = index.search('십자가')
+    # 조사가 붙은 '십자가를', '십자가의'도 찾음
+    assert {(hit.date.day, hit.kind) for hit in hits} == {(24, 'verse'), (25, 'section')}
+    assert hits[0].score <= hits[1].score
+    assert '[십자가]' in hits[0].snippet
+
+    assert [hit.date.day for hit in index.search('십자가 좁은')] == [25]
+    assert [hit.ref for hit in index.search('십자가', kind='verse')] == ['25']
+    assert [hit.date.day for hit in index.search('십자가', start=datetime(2025, 3, 25))] == [25]
+    assert index.search('없는검색어') == []
+
+
+def test_search_short_terms_and_operators(index):
+    # 두 글자 검색어는 LIKE로 찾고, FTS5 연산자 문자는 그대로 검색어로 취급
+    assert [hit.date.day for hit in index.search('망대')] == [25]
+    assert index.search('"AND" OR') == []
+
+
+def test_add_reading_replaces_day(index):
+    index.add_reading(make_reading(24, '새 본문', '새 해설'))
+
+    assert [hit.date.day for hit in index.search('십자가')] == [25]
+    assert index.stats() == {'days': 2, 'verses': 4, 'sections': 2}
+
+
+def test_sync_index_only_indexes_changed_days(tmp_path):
+    texts_dir = str(tmp_path / 'texts')
+    store = ArchiveStore(texts_dir)
+    store.put(datetime(2025, 3, 24), make_reading(24, '자기 십자가를 지고', '진정한 제자'))
+    index = SearchIndex(str(tmp_path / 'search.sqlite3'))
+
+    assert sync_index(texts_dir, index) == 1
+    assert sync_index(texts_dir, index) == 0
+
+    store.put(datetime(2025, 3, 24), make_reading(24, '망대를 세우고자', '진정한 제자'))
+    assert sync_index(texts_dir, index) == 1
+    assert [hit.ref for hit in index.search('망대를')] == ['25']
+
+
+def test_make_snippet_marks_first_match():
+    text = '가' * 50 + '십자가' + '나' * 50
+    assert make_snippet(text, ['십자가'], width=5) == '…가가가가가[십자가]나나나나나…'
@@ -0,0 +1,113 @@
+import http.client
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from daily_bible_crawler.archive import ArchiveStore
+from daily_bible_crawler.reading import DailyReading, Section, Verse
+from daily_bible_crawler.server import ReadingCache, ReadingServer, etag_matches
+
+
+def make_reading(day):
+    return DailyReading(
+        date=datetime(2025, 3, day),
+        header=f"매일성경 2025.03.{day:02d}(월)\n제자도\n본문 : 누가복음(Luke) 14:25 - 14:35",
+        verses=[Verse('25', '수많은 무리가 함께 갈새'), Verse('26', '무릇 내게 오는 자가')],
+        title='제자가 되려면 분명한 대가가 있음을 알고 따라야 합니다.',
+        sections=[Section('예수님은 어떤 분입니까?', '진정한 제자를 원하십니다.')],
+        info=f"매일성경 2025.03.{day:02d}(월)",
+        css='.bible-verse { color: #333; }',
+    )
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # CSS 정리 캐시가 작업 디렉토리에 만들어지지 않도록 임시 디렉토리에서 실행
+    monkeypatch.chdir(tmp_path)
+    store = ArchiveStore(str(tmp_path / 'texts'))
+    for day in (23, 24):
+        store.put(datetime(2025, 3, day), make_reading(day))
+    return store
+
+
+@pytest.fixture
+def server(store):
+    cache = ReadingCache(store.directory, capacity=2)
+    server = ReadingServer(('127.0.0.1', 0), cache)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, method='GET', headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=5)
+    try:
+        connection.request(method, path, headers=headers or {})
+        response = connection.getresponse()
+        return response, response.read()
+    finally:
+        connection.close()
+
+
+def test_serves_reading_in_each_format(server, store):
+    response, body = request(server, '/readings/2025-03-24')
+    document = json.loads(body)
+    assert response.status == 200
+    assert response.getheader('Content-Type') == 'application/json; charset=utf-8'
+    assert document['date'] == '2025-03-24'
+    assert document['passage'] == {'korean': '누가복음', 'english': 'Luke', 'start': '14:25', 'end': '14:35'}
+    assert document['verses'][0] == {'number': '25', 'text': '수많은 무리가 함께 갈새'}
+    assert 'css' not in document
+
+    date = datetime(2025, 3, 24)
+    assert request(server, '/readings/2025-03-24.html')[1].decode('utf-8') == store.render_html(date)
+    assert request(server, '/readings/latest.txt')[1].decode('utf-8') == store.render_text(date)
+    assert json.loads(request(server, '/readings')[1]) == {'dates': ['2025-03-23', '2025-03-24']}
+
+
+def test_etag_returns_not_modified(server):
+    response, _ = request(server, '/readings/2025-03-23')
+    etag = response.getheader('ETag')
+
+    response, body = request(server, '/readings/2025-03-23', headers={'If-None-Match': f'"other", W/{etag}'})
+    assert response.status == 304 and body == b''
+    # 다른 형식은 ETag가 다름
+    response, _ = request(server, '/readings/2025-03-23.txt', headers={'If-None-Match': etag})
+    assert response.status == 200
+
+
+def test_unknown_dates_and_paths_return_not_found(server):
+    for path in ('/readings/2025-03-25', '/readings/yesterday', '/readings/2025-03-24.pdf', '/other'):
+        assert request(server, path)[0].status == 404
+    response, body = request(server, '/readings/2025-03-24', method='HEAD')
+    assert response.status == 200 and body == b''
+
+
+def test_cache_evicts_least_recently_used_and_prerenders_new_day(store):
+    cache = ReadingCache(store.directory, capacity=2)
+    # 시작할 때 가장 최근 날짜를 미리 렌더링
+    assert cache.stats()['cached'] == 1
+    cache.get(datetime(2025, 3, 23))
+    assert cache.stats()['hits'] == 0 and cache.stats()['misses'] == 1
+
+    store.put(datetime(2025, 3, 25), make_reading(25))
+    assert cache.refresh() == [datetime(2025, 3, 25)]
+
+    # 새 날짜는 요청 전에 캐시에 있고, 가장 오래 쓰지 않은 3/24는 밀려남
+    cache.get(datetime(2025, 3, 25))
+    cache.get(datetime(2025, 3, 23))
+    stats = cache.stats()
+    assert stats['latest'] == '2025-03-25'
+    assert stats['cached'] == 2 and stats['hits'] == 2
+    assert list(cache._entries) == [datetime(2025, 3, 25), datetime(2025, 3, 23)]
+
+
+def test_etag_matches():
+    assert etag_matches('*', '"a"')
+    assert etag_matches('"b", W/"a"', '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"b"', '"a"')
@@ -0,0 +1,132 @@
+import asyncio
+from email.mime.text import MIMEText
+
+from daily_bible_crawler.rate_limiter import AdaptiveRateLimiter
+from daily_bible_crawler.smtp_sender import SmtpConnectionPool, send_messages, send_messages_async
+
+
+def make_message(recipient):
+    msg = MIMEText("오늘의 말씀", 'plain', 'utf-8')
+    msg['From'] = 'sender@example.com'
+    msg['To'] = recipient
+    msg['Subject'] = '[매일성경] 오늘의 말씀'
+    return msg
+
+
+def test_send_messages_reuses_connections(smtp_server):
+    handler, port = smtp_server
+    recipients = [f"user{index}@example.com" for index in range(20)]
+    
+    with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=3) as pool:
+        stats = send_messages(pool, ((recipient, make_message(recipient)) for recipient in recipients))
+    
+    assert stats['sent'] == 20
+    assert stats['failed'] == 0
+    assert stats['rate'] > 0
+    # 수신자마다 연결하지 않고 최대 풀 크기만큼만 연결
+    assert pool.connects <= 3
+    assert sorted(envelope.rcpt_tos[0] for envelope in handler.envelopes) == sorted(recipients)
+
+
+def test_pool_reconnects_after_disconnect(smtp_server):
+    handler, port = smtp_server
+    
+    with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=1) as pool:
+        pool.send(make_message("first@example.com"))
+        # 서버가 연결을 끊은 상황을 흉내 내기 위해 유휴 연결의 소켓을 닫음
+        with pool.connection() as connection:
+            connection.server.close()
+        pool.send(make_message("second@example.com"))
+    
+    assert pool.reconnects == 1
+    assert pool.connects == 2
+    assert [envelope.rcpt_tos[0] for envelope in handler.envelopes] == ["first@example.com", "second@example.com"]
+
+
+def test_pool_recycles_connection_after_message_limit(smtp_server):
+    handler, port = smtp_server
+    
+    with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=1, max_messages_per_connection=2) as pool:
+        for index in range(5):
+            pool.send(make_message(f"user{index}@example.com"))
+    
+    assert pool.connects == 3
+    assert len(handler.envelopes) == 5
+
+
+def test_warm_up_opens_idle_connections_before_sending(smtp_server):
+    handler, port = smtp_server
+    
+    with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=2) as pool:
+        assert pool.warm_up() == 2
+        assert pool.warm_up() == 0
+        stats = send_messages(pool, ((recipient, make_message(recipient)) for recipient in ['a@example.com']))
+    
+    assert stats['sent'] == 1
+    # 미리 연 연결로 보내므로 새로 연결하지 않음
+    assert pool.connects == 2
+
+
+def test_send_prepared_bcc_message(smtp_server):
+    from daily_bible_crawler.message_builder import PreparedMessage
+    
+    handler, port = smtp_server
+    prepared = PreparedMessage("sender@example.com", "[매일성경] 오늘의 말씀", "<html></html>")
+    recipients = ["a@example.com", "b@example.com"]
+    
+    with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=1) as pool:
+        stats = send_messages(pool, [("a, b", ("sender@example.com", recipients, prepared.as_bcc_bytes()))])
+    
+    # 한 통의 메시지가 봉투의 모든 수신자에게 전달됨
+    assert stats['sent'] == 1
+    assert handler.envelopes[0].rcpt_tos == recipients
+
+
+def test_send_messages_async_limits_concurrency(smtp_server):
+    handler, port = smtp_server
+    recipients = [f"user{index}@example.com" for index in range(10)]
+    
+    async def run():
+        with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=4) as pool:
+            stats = await send_messages_async(pool, ((recipient, make_message(recipient)) for recipient in recipients), 4)
+        return stats, pool.connects
+    
+    stats, connects = asyncio.run(run())
+    assert stats['sent'] == 10
+    assert connects <= 4
+    assert sorted(envelope.rcpt_tos[0] for envelope in handler.envelopes) == sorted(recipients)
+
+
+def test_send_messages_slows_down_and_retries_throttled_messages(smtp_server):
+    handler, port = smtp_server
+    handler.throttle = 2
+    recipients = [f"user{index}@example.com" for index in range(6)]
+    limiter = AdaptiveRateLimiter('smtp', max_rate=1000, increase_after=100)
+    
+    with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=2) as pool:
+        stats = send_messages(pool, ((recipient, make_message(recipient)) for recipient in recipients), limiter=limiter)
+    
+    # 제한된 메시지도 다시 보내 모두 전달되고, 속도 한도는 줄어듦
+    assert stats['sent'] == 6
+    assert stats['failed'] == 0
+    assert limiter.throttled == 2
+    assert limiter.rate == 250
+    assert sorted(envelope.rcpt_tos[0] for envelope in handler.envelopes) == sorted(recipients)
+
+
+def test_send_messages_stops_at_daily_limit(smtp_server):
+    handler, port = smtp_server
+    recipients = [f"user{index}@example.com" for index in range(5)]
+    limiter = AdaptiveRateLimiter('smtp', max_rate=1000, daily_limit=3)
+    
+    async def run():
+        with SmtpConnectionPool(host='127.0.0.1', port=port, use_ssl=False, size=2) as pool:
+            return await send_messages_async(pool, ((recipient, make_message(recipient)) for recipient in recipients),
+                                             2, limiter=limiter)
+    
+    stats = asyncio.run(run())
+    # 남은 수신자는 실패로 처리하지 않고 보내지 않은 채로 남김
+    assert stats['limit_reached']
+    assert stats['sent'] == 3
+    assert stats['failed'] == 0
+    assert len(handler.envelopes) == 3